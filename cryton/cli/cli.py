@@ -2,7 +2,7 @@ import click
 
 from cryton.cli.utility import helpers
 from cryton.cli.config import SETTINGS
-from cryton.cli.commands import plan_template, run, plan, step, worker, execution_variable, stage, log
+from cryton.cli.commands import plan_template, run, plan, step, worker, execution_variable, stage, log, operation
 
 
 @click.group(cls=helpers.AliasedGroup)
@@ -33,6 +33,7 @@ def cli(ctx: click.Context, host: str | None, port: int | None, secure: bool, de
 
 
 cli.add_command(run.run)
+cli.add_command(run.run_archive_group)
 cli.add_command(plan.plan)
 cli.add_command(plan.plan_execution)
 cli.add_command(stage.stage)
@@ -43,6 +44,7 @@ cli.add_command(worker.worker)
 cli.add_command(plan_template.template)
 cli.add_command(execution_variable.execution_variable)
 cli.add_command(log.log)
+cli.add_command(operation.operation)
 
 
 @cli.command("generate-docs")
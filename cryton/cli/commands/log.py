@@ -1,9 +1,13 @@
+import time
+
 import click
 
 from cryton.cli.utility import helpers
 from cryton.cli.utility.decorators import *
 from cryton.cli.config import Log
 
+FOLLOW_POLL_INTERVAL = 1
+
 
 @click.group("logs", helpers.AliasedGroup)
 @click.pass_context
@@ -20,6 +24,13 @@ def log(_) -> None:
 @log.command("list")
 @click.pass_context
 @common_list_decorators
+@click.option(
+    "--since", type=click.STRING, help="Show logs since the time (ISO format, for example `2025-01-07T11:18`)."
+)
+@click.option("--until", type=click.STRING, help="Show logs before the time (ISO format).")
+@click.option("-s", "--search", type=click.STRING, help="Full-text search in the logs.")
+@click.option("-t", "--tail", type=click.INT, default=0, help="Show only the last N logs.")
+@click.option("-F", "--follow", is_flag=True, help="Keep showing new logs until interrupted.")
 def log_list(
     ctx: helpers.Context,
     less: bool,
@@ -27,6 +38,11 @@ def log_list(
     limit: int,
     localize: bool,
     parameter_filters: tuple[tuple[str, str | int]],
+    since: str | None,
+    until: str | None,
+    search: str | None,
+    tail: int,
+    follow: bool,
 ) -> None:
     """
     List existing Logs.
@@ -38,7 +54,37 @@ def log_list(
     :param limit: Number of results per page
     :param localize: If datetime variables should be converted to local timezone
     :param parameter_filters: Filter results using returned parameters
+    :param since: Show logs since the time
+    :param until: Show logs before the time
+    :param search: Full-text search query
+    :param tail: Show only the last N logs
+    :param follow: Keep showing new logs
     :return: None
     """
     additional_parameters = {each[0]: each[1] for each in parameter_filters}
-    ctx.obj.get_items(Log.LIST, offset, limit, additional_parameters, [], less, localize)
+    for key, value in {"since": since, "until": until, "search": search, "tail": tail}.items():
+        if value:
+            additional_parameters[key] = value
+
+    if not follow:
+        ctx.obj.get_items(Log.LIST, offset, limit, additional_parameters, [], less, localize)
+        return
+
+    parameters = {"offset": offset, "limit": limit} | additional_parameters
+    try:
+        while True:
+            response = ctx.obj.api_get(Log.LIST, parameters=parameters)
+            if isinstance(response, str) or not response.ok:
+                helpers.print_items(response, [], localize=localize, debug=ctx.obj.debug)
+                return
+
+            response_data = response.json()
+            for line in helpers.format_list_results(response_data["results"], [], localize):
+                click.echo(line.rstrip("\n"))
+            # Only the new logs from now on
+            parameters = additional_parameters | {"after": response_data["last_id"] or 0}
+            parameters.pop("tail", None)
+            if not response_data["results"]:
+                time.sleep(FOLLOW_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,68 @@
+import click
+
+from cryton.cli.utility import helpers
+from cryton.cli.utility.decorators import *
+from cryton.cli.config import Operation
+
+
+@click.group("operations", helpers.AliasedGroup)
+@click.pass_context
+def operation(_) -> None:
+    """
+    Check background operations (for example, deletions) from here.
+
+    \f
+    :param _: Click context
+    :return: None
+    """
+
+
+@operation.command("list")
+@click.pass_context
+@common_list_decorators
+def operation_list(
+    ctx: helpers.Context,
+    less: bool,
+    offset: int,
+    limit: int,
+    localize: bool,
+    parameter_filters: tuple[tuple[str, str | int]],
+) -> None:
+    """
+    List existing background operations.
+
+    \f
+    :param ctx: Click ctx object
+    :param less: Show less like output
+    :param offset: Initial index from which to return the results
+    :param limit: Number of results per page
+    :param localize: If datetime variables should be converted to local timezone
+    :param parameter_filters: Filter results using returned parameters (for example `id`, `type`, etc.)
+    :return: None
+    """
+    additional_parameters = {each[0]: each[1] for each in parameter_filters}
+    include = ["id", "type", "object_id", "state", "created_at", "finish_time"]
+    ctx.obj.get_items(Operation.LIST, offset, limit, additional_parameters, include, less, localize)
+
+
+@operation.command("show")
+@click.pass_context
+@click.argument("operation_id", type=click.INT, required=True)
+@d_less
+@d_localize
+def operation_read(ctx: helpers.Context, operation_id: int, less: bool, localize: bool) -> None:
+    """
+    Show background operation with OPERATION_ID and its progress.
+
+    OPERATION_ID is ID of the operation you want to see.
+
+    \f
+    :param ctx: Click ctx object
+    :param operation_id: ID of the desired operation
+    :param less: Show less like output
+    :param localize: If datetime variables should be converted to local timezone
+    :return: None
+    """
+    response = ctx.obj.api_get(Operation.READ, operation_id)
+    include = ["id", "type", "object_id", "state", "progress", "result", "error", "created_at", "finish_time"]
+    helpers.print_items(response, include, less, localize, ctx.obj.debug)
@@ -102,7 +102,8 @@ def plan_read(ctx: helpers.Context, plan_id: int, less: bool, localize: bool) ->
 @click.argument("plan_id", type=click.INT, required=True)
 def plan_delete(ctx: helpers.Context, plan_id: int) -> None:
     """
-    Delete Plan with PLAN_ID saved in Cryton.
+    Delete Plan with PLAN_ID saved in Cryton. The Plan is deleted in the background, use `operations show` to check the
+    progress.
 
     PLAN_ID is ID of the Plan you want to delete.
 
@@ -344,7 +345,8 @@ def plan_execution_resume(ctx: helpers.Context, execution_id: int) -> None:
 @plan_execution.command("validate-modules")
 @click.pass_context
 @click.argument("execution_id", type=click.INT, required=True)
-def plan_execution_validate_modules(ctx: helpers.Context, execution_id: int) -> None:
+@d_background
+def plan_execution_validate_modules(ctx: helpers.Context, execution_id: int, background: bool) -> None:
     """
     Validate modules for Plan's execution with EXECUTION_ID saved in Cryton.
 
@@ -353,16 +355,18 @@ def plan_execution_validate_modules(ctx: helpers.Context, execution_id: int) ->
     \f
     :param ctx: Click ctx object
     :param execution_id: ID of the desired Plan's execution
+    :param background: Run the action in the background
     :return: None
     """
-    response = ctx.obj.api_post(PlanExecution.VALIDATE_MODULES, execution_id)
+    response = ctx.obj.api_post(PlanExecution.VALIDATE_MODULES, execution_id, parameters={"background": background})
     helpers.print_message(response, ctx.obj.debug)
 
 
 @plan_execution.command("stop")
 @click.pass_context
 @click.argument("execution_id", type=click.INT, required=True)
-def plan_execution_stop(ctx: helpers.Context, execution_id: int) -> None:
+@d_background
+def plan_execution_stop(ctx: helpers.Context, execution_id: int, background: bool) -> None:
     """
     Stop Plan's execution with EXECUTION_ID saved in Cryton.
 
@@ -371,7 +375,77 @@ def plan_execution_stop(ctx: helpers.Context, execution_id: int) -> None:
     \f
     :param ctx: Click ctx object
     :param execution_id: ID of the desired Plan's execution
+    :param background: Run the action in the background
     :return: None
     """
-    response = ctx.obj.api_post(PlanExecution.STOP, execution_id)
+    response = ctx.obj.api_post(PlanExecution.STOP, execution_id, parameters={"background": background})
     helpers.print_message(response, ctx.obj.debug)
+
+
+@plan_execution.command("bulk-pause")
+@click.pass_context
+@click.argument("execution_ids", type=click.INT, nargs=-1)
+@d_filter
+def plan_execution_bulk_pause(
+    ctx: helpers.Context, execution_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]
+) -> None:
+    """
+    Pause multiple Plan executions with EXECUTION_IDS or matching the filters.
+
+    EXECUTION_IDS is list of IDs of the Plan executions you want to pause. (1 2 3)
+
+    \f
+    :param ctx: Click ctx object
+    :param execution_ids: IDs of the desired Plan executions
+    :param parameter_filters: Filter the Plan executions using their parameters (for example `state RUNNING`)
+    :return: None
+    """
+    request_data = helpers.get_bulk_selection(execution_ids, parameter_filters)
+    response = ctx.obj.api_post(PlanExecution.BULK_PAUSE, json=request_data)
+    helpers.print_bulk_results(response, ctx.obj.debug)
+
+
+@plan_execution.command("bulk-resume")
+@click.pass_context
+@click.argument("execution_ids", type=click.INT, nargs=-1)
+@d_filter
+def plan_execution_bulk_resume(
+    ctx: helpers.Context, execution_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]
+) -> None:
+    """
+    Resume multiple Plan executions with EXECUTION_IDS or matching the filters.
+
+    EXECUTION_IDS is list of IDs of the Plan executions you want to resume. (1 2 3)
+
+    \f
+    :param ctx: Click ctx object
+    :param execution_ids: IDs of the desired Plan executions
+    :param parameter_filters: Filter the Plan executions using their parameters (for example `state RUNNING`)
+    :return: None
+    """
+    request_data = helpers.get_bulk_selection(execution_ids, parameter_filters)
+    response = ctx.obj.api_post(PlanExecution.BULK_RESUME, json=request_data)
+    helpers.print_bulk_results(response, ctx.obj.debug)
+
+
+@plan_execution.command("bulk-stop")
+@click.pass_context
+@click.argument("execution_ids", type=click.INT, nargs=-1)
+@d_filter
+def plan_execution_bulk_stop(
+    ctx: helpers.Context, execution_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]
+) -> None:
+    """
+    Stop multiple Plan executions with EXECUTION_IDS or matching the filters.
+
+    EXECUTION_IDS is list of IDs of the Plan executions you want to stop. (1 2 3)
+
+    \f
+    :param ctx: Click ctx object
+    :param execution_ids: IDs of the desired Plan executions
+    :param parameter_filters: Filter the Plan executions using their parameters (for example `state RUNNING`)
+    :return: None
+    """
+    request_data = helpers.get_bulk_selection(execution_ids, parameter_filters)
+    response = ctx.obj.api_post(PlanExecution.BULK_STOP, json=request_data)
+    helpers.print_bulk_results(response, ctx.obj.debug)
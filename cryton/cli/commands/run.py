@@ -2,7 +2,7 @@ import click
 
 from cryton.cli.utility import helpers
 from cryton.cli.utility.decorators import *
-from cryton.cli.config import Run, SETTINGS
+from cryton.cli.config import Run, RunArchive, SETTINGS
 
 
 @click.group("runs", helpers.AliasedGroup)
@@ -97,7 +97,8 @@ def run_read(ctx: helpers.Context, run_id: int, less: bool, localize: bool) -> N
 @click.argument("run_id", type=click.INT, required=True)
 def run_delete(ctx: helpers.Context, run_id: int) -> None:
     """
-    Delete Run with RUN_ID saved in Cryton.
+    Delete Run with RUN_ID saved in Cryton. The Run is deleted in the background, use `operations show` to check the
+    progress.
 
     RUN_ID is ID of the Run you want to delete.
 
@@ -113,7 +114,8 @@ def run_delete(ctx: helpers.Context, run_id: int) -> None:
 @click.pass_context
 @click.argument("run_id", type=click.INT, required=True)
 @click.option("-S", "--skip-checks", is_flag=True, help="Skip health-checks and modules validation.")
-def run_execute(ctx: helpers.Context, run_id: int, skip_checks: bool) -> None:
+@d_background
+def run_execute(ctx: helpers.Context, run_id: int, skip_checks: bool, background: bool) -> None:
     """
     Execute Run saved in Cryton with RUN_ID.
 
@@ -123,6 +125,7 @@ def run_execute(ctx: helpers.Context, run_id: int, skip_checks: bool) -> None:
     :param skip_checks: Skip health-checks and modules validation
     :param ctx: Click ctx object
     :param run_id: ID of the desired Run
+    :param background: Run the action in the background
     :return: None
     """
     if not skip_checks:
@@ -134,10 +137,43 @@ def run_execute(ctx: helpers.Context, run_id: int, skip_checks: bool) -> None:
             click.secho("Unable to execute the Run. To skip checks use the option `--skip-checks`.", fg="red")
             return
 
-    response = ctx.obj.api_post(Run.EXECUTE, run_id)
+    response = ctx.obj.api_post(Run.EXECUTE, run_id, parameters={"background": background})
     helpers.print_message(response, ctx.obj.debug)
 
 
+@run.command("export")
+@click.pass_context
+@click.argument("run_id", type=click.INT, required=True)
+@d_save_report
+@click.option(
+    "-c",
+    "--compression",
+    type=click.Choice(["none", "gzip", "zstd"]),
+    default="none",
+    help="Compress the export (default is none).",
+)
+@click.option("--no-output", is_flag=True, help="Omit raw output of Step executions.")
+def run_export(ctx: helpers.Context, run_id: int, file: str, compression: str, no_output: bool) -> None:
+    """
+    Export Run with RUN_ID saved in Cryton as JSON lines (one record per execution).
+
+    Unlike the report, the export is streamed, so it is suitable for Runs with large outputs.
+
+    RUN_ID is ID of the Run you want to export.
+
+    \f
+    :param ctx: Click ctx object
+    :param run_id: ID of the desired Run
+    :param file: File to save the export to (default is /tmp)
+    :param compression: Compression of the export
+    :param no_output: If the raw output of Step executions should be omitted
+    :return: None
+    """
+    parameters = {"compression": compression} | ({"include_output": False} if no_output else {})
+    response = ctx.obj.api_get(Run.EXPORT, run_id, parameters, stream=True)
+    helpers.save_stream(response, file, f"run-{run_id}.ndjson", ctx.obj.debug)
+
+
 @run.command("pause")
 @click.pass_context
 @click.argument("run_id", type=click.INT, required=True)
@@ -162,7 +198,8 @@ def run_pause(ctx: helpers.Context, run_id: int) -> None:
 @d_save_report
 @d_less
 @d_localize
-def run_report(ctx: helpers.Context, run_id: int, file: str, less: bool, localize: bool) -> None:
+@click.option("--no-output", is_flag=True, help="Omit raw output of Step executions.")
+def run_report(ctx: helpers.Context, run_id: int, file: str, less: bool, localize: bool, no_output: bool) -> None:
     """
     Create report for Run with RUN_ID saved in Cryton.
 
@@ -174,9 +211,11 @@ def run_report(ctx: helpers.Context, run_id: int, file: str, less: bool, localiz
     :param file: File to save the report to (default is /tmp)
     :param less: Show less like output
     :param localize: If datetime variables should be converted to local timezone
+    :param no_output: If the raw output of Step executions should be omitted
     :return: None
     """
-    response = ctx.obj.api_get(Run.REPORT, run_id)
+    parameters = {"include_output": False} if no_output else None
+    response = ctx.obj.api_get(Run.REPORT, run_id, parameters)
     helpers.save_yaml(response, file, f"run-{run_id}.yml", less, less, localize, ctx.obj.debug)
 
 
@@ -277,7 +316,8 @@ def run_unschedule(ctx: helpers.Context, run_id: int) -> None:
 @run.command("stop")
 @click.pass_context
 @click.argument("run_id", type=click.INT, required=True)
-def run_stop(ctx: helpers.Context, run_id: int) -> None:
+@d_background
+def run_stop(ctx: helpers.Context, run_id: int, background: bool) -> None:
     """
     Stop Run saved in Cryton with RUN_ID.
 
@@ -286,16 +326,104 @@ def run_stop(ctx: helpers.Context, run_id: int) -> None:
     \f
     :param ctx: Click ctx object
     :param run_id: ID of the desired Run
+    :param background: Run the action in the background
     :return: None
     """
-    response = ctx.obj.api_post(Run.STOP, run_id)
+    response = ctx.obj.api_post(Run.STOP, run_id, parameters={"background": background})
     helpers.print_message(response, ctx.obj.debug)
 
 
+@run.command("bulk-execute")
+@click.pass_context
+@click.argument("run_ids", type=click.INT, nargs=-1)
+@d_filter
+def run_bulk_execute(
+    ctx: helpers.Context, run_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]
+) -> None:
+    """
+    Execute multiple Runs with RUN_IDS or matching the filters.
+
+    RUN_IDS is list of IDs of the Runs you want to execute. (1 2 3)
+
+    \f
+    :param ctx: Click ctx object
+    :param run_ids: IDs of the desired Runs
+    :param parameter_filters: Filter the Runs using their parameters (for example `state RUNNING`)
+    :return: None
+    """
+    request_data = helpers.get_bulk_selection(run_ids, parameter_filters)
+    response = ctx.obj.api_post(Run.BULK_EXECUTE, json=request_data)
+    helpers.print_bulk_results(response, ctx.obj.debug)
+
+
+@run.command("bulk-pause")
+@click.pass_context
+@click.argument("run_ids", type=click.INT, nargs=-1)
+@d_filter
+def run_bulk_pause(ctx: helpers.Context, run_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]) -> None:
+    """
+    Pause multiple Runs with RUN_IDS or matching the filters.
+
+    RUN_IDS is list of IDs of the Runs you want to pause. (1 2 3)
+
+    \f
+    :param ctx: Click ctx object
+    :param run_ids: IDs of the desired Runs
+    :param parameter_filters: Filter the Runs using their parameters (for example `state RUNNING`)
+    :return: None
+    """
+    request_data = helpers.get_bulk_selection(run_ids, parameter_filters)
+    response = ctx.obj.api_post(Run.BULK_PAUSE, json=request_data)
+    helpers.print_bulk_results(response, ctx.obj.debug)
+
+
+@run.command("bulk-resume")
+@click.pass_context
+@click.argument("run_ids", type=click.INT, nargs=-1)
+@d_filter
+def run_bulk_resume(ctx: helpers.Context, run_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]) -> None:
+    """
+    Resume multiple Runs with RUN_IDS or matching the filters.
+
+    RUN_IDS is list of IDs of the Runs you want to resume. (1 2 3)
+
+    \f
+    :param ctx: Click ctx object
+    :param run_ids: IDs of the desired Runs
+    :param parameter_filters: Filter the Runs using their parameters (for example `state RUNNING`)
+    :return: None
+    """
+    request_data = helpers.get_bulk_selection(run_ids, parameter_filters)
+    response = ctx.obj.api_post(Run.BULK_RESUME, json=request_data)
+    helpers.print_bulk_results(response, ctx.obj.debug)
+
+
+@run.command("bulk-stop")
+@click.pass_context
+@click.argument("run_ids", type=click.INT, nargs=-1)
+@d_filter
+def run_bulk_stop(ctx: helpers.Context, run_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]) -> None:
+    """
+    Stop multiple Runs with RUN_IDS or matching the filters.
+
+    RUN_IDS is list of IDs of the Runs you want to stop. (1 2 3)
+
+    \f
+    :param ctx: Click ctx object
+    :param run_ids: IDs of the desired Runs
+    :param parameter_filters: Filter the Runs using their parameters (for example `state RUNNING`)
+    :return: None
+    """
+    request_data = helpers.get_bulk_selection(run_ids, parameter_filters)
+    response = ctx.obj.api_post(Run.BULK_STOP, json=request_data)
+    helpers.print_bulk_results(response, ctx.obj.debug)
+
+
 @run.command("health-check-workers")
 @click.pass_context
 @click.argument("run_id", type=click.INT, required=True)
-def run_health_check_workers(ctx: helpers.Context, run_id: int) -> bool:
+@d_background
+def run_health_check_workers(ctx: helpers.Context, run_id: int, background: bool) -> bool:
     """
     Check Workers for Run with RUN_ID saved in Cryton.
 
@@ -304,16 +432,18 @@ def run_health_check_workers(ctx: helpers.Context, run_id: int) -> bool:
     \f
     :param ctx: Click ctx object
     :param run_id: ID of the desired Run
+    :param background: Run the action in the background
     :return: True when the results are OK
     """
-    response = ctx.obj.api_post(Run.HEALTH_CHECK_WORKERS, run_id)
+    response = ctx.obj.api_post(Run.HEALTH_CHECK_WORKERS, run_id, parameters={"background": background})
     return helpers.print_message(response, ctx.obj.debug)
 
 
 @run.command("validate-modules")
 @click.pass_context
 @click.argument("run_id", type=click.INT, required=True)
-def run_validate_modules(ctx: helpers.Context, run_id: int) -> bool:
+@d_background
+def run_validate_modules(ctx: helpers.Context, run_id: int, background: bool) -> bool:
     """
     Validate modules for Run with RUN_ID saved in Cryton.
 
@@ -322,9 +452,10 @@ def run_validate_modules(ctx: helpers.Context, run_id: int) -> bool:
     \f
     :param ctx: Click ctx object
     :param run_id: ID of the desired Run
+    :param background: Run the action in the background
     :return: True when the results are OK
     """
-    response = ctx.obj.api_post(Run.VALIDATE_MODULES, run_id)
+    response = ctx.obj.api_post(Run.VALIDATE_MODULES, run_id, parameters={"background": background})
     return helpers.print_message(response, ctx.obj.debug)
 
 
@@ -352,3 +483,138 @@ def run_get_plan(ctx: helpers.Context, run_id: int, file: str, less: bool, local
     """
     response = ctx.obj.api_get(Run.GET_PLAN, run_id)
     helpers.save_yaml(response, file, f"plan-used-in-run-{run_id}.yml", less, less, localize, ctx.obj.debug)
+
+
+@run.command("archive")
+@click.pass_context
+@click.argument("run_id", type=click.INT, required=True)
+def run_archive(ctx: helpers.Context, run_id: int) -> None:
+    """
+    Archive finished Run with RUN_ID saved in Cryton. Its executions and outputs are removed from the database.
+
+    RUN_ID is ID of the Run you want to archive.
+
+    \f
+    :param ctx: Click ctx object
+    :param run_id: ID of the desired Run
+    :return: None
+    """
+    response = ctx.obj.api_post(Run.ARCHIVE, run_id)
+    helpers.print_message(response, ctx.obj.debug)
+
+
+@click.group("run-archives", helpers.AliasedGroup)
+@click.pass_context
+def run_archive_group(_) -> None:
+    """
+    Manage archived Runs from here.
+
+    \f
+    :param _: Click ctx object
+    :return: None
+    """
+
+
+@run_archive_group.command("list")
+@click.pass_context
+@common_list_decorators
+def run_archive_list(
+    ctx: helpers.Context,
+    less: bool,
+    offset: int,
+    limit: int,
+    localize: bool,
+    parameter_filters: tuple[tuple[str, str | int]],
+) -> None:
+    """
+    List archived Runs in Cryton.
+
+    \f
+    :param ctx: Click ctx object
+    :param less: Show less like output
+    :param offset: Initial index from which to return the results
+    :param limit: Number of results per page
+    :param localize: If datetime variables should be converted to local timezone
+    :param parameter_filters: Filter results using returned parameters (for example `id`, `name`, etc.)
+    :return: None
+    """
+    additional_parameters = {each[0]: each[1] for each in parameter_filters}
+    include = ["id", "run_id", "plan_name", "state", "created_at", "size"]
+    ctx.obj.get_items(RunArchive.LIST, offset, limit, additional_parameters, include, less, localize)
+
+
+@run_archive_group.command("delete")
+@click.pass_context
+@click.argument("archive_id", type=click.INT, required=True)
+def run_archive_delete(ctx: helpers.Context, archive_id: int) -> None:
+    """
+    Delete Run archive with ARCHIVE_ID saved in Cryton. The archived Run is lost.
+
+    ARCHIVE_ID is ID of the archive you want to delete.
+
+    \f
+    :param ctx: Click ctx object
+    :param archive_id: ID of the desired archive
+    :return: None
+    """
+    ctx.obj.delete_item(RunArchive.DELETE, archive_id)
+
+
+@run_archive_group.command("report")
+@click.pass_context
+@click.argument("archive_id", type=click.INT, required=True)
+@d_save_report
+@d_less
+@d_localize
+def run_archive_report(ctx: helpers.Context, archive_id: int, file: str, less: bool, localize: bool) -> None:
+    """
+    Get report of the archived Run with ARCHIVE_ID saved in Cryton.
+
+    ARCHIVE_ID is ID of the archive you want to get the report for.
+
+    \f
+    :param ctx: Click ctx object
+    :param archive_id: ID of the desired archive
+    :param file: File to save the report to (default is /tmp)
+    :param less: Show less like output
+    :param localize: If datetime variables should be converted to local timezone
+    :return: None
+    """
+    response = ctx.obj.api_get(RunArchive.REPORT, archive_id)
+    helpers.save_yaml(response, file, f"run-archive-{archive_id}.yml", less, less, localize, ctx.obj.debug)
+
+
+@run_archive_group.command("restore")
+@click.pass_context
+@click.argument("archive_id", type=click.INT, required=True)
+def run_archive_restore(ctx: helpers.Context, archive_id: int) -> None:
+    """
+    Restore the archived Run with ARCHIVE_ID back to Cryton.
+
+    ARCHIVE_ID is ID of the archive you want to restore.
+
+    \f
+    :param ctx: Click ctx object
+    :param archive_id: ID of the desired archive
+    :return: None
+    """
+    response = ctx.obj.api_post(RunArchive.RESTORE, archive_id)
+    helpers.print_message(response, ctx.obj.debug)
+
+
+@run_archive_group.command("archive-finished")
+@click.pass_context
+@click.argument("days", type=click.INT, required=True)
+def run_archive_finished(ctx: helpers.Context, days: int) -> None:
+    """
+    Archive all Runs that finished more than DAYS ago.
+
+    DAYS is the minimal age of the Runs you want to archive.
+
+    \f
+    :param ctx: Click ctx object
+    :param days: Minimal age (in days) of the archived Runs
+    :return: None
+    """
+    response = ctx.obj.api_post(RunArchive.ARCHIVE_FINISHED, json={"days": days})
+    helpers.print_message(response, ctx.obj.debug)
@@ -313,6 +313,28 @@ def step_execution_report(ctx: helpers.Context, execution_id: int, file: str, le
     helpers.save_yaml(response, file, f"step-execution-{execution_id}.yml", less, less, localize, ctx.obj.debug)
 
 
+@step_execution.command("output")
+@click.pass_context
+@click.argument("execution_id", type=click.INT, required=True)
+@d_save_report
+@d_less
+def step_execution_output(ctx: helpers.Context, execution_id: int, file: str, less: bool) -> None:
+    """
+    Get raw output of Step's execution with EXECUTION_ID saved in Cryton.
+
+    EXECUTION_ID is ID of the Step's execution you want to get the output for.
+
+    \f
+    :param ctx: Click ctx object
+    :param execution_id: ID of the desired Step's execution
+    :param file: File to save the output to (default is /tmp)
+    :param less: Show less like output
+    :return: None
+    """
+    response = ctx.obj.api_get(StepExecution.OUTPUT, execution_id)
+    helpers.save_yaml(response, file, f"step-execution-{execution_id}-output.yml", less, less, False, ctx.obj.debug)
+
+
 @step_execution.command("stop")
 @click.pass_context
 @click.argument("execution_id", type=click.INT, required=True)
@@ -6,6 +6,7 @@ class Run:
     EXECUTE = "runs/{}/execute/"
     PAUSE = "runs/{}/pause/"
     REPORT = "runs/{}/report/"
+    EXPORT = "runs/{}/export/"
     RESCHEDULE = "runs/{}/reschedule/"
     SCHEDULE = "runs/{}/schedule/"
     RESUME = "runs/{}/resume/"
@@ -14,6 +15,20 @@ class Run:
     HEALTH_CHECK_WORKERS = "runs/{}/healthcheck_workers/"
     VALIDATE_MODULES = "runs/{}/validate_modules/"
     GET_PLAN = "runs/{}/get_plan/"
+    ARCHIVE = "runs/{}/archive/"
+    BULK_EXECUTE = "runs/bulk_execute/"
+    BULK_PAUSE = "runs/bulk_pause/"
+    BULK_RESUME = "runs/bulk_resume/"
+    BULK_STOP = "runs/bulk_stop/"
+
+
+class RunArchive:
+    LIST = "run_archives/"
+    READ = "run_archives/{}/"
+    DELETE = "run_archives/{}/"
+    REPORT = "run_archives/{}/report/"
+    RESTORE = "run_archives/{}/restore/"
+    ARCHIVE_FINISHED = "run_archives/archive_finished/"
 
 
 class Plan:
@@ -35,6 +50,9 @@ class PlanExecution:
     RESUME = "plan_executions/{}/resume/"
     VALIDATE_MODULES = "plan_executions/{}/validate_modules/"
     STOP = "plan_executions/{}/stop/"
+    BULK_PAUSE = "plan_executions/bulk_pause/"
+    BULK_RESUME = "plan_executions/bulk_resume/"
+    BULK_STOP = "plan_executions/bulk_stop/"
 
 
 class Stage:
@@ -69,6 +87,7 @@ class StepExecution:
     READ = "step_executions/{}/"
     DELETE = "step_executions/{}/"
     REPORT = "step_executions/{}/report/"
+    OUTPUT = "step_executions/{}/output/"
     STOP = "step_executions/{}/stop/"
     RE_EXECUTE = "step_executions/{}/re_execute/"
 
@@ -98,3 +117,8 @@ class ExecutionVariable:
 
 class Log:
     LIST = "logs/"
+
+
+class Operation:
+    LIST = "operations/"
+    READ = "operations/{}/"
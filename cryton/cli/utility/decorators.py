@@ -12,6 +12,9 @@ d_filter = option(
     multiple=True,
     help="Filter results using returned parameters (for example `id 1`, `name value`).",
 )
+d_background = option(
+    "-b", "--background", is_flag=True, help="Run the action in the background and return its operation ID."
+)
 d_save_report = option(
     "-f", "--file", type=Path(exists=True), default="/tmp", help="File to save the report to (default is /tmp)."
 )
@@ -29,19 +29,25 @@ class CLIContext:
         except requests.exceptions.ConnectionError:
             return f"Unable to connect to {url}."
 
-    def api_get(self, endpoint_url: str, object_id: int = None, parameters: dict = None):
+    def api_get(self, endpoint_url: str, object_id: int = None, parameters: dict = None, stream: bool = False):
         url = self._build_request_url(endpoint_url, object_id)
         try:
-            return requests.get(url, parameters)
+            return requests.get(url, parameters, stream=stream)
         except requests.exceptions.ConnectionError:
             return f"Unable to connect to {url}."
 
     def api_post(
-        self, endpoint_url: str, object_id: int = None, data: dict = None, json: dict = None, files: dict = None
+        self,
+        endpoint_url: str,
+        object_id: int = None,
+        data: dict = None,
+        json: dict = None,
+        files: dict = None,
+        parameters: dict = None,
     ):
         url = self._build_request_url(endpoint_url, object_id)
         try:
-            return requests.post(url, data, json, files=files)
+            return requests.post(url, data, json, files=files, params=parameters)
         except requests.exceptions.ConnectionError:
             return f"Unable to connect to {url}."
 
@@ -80,6 +86,15 @@ class Context(click.Context):
     obj: CLIContext
 
 
+def _get_file_path(file_path: str, file_prefix: str) -> str:
+    if file_path == "/tmp":
+        time_stamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S-%f")
+        file_tail = "".join(random.choices(string.ascii_uppercase + string.digits + string.ascii_lowercase, k=5))
+        file_path = f"/tmp/{file_prefix}_{time_stamp}_{file_tail}"
+
+    return file_path
+
+
 def save_yaml_to_file(content: dict, file_path: str, file_prefix: str = "file") -> str:
     """
     Save content into file.
@@ -88,10 +103,7 @@ def save_yaml_to_file(content: dict, file_path: str, file_prefix: str = "file")
     :param file_prefix: Prefix for the file name (only if path is `/tmp`)
     :return: Path to the file
     """
-    if file_path == "/tmp":
-        time_stamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S-%f")
-        file_tail = "".join(random.choices(string.ascii_uppercase + string.digits + string.ascii_lowercase, k=5))
-        file_path = f"/tmp/{file_prefix}_{time_stamp}_{file_tail}"
+    file_path = _get_file_path(file_path, file_prefix)
 
     try:
         with open(file_path, "w+") as report_file:
@@ -184,6 +196,39 @@ def print_message(response: str | requests.Response, debug: bool = False) -> boo
         return True
 
 
+def get_bulk_selection(object_ids: tuple[int], parameter_filters: tuple[tuple[str, str | int]]) -> dict:
+    """
+    Create the request data selecting the objects for a bulk action.
+    :param object_ids: IDs of the objects
+    :param parameter_filters: Filters the objects must match
+    :return: Request data
+    """
+    if bool(object_ids) == bool(parameter_filters):
+        raise click.UsageError("Specify either the IDs or the filters.")
+
+    if object_ids:
+        return {"ids": list(object_ids)}
+    return {"filters": {each[0]: each[1] for each in parameter_filters}}
+
+
+def print_bulk_results(response: str | requests.Response, debug: bool = False) -> bool:
+    """
+    Echo result of a bulk action for each object and the summary.
+    :param response: Response containing data from REST API
+    :param debug: Show non formatted raw output
+    :return: True if the action succeeded for all objects
+    """
+    if isinstance(response, str) or debug or not response.ok:
+        return print_message(response, debug)
+
+    response_data = response.json()
+    for result in response_data["results"]:
+        click.echo(f"{result['id']}: {click.style(result['detail'], fg='green' if result['success'] else 'red')}")
+    click.echo(response_data["detail"])
+
+    return all(result["success"] for result in response_data["results"])
+
+
 def format_result_line(line: dict, to_print: list[str], localize: bool) -> str:
     """
     Filter dictionary values, optionally update timezone, and create user readable line.
@@ -367,6 +412,39 @@ def save_yaml(
                 click.echo(yaml.dump(parsed_response, sort_keys=False))
 
 
+def save_stream(response: str | requests.Response, file_path: str, file_name: str, debug: bool = False) -> None:
+    """
+    Save the streamed response into a file as it arrives, without loading it into memory.
+    :param response: Streamed response from REST API
+    :param file_path: Where to save the file
+    :param file_name: Prefix for the file name (only if path is `/tmp`)
+    :param debug: Show non formatted raw output
+    :return: None
+    """
+    if isinstance(response, str):
+        click.secho(response, fg="red")
+        return
+
+    if not response.ok:
+        if debug:
+            click.echo(response.text)
+        else:
+            click.echo(f"{click.style(parse_response(response), fg='red')} ({response.reason})")
+        return
+
+    file_path = _get_file_path(file_path, file_name)
+    try:
+        with open(file_path, "wb") as export_file:
+            for chunk in response.iter_content(64 * 1024):
+                export_file.write(chunk)
+    except IOError as ex:
+        click.secho(f"Unable to save file to {file_path}. Original exception: {ex}", fg="red")
+    except requests.exceptions.RequestException as ex:
+        click.secho(f"Unable to download the file to {file_path}. Original exception: {ex}", fg="red")
+    else:
+        click.secho(f"Successfully saved file to {file_path}", fg="green")
+
+
 def render_documentation(raw_documentation: dict, layer: int) -> str:
     """
     Process and create documentation in markdown.
@@ -1,7 +1,15 @@
 from dataclasses import dataclass
-from os import getenv, sched_getaffinity
+from os import getenv, path, sched_getaffinity
 
-from cryton.lib.config.settings import SETTINGS_HIVE, getenv_bool, getenv_int, getenv_list, EVIDENCE_DIRECTORY
+from cryton.lib.config.settings import (
+    SETTINGS_HIVE,
+    getenv_bool,
+    getenv_int,
+    getenv_list,
+    APP_DIRECTORY,
+    EVIDENCE_DIRECTORY,
+    LOGS_DIRECTORY,
+)
 
 
 @dataclass
@@ -33,6 +41,7 @@ class SettingsRabbit:
     username: str
     password: str
     queues: SettingsRabbitQueues
+    events_exchange: str
 
     def __init__(self, raw_settings: dict):
         self.host = getenv("CRYTON_HIVE_RABBIT_HOST", raw_settings.get("host", "127.0.0.1"))
@@ -40,6 +49,9 @@ class SettingsRabbit:
         self.username = getenv("CRYTON_HIVE_RABBIT_USERNAME", raw_settings.get("username", "cryton"))
         self.password = getenv("CRYTON_HIVE_RABBIT_PASSWORD", raw_settings.get("password", "cryton"))
         self.queues = SettingsRabbitQueues(raw_settings.get("queues", {}))
+        self.events_exchange = getenv(
+            "CRYTON_HIVE_RABBIT_EVENTS_EXCHANGE", raw_settings.get("events_exchange", "cryton.execution.events")
+        )
 
 
 @dataclass
@@ -49,6 +61,9 @@ class SettingsDatabase:
     name: str
     username: str
     password: str
+    connection_max_age: int
+    max_connections: int
+    connection_wait_timeout: int
 
     def __init__(self, raw_settings: dict):
         self.host = getenv("CRYTON_HIVE_DATABASE_HOST", raw_settings.get("host", "127.0.0.1"))
@@ -56,23 +71,40 @@ class SettingsDatabase:
         self.name = getenv("CRYTON_HIVE_DATABASE_NAME", raw_settings.get("name", "cryton"))
         self.username = getenv("CRYTON_HIVE_DATABASE_USERNAME", raw_settings.get("username", "cryton"))
         self.password = getenv("CRYTON_HIVE_DATABASE_PASSWORD", raw_settings.get("password", "cryton"))
+        self.connection_max_age = getenv_int(
+            "CRYTON_HIVE_DATABASE_CONNECTION_MAX_AGE",
+            raw_settings.get("connection_max_age", 0),
+            min_value=0,
+            fallback=0,
+        )
+        self.max_connections = getenv_int(
+            "CRYTON_HIVE_DATABASE_MAX_CONNECTIONS", raw_settings.get("max_connections", 40)
+        )
+        self.connection_wait_timeout = getenv_int(
+            "CRYTON_HIVE_DATABASE_CONNECTION_WAIT_TIMEOUT", raw_settings.get("connection_wait_timeout", 30)
+        )
 
 
 @dataclass
 class SettingsAPI:
     secret_key: str
     allowed_hosts: list[str]
+    action_workers: int
     root = "api/"
 
     def __init__(self, raw_settings: dict):
         self.secret_key = getenv("CRYTON_HIVE_API_SECRET_KEY", raw_settings.get("secret_key", "cryton"))
         self.allowed_hosts = getenv_list("CRYTON_HIVE_API_ALLOWED_HOSTS", raw_settings.get("allowed_hosts", "*"))
+        self.action_workers = getenv_int(
+            "CRYTON_HIVE_API_ACTION_WORKERS", raw_settings.get("action_workers", 4), fallback=4
+        )
 
 
 @dataclass
 class SettingsScheduler:
     max_threads = 20
     max_job_instances = 1
+    database_pool_size = 5
     misfire_grace_time: int
 
     def __init__(self, message_timeout: int):
@@ -90,6 +122,11 @@ class Settings:
     timezone = "UTC"
     threads_per_process: int
     cpu_cores: int
+    output_offload_threshold: int
+    deletion_batch_size: int
+    report_cache_timeout: int
+    bulk_action_parallelism: int
+    log_store_retention: int
 
     def __init__(self, raw_settings: dict):
         self.debug = getenv_bool("CRYTON_HIVE_DEBUG", raw_settings.get("debug", False))
@@ -100,11 +137,33 @@ class Settings:
         self.cpu_cores = getenv_int(
             "CRYTON_HIVE_CPU_CORES", raw_settings.get("cpu_cores", 3), fallback=len(sched_getaffinity(0))
         )
+        self.output_offload_threshold = getenv_int(
+            "CRYTON_HIVE_OUTPUT_OFFLOAD_THRESHOLD",
+            raw_settings.get("output_offload_threshold", 65536),
+            min_value=0,
+            fallback=0,
+        )
+        self.deletion_batch_size = getenv_int(
+            "CRYTON_HIVE_DELETION_BATCH_SIZE", raw_settings.get("deletion_batch_size", 1000), fallback=1000
+        )
+        self.report_cache_timeout = getenv_int(
+            "CRYTON_HIVE_REPORT_CACHE_TIMEOUT", raw_settings.get("report_cache_timeout", 3600), min_value=0, fallback=0
+        )
+        self.bulk_action_parallelism = getenv_int(
+            "CRYTON_HIVE_BULK_ACTION_PARALLELISM", raw_settings.get("bulk_action_parallelism", 10), fallback=10
+        )
+        self.log_store_retention = getenv_int(
+            "CRYTON_HIVE_LOG_STORE_RETENTION", raw_settings.get("log_store_retention", 7), min_value=0, fallback=7
+        )
         self.rabbit = SettingsRabbit(raw_settings.get("rabbit", {}))
         self.database = SettingsDatabase(raw_settings.get("database", {}))
         self.api = SettingsAPI(raw_settings.get("api", {}))
         self.scheduler = SettingsScheduler(self.message_timeout)
         self.evidence_directory = EVIDENCE_DIRECTORY
+        self.output_blob_directory = path.join(EVIDENCE_DIRECTORY, "blobs")
+        self.archive_directory = path.join(APP_DIRECTORY, "archive")
+        self.cache_directory = path.join(APP_DIRECTORY, "cache")
+        self.log_store_file = path.join(LOGS_DIRECTORY, "cryton-hive.sqlite3")
 
 
 SETTINGS = Settings(SETTINGS_HIVE)
@@ -0,0 +1,112 @@
+import hashlib
+from typing import Callable
+
+from django.core.cache import cache
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.cryton_app.models import (
+    RunModel,
+    PlanModel,
+    StageModel,
+    StepModel,
+    PlanExecutionModel,
+    StageExecutionModel,
+    StepExecutionModel,
+)
+
+
+class Version:
+    def __init__(self, querysets: list[QuerySet], variant: str = ""):
+        """
+        Version of a response built from the rows. It changes when any of the rows is saved, added, or removed.
+        :param querysets: Rows the response is built from
+        :param variant: Distinguishes different representations of the same rows
+        """
+        signature = [variant]
+        for queryset in querysets:
+            aggregated = queryset.aggregate(last_modified=Max("updated_at"), count=Count("id"), last_id=Max("id"))
+            signature.append(f"{aggregated['last_modified']}:{aggregated['count']}:{aggregated['last_id']}")
+
+        self.etag = f'"{hashlib.sha1("|".join(signature).encode()).hexdigest()}"'
+
+
+def get_run_version(run_id: int, variant: str = "") -> Version:
+    """
+    Get version of the Run (and its Plan, Stage, and Step executions).
+    :param run_id: ID of the Run
+    :param variant: Distinguishes different representations of the Run
+    :return: Version
+    """
+    return Version(
+        [
+            RunModel.objects.filter(id=run_id),
+            PlanExecutionModel.objects.filter(run_id=run_id),
+            StageExecutionModel.objects.filter(plan_execution__run_id=run_id),
+            StepExecutionModel.objects.filter(stage_execution__plan_execution__run_id=run_id),
+        ],
+        variant,
+    )
+
+
+def get_plan_execution_version(plan_execution_id: int, variant: str = "") -> Version:
+    """
+    Get version of the Plan execution (and its Stage and Step executions).
+    :param plan_execution_id: ID of the Plan execution
+    :param variant: Distinguishes different representations of the Plan execution
+    :return: Version
+    """
+    return Version(
+        [
+            PlanExecutionModel.objects.filter(id=plan_execution_id),
+            StageExecutionModel.objects.filter(plan_execution_id=plan_execution_id),
+            StepExecutionModel.objects.filter(stage_execution__plan_execution_id=plan_execution_id),
+        ],
+        variant,
+    )
+
+
+def get_plan_version(plan_id: int) -> Version:
+    """
+    Get version of the Plan (and its Stages and Steps).
+    :param plan_id: ID of the Plan
+    :return: Version
+    """
+    return Version(
+        [
+            PlanModel.objects.filter(id=plan_id),
+            StageModel.objects.filter(plan_id=plan_id),
+            StepModel.objects.filter(stage__plan_id=plan_id),
+        ]
+    )
+
+
+def conditional_response(
+    request: Request, version: Version, render: Callable[[], dict], cache_key: str | None = None
+) -> Response:
+    """
+    Respond with 304 if the client has the current version, otherwise render (or load from the cache) the content.
+    :param request: Incoming request
+    :param version: Current version of the content
+    :param render: Function creating the content
+    :param cache_key: Key used to cache the rendered content, None to disable caching
+    :return: Response
+    """
+    # No Last-Modified, removed rows and changes within the same second wouldn't change it
+    headers = {"ETag": version.etag}
+    if (conditional := get_conditional_response(request, version.etag)) is not None:
+        return Response(status=conditional.status_code, headers=headers)  # 304 or 412
+
+    if cache_key is None or SETTINGS.report_cache_timeout == 0:
+        return Response({"detail": render()}, status=status.HTTP_200_OK, headers=headers)
+
+    cache_key = f"{cache_key}:{version.etag}"  # Older versions are never read again and expire on their own
+    if (content := cache.get(cache_key)) is None:
+        content = render()
+        cache.set(cache_key, content, SETTINGS.report_cache_timeout)
+
+    return Response({"detail": content}, status=status.HTTP_200_OK, headers=headers)
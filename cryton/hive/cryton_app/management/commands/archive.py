@@ -0,0 +1,48 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from click import echo
+
+from cryton.hive.cryton_app.models import RunModel
+from cryton.hive.utility import archive, exceptions
+
+
+class Command(BaseCommand):
+    help = "Archive finished Runs into compressed bundles and remove them from the database, or restore them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("run_ids", nargs="*", type=int, help="IDs of the Runs to archive (or restore).")
+        parser.add_argument("--older-than", type=int, help="Archive all Runs that finished more than DAYS ago.")
+        parser.add_argument("--restore", action="store_true", help="Restore the archived Runs instead.")
+
+    def handle(self, *args, **options):
+        """
+        Archive or restore Runs.
+        :param args: Arguments passed to the handle
+        :param options: Options passed to the handle
+        :return: None
+        """
+        run_ids: list[int] = options["run_ids"]
+        older_than: int | None = options["older_than"]
+        if not run_ids and older_than is None:
+            raise CommandError("Specify the Run IDs or the `--older-than` option.")
+
+        if options["restore"]:
+            for run_id in run_ids:
+                try:
+                    archive.restore_run(run_id)
+                except (exceptions.RunObjectDoesNotExist, exceptions.ArchiveError) as ex:
+                    raise CommandError(f"Run {run_id} cannot be restored. {ex}")
+                echo(f"Run {run_id} restored.")
+            return
+
+        for run_id in run_ids:
+            try:
+                archive_model = archive.archive_run(run_id)
+            except (RunModel.DoesNotExist, exceptions.ArchiveError) as ex:
+                raise CommandError(f"Run {run_id} cannot be archived. {ex}")
+            echo(f"Run {run_id} archived to {archive_model.file}.")
+
+        if older_than is not None:
+            archived = archive.archive_finished_runs(timezone.now() - timedelta(days=older_than))
+            echo(f"Archived {len(archived)} Run(s): {', '.join(str(run_id) for run_id in archived)}")
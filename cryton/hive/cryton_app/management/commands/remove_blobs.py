@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from click import echo
+
+from cryton.hive.utility.blob_store import remove_unreferenced_blobs
+
+
+class Command(BaseCommand):
+    help = "Remove offloaded outputs that are no longer used by any Step execution."
+
+    def handle(self, *args, **options):
+        """
+        Remove the unreferenced blobs.
+        :param args: Arguments passed to the handle
+        :param options: Options passed to the handle
+        :return: None
+        """
+        echo(f"Removed {remove_unreferenced_blobs()} unused output(s).")
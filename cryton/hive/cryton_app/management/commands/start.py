@@ -1,10 +1,13 @@
 import time
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 from click import echo, secho
 
 from cryton.hive.asgi import application
 from cryton.hive.services.gunicorn import GunicornApplication
 from cryton.hive.services.listener import Listener
+from cryton.hive.utility.actions import abort_interrupted_actions
+from cryton.hive.utility.deletion import resume_deletions
 
 
 class Command(BaseCommand):
@@ -20,6 +23,7 @@ class Command(BaseCommand):
         :param options: Options passed to the handle
         :return: None
         """
+        started_at = timezone.now()  # Operations created from now on aren't interrupted ones
         hard_options = {
             "bind": options.get("bind", "0.0.0.0:8000"),
             "worker_class": "uvicorn.workers.UvicornWorker",
@@ -37,6 +41,11 @@ class Command(BaseCommand):
         listener.start(False)
         echo("OK")
 
+        if resumed := resume_deletions(started_at):
+            echo(f"Resumed interrupted deletions: {', '.join(str(operation_id) for operation_id in resumed)}")
+        if aborted := abort_interrupted_actions(started_at):
+            echo(f"Aborted interrupted actions: {', '.join(str(operation_id) for operation_id in aborted)}")
+
         secho("Cryton Hive is up and running!", fg="green")
         echo("To exit press CTRL+C")
 
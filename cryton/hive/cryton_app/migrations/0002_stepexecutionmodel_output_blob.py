@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryton_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stepexecutionmodel",
+            name="output_blob",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="stepexecutionmodel",
+            name="output_size",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
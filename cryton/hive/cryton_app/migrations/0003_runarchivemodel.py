@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryton_app", "0002_stepexecutionmodel_output_blob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RunArchiveModel",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("run_id", models.PositiveIntegerField(unique=True)),
+                ("plan_name", models.TextField()),
+                ("state", models.TextField()),
+                ("file", models.TextField()),
+                ("size", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryton_app", "0003_runarchivemodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OperationModel",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("type", models.TextField()),
+                ("object_id", models.PositiveIntegerField()),
+                ("state", models.TextField(default="PENDING")),
+                ("progress", models.JSONField(default=dict)),
+                ("error", models.TextField(default="")),
+                ("finish_time", models.DateTimeField(null=True)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+    ]
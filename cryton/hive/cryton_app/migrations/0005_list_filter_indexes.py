@@ -0,0 +1,152 @@
+# Generated by Django 4.2.30 on 2026-10-19 17:59
+
+from django.db import migrations, models
+
+TRIGRAM_INDEXED_TABLES = [
+    "cryton_app_planmodel",
+    "cryton_app_stagemodel",
+    "cryton_app_stepmodel",
+    "cryton_app_workermodel",
+    "cryton_app_executionvariablemodel",
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in TRIGRAM_INDEXED_TABLES:
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {table}_name_trgm ON {table} USING gin (name gin_trgm_ops)")
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in TRIGRAM_INDEXED_TABLES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryton_app", "0004_operationmodel"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="executionvariablemodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="executionvariablemodel",
+            name="name",
+            field=models.TextField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="operationmodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="operationmodel",
+            name="state",
+            field=models.TextField(db_index=True, default="PENDING"),
+        ),
+        migrations.AlterField(
+            model_name="operationmodel",
+            name="type",
+            field=models.TextField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="planexecutionmodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="planexecutionmodel",
+            name="state",
+            field=models.TextField(db_index=True, default="PENDING"),
+        ),
+        migrations.AlterField(
+            model_name="planmodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="planmodel",
+            name="name",
+            field=models.TextField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="runarchivemodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="runmodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="runmodel",
+            name="state",
+            field=models.TextField(db_index=True, default="PENDING"),
+        ),
+        migrations.AlterField(
+            model_name="stageexecutionmodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="stageexecutionmodel",
+            name="state",
+            field=models.TextField(db_index=True, default="PENDING"),
+        ),
+        migrations.AlterField(
+            model_name="stagemodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="stagemodel",
+            name="name",
+            field=models.TextField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="stepexecutionmodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="stepexecutionmodel",
+            name="state",
+            field=models.TextField(db_index=True, default="PENDING"),
+        ),
+        migrations.AlterField(
+            model_name="stepmodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="stepmodel",
+            name="name",
+            field=models.TextField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="workermodel",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="workermodel",
+            name="name",
+            field=models.TextField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="workermodel",
+            name="state",
+            field=models.TextField(db_index=True, default="DOWN"),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryton_app", "0005_list_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="operationmodel",
+            name="result",
+            field=models.TextField(default=""),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cryton_app", "0006_operationmodel_result"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="planmodel",
+            name="document",
+            field=models.JSONField(default=None, null=True),
+        ),
+    ]
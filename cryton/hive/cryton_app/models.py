@@ -5,7 +5,7 @@ from cryton.hive.config.settings import UPLOAD_DIRECTORY_RELATIVE
 
 
 class TimedModel(models.Model):
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -13,14 +13,14 @@ class TimedModel(models.Model):
 
 
 class InstanceModel(TimedModel):
-    name = models.TextField()
+    name = models.TextField(db_index=True)
 
     class Meta:
         abstract = True
 
 
 class ExecutionModel(TimedModel):
-    state = models.TextField(default=states.PENDING)
+    state = models.TextField(default=states.PENDING, db_index=True)
     start_time = models.DateTimeField(null=True)
     pause_time = models.DateTimeField(null=True)
     finish_time = models.DateTimeField(null=True)
@@ -59,6 +59,7 @@ class PlanSettings(models.Model):
 class PlanModel(DescriptiveModel):
     settings = models.OneToOneField(PlanSettings, models.CASCADE)
     dynamic = models.BooleanField(default=False)
+    document = models.JSONField(null=True, default=None)  # Cached canonical Plan (see Plan.generate_plan)
 
 
 class StageModel(DescriptiveModel):
@@ -89,7 +90,7 @@ class StepModel(DescriptiveModel):
 
 class WorkerModel(InstanceModel):
     description = models.TextField()
-    state = models.TextField(default=states.DOWN)
+    state = models.TextField(default=states.DOWN, db_index=True)
 
 
 class RunModel(SchedulableExecutionModel):
@@ -114,6 +115,8 @@ class StepExecutionModel(ExecutionModel, OutputModel):
     step = models.ForeignKey(StepModel, models.CASCADE, related_name="step_executions")
     valid = models.BooleanField(default=False)
     parent = models.ForeignKey("self", models.CASCADE, null=True)
+    output_blob = models.CharField(max_length=64, default="", blank=True, db_index=True)
+    output_size = models.PositiveBigIntegerField(default=0)
 
 
 class ExecutionVariableModel(InstanceModel):
@@ -133,6 +136,24 @@ class CorrelationEventModel(models.Model):
     step_execution = models.ForeignKey(StepExecutionModel, models.CASCADE, related_name="correlation_events")
 
 
+class RunArchiveModel(TimedModel):
+    run_id = models.PositiveIntegerField(unique=True)
+    plan_name = models.TextField()
+    state = models.TextField()
+    file = models.TextField()
+    size = models.PositiveBigIntegerField(default=0)
+
+
+class OperationModel(TimedModel):
+    type = models.TextField(db_index=True)
+    object_id = models.PositiveIntegerField()
+    state = models.TextField(default=states.PENDING, db_index=True)
+    progress = models.JSONField(default=dict)
+    result = models.TextField(default="")
+    error = models.TextField(default="")
+    finish_time = models.DateTimeField(null=True)
+
+
 class PlanTemplateModel(models.Model):
     file = models.FileField(upload_to=UPLOAD_DIRECTORY_RELATIVE)
 
@@ -0,0 +1,48 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+from cryton.hive.cryton_app import exceptions
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination, the page is located using the last seen value of the ordering column instead of an offset.
+    """
+
+    page_size = 20
+    page_size_query_param = "limit"
+    max_page_size = 1000
+    ordering = "id"
+    orderings = ["id", "-id", "created_at", "-created_at"]
+
+    def get_ordering(self, request, queryset, view) -> tuple[str]:
+        ordering = request.query_params.get("order_by", self.ordering)
+        if ordering not in self.orderings:
+            raise exceptions.ValidationError(f"Results with cursor can be ordered only by {self.orderings}.")
+
+        return (ordering,)
+
+
+class ListPagination(LimitOffsetPagination):
+    """
+    Offset pagination (if `limit` is used) that switches to keyset pagination once the `cursor` parameter is present.
+    """
+
+    keyset_pagination: KeysetPagination | None = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset_pagination = KeysetPagination()
+            return self.keyset_pagination.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_pagination is not None:
+            return self.keyset_pagination.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            KeysetPagination().get_schema_operation_parameters(view)[0]
+        ]
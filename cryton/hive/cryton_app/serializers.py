@@ -14,11 +14,35 @@ class BaseSerializer(serializers.Serializer):
 
 class ListSerializer(BaseSerializer):
     order_by = serializers.CharField(required=False, help_text="The parameter used to sort the results.")
+    search = serializers.ChoiceField(
+        ["exact", "contains", "trigram"],
+        required=False,
+        default="exact",
+        help_text="How to match `state`, `name`, and `type` filters. IDs always match exactly, the rest by substring.",
+    )
     any_returned_parameter = serializers.CharField(
         required=False, help_text="Filter the results using any returned parameter."
     )
 
 
+class ReportSerializer(BaseSerializer):
+    include_output = serializers.BooleanField(
+        required=False, default=True, help_text="Include the raw output of Step executions."
+    )
+
+
+class ExportSerializer(ReportSerializer):
+    compression = serializers.ChoiceField(
+        ["none", "gzip", "zstd"], required=False, default="none", help_text="Compress the export (`zstd` is optional)."
+    )
+
+
+class BackgroundSerializer(BaseSerializer):
+    background = serializers.BooleanField(
+        required=False, default=False, help_text="Run the action in the background and return its operation."
+    )
+
+
 class DetailStringSerializer(BaseSerializer):
     detail = serializers.CharField()
 
@@ -35,6 +59,30 @@ class ExecutionCreateDetailSerializer(DetailStringSerializer):
     execution_id = serializers.IntegerField()
 
 
+class OperationDetailSerializer(DetailStringSerializer):
+    operation_id = serializers.IntegerField()
+
+
+class BulkActionSerializer(BaseSerializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, help_text="IDs of the objects to run the action for."
+    )
+    filters = serializers.DictField(
+        required=False,
+        help_text='Run the action for the objects matching the filters (for example `{"state": "RUNNING"}`).',
+    )
+
+
+class BulkActionResultSerializer(BaseSerializer):
+    id = serializers.IntegerField()
+    success = serializers.BooleanField()
+    detail = serializers.CharField()
+
+
+class BulkActionDetailSerializer(DetailStringSerializer):
+    results = BulkActionResultSerializer(many=True)
+
+
 class CreateWithFilesSerializer(BaseSerializer):
     file = serializers.FileField()
     inventory_file = serializers.FileField()
@@ -56,7 +104,7 @@ class LogSerializer(BaseSerializer):
 class PlanSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.PlanModel
-        exclude = []
+        exclude = ["document"]
 
 
 class PlanCreateSerializer(BaseSerializer):
@@ -124,6 +172,22 @@ class RunScheduleSerializer(BaseSerializer):
     start_time = serializers.CharField()
 
 
+class RunArchiveSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.RunArchiveModel
+        exclude = []
+
+
+class RunArchiveOlderThanSerializer(BaseSerializer):
+    days = serializers.IntegerField(min_value=0, help_text="Archive Runs that finished more than DAYS ago.")
+
+
+class OperationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.OperationModel
+        exclude = []
+
+
 class PlanExecutionSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.PlanExecutionModel
@@ -158,6 +222,11 @@ class StepExecutionSerializer(serializers.ModelSerializer):
         exclude = []
 
 
+class StepExecutionOutputSerializer(BaseSerializer):
+    output = serializers.CharField()
+    output_size = serializers.IntegerField()
+
+
 class StepExecutionListSerializer(ListSerializer):
     stage_execution_id = serializers.IntegerField(
         required=False, help_text="Stage execution ID used to filter the results."
@@ -7,6 +7,9 @@ from cryton.hive.cryton_app.views import (
     stage_views,
     step_views,
     run_views,
+    run_archive_views,
+    operation_views,
+    event_views,
     plan_execution_views,
     stage_execution_views,
     step_execution_views,
@@ -18,6 +21,8 @@ from cryton.hive.cryton_app.views import (
 
 router = routers.DefaultRouter()
 router.register(r"runs", run_views.RunViewSet)
+router.register(r"run_archives", run_archive_views.RunArchiveViewSet)
+router.register(r"operations", operation_views.OperationViewSet)
 router.register(r"plans", plan_views.PlanViewSet)
 router.register(r"plan_executions", plan_execution_views.PlanExecutionViewSet)
 router.register(r"stages", stage_views.StageViewSet)
@@ -32,6 +37,7 @@ router.register(r"logs", log_views.LogViewSet, "log")
 urlpatterns = [
     path("", router.get_api_root_view()),
     path("", include(router.urls)),
+    path("events/", event_views.stream_events, name="events"),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path("schema/swagger-ui/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("schema/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc-ui"),
@@ -5,6 +5,7 @@ import json
 import pytz
 from jinja2 import nativetypes, DebugUndefined, ChainableUndefined, UndefinedError
 from abc import ABC, abstractmethod
+from typing import Callable
 
 from rest_framework.viewsets import GenericViewSet, mixins
 from rest_framework.response import Response
@@ -13,12 +14,57 @@ from rest_framework import status
 from drf_spectacular.utils import extend_schema
 
 from django.db.models.query import QuerySet
-from django.db.models import ObjectDoesNotExist
-from django.db import IntegrityError, DatabaseError
+from django.core.exceptions import FieldError
+from django.db.models import ObjectDoesNotExist, Lookup, TextField
+from django.db import IntegrityError, DatabaseError, NotSupportedError, connection
 from django.utils.datastructures import MultiValueDict
 
-from cryton.hive.cryton_app import exceptions, serializers
-from cryton.hive.utility import util as core_util, constants, exceptions as core_exceptions
+from cryton.hive.cryton_app import exceptions, serializers, pagination
+from cryton.hive.cryton_app.models import OperationModel
+from cryton.hive.utility import util as core_util, actions, constants, exceptions as core_exceptions
+
+
+SEARCH_EXACT = "exact"
+SEARCH_CONTAINS = "contains"
+SEARCH_TRIGRAM = "trigram"
+SEARCH_MODES = [SEARCH_EXACT, SEARCH_CONTAINS, SEARCH_TRIGRAM]
+
+# Indexed columns, filtered using exact match unless another search mode is requested
+EXACT_FILTER_KEYS = ["id", "state", "name", "type"]
+
+
+@TextField.register_lookup
+class TrigramSimilar(Lookup):
+    """
+    Similarity lookup using the `pg_trgm` extension (available only for Postgres).
+    """
+
+    lookup_name = "trigram_similar"
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError("Trigram search is supported only by Postgres.")
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} %% {rhs}", lhs_params + rhs_params
+
+
+def get_filter_lookup(key: str, search: str) -> str:
+    """
+    Get the lookup used to filter by the key.
+    :param key: Query parameter name
+    :param search: Search mode
+    :return: Lookup for the queryset filter
+    """
+    if key == "id" or key.endswith("_id"):
+        return key
+    if key not in EXACT_FILTER_KEYS or search == SEARCH_CONTAINS:
+        return f"{key}__icontains"
+    if search == SEARCH_TRIGRAM:
+        return f"{key}__trigram_similar"
+
+    return key
 
 
 def filter_decorator(func):
@@ -39,29 +85,21 @@ def filter_decorator(func):
 
         # Get rid of parameters that would get in a way of filter
         order_by_param = filters_dict.pop("order_by", "id")
+        search = filters_dict.pop("search", SEARCH_EXACT)
         filters_dict.pop("limit", None)
         filters_dict.pop("offset", None)
+        filters_dict.pop(pagination.KeysetPagination.cursor_query_param, None)
+
+        if search not in SEARCH_MODES:
+            raise exceptions.ValidationError(f"Parameter 'search' must be one of {SEARCH_MODES}.")
+        if search == SEARCH_TRIGRAM and connection.vendor != "postgresql":
+            raise exceptions.ValidationError("Trigram search is supported only by Postgres.")
 
         # Obtain queryset
         queryset: QuerySet = func(self)
 
-        # Update filters (optionally with __icontains)
-        unsearchable_keys = [
-            "run_id",
-            "plan_execution_id",
-            "stage_execution_id",
-            "step_execution_id",
-            "plan_id",
-            "stage_id",
-            "step_id",
-        ]
-        filters_dict_update = {}
-
-        for key, value in filters_dict.items():
-            if key not in unsearchable_keys:
-                filters_dict_update.update({key + "__icontains": value})
-            else:
-                filters_dict_update.update({key: value})
+        # Exact match on indexed columns, substring match (case-insensitive) on the rest
+        filters_dict_update = {get_filter_lookup(key, search): value for key, value in filters_dict.items()}
 
         # Filter and order queryset
         queryset = queryset.filter(**filters_dict_update)
@@ -72,6 +110,43 @@ def filter_decorator(func):
     return inner
 
 
+def get_include_output(query_params: dict) -> bool:
+    """
+    Parse the `include_output` query parameter.
+    :param query_params: Incoming query parameters
+    :return: False if the raw output should be omitted
+    """
+    return str(query_params.get("include_output", "true")).lower() != "false"
+
+
+def get_background(query_params: dict) -> bool:
+    """
+    Parse the `background` query parameter.
+    :param query_params: Incoming query parameters
+    :return: True if the action should run in the background
+    """
+    return str(query_params.get("background", "false")).lower() == "true"
+
+
+def start_background_action(
+    queryset: QuerySet, operation_type: str, object_id: int, action: Callable[[int], str]
+) -> Response:
+    """
+    Run the action in the background and respond with its operation.
+    :param queryset: Objects the action can be run for
+    :param operation_type: Type of the action
+    :param object_id: ID of the object
+    :param action: Function running the action for the object, returns a message
+    :return: Response
+    """
+    if not queryset.filter(id=object_id).exists():
+        raise exceptions.NotFound()
+
+    operation = actions.start_action(operation_type, int(object_id), action)
+    msg = {"detail": "Action started.", "operation_id": operation.id}
+    return Response(msg, status=status.HTTP_202_ACCEPTED)
+
+
 def get_start_time(request_data: dict) -> datetime:
     """
     Parse start time and its timezone.
@@ -103,6 +178,44 @@ def get_start_time(request_data: dict) -> datetime:
     return start_time
 
 
+def get_bulk_object_ids(request_data: dict, queryset: QuerySet) -> list[int]:
+    """
+    Get IDs of the objects selected for a bulk action, either listed (`ids`) or matching the filters (`filters`).
+    :param request_data: Incoming request data
+    :param queryset: Objects the IDs can be selected from
+    :return: IDs of the selected objects
+    """
+    object_ids, filters = request_data.get("ids"), request_data.get("filters")
+    if (object_ids is None) == (filters is None):
+        raise exceptions.ValidationError("Specify either 'ids' or 'filters'.")
+
+    if object_ids is not None:
+        try:
+            return list(dict.fromkeys(int(object_id) for object_id in object_ids))
+        except (ValueError, TypeError):
+            raise exceptions.ValidationError("Parameter 'ids' must be a list of integers.")
+
+    if not isinstance(filters, dict) or not filters:
+        raise exceptions.ValidationError("Parameter 'filters' must be a non-empty dictionary.")
+
+    try:
+        queryset = queryset.filter(**{get_filter_lookup(key, SEARCH_EXACT): value for key, value in filters.items()})
+        return list(queryset.order_by("id").values_list("id", flat=True))
+    except (FieldError, ValueError, TypeError) as ex:
+        raise exceptions.ValidationError(f"Parameter 'filters' is wrong. Original exception: {ex}")
+
+
+def bulk_action_response(results: list[dict]) -> Response:
+    """
+    Summarize the results of a bulk action.
+    :param results: Results of the action for each object
+    :return: Response
+    """
+    succeeded = sum(result["success"] for result in results)
+    msg = {"detail": f"{succeeded} succeeded, {len(results) - succeeded} failed.", "results": results}
+    return Response(msg, status=status.HTTP_200_OK)
+
+
 def parse_inventory(inventory: str) -> dict:
     """
     Reads inventory file (JSON, YAML, INI) and returns it as a dictionary
@@ -234,7 +347,7 @@ class InstanceViewSet(mixins.RetrieveModelMixin, mixins.DestroyModelMixin, BaseV
     def destroy(self, _, *args, **kwargs):
         model_id = kwargs.get("pk")
         try:
-            self._destroy(model_id)
+            operation = self._destroy(model_id)
         except (ObjectDoesNotExist, core_exceptions.ObjectDoesNotExist):
             raise exceptions.NotFound()
         except IntegrityError:
@@ -242,14 +355,18 @@ class InstanceViewSet(mixins.RetrieveModelMixin, mixins.DestroyModelMixin, BaseV
         except DatabaseError as ex:
             raise exceptions.ValidationError(f"Unable to delete. Reason: {type(ex)}")
 
+        if operation is not None:  # The object is deleted in the background
+            msg = {"detail": "Deletion started.", "operation_id": operation.id}
+            return Response(msg, status=status.HTTP_202_ACCEPTED)
+
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @abstractmethod
-    def _destroy(self, model_id: int):
+    def _destroy(self, model_id: int) -> OperationModel | None:
         """
         Override this method to delete the correct object.
         :param model_id: ID of the desired object
-        :return: None
+        :return: Operation deleting the object in the background or None
         """
         pass
 
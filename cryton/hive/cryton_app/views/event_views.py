@@ -0,0 +1,75 @@
+import asyncio
+import json
+from typing import AsyncIterator
+
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from cryton.hive.utility import event_stream
+
+KEEP_ALIVE_INTERVAL = 15
+
+
+def _parse_run_ids(value: str | None) -> set[int] | None:
+    if not value:
+        return None
+    return {int(run_id) for run_id in value.split(",")}
+
+
+def _parse_event_types(value: str | None, include_output: bool) -> set[str]:
+    if not value:
+        event_types = set(event_stream.EVENT_TYPES)
+    else:
+        event_types = set(value.split(","))
+        if unknown := event_types.difference(event_stream.EVENT_TYPES):
+            raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}.")
+
+    if not include_output:
+        event_types.discard(event_stream.STEP_EXECUTION_OUTPUT)
+
+    return event_types
+
+
+async def _event_source(subscription: event_stream.Subscription) -> AsyncIterator[str]:
+    """
+    Send the subscribed events as server-sent events.
+    :param subscription: Subscription receiving the events
+    :return: Server-sent event frames
+    """
+    event_id = 0
+    try:
+        yield f"retry: {event_stream.RECONNECT_DELAY * 1000}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), KEEP_ALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"  # Keeps proxies from closing the idle connection
+                continue
+
+            event_id += 1
+            yield f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    finally:
+        event_stream.hub.unsubscribe(subscription)
+
+
+@require_GET
+async def stream_events(request: HttpRequest):
+    """
+    Stream state changes (and optionally outputs) of the executions as server-sent events.
+    :param request: Incoming request
+    :return: Streaming response
+    """
+    try:
+        run_ids = _parse_run_ids(request.GET.get("run_id"))
+        event_types = _parse_event_types(request.GET.get("types"), request.GET.get("output", "false").lower() == "true")
+    except ValueError as ex:
+        return JsonResponse({"detail": str(ex)}, status=400)
+
+    subscription = event_stream.Subscription(run_ids, event_types)
+    event_stream.hub.subscribe(subscription)
+
+    response = StreamingHttpResponse(_event_source(subscription), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Disable proxy buffering (nginx)
+
+    return response
@@ -6,7 +6,20 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from cryton.hive.cryton_app import util, exceptions, serializers
-from cryton.hive.utility import util as core_util
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.utility import log_store
+
+
+def _pop_int(query_params: dict, key: str, default: int | None) -> int | None:
+    value = query_params.pop(key, None)
+    if value is None:
+        return default
+
+    value = int(value[0])
+    if value < 0:
+        raise ValueError(f"The `{key}` parameter must be a positive number.")
+
+    return value
 
 
 class LogViewSet(util.BaseViewSet):
@@ -18,10 +31,26 @@ class LogViewSet(util.BaseViewSet):
     serializer_class = serializers.LogSerializer
 
     @extend_schema(
-        description="Get Cryton Hive app logs.",
+        description="Get Cryton Hive app logs (of all Hive processes).",
         parameters=[
             OpenApiParameter("offset", OpenApiTypes.NUMBER, OpenApiParameter.QUERY),
             OpenApiParameter("limit", OpenApiTypes.NUMBER, OpenApiParameter.QUERY),
+            OpenApiParameter(
+                "since", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Logs since the time (ISO format)."
+            ),
+            OpenApiParameter(
+                "until", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Logs before the time (ISO format)."
+            ),
+            OpenApiParameter(
+                "tail", OpenApiTypes.NUMBER, OpenApiParameter.QUERY, description="Return only the last N logs."
+            ),
+            OpenApiParameter(
+                "after",
+                OpenApiTypes.NUMBER,
+                OpenApiParameter.QUERY,
+                description="Return only logs newer than the returned `last_id` (used to follow the logs).",
+            ),
+            OpenApiParameter("search", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Full-text search."),
             OpenApiParameter(
                 "any", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Filter results using `any` key."
             ),
@@ -29,24 +58,38 @@ class LogViewSet(util.BaseViewSet):
         ],
         responses={
             200: serializers.LogSerializer,  # 'next'/'previous' parameters are inherited by default
+            400: serializers.DetailStringSerializer,
             500: serializers.DetailStringSerializer,
         },
     )
     def list(self, request: Request):
         query_params = request.query_params.copy()
         try:
-            offset = int(query_params.pop("offset", 0)[0])
-            limit = int(query_params.pop("limit", 0)[0])
+            offset = _pop_int(query_params, "offset", 0)
+            limit = _pop_int(query_params, "limit", 0)
+            tail = _pop_int(query_params, "tail", 0)
+            after = _pop_int(query_params, "after", None)
+        except ValueError as ex:
+            raise exceptions.ValidationError(ex)
 
-            if offset < 0:
-                raise ValueError("The `offset` parameter must be a positive number.")
+        since = query_params.pop("since", [None])[0]
+        until = query_params.pop("until", [None])[0]
+        search = query_params.pop("search", [None])[0]
 
-            if limit < 0:
-                raise ValueError("The `limit` parameter must be a positive number.")
+        try:
+            logs, last_id = log_store.get_logs(
+                SETTINGS.log_store_file,
+                offset,
+                limit,
+                query_params.dict(),
+                since,
+                until,
+                after,
+                tail,
+                search,
+            )
         except ValueError as ex:
             raise exceptions.ValidationError(ex)
 
-        logs = core_util.get_logs(offset, limit, query_params)
-
-        msg = {"count": len(logs), "results": logs, "next": "", "previous": ""}
+        msg = {"count": len(logs), "results": logs, "next": "", "previous": "", "last_id": last_id}
         return Response(msg, status=status.HTTP_200_OK)
@@ -0,0 +1,24 @@
+from rest_framework.viewsets import mixins
+
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from cryton.hive.cryton_app import util, serializers
+from cryton.hive.cryton_app.models import OperationModel
+
+
+@extend_schema_view(
+    list=extend_schema(description="List background operations.", parameters=[serializers.ListSerializer]),
+    retrieve=extend_schema(description="Get existing background operation."),
+)
+class OperationViewSet(mixins.RetrieveModelMixin, util.BaseViewSet):
+    """
+    Operation ViewSet.
+    """
+
+    queryset = OperationModel.objects.all()
+    http_method_names = ["get"]
+    serializer_class = serializers.OperationSerializer
+
+    @util.filter_decorator
+    def get_queryset(self):
+        return self.queryset
@@ -1,12 +1,13 @@
 from rest_framework.response import Response
+from rest_framework.request import Request
 from rest_framework import status
 from rest_framework.decorators import action
 
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
-from cryton.hive.cryton_app import util, serializers, exceptions
+from cryton.hive.cryton_app import util, serializers, exceptions, caching
 from cryton.hive.cryton_app.models import PlanExecutionModel
-from cryton.hive.utility import exceptions as core_exceptions
+from cryton.hive.utility import exceptions as core_exceptions, bulk, constants, states
 from cryton.hive.models.plan import PlanExecution
 
 
@@ -32,24 +33,54 @@ class PlanExecutionViewSet(util.ExecutionViewSet):
         """
         PlanExecution(model_id).delete()
 
+    @staticmethod
+    def _pause(plan_ex_id: int) -> str:
+        PlanExecution(plan_ex_id).pause()
+        return f"Plan execution {plan_ex_id} is paused."
+
+    @staticmethod
+    def _resume(plan_ex_id: int) -> str:
+        PlanExecution(plan_ex_id).resume()
+        return f"Plan execution {plan_ex_id} resumed."
+
+    @staticmethod
+    def _stop(plan_ex_id: int) -> str:
+        PlanExecution(plan_ex_id).stop()
+        return f"Plan execution {plan_ex_id} is stopped."
+
+    @staticmethod
+    def _validate_modules(plan_ex_id: int) -> str:
+        if not PlanExecution(plan_ex_id).validate_modules():
+            raise ValueError("Plan execution's modules are not valid.")
+        return "Plan execution's modules were validated."
+
     @extend_schema(
-        description="Generate Plan execution report.",
+        description="Generate Plan execution report. Supports conditional requests (`If-None-Match`).",
+        parameters=[serializers.ReportSerializer],
         responses={
             200: serializers.DetailDictionarySerializer,
+            304: None,
             404: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["get"], detail=True)
-    def report(self, _, **kwargs):
+    def report(self, request: Request, **kwargs):
         plan_ex_id = kwargs.get("pk")
         try:
             plan_ex_obj = PlanExecution(plan_ex_id)
         except core_exceptions.PlanExecutionDoesNotExist:
             raise exceptions.NotFound()
-        report = plan_ex_obj.report()
 
-        msg = {"detail": report}
-        return Response(msg, status=status.HTTP_200_OK)
+        include_output = util.get_include_output(request.query_params)
+        variant = f"report:{include_output}"
+        # Reports of finished Plan executions can be cached, the cache key changes together with the version
+        cache_key = f"plan_execution:{plan_ex_id}:{variant}" if plan_ex_obj.state in states.PLAN_FINAL_STATES else None
+        return caching.conditional_response(
+            request,
+            caching.get_plan_execution_version(plan_ex_id, variant),
+            lambda: plan_ex_obj.report(include_output),
+            cache_key,
+        )
 
     @extend_schema(
         description="Pause Plan execution.",
@@ -62,16 +93,13 @@ class PlanExecutionViewSet(util.ExecutionViewSet):
     )
     @action(methods=["post"], detail=True)
     def pause(self, _, **kwargs):
-        plan_ex_id = kwargs.get("pk")
         try:
-            plan_ex_obj = PlanExecution(plan_ex_id)
-            plan_ex_obj.pause()
+            msg = {"detail": self._pause(kwargs.get("pk"))}
         except core_exceptions.PlanExecutionDoesNotExist:
             raise exceptions.NotFound()
         except core_exceptions.InvalidStateError as ex:
             raise exceptions.ApiWrongObjectState(ex)
 
-        msg = {"detail": f"Plan execution {plan_ex_id} is paused."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -85,66 +113,99 @@ class PlanExecutionViewSet(util.ExecutionViewSet):
     )
     @action(methods=["post"], detail=True)
     def resume(self, _, **kwargs):
-        plan_ex_id = kwargs.get("pk")
         try:
-            plan_ex_obj = PlanExecution(plan_ex_id)
-            plan_ex_obj.resume()
+            msg = {"detail": self._resume(kwargs.get("pk"))}
         except core_exceptions.PlanExecutionDoesNotExist as ex:
             raise exceptions.NotFound(ex)
         except core_exceptions.InvalidStateError as ex:
             raise exceptions.ApiWrongObjectState(ex)
 
-        msg = {"detail": f"Plan execution {plan_ex_id} resumed."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
         description="Validate modules in Plan execution.",
+        parameters=[serializers.BackgroundSerializer],
         request=None,
         responses={
             200: serializers.DetailStringSerializer,
+            202: serializers.OperationDetailSerializer,
             404: serializers.DetailStringSerializer,
             500: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["post"], detail=True)
-    def validate_modules(self, _, **kwargs):
+    def validate_modules(self, request: Request, **kwargs):
         plan_ex_id = kwargs.get("pk")
+        if util.get_background(request.query_params):
+            return util.start_background_action(
+                self.queryset, constants.OPERATION_PLAN_EXECUTION_VALIDATE_MODULES, plan_ex_id, self._validate_modules
+            )
+
         try:
-            plan_ex_obj = PlanExecution(plan_ex_id)
+            msg = {"detail": self._validate_modules(plan_ex_id)}
         except core_exceptions.PlanExecutionDoesNotExist:
             raise exceptions.NotFound()
-
-        try:
-            all_valid = plan_ex_obj.validate_modules()
         except core_exceptions.RpcTimeoutError:
             raise exceptions.RpcTimeout("Module's validation failed due to RPC timeout.")
+        except ValueError as ex:
+            return Response({"detail": str(ex)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not all_valid:
-            msg = {"detail": "Plan execution's modules are not valid."}
-            return Response(msg, status=status.HTTP_400_BAD_REQUEST)
-
-        msg = {"detail": "Plan execution's modules were validated."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
         description="Stop Plan execution.",
+        parameters=[serializers.BackgroundSerializer],
         request=None,
         responses={
             200: serializers.DetailStringSerializer,
+            202: serializers.OperationDetailSerializer,
             400: serializers.DetailStringSerializer,
             404: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["post"], detail=True)
-    def stop(self, _, **kwargs):
+    def stop(self, request: Request, **kwargs):
         plan_ex_id = kwargs.get("pk")
+        if util.get_background(request.query_params):
+            return util.start_background_action(
+                self.queryset, constants.OPERATION_PLAN_EXECUTION_STOP, plan_ex_id, self._stop
+            )
+
         try:
-            plan_ex_obj = PlanExecution(plan_ex_id)
-            plan_ex_obj.stop()
+            msg = {"detail": self._stop(plan_ex_id)}
         except core_exceptions.PlanExecutionDoesNotExist:
             raise exceptions.NotFound()
         except core_exceptions.InvalidStateError as ex:
             raise exceptions.ApiWrongObjectState(ex)
 
-        msg = {"detail": f"Plan execution {plan_ex_id} is stopped."}
         return Response(msg, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description="Pause multiple Plan executions (selected by `ids` or `filters`) concurrently.",
+        request=serializers.BulkActionSerializer,
+        responses={200: serializers.BulkActionDetailSerializer, 400: serializers.DetailStringSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_pause(self, request: Request, **kwargs):
+        plan_ex_ids = util.get_bulk_object_ids(request.data, self.queryset)
+        return util.bulk_action_response(bulk.run_action(self._pause, plan_ex_ids))
+
+    @extend_schema(
+        description="Resume multiple Plan executions (selected by `ids` or `filters`) concurrently.",
+        request=serializers.BulkActionSerializer,
+        responses={200: serializers.BulkActionDetailSerializer, 400: serializers.DetailStringSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_resume(self, request: Request, **kwargs):
+        plan_ex_ids = util.get_bulk_object_ids(request.data, self.queryset)
+        return util.bulk_action_response(bulk.run_action(self._resume, plan_ex_ids))
+
+    @extend_schema(
+        description="Stop multiple Plan executions (selected by `ids` or `filters`) concurrently.",
+        request=serializers.BulkActionSerializer,
+        responses={200: serializers.BulkActionDetailSerializer, 400: serializers.DetailStringSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_stop(self, request: Request, **kwargs):
+        plan_ex_ids = util.get_bulk_object_ids(request.data, self.queryset)
+        return util.bulk_action_response(bulk.run_action(self._stop, plan_ex_ids))
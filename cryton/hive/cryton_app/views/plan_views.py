@@ -7,9 +7,9 @@ from rest_framework.decorators import action
 
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample
 
-from cryton.hive.cryton_app import util, serializers, exceptions
-from cryton.hive.cryton_app.models import PlanModel, PlanTemplateModel, RunModel, WorkerModel
-from cryton.hive.utility import exceptions as core_exceptions, creator, states
+from cryton.hive.cryton_app import util, serializers, exceptions, caching
+from cryton.hive.cryton_app.models import PlanModel, PlanTemplateModel, RunModel, WorkerModel, OperationModel
+from cryton.hive.utility import exceptions as core_exceptions, creator, states, constants, deletion
 from cryton.hive.models.plan import Plan, PlanExecution
 from cryton.hive.models.run import Run
 from cryton.hive.utility.validator import Validator
@@ -18,24 +18,28 @@ from cryton.hive.utility.validator import Validator
 @extend_schema_view(
     list=extend_schema(description="List Plans.", parameters=[serializers.ListSerializer]),
     retrieve=extend_schema(description="Get existing Plan."),
-    destroy=extend_schema(description="Delete Plan."),
+    destroy=extend_schema(
+        description="Delete Plan in the background. Use the returned operation to check the progress.",
+        responses={202: serializers.OperationDetailSerializer, 404: serializers.DetailStringSerializer},
+    ),
 )
 class PlanViewSet(util.InstanceFullViewSet):
     """
     Plan ViewSet.
     """
 
-    queryset = PlanModel.objects.all()
+    queryset = PlanModel.objects.defer("document")
     http_method_names = ["get", "post", "delete"]
     serializer_class = serializers.PlanSerializer
 
-    def _destroy(self, model_id: int):
+    def _destroy(self, model_id: int) -> OperationModel:
         """
-        Delete Plan.
+        Start Plan deletion.
         :param model_id: ID of the desired object
-        :return: None
+        :return: Deletion operation
         """
-        Plan(model_id).delete()
+        PlanModel.objects.get(id=model_id)
+        return deletion.start_deletion(constants.OPERATION_DELETE_PLAN, int(model_id))
 
     @extend_schema(
         description="Create new Plan. There is no limit or naming convention for inventory files.",
@@ -157,16 +161,16 @@ class PlanViewSet(util.InstanceFullViewSet):
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
-        description="Get Plan's YAML.",
-        responses={200: serializers.DetailDictionarySerializer, 404: serializers.DetailStringSerializer},
+        description="Get Plan's YAML. Supports conditional requests (`If-None-Match`).",
+        responses={200: serializers.DetailDictionarySerializer, 304: None, 404: serializers.DetailStringSerializer},
     )
     @action(methods=["get"], detail=True)
-    def get_plan(self, _, **kwargs):
+    def get_plan(self, request: Request, **kwargs):
         plan_id = kwargs.get("pk")
         try:
             plan_obj = Plan(plan_id)
         except core_exceptions.PlanObjectDoesNotExist:
             raise exceptions.NotFound(f"Plan with ID {plan_id} does not exist.")
 
-        msg = {"detail": plan_obj.generate_plan()}
-        return Response(msg, status=status.HTTP_200_OK)
+        version = caching.get_plan_version(plan_id)
+        return caching.conditional_response(request, version, plan_obj.generate_plan, f"plan:{plan_id}")
@@ -0,0 +1,110 @@
+import os
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.request import Request
+from rest_framework import status
+from rest_framework.decorators import action
+
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from cryton.hive.cryton_app import util, serializers, exceptions
+from cryton.hive.cryton_app.models import RunArchiveModel
+from cryton.hive.utility import exceptions as core_exceptions, archive
+
+
+@extend_schema_view(
+    list=extend_schema(description="List archived Runs.", parameters=[serializers.ListSerializer]),
+    retrieve=extend_schema(description="Get existing Run archive."),
+    destroy=extend_schema(description="Delete Run archive (the archived Run is lost)."),
+)
+class RunArchiveViewSet(util.InstanceViewSet):
+    """
+    RunArchive ViewSet.
+    """
+
+    queryset = RunArchiveModel.objects.all()
+    http_method_names = ["get", "post", "delete"]
+    serializer_class = serializers.RunArchiveSerializer
+
+    def _destroy(self, model_id: int):
+        """
+        Delete Run archive.
+        :param model_id: ID of the desired object
+        :return: None
+        """
+        archive_model = RunArchiveModel.objects.get(id=model_id)
+        try:
+            os.remove(archive_model.file)
+        except FileNotFoundError:
+            pass
+        archive_model.delete()
+
+    @extend_schema(
+        description="Get report of the archived Run.",
+        responses={
+            200: serializers.DetailDictionarySerializer,
+            404: serializers.DetailStringSerializer,
+            500: serializers.DetailStringSerializer,
+        },
+    )
+    @action(methods=["get"], detail=True)
+    def report(self, _, **kwargs):
+        archive_id = kwargs.get("pk")
+        try:
+            archive_model = RunArchiveModel.objects.get(id=archive_id)
+        except RunArchiveModel.DoesNotExist:
+            raise exceptions.NotFound()
+
+        try:
+            report = archive.read_archived_report(archive_model)
+        except core_exceptions.ArchiveError as ex:
+            raise exceptions.APIException(ex)
+
+        return Response({"detail": report}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description="Restore the archived Run back to the database.",
+        request=None,
+        responses={
+            200: serializers.DetailStringSerializer,
+            400: serializers.DetailStringSerializer,
+            404: serializers.DetailStringSerializer,
+        },
+    )
+    @action(methods=["post"], detail=True)
+    def restore(self, _, **kwargs):
+        archive_id = kwargs.get("pk")
+        try:
+            run_id = RunArchiveModel.objects.get(id=archive_id).run_id
+            archive.restore_run(run_id)
+        except (RunArchiveModel.DoesNotExist, core_exceptions.RunObjectDoesNotExist):
+            raise exceptions.NotFound()
+        except core_exceptions.ArchiveError as ex:
+            raise exceptions.ValidationError(ex)
+
+        msg = {"detail": f"Run {run_id} is restored."}
+        return Response(msg, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description="Archive all Runs that finished more than `days` ago.",
+        request=serializers.RunArchiveOlderThanSerializer,
+        responses={
+            200: serializers.CreateMultipleDetailSerializer,
+            400: serializers.DetailStringSerializer,
+        },
+    )
+    @action(methods=["post"], detail=False)
+    def archive_finished(self, request: Request, **kwargs):
+        try:
+            days = int(request.data["days"])
+            if days < 0:
+                raise ValueError("The `days` parameter must be a positive number.")
+        except (KeyError, ValueError, TypeError) as ex:
+            raise exceptions.ValidationError(str(ex))
+
+        run_ids = archive.archive_finished_runs(timezone.now() - timedelta(days=days))
+
+        msg = {"detail": f"Archived {len(run_ids)} Run(s).", "ids": run_ids}
+        return Response(msg, status=status.HTTP_200_OK)
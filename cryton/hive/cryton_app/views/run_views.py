@@ -1,13 +1,15 @@
+from django.http import StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework import status
 from rest_framework.decorators import action
 
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample
+from drf_spectacular.types import OpenApiTypes
 
-from cryton.hive.cryton_app import util, serializers, exceptions
-from cryton.hive.cryton_app.models import RunModel, WorkerModel, PlanModel
-from cryton.hive.utility import exceptions as core_exceptions, states
+from cryton.hive.cryton_app import util, serializers, exceptions, caching
+from cryton.hive.cryton_app.models import RunModel, WorkerModel, PlanModel, OperationModel
+from cryton.hive.utility import exceptions as core_exceptions, states, archive, bulk, constants, deletion, export
 from cryton.hive.models.run import Run
 from cryton.hive.models.plan import Plan
 
@@ -15,7 +17,10 @@ from cryton.hive.models.plan import Plan
 @extend_schema_view(
     list=extend_schema(description="List Runs.", parameters=[serializers.ListSerializer]),
     retrieve=extend_schema(description="Get existing Run."),
-    destroy=extend_schema(description="Delete Run."),
+    destroy=extend_schema(
+        description="Delete Run in the background. Use the returned operation to check the progress.",
+        responses={202: serializers.OperationDetailSerializer, 404: serializers.DetailStringSerializer},
+    ),
 )
 class RunViewSet(util.ExecutionFullViewSet):
     """
@@ -26,13 +31,51 @@ class RunViewSet(util.ExecutionFullViewSet):
     http_method_names = ["get", "post", "delete"]
     serializer_class = serializers.RunSerializer
 
-    def _destroy(self, model_id: int):
+    def _destroy(self, model_id: int) -> OperationModel:
         """
-        Delete Run.
+        Start Run deletion.
         :param model_id: ID of the desired object
-        :return: None
+        :return: Deletion operation
         """
-        Run(model_id).delete()
+        RunModel.objects.get(id=model_id)
+        return deletion.start_deletion(constants.OPERATION_DELETE_RUN, int(model_id))
+
+    @staticmethod
+    def _pause(run_id: int) -> str:
+        Run(run_id).pause()
+        return f"Run {run_id} is paused."
+
+    @staticmethod
+    def _resume(run_id: int) -> str:
+        Run(run_id).resume()
+        return f"Run {run_id} is resumed."
+
+    @staticmethod
+    def _execute(run_id: int) -> str:
+        run_obj = Run(run_id)
+        if run_obj.state not in states.RUN_EXECUTE_NOW_STATES:
+            raise core_exceptions.InvalidStateError(
+                f"Run object in wrong state: {run_obj.state}, " f"must be in: {states.RUN_EXECUTE_NOW_STATES}"
+            )
+
+        run_obj.start()
+        return f"Run {run_id} was executed."
+
+    @staticmethod
+    def _stop(run_id: int) -> str:
+        Run(run_id).stop()
+        return f"Run {run_id} is stopped."
+
+    @staticmethod
+    def _healthcheck_workers(run_id: int) -> str:
+        Run(run_id).healthcheck_workers()
+        return "Run's Workers are available."
+
+    @staticmethod
+    def _validate_modules(run_id: int) -> str:
+        if not Run(run_id).validate_modules():
+            raise ValueError("Run's modules are not valid.")
+        return "Run's modules were validated."
 
     @extend_schema(
         description="Create new Run.",
@@ -68,22 +111,60 @@ class RunViewSet(util.ExecutionFullViewSet):
         return Response(msg, status=status.HTTP_201_CREATED)
 
     @extend_schema(
-        description="Generate Run report.",
+        description="Generate Run report. Supports conditional requests (`If-None-Match`).",
+        parameters=[serializers.ReportSerializer],
         responses={
             200: serializers.DetailDictionarySerializer,
+            304: None,
             404: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["get"], detail=True)
-    def report(self, _, **kwargs):
+    def report(self, request: Request, **kwargs):
         run_id = kwargs.get("pk")
         try:
             run_obj = Run(run_id)
-            report = run_obj.report()
         except RunModel.DoesNotExist:
             raise exceptions.NotFound()
 
-        return Response({"detail": report}, status=status.HTTP_200_OK)
+        include_output = util.get_include_output(request.query_params)
+        variant = f"report:{include_output}"
+        # Reports of finished Runs can be cached, the cache key changes together with the version
+        cache_key = f"run:{run_id}:{variant}" if run_obj.state in states.RUN_FINAL_STATES else None
+        return caching.conditional_response(
+            request, caching.get_run_version(run_id, variant), lambda: run_obj.report(include_output), cache_key
+        )
+
+    @extend_schema(
+        description="Export Run and its executions as JSON lines (one record per execution, parents first). "
+        "Unlike the report, the export is streamed, so even large Runs don't need to fit in memory.",
+        parameters=[serializers.ExportSerializer],
+        responses={
+            (200, "application/x-ndjson"): OpenApiTypes.BINARY,
+            400: serializers.DetailStringSerializer,
+            404: serializers.DetailStringSerializer,
+        },
+    )
+    @action(methods=["get"], detail=True)
+    def export(self, request: Request, **kwargs):
+        run_id = kwargs.get("pk")
+        if not RunModel.objects.filter(id=run_id).exists():
+            raise exceptions.NotFound()
+
+        compression = request.query_params.get("compression", "none")
+        try:
+            export.validate_compression(compression)
+        except ValueError as ex:
+            raise exceptions.ValidationError(ex)
+
+        include_output = util.get_include_output(request.query_params)
+        content_type, extension = export.COMPRESSIONS[compression]
+        response = StreamingHttpResponse(
+            export.iterate_async(export.export_run(int(run_id), compression, include_output)), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="run-{run_id}{extension}"'
+
+        return response
 
     @extend_schema(
         description="Pause Run.",
@@ -96,17 +177,13 @@ class RunViewSet(util.ExecutionFullViewSet):
     )
     @action(methods=["post"], detail=True)
     def pause(self, _, **kwargs):
-        run_id = kwargs.get("pk")
-
         try:
-            run_obj = Run(run_id)
-            run_obj.pause()
+            msg = {"detail": self._pause(kwargs.get("pk"))}
         except core_exceptions.InvalidStateError as ex:
             raise exceptions.ApiWrongObjectState(ex)
         except RunModel.DoesNotExist:
             raise exceptions.NotFound()
 
-        msg = {"detail": f"Run {run_id} is paused."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -120,17 +197,13 @@ class RunViewSet(util.ExecutionFullViewSet):
     )
     @action(methods=["post"], detail=True)
     def resume(self, _, **kwargs):
-        run_id = kwargs.get("pk")
-
         try:
-            run_obj = Run(run_id)
-            run_obj.resume()
+            msg = {"detail": self._resume(kwargs.get("pk"))}
         except core_exceptions.InvalidStateError as ex:
             raise exceptions.ApiWrongObjectState(ex)
         except RunModel.DoesNotExist:
             raise exceptions.NotFound()
 
-        msg = {"detail": f"Run {run_id} is resumed."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -178,34 +251,30 @@ class RunViewSet(util.ExecutionFullViewSet):
 
     @extend_schema(
         description="Execute Run.",
+        parameters=[serializers.BackgroundSerializer],
         request=None,
         responses={
             200: serializers.DetailStringSerializer,
+            202: serializers.OperationDetailSerializer,
             400: serializers.DetailStringSerializer,
             404: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["post"], detail=True)
-    def execute(self, _, **kwargs):
+    def execute(self, request: Request, **kwargs):
         run_id = kwargs.get("pk")
+        if util.get_background(request.query_params):
+            return util.start_background_action(self.queryset, constants.OPERATION_RUN_EXECUTE, run_id, self._execute)
+
         try:
-            run_obj = Run(run_id)
+            msg = {"detail": self._execute(run_id)}
         except RunModel.DoesNotExist:
             raise exceptions.NotFound()
-
-        if run_obj.state not in states.RUN_EXECUTE_NOW_STATES:
-            raise exceptions.ApiWrongObjectState(
-                f"Run object in wrong state: {run_obj.state}, " f"must be in: {states.RUN_EXECUTE_NOW_STATES}"
-            )
-
-        try:
-            run_obj.start()
         except core_exceptions.InvalidStateError as ex:
             raise exceptions.ApiWrongObjectState(ex)
         except core_exceptions.RpcTimeoutError as ex:
             raise exceptions.RpcTimeout(ex)
 
-        msg = {"detail": f"Run {run_id} was executed."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
@@ -276,88 +345,157 @@ class RunViewSet(util.ExecutionFullViewSet):
 
     @extend_schema(
         description="Stop Run.",
+        parameters=[serializers.BackgroundSerializer],
         request=None,
         responses={
             200: serializers.DetailStringSerializer,
+            202: serializers.OperationDetailSerializer,
             400: serializers.DetailStringSerializer,
             404: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["post"], detail=True)
-    def stop(self, _, **kwargs):
+    def stop(self, request: Request, **kwargs):
         run_id = kwargs.get("pk")
+        if util.get_background(request.query_params):
+            return util.start_background_action(self.queryset, constants.OPERATION_RUN_STOP, run_id, self._stop)
 
         try:
-            run_obj = Run(run_id)
-            run_obj.stop()
+            msg = {"detail": self._stop(run_id)}
         except RunModel.DoesNotExist:
             raise exceptions.NotFound()
         except core_exceptions.InvalidStateError as ex:
             raise exceptions.ApiWrongObjectState(ex)
 
-        msg = {"detail": f"Run {run_id} is stopped."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
-        description="Check if Workers in Run are available.",
+        description="Pause multiple Runs (selected by `ids` or `filters`) concurrently.",
+        request=serializers.BulkActionSerializer,
+        responses={200: serializers.BulkActionDetailSerializer, 400: serializers.DetailStringSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_pause(self, request: Request, **kwargs):
+        run_ids = util.get_bulk_object_ids(request.data, self.queryset)
+        return util.bulk_action_response(bulk.run_action(self._pause, run_ids))
+
+    @extend_schema(
+        description="Resume multiple Runs (selected by `ids` or `filters`) concurrently.",
+        request=serializers.BulkActionSerializer,
+        responses={200: serializers.BulkActionDetailSerializer, 400: serializers.DetailStringSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_resume(self, request: Request, **kwargs):
+        run_ids = util.get_bulk_object_ids(request.data, self.queryset)
+        return util.bulk_action_response(bulk.run_action(self._resume, run_ids))
+
+    @extend_schema(
+        description="Execute multiple Runs (selected by `ids` or `filters`) concurrently.",
+        request=serializers.BulkActionSerializer,
+        responses={200: serializers.BulkActionDetailSerializer, 400: serializers.DetailStringSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_execute(self, request: Request, **kwargs):
+        run_ids = util.get_bulk_object_ids(request.data, self.queryset)
+        return util.bulk_action_response(bulk.run_action(self._execute, run_ids))
+
+    @extend_schema(
+        description="Stop multiple Runs (selected by `ids` or `filters`) concurrently.",
+        request=serializers.BulkActionSerializer,
+        responses={200: serializers.BulkActionDetailSerializer, 400: serializers.DetailStringSerializer},
+    )
+    @action(methods=["post"], detail=False)
+    def bulk_stop(self, request: Request, **kwargs):
+        run_ids = util.get_bulk_object_ids(request.data, self.queryset)
+        return util.bulk_action_response(bulk.run_action(self._stop, run_ids))
+
+    @extend_schema(
+        description="Archive finished Run. Its report, executions, and outputs are saved into a compressed bundle and "
+        "removed from the database.",
         request=None,
         responses={
             200: serializers.DetailStringSerializer,
+            400: serializers.DetailStringSerializer,
             404: serializers.DetailStringSerializer,
-            500: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["post"], detail=True)
-    def healthcheck_workers(self, _, **kwargs):
+    def archive(self, _, **kwargs):
         run_id = kwargs.get("pk")
         try:
-            run_obj = Run(run_id)
+            archive.archive_run(run_id)
         except RunModel.DoesNotExist:
             raise exceptions.NotFound()
+        except core_exceptions.ArchiveError as ex:
+            raise exceptions.ApiWrongObjectState(ex)
+
+        msg = {"detail": f"Run {run_id} is archived."}
+        return Response(msg, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description="Check if Workers in Run are available.",
+        parameters=[serializers.BackgroundSerializer],
+        request=None,
+        responses={
+            200: serializers.DetailStringSerializer,
+            202: serializers.OperationDetailSerializer,
+            404: serializers.DetailStringSerializer,
+            500: serializers.DetailStringSerializer,
+        },
+    )
+    @action(methods=["post"], detail=True)
+    def healthcheck_workers(self, request: Request, **kwargs):
+        run_id = kwargs.get("pk")
+        if util.get_background(request.query_params):
+            return util.start_background_action(
+                self.queryset, constants.OPERATION_RUN_HEALTHCHECK_WORKERS, run_id, self._healthcheck_workers
+            )
 
         try:
-            run_obj.healthcheck_workers()
+            msg = {"detail": self._healthcheck_workers(run_id)}
+        except RunModel.DoesNotExist:
+            raise exceptions.NotFound()
         except ConnectionError as ex:
             raise exceptions.RpcTimeout(ex)
 
-        msg = {"detail": "Run's Workers are available."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
         description="Validate modules in Run.",
+        parameters=[serializers.BackgroundSerializer],
         request=None,
         responses={
             200: serializers.DetailStringSerializer,
+            202: serializers.OperationDetailSerializer,
             404: serializers.DetailStringSerializer,
             500: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["post"], detail=True)
-    def validate_modules(self, _, **kwargs):
+    def validate_modules(self, request: Request, **kwargs):
         run_id = kwargs.get("pk")
+        if util.get_background(request.query_params):
+            return util.start_background_action(
+                self.queryset, constants.OPERATION_RUN_VALIDATE_MODULES, run_id, self._validate_modules
+            )
+
         try:
-            run_obj = Run(run_id)
+            msg = {"detail": self._validate_modules(run_id)}
         except RunModel.DoesNotExist:
             raise exceptions.NotFound()
-
-        try:
-            all_valid = run_obj.validate_modules()
         except core_exceptions.RpcTimeoutError:
             raise exceptions.RpcTimeout("Module's validation failed due to RPC timeout.")
+        except ValueError as ex:
+            return Response({"detail": str(ex)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not all_valid:
-            msg = {"detail": "Run's modules are not valid."}
-            return Response(msg, status=status.HTTP_400_BAD_REQUEST)
-
-        msg = {"detail": "Run's modules were validated."}
         return Response(msg, status=status.HTTP_200_OK)
 
     @extend_schema(
-        description="Get Plan's YAML.",
-        responses={200: serializers.DetailDictionarySerializer, 404: serializers.DetailStringSerializer},
+        description="Get Plan's YAML. Supports conditional requests (`If-None-Match`).",
+        responses={200: serializers.DetailDictionarySerializer, 304: None, 404: serializers.DetailStringSerializer},
     )
     @action(methods=["get"], detail=True)
-    def get_plan(self, _, **kwargs):
+    def get_plan(self, request: Request, **kwargs):
         run_id = kwargs.get("pk")
         try:
             run_obj = RunModel.objects.get(id=run_id)
@@ -365,6 +503,6 @@ class RunViewSet(util.ExecutionFullViewSet):
             raise exceptions.NotFound(f"Run with ID {run_id} does not exist.")
 
         plan_obj = Plan(run_obj.plan_id)
+        version = caching.get_plan_version(run_obj.plan_id)
 
-        msg = {"detail": plan_obj.generate_plan()}
-        return Response(msg, status=status.HTTP_200_OK)
+        return caching.conditional_response(request, version, plan_obj.generate_plan, f"plan:{run_obj.plan_id}")
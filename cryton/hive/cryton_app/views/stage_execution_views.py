@@ -35,19 +35,20 @@ class StageExecutionViewSet(util.ExecutionViewSet):
 
     @extend_schema(
         description="Generate Stage execution report.",
+        parameters=[serializers.ReportSerializer],
         responses={
             200: serializers.DetailDictionarySerializer,
             404: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["get"], detail=True)
-    def report(self, _, **kwargs):
+    def report(self, request: Request, **kwargs):
         stage_execution_id = kwargs.get("pk")
         try:
             stage_ex_obj = StageExecution(stage_execution_id)
         except core_exceptions.StageExecutionObjectDoesNotExist:
             raise exceptions.NotFound()
-        report = stage_ex_obj.report()
+        report = stage_ex_obj.report(util.get_include_output(request.query_params))
 
         return Response(report, status=status.HTTP_200_OK)
 
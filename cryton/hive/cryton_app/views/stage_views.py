@@ -10,7 +10,7 @@ from cryton.hive.cryton_app.models import StageModel
 from cryton.hive.utility import exceptions as core_exceptions, creator, states
 from cryton.hive.models.stage import Stage, StageExecution
 from cryton.hive.models.plan import Plan, PlanExecution
-from cryton.hive.utility.validator import Validator
+from cryton.hive.utility.validator import Validator, DynamicValidator
 
 
 @extend_schema_view(
@@ -65,19 +65,15 @@ class StageViewSet(util.InstanceFullViewSet):
         if len(stages) != 1:
             raise exceptions.ValidationError("Create one stage at a time.")
 
-        # Check validity of the new plan
-        new_plan = plan_obj.generate_plan()
-        if new_plan["stages"].get(stage_name):
-            exceptions.ValidationError(f"Stage {stage_name} is already present in the plan.")
-        new_plan["stages"][stage_name] = stage_data
-
+        # Check validity of the new stage (only against the existing names)
         try:
-            Validator(new_plan).validate()
+            DynamicValidator(plan_obj.model.id).validate_stages(stages)
         except core_exceptions.ValidationError as ex:
             raise exceptions.ValidationError(ex)
 
         # Create the stage
         stage_id = creator.create_stages(plan_obj.model, stages)
+        plan_obj.update_document(stage_ids=stage_id)
         msg = {"id": stage_id, "detail": "Stage successfully created."}
 
         return Response(msg, status=status.HTTP_201_CREATED)
@@ -99,14 +95,16 @@ class StageViewSet(util.InstanceFullViewSet):
 
         stage_data = util.parse_object_from_files(request.FILES)
 
-        new_plan = plan_obj.generate_plan()
-        for stage, stage_dict in stage_data.items():
-            if new_plan["stages"].get(stage):
-                raise exceptions.ValidationError(f"Stage {stage} is already present in the plan.")
-            new_plan["stages"][stage] = stage_dict
-
         try:
-            Validator(new_plan).validate()
+            if plan_obj.dynamic:
+                DynamicValidator(plan_obj.model.id).validate_stages(stage_data)
+            else:
+                new_plan = plan_obj.generate_plan()
+                for stage, stage_dict in stage_data.items():
+                    if new_plan["stages"].get(stage):
+                        raise exceptions.ValidationError(f"Stage {stage} is already present in the plan.")
+                    new_plan["stages"][stage] = stage_dict
+                Validator(new_plan).validate()
         except core_exceptions.ValidationError as ex:
             raise exceptions.ValidationError(f"Adding the stage(s) would make the plan invalid.\n{ex}")
 
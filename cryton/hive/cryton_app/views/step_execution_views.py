@@ -1,4 +1,5 @@
 from rest_framework.response import Response
+from rest_framework.request import Request
 from rest_framework import status
 from rest_framework.decorators import action
 
@@ -34,23 +35,43 @@ class StepExecutionViewSet(util.ExecutionViewSet):
 
     @extend_schema(
         description="Generate Step execution report.",
+        parameters=[serializers.ReportSerializer],
         responses={
             200: serializers.DetailDictionarySerializer,
             404: serializers.DetailStringSerializer,
         },
     )
     @action(methods=["get"], detail=True)
-    def report(self, _, **kwargs):
+    def report(self, request: Request, **kwargs):
         step_execution_id = kwargs.get("pk")
 
         try:
             step_ex_obj = StepExecution(step_execution_id)
         except core_exceptions.StepExecutionObjectDoesNotExist:
             raise exceptions.NotFound()
-        report = step_ex_obj.report()
+        report = step_ex_obj.report(util.get_include_output(request.query_params))
 
         return Response(report, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        description="Get raw output of Step execution.",
+        responses={
+            200: serializers.StepExecutionOutputSerializer,
+            404: serializers.DetailStringSerializer,
+        },
+    )
+    @action(methods=["get"], detail=True)
+    def output(self, _, **kwargs):
+        step_execution_id = kwargs.get("pk")
+
+        try:
+            step_ex_obj = StepExecution(step_execution_id)
+        except core_exceptions.StepExecutionObjectDoesNotExist:
+            raise exceptions.NotFound()
+
+        msg = {"output": step_ex_obj.output, "output_size": step_ex_obj.output_size}
+        return Response(msg, status=status.HTTP_200_OK)
+
     @extend_schema(
         description="Stop Step execution.",
         request=None,
@@ -11,7 +11,7 @@ from cryton.hive.utility import exceptions as core_exceptions, creator, states
 from cryton.hive.models.step import Step, StepExecution
 from cryton.hive.models.stage import Stage, StageExecution
 from cryton.hive.models import Plan
-from cryton.hive.utility.validator import Validator
+from cryton.hive.utility.validator import Validator, DynamicValidator
 
 
 @extend_schema_view(
@@ -72,20 +72,10 @@ class StepViewSet(util.InstanceFullViewSet):
         if not step_data.get("is_init", False) and (previous_step := stage_obj.model.steps.last()) is None:
             step_data["is_init"] = True
 
-        # Check validity of the new plan
-        new_plan = plan_obj.generate_plan()
-        if new_plan["stages"][stage_obj.name]["steps"].get(step_name):
-            raise exceptions.ValidationError(f"Step {step_name} is already present in the plan.")
-        new_plan["stages"][stage_obj.name]["steps"][step_name] = step_data
-        if previous_step:
-            previous_step_data = new_plan["stages"][stage_obj.name]["steps"][previous_step.name]
-            if previous_step_next := previous_step_data.get("next"):
-                previous_step_next.append({"step": step_name, "type": "any"})
-            else:
-                previous_step_data["next"] = [{"step": step_name, "type": "any"}]
-
+        # Check validity of the new step (only against the existing names and the stage's graph)
+        parents = {step_name: previous_step.name} if previous_step else None
         try:
-            Validator(new_plan).validate()
+            DynamicValidator(plan_obj.model.id).validate_steps(stage_obj.model.id, steps, parents)
         except core_exceptions.ValidationError as ex:
             raise exceptions.ValidationError(f"Adding the steps(s) would make the plan invalid.\n{ex}")
 
@@ -93,6 +83,7 @@ class StepViewSet(util.InstanceFullViewSet):
         step_id = creator.create_steps(stage_obj.model, {step_name: step_data})[0]
         if previous_step:
             creator.create_successors(stage_obj.model, {previous_step.id: [{"step": step_name, "type": "any"}]})
+        plan_obj.update_document(step_ids=[step_id, previous_step.id] if previous_step else [step_id])
         msg = {"id": step_id, "detail": "Step successfully created."}
 
         return Response(msg, status=status.HTTP_201_CREATED)
@@ -116,14 +107,16 @@ class StepViewSet(util.InstanceFullViewSet):
 
         step_data = util.parse_object_from_files(request.FILES)
 
-        new_plan = plan_obj.generate_plan()
-        for step_name, step_dict in step_data.items():
-            if new_plan["stages"][stage_obj.name]["steps"].get(step_name):
-                raise exceptions.ValidationError(f"Step {step_name} is already present in the plan.")
-            new_plan["stages"][stage_obj.name]["steps"][step_name] = step_dict
-
         try:
-            Validator(new_plan).validate()
+            if plan_obj.dynamic:
+                DynamicValidator(plan_obj.model.id).validate_steps(stage_obj.model.id, step_data)
+            else:
+                new_plan = plan_obj.generate_plan()
+                for step_name, step_dict in step_data.items():
+                    if new_plan["stages"][stage_obj.name]["steps"].get(step_name):
+                        raise exceptions.ValidationError(f"Step {step_name} is already present in the plan.")
+                    new_plan["stages"][stage_obj.name]["steps"][step_name] = step_dict
+                Validator(new_plan).validate()
         except core_exceptions.ValidationError as ex:
             raise exceptions.ValidationError(f"Adding the steps(s) would make the plan invalid.\n{ex}")
 
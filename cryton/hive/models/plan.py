@@ -2,14 +2,22 @@ import os
 from datetime import datetime
 from typing import Type
 
-from django.db import transaction, connections
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
 from django.forms.models import model_to_dict
 
-from multiprocessing import Process
 
-from cryton.hive.cryton_app.models import PlanModel, PlanExecutionModel, StageExecutionModel, PlanSettings
+from cryton.hive.cryton_app.models import (
+    PlanModel,
+    PlanExecutionModel,
+    StageExecutionModel,
+    PlanSettings,
+    StageModel,
+    StepModel,
+    SuccessorModel,
+)
 
-from cryton.hive.utility import constants, exceptions, logger, scheduler_client, states as st
+from cryton.hive.utility import constants, db, event_stream, exceptions, logger, scheduler_client, states as st
 from cryton.hive.config.settings import SETTINGS
 from cryton.hive.models.stage import StageExecution
 from django.utils import timezone
@@ -22,7 +30,7 @@ class Plan(Instance):
         """
         :param model_id: Model ID
         """
-        self.__model = PlanModel.objects.get(id=model_id)
+        self.__model = PlanModel.objects.defer("document").get(id=model_id)
         self._logger = logger.logger.bind(plan_id=model_id, name=self.name)
 
     @staticmethod
@@ -51,6 +59,7 @@ class Plan(Instance):
         model = self.model
         model.name = value
         model.save()
+        self.discard_document(model.id)
 
     @property
     def dynamic(self) -> bool:
@@ -61,6 +70,7 @@ class Plan(Instance):
         model = self.model
         model.dynamic = value
         model.save()
+        self.discard_document(model.id)
 
     @property
     def metadata(self) -> dict:
@@ -71,57 +81,114 @@ class Plan(Instance):
         model = self.model
         model.metadata = value
         model.save()
+        self.discard_document(model.id)
 
     def generate_plan(self) -> dict:
         """
-        Get Plan's YAML from database.
+        Get Plan's YAML. It is built from the database only once and then stored with the Plan.
         :return: Plan and its Stages/Steps
         """
-        stages: dict[str, dict] = {}
-        for stage_obj in self.model.stages.all():
-            steps: dict[str, dict] = {}
-            for step_obj in stage_obj.steps.all():
-                step_data = model_to_dict(step_obj, exclude=["stage", "id", "is_final", "output_settings"])
-
-                successors = []
-                for successor_obj in step_obj.successors.all():
-
-                    successor_data = {
-                        "type": successor_obj.type,
-                        "value": successor_obj.value,
-                        "step": successor_obj.successor.name,
-                    }
-                    if successor_obj.type == "any":
-                        successor_data.pop("value")
-                    successors.append(successor_data)
-
-                if successors:
-                    step_data["next"] = successors
-                output_settings = dict()
-                if step_obj.output_settings.alias:
-                    output_settings["alias"] = step_obj.output_settings.alias
-                if step_obj.output_settings.replace:
-                    output_settings["replace"] = step_obj.output_settings.replace
-                if mappings := [
-                    {"from": mapping.name_from, "to": mapping.name_to}
-                    for mapping in step_obj.output_settings.mappings.all()
-                ]:
-                    output_settings["mapping"] = mappings
-                if output_settings:
-                    step_data["output"] = output_settings
-                steps[step_obj.name] = step_data
-
-            stage_data = model_to_dict(stage_obj, exclude=["plan", "id"])
-            stage_data["steps"] = steps
-            stages[stage_obj.name] = stage_data
-
-        plan_data = model_to_dict(self.model, exclude=["id", "settings"])
+        if (document := PlanModel.objects.values_list("document", flat=True).get(id=self.model.id)) is not None:
+            return document
+
+        document = self._build_document()
+        PlanModel.objects.filter(id=self.model.id).update(document=document)
+
+        return document
+
+    def update_document(self, stage_ids: list[int] = None, step_ids: list[int] = None) -> None:
+        """
+        Update the stored Plan's YAML with the added (or changed) Stages and Steps.
+        :param stage_ids: IDs of the Stages (including their Steps) to update
+        :param step_ids: IDs of the Steps to update
+        :return: None
+        """
+        with transaction.atomic():
+            model = PlanModel.objects.select_for_update().only("document").get(id=self.model.id)
+            if (document := model.document) is None:  # It will be built on the next read
+                return
+
+            for stage_obj in _prefetch_stages(StageModel.objects.filter(id__in=stage_ids or [])):
+                document["stages"][stage_obj.name] = _stage_document(stage_obj)
+            for step_obj in _prefetch_steps(StepModel.objects.filter(id__in=step_ids or []).select_related("stage")):
+                document["stages"][step_obj.stage.name]["steps"][step_obj.name] = _step_document(step_obj)
+
+            model.save(update_fields=["document"])
+
+    @staticmethod
+    def discard_document(plan_id: int) -> None:
+        """
+        Discard the stored Plan's YAML, it will be built again on the next read.
+        :param plan_id: ID of the Plan
+        :return: None
+        """
+        PlanModel.objects.filter(id=plan_id).update(document=None)
+
+    def _build_document(self) -> dict:
+        """
+        Build Plan's YAML from database.
+        :return: Plan and its Stages/Steps
+        """
+        model = self.model
+        stages = {
+            stage_obj.name: _stage_document(stage_obj) for stage_obj in _prefetch_stages(model.stages.order_by("id"))
+        }
+
+        plan_data = model_to_dict(model, exclude=["id", "settings", "document"])
         plan_data["stages"] = stages
-        plan_data["settings"] = model_to_dict(self.model.settings, exclude=["id"])
+        plan_data["settings"] = model_to_dict(model.settings, exclude=["id"])
 
         return plan_data
 
 
+def _prefetch_steps(steps: QuerySet) -> QuerySet:
+    return steps.order_by("id").prefetch_related(
+        "output_settings__mappings", Prefetch("successors", SuccessorModel.objects.select_related("successor"))
+    )
+
+
+def _prefetch_stages(stages: QuerySet) -> QuerySet:
+    return stages.prefetch_related(Prefetch("steps", _prefetch_steps(StepModel.objects.all())))
+
+
+def _step_document(step_obj: StepModel) -> dict:
+    step_data = model_to_dict(step_obj, exclude=["stage", "id", "is_final", "output_settings"])
+
+    successors = []
+    for successor_obj in step_obj.successors.all():
+        successor_data = {
+            "type": successor_obj.type,
+            "value": successor_obj.value,
+            "step": successor_obj.successor.name,
+        }
+        if successor_obj.type == "any":
+            successor_data.pop("value")
+        successors.append(successor_data)
+
+    if successors:
+        step_data["next"] = successors
+    output_settings = dict()
+    if step_obj.output_settings.alias:
+        output_settings["alias"] = step_obj.output_settings.alias
+    if step_obj.output_settings.replace:
+        output_settings["replace"] = step_obj.output_settings.replace
+    if mappings := [
+        {"from": mapping.name_from, "to": mapping.name_to} for mapping in step_obj.output_settings.mappings.all()
+    ]:
+        output_settings["mapping"] = mappings
+    if output_settings:
+        step_data["output"] = output_settings
+
+    return step_data
+
+
+def _stage_document(stage_obj: StageModel) -> dict:
+    stage_data = model_to_dict(stage_obj, exclude=["plan", "id"])
+    stage_data["steps"] = {step_obj.name: _step_document(step_obj) for step_obj in stage_obj.steps.all()}
+
+    return stage_data
+
+
 class PlanExecution(SchedulableExecution):
     def __init__(self, model_id: int):
         """
@@ -162,8 +229,13 @@ class PlanExecution(SchedulableExecution):
             if st.PlanStateMachine.validate_transition(self.state, value):
                 self._logger.debug("plan execution state changed", state_from=self.state, state_to=value)
                 model = self.model
+                state_from = model.state
                 model.state = value
                 model.save()
+                run_id = model.run_id
+                transaction.on_commit(
+                    lambda: event_stream.publish_state(event_stream.PLAN_EXECUTION, model.id, run_id, state_from, value)
+                )
 
     @property
     def schedule_time(self) -> datetime | None:
@@ -352,9 +424,10 @@ class PlanExecution(SchedulableExecution):
         self._logger.info("plan execution modules validated")
         return all_valid
 
-    def report(self) -> dict:
+    def report(self, include_output: bool = True) -> dict:
         """
         Generate a report from Plan execution.
+        :param include_output: Whether to include the raw output of Step executions
         :return: report from Plan execution
         """
         self._logger.debug("plan execution generating report")
@@ -374,7 +447,7 @@ class PlanExecution(SchedulableExecution):
         )
 
         for stage_execution_obj in StageExecutionModel.objects.filter(plan_execution_id=self.model.id).order_by("id"):
-            stage_ex_report = StageExecution(stage_execution_obj.id).report()
+            stage_ex_report = StageExecution(stage_execution_obj.id).report(include_output)
             report_dict["stage_executions"].append(stage_ex_report)
 
         return report_dict
@@ -388,26 +461,17 @@ class PlanExecution(SchedulableExecution):
         st.PlanStateMachine.validate_state(self.state, st.PLAN_STOP_STATES)
         self.state = st.STOPPING
 
-        processes = list()
+        targets = list()
 
         # Unschedule Stage executions that can be unscheduled
         for stage_ex_model in self.model.stage_executions.filter(state=st.AWAITING):
-            stage_ex = StageExecution(stage_ex_model.id)
-            process = Process(target=stage_ex.trigger.stop)
-            processes.append(process)
+            targets.append(StageExecution(stage_ex_model.id).trigger.stop)
 
         # Stop Stage executions that cannot be unscheduled
         for stage_ex_model in self.model.stage_executions.filter(state__in=st.STAGE_STOP_STATES):
-            stage_ex = StageExecution(stage_ex_model.id)
-            process = Process(target=stage_ex.stop)
-            processes.append(process)
-
-        connections.close_all()  # close connections to force each process to create its own
-        for process in processes:
-            process.start()
+            targets.append(StageExecution(stage_ex_model.id).stop)
 
-        for process in processes:
-            process.join()
+        db.run_in_threads(targets)
 
         self.finish_time = timezone.now()
         self.state = st.STOPPED
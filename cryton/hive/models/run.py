@@ -1,12 +1,11 @@
 from typing import Type
 from datetime import datetime
-from threading import Thread
 
 from django.db import transaction
 from django.utils import timezone
 
 from cryton.hive.cryton_app.models import RunModel
-from cryton.hive.utility import logger, scheduler_client, states as st
+from cryton.hive.utility import db, event_stream, logger, scheduler_client, states as st
 from cryton.hive.models.plan import PlanExecution
 from cryton.hive.models.worker import Worker
 from cryton.hive.models.abstract import SchedulableExecution
@@ -108,8 +107,12 @@ class Run(SchedulableExecution):
             if st.RunStateMachine.validate_transition(self.state, value):
                 self._logger.debug("run changed state", state_from=self.state, state_to=value)
                 model = self.model
+                state_from = model.state
                 model.state = value
                 model.save()
+                transaction.on_commit(
+                    lambda: event_stream.publish_state(event_stream.RUN, model.id, model.id, state_from, value)
+                )
 
     @property
     def trigger_id(self) -> str:
@@ -125,7 +128,12 @@ class Run(SchedulableExecution):
     def all_plans_finished(self) -> bool:
         return not self.model.plan_executions.all().exclude(state__in=st.PLAN_FINAL_STATES).exists()
 
-    def report(self) -> dict:
+    def report(self, include_output: bool = True) -> dict:
+        """
+        Generate a report from Run.
+        :param include_output: Whether to include the raw output of Step executions
+        :return: report from Run
+        """
         report_obj = dict(
             id=self.model.id,
             plan_id=self.model.plan.id,
@@ -139,7 +147,7 @@ class Run(SchedulableExecution):
         )
 
         for plan_execution_model in self.model.plan_executions.order_by("id"):
-            plan_execution_report = PlanExecution(plan_execution_model.id).report()
+            plan_execution_report = PlanExecution(plan_execution_model.id).report(include_output)
             report_obj["plan_executions"].append(plan_execution_report)
 
         return report_obj
@@ -266,23 +274,16 @@ class Run(SchedulableExecution):
         st.RunStateMachine.validate_state(self.state, st.RUN_STOP_STATES)
         self.state = st.STOPPING
 
-        threads = list()
+        targets = list()
         # Unschedule Plan executions that can be unscheduled
         for plan_ex_obj in self.model.plan_executions.filter(state__in=st.PLAN_UNSCHEDULE_STATES):
-            plan_ex = PlanExecution(plan_ex_obj.id)
-            thread = Thread(target=plan_ex.unschedule)
-            thread.start()
-            threads.append(thread)
+            targets.append(PlanExecution(plan_ex_obj.id).unschedule)
 
         # Stop Plan executions that cannot be unscheduled
         for plan_ex_obj in self.model.plan_executions.filter(state__in=st.PLAN_STOP_STATES):
-            plan_ex = PlanExecution(plan_ex_obj.id)
-            thread = Thread(target=plan_ex.stop)
-            thread.start()
-            threads.append(thread)
+            targets.append(PlanExecution(plan_ex_obj.id).stop)
 
-        for thread in threads:
-            thread.join()
+        db.run_in_threads(targets)
 
         self.finish_time = timezone.now()
         self.state = st.STOPPED
@@ -1,13 +1,12 @@
 from typing import Type
 from datetime import datetime
 from django.utils import timezone
-from threading import Thread
 from multiprocessing import Process
 
 from django.db import transaction, connections
 
-from cryton.hive.cryton_app.models import StageModel, StageExecutionModel
-from cryton.hive.utility import logger, states as st, util
+from cryton.hive.cryton_app.models import PlanModel, StageModel, StageExecutionModel
+from cryton.hive.utility import db, event_stream, logger, states as st, util
 from cryton.hive.triggers import (
     TriggerType,
     TriggerDelta,
@@ -37,7 +36,9 @@ class Stage(Instance):
         )
 
     def delete(self):
-        self.model.delete()
+        model = self.model
+        model.delete()
+        PlanModel.objects.filter(id=model.plan_id).update(document=None)  # Discard the stored Plan's YAML
 
     @property
     def model(self) -> Type[StageModel] | StageModel:
@@ -63,6 +64,7 @@ class StageExecution(Execution):
         :param model_id: Model ID
         """
         self.__model = StageExecutionModel.objects.get(id=model_id)
+        self._run_id: int | None = None
         self._logger = logger.logger.bind(stage_execution_id=model_id, name=self.model.stage.name)
 
     @staticmethod
@@ -86,6 +88,18 @@ class StageExecution(Execution):
         self.__model.refresh_from_db()
         return self.__model
 
+    @property
+    def run_id(self) -> int:
+        """
+        ID of the Run the execution belongs to, loaded only once (it never changes).
+        :return: Run ID
+        """
+        if self._run_id is None:
+            self._run_id = StageExecutionModel.objects.values_list("plan_execution__run_id", flat=True).get(
+                id=self.__model.id
+            )
+        return self._run_id
+
     @property
     def state(self) -> str:
         return self.model.state
@@ -97,8 +111,15 @@ class StageExecution(Execution):
             if st.StageStateMachine.validate_transition(self.state, value):
                 self._logger.debug("stage execution changed state", state_from=self.state, state_to=value)
                 model = self.model
+                state_from = model.state
                 model.state = value
                 model.save()
+                run_id = self.run_id
+                transaction.on_commit(
+                    lambda: event_stream.publish_state(
+                        event_stream.STAGE_EXECUTION, model.id, run_id, state_from, value
+                    )
+                )
 
     @property
     def start_time(self) -> datetime | None:
@@ -229,7 +250,7 @@ class StageExecution(Execution):
         self.state = st.AWAITING
 
         if isinstance(self.trigger, TriggerImmediate):
-            Thread(target=self.execute).start()
+            db.start_thread(self.execute)
         self._logger.info("stage execution trigger started")
 
     def stop(self):
@@ -245,15 +266,8 @@ class StageExecution(Execution):
         elif state_before == st.WAITING:
             pass
         else:
-            threads = list()
-            for step_ex_model in self.model.step_executions.filter(state__in=st.STEP_STOP_STATES):
-                step_ex = StepExecution(step_ex_model.id)
-                thread = Thread(target=step_ex.stop)
-                thread.start()
-                threads.append(thread)
-
-            for thread in threads:
-                thread.join()
+            step_executions = self.model.step_executions.filter(state__in=st.STEP_STOP_STATES)
+            db.run_in_threads([StepExecution(step_ex_model.id).stop for step_ex_model in step_executions])
 
         self.finish_time = timezone.now()
         self.state = st.STOPPED
@@ -343,7 +357,12 @@ class StageExecution(Execution):
         self._logger.info("stage execution modules validated")
         return all_valid
 
-    def report(self) -> dict:
+    def report(self, include_output: bool = True) -> dict:
+        """
+        Generate a report from Stage execution.
+        :param include_output: Whether to include the raw output of Step executions
+        :return: report from Stage execution
+        """
         self._logger.debug("stage execution generating report")
         report_obj = dict(
             id=self.model.id,
@@ -358,7 +377,7 @@ class StageExecution(Execution):
         )
 
         for step_execution_model in self.model.step_executions.order_by("id"):
-            step_execution_report = StepExecution(step_execution_model.id).report()
+            step_execution_report = StepExecution(step_execution_model.id).report(include_output)
             report_obj["step_executions"].append(step_execution_report)
 
         return report_obj
@@ -375,7 +394,7 @@ class StageExecution(Execution):
         )
         for subject_to_ex in subject_to_exs:
             subject_to_ex_obj = StageExecution(subject_to_ex.id)
-            Thread(target=subject_to_ex_obj.execute).run()
+            subject_to_ex_obj.execute()
 
     def re_execute(self, immediately: bool = False) -> None:
         """
@@ -11,6 +11,7 @@ from django.db import transaction
 from django.utils import timezone
 
 from cryton.hive.cryton_app.models import (
+    PlanModel,
     StepModel,
     StepExecutionModel,
     CorrelationEventModel,
@@ -22,7 +23,8 @@ from cryton.hive.cryton_app.models import (
 
 from cryton.hive.models.abstract import Instance, Execution
 from cryton.hive.config.settings import SETTINGS
-from cryton.hive.utility import constants, exceptions, logger, states, util, rabbit_client
+from cryton.hive.utility import constants, event_stream, exceptions, logger, states, util, rabbit_client
+from cryton.hive.utility.blob_store import blob_store, release_blobs
 from cryton.hive.models import worker
 from cryton.lib.utility.enums import Result
 
@@ -67,7 +69,9 @@ class Step(Instance):
         )
 
     def delete(self):
-        self.model.delete()
+        model = self.model
+        model.delete()
+        PlanModel.objects.filter(stages__id=model.stage_id).update(document=None)  # Discard the stored Plan's YAML
 
     @property
     def model(self) -> StepModel:
@@ -97,6 +101,7 @@ class StepExecution(Execution):
         :param model_id: Model ID
         """
         self.__model = StepExecutionModel.objects.get(id=model_id)
+        self._run_id: int | None = None
         self._logger = logger.logger.bind(step_execution_id=model_id, name=self.model.step.name)
 
     @staticmethod
@@ -117,6 +122,18 @@ class StepExecution(Execution):
         self.__model.refresh_from_db()
         return self.__model
 
+    @property
+    def run_id(self) -> int:
+        """
+        ID of the Run the execution belongs to, loaded only once (it never changes).
+        :return: Run ID
+        """
+        if self._run_id is None:
+            self._run_id = StepExecutionModel.objects.values_list(
+                "stage_execution__plan_execution__run_id", flat=True
+            ).get(id=self.__model.id)
+        return self._run_id
+
     @property
     def state(self) -> str:
         return self.model.state
@@ -128,18 +145,47 @@ class StepExecution(Execution):
             if states.StepStateMachine.validate_transition(self.state, value):
                 self._logger.debug("step execution state updated", state_from=self.state, state_to=value)
                 model = self.model
+                state_from = model.state
                 model.state = value
                 model.save()
+                run_id = self.run_id
+                transaction.on_commit(
+                    lambda: event_stream.publish_state(event_stream.STEP_EXECUTION, model.id, run_id, state_from, value)
+                )
 
     @property
     def output(self) -> str:
-        return self.model.output
+        model = self.model
+        if model.output_blob:
+            return blob_store.get(model.output_blob)
+        return model.output
 
     @output.setter
     def output(self, value: str):
+        self._save_output(value, value, False)
+
+    def append_output(self, value: str) -> None:
+        """
+        Append to the output. Only the appended part is published.
+        :param value: Output to append
+        :return: None
+        """
+        if value:
+            self._save_output(self.output + value, value, True)
+
+    def _save_output(self, output: str, published: str, append: bool) -> None:
         model = self.model
-        model.output = value
+        old_blob = model.output_blob
+        model.output, model.output_blob, model.output_size = blob_store.offload(output)
         model.save()
+        if old_blob and old_blob != model.output_blob:
+            transaction.on_commit(lambda: release_blobs({old_blob}))
+        run_id = self.run_id
+        transaction.on_commit(lambda: event_stream.publish_output(model.id, run_id, published, append))
+
+    @property
+    def output_size(self) -> int:
+        return self.model.output_size
 
     @property
     def serialized_output(self) -> list | dict:
@@ -263,9 +309,10 @@ class StepExecution(Execution):
     def _process_successors(self):
         pass
 
-    def report(self) -> dict:
+    def report(self, include_output: bool = True) -> dict:
         """
         Generate report containing output from Step Execution.
+        :param include_output: Whether to load the raw output (it can be large and stored outside the database)
         :return: Step Execution report
         """
         report_obj = dict(
@@ -276,7 +323,8 @@ class StepExecution(Execution):
             start_time=self.start_time,
             finish_time=self.finish_time,
             serialized_output=self.serialized_output,
-            output=self.output,
+            output=self.output if include_output else None,
+            output_size=self.output_size,
             valid=self.valid,
         )
 
@@ -500,6 +548,8 @@ class StepExecution(Execution):
         output: str = ret_vals[constants.OUTPUT]
         result = Result(ret_vals[constants.RESULT])
 
+        # Errors are collected and saved together with the output, so the (possibly offloaded) output is written once
+        errors = ""
         match result:
             case Result.STOPPED:
                 self.state = states.STOPPED
@@ -512,12 +562,12 @@ class StepExecution(Execution):
                     output, serialized_output = self._alter_output(output, serialized_output)
                 except Exception as ex:
                     self.state = states.ERROR
-                    self.output += f"An error occurred while altering the output: {ex}.\n"
+                    errors += f"An error occurred while altering the output: {ex}.\n"
                 try:
                     self._apply_output_mappings(serialized_output)
                 except Exception as ex:
                     self.state = states.ERROR
-                    self.output += f"An error occurred while updating the output mappings: {ex}.\n"
+                    errors += f"An error occurred while updating the output mappings: {ex}.\n"
 
                 try:
                     self.state = states.FINISHED
@@ -525,7 +575,7 @@ class StepExecution(Execution):
                     pass
 
         self.serialized_output = serialized_output
-        self.output += output
+        self.append_output(errors + output)
 
         # update Successors parents
         for successor in self._get_executable_successors():
@@ -608,6 +658,8 @@ class StepExecution(Execution):
         with transaction.atomic():
             model = self.model
             StepExecutionModel.objects.select_for_update().get(id=model.id)
+            if old_blob := model.output_blob:
+                transaction.on_commit(lambda: release_blobs({old_blob}))
 
             model.state = states.PENDING
             model.start_time = None
@@ -615,6 +667,8 @@ class StepExecution(Execution):
             model.finish_time = None
             model.serialized_output = dict()
             model.output = ""
+            model.output_blob = ""
+            model.output_size = 0
             model.valid = False
             model.parent = None
             model.save()
@@ -8,7 +8,7 @@ import amqpstorm
 from traceback import format_exc
 from structlog.stdlib import BoundLogger
 
-from cryton.hive.utility import constants, logger, states, event, rabbit_client
+from cryton.hive.utility import constants, db, logger, states, event, rabbit_client
 from cryton.hive.models import stage, plan, step, run
 from cryton.hive.config.settings import SETTINGS
 from cryton.hive.cryton_app.models import CorrelationEventModel
@@ -92,8 +92,13 @@ class Consumer:
         """
         self._logger.debug("consumer started", channel_consumer_count=self._channel_consumer_count)
         self._stopped.clear()
+        next_stats_report = time.monotonic()
 
         while not self._stopped.is_set():  # Keep self and connection alive and check for stop.
+            if self._id == 0 and time.monotonic() >= next_stats_report:  # The statistics are shared by all processes
+                self._logger.debug("database connection statistics", **db.connection_limiter.stats())
+                next_stats_report = time.monotonic() + 60
+
             try:
                 if self._update_connection():
                     self._start_channel_consumers()
@@ -183,10 +188,10 @@ class Listener:
         self._scheduler = SchedulerService(self._scheduler_job_queue)
 
         self.rabbit_queues = {
-            SETTINGS.rabbit.queues.attack_response: self.step_response_callback,
-            SETTINGS.rabbit.queues.agent_response: self.step_response_callback,
-            SETTINGS.rabbit.queues.event_response: self.event_callback,
-            SETTINGS.rabbit.queues.control_request: self.control_request_callback,
+            SETTINGS.rabbit.queues.attack_response: db.managed_connection(self.step_response_callback),
+            SETTINGS.rabbit.queues.agent_response: db.managed_connection(self.step_response_callback),
+            SETTINGS.rabbit.queues.event_response: db.managed_connection(self.event_callback),
+            SETTINGS.rabbit.queues.control_request: db.managed_connection(self.control_request_callback),
         }
 
     def start(self, blocking: bool = True) -> None:
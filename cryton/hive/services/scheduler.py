@@ -21,7 +21,12 @@ class SchedulerService:
             f"{SETTINGS.database.port}/{SETTINGS.database.name}"
         )
 
-        jobstores = {"default": SQLAlchemyJobStore(url=db_url)}
+        engine_options = {
+            "pool_size": SETTINGS.scheduler.database_pool_size,
+            "max_overflow": 0,
+            "pool_pre_ping": True,
+        }
+        jobstores = {"default": SQLAlchemyJobStore(url=db_url, engine_options=engine_options)}
 
         executors = {
             "default": ThreadPoolExecutor(SETTINGS.scheduler.max_threads),
@@ -79,6 +79,18 @@ DATABASES = {
         "PASSWORD": SETTINGS.database.password,
         "HOST": SETTINGS.database.host,
         "PORT": SETTINGS.database.port,
+        "CONN_MAX_AGE": SETTINGS.database.connection_max_age,
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Cache (rendered reports), shared by all processes
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": SETTINGS.cache_directory,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
     }
 }
 
@@ -117,7 +129,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "cryton.hive.cryton_app.pagination.ListPagination",
 }
 
 SPECTACULAR_SETTINGS = {
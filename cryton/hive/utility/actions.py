@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from typing import Callable
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.cryton_app.models import OperationModel
+from cryton.hive.utility import constants, operations
+
+ACTION_TYPES = [
+    constants.OPERATION_RUN_EXECUTE,
+    constants.OPERATION_RUN_STOP,
+    constants.OPERATION_RUN_HEALTHCHECK_WORKERS,
+    constants.OPERATION_RUN_VALIDATE_MODULES,
+    constants.OPERATION_PLAN_EXECUTION_STOP,
+    constants.OPERATION_PLAN_EXECUTION_VALIDATE_MODULES,
+]
+
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+_executor_lock = Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the process' executor for the background actions. Threads don't survive a fork, each process needs its own.
+    :return: Executor
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(SETTINGS.api.action_workers, "action")
+            _executor_pid = os.getpid()
+
+    return _executor
+
+
+def start_action(operation_type: str, object_id: int, action: Callable[[int], str]) -> OperationModel:
+    """
+    Run the action in the background. If the same action is already running for the object, its operation is returned.
+    :param operation_type: Type of the action
+    :param object_id: ID of the object the action works on
+    :param action: Function running the action for the object, returns a message
+    :return: Action's operation
+    """
+    if (operation := operations.get_unfinished(operation_type, object_id)) is not None:
+        return operation
+
+    return operations.start(
+        operation_type, object_id, lambda _, action_object_id: action(action_object_id), get_executor()
+    )
+
+
+def abort_interrupted_actions(started_at: datetime) -> list[int]:
+    """
+    Mark actions interrupted by the Hive's shutdown as failed. Repeating them (e.g. the execution) wouldn't be safe.
+    :param started_at: When the Hive started, actions created later are still running
+    :return: IDs of the aborted operations
+    """
+    return operations.abort_interrupted(ACTION_TYPES, started_at)
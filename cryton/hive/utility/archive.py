@@ -0,0 +1,202 @@
+import gzip
+import json
+import os
+from datetime import datetime
+from tempfile import NamedTemporaryFile
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction, IntegrityError
+from django.db.models import Model, QuerySet
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.cryton_app.models import (
+    RunModel,
+    PlanExecutionModel,
+    ExecutionVariableModel,
+    StageExecutionModel,
+    StepExecutionModel,
+    CorrelationEventModel,
+    RunArchiveModel,
+)
+from cryton.hive.models.run import Run
+from cryton.hive.utility import exceptions, logger, states
+from cryton.hive.utility.blob_store import blob_store, release_blobs
+
+ARCHIVE_VERSION = 1
+
+
+def _get_run_rows(run_id: int) -> dict[str, QuerySet]:
+    """
+    Get all rows belonging to the Run. Parents are listed before their children.
+    :param run_id: ID of the Run
+    :return: Querysets keyed by the model label
+    """
+    querysets: list[QuerySet] = [
+        RunModel.objects.filter(id=run_id),
+        PlanExecutionModel.objects.filter(run_id=run_id),
+        ExecutionVariableModel.objects.filter(plan_execution__run_id=run_id),
+        StageExecutionModel.objects.filter(plan_execution__run_id=run_id),
+        StepExecutionModel.objects.filter(stage_execution__plan_execution__run_id=run_id),
+        CorrelationEventModel.objects.filter(step_execution__stage_execution__plan_execution__run_id=run_id),
+    ]
+
+    return {queryset.model._meta.label: queryset.order_by("id") for queryset in querysets}
+
+
+def _serialize_rows(queryset: QuerySet) -> list[dict]:
+    rows = serializers.serialize("python", queryset.iterator())
+    if queryset.model is StepExecutionModel:  # Blobs are pruned with the rows, the outputs must be in the bundle
+        for row in rows:
+            fields = row["fields"]
+            if fields["output_blob"]:
+                fields["output"] = blob_store.get(fields["output_blob"])
+                fields["output_blob"] = ""
+
+    return rows
+
+
+def _write_bundle(file_path: str, bundle: dict) -> int:
+    """
+    Atomically write the compressed bundle.
+    :param file_path: Where to save the bundle
+    :param bundle: Bundle content
+    :return: Size of the saved file
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with NamedTemporaryFile("wb", dir=os.path.dirname(file_path), delete=False) as temporary_file:
+        with gzip.GzipFile(fileobj=temporary_file, mode="wb") as compressed_file:
+            compressed_file.write(json.dumps(bundle, cls=DjangoJSONEncoder).encode())
+        temporary_file.flush()
+        os.fsync(temporary_file.fileno())
+    os.replace(temporary_file.name, file_path)
+
+    return os.path.getsize(file_path)
+
+
+def _read_bundle(file_path: str) -> dict:
+    with gzip.open(file_path, "rb") as compressed_file:
+        return json.loads(compressed_file.read())
+
+
+def read_archived_report(archive: RunArchiveModel) -> dict:
+    """
+    Get the report saved in the Run archive.
+    :param archive: Archive record
+    :return: Run report (without the raw outputs)
+    """
+    try:
+        return _read_bundle(archive.file)["report"]
+    except (OSError, ValueError, KeyError) as ex:
+        raise exceptions.ArchiveError(f"Unable to read the archive. {ex}", archive.run_id)
+
+
+def get_archive_path(run_id: int) -> str:
+    return os.path.join(SETTINGS.archive_directory, f"run-{run_id}.json.gz")
+
+
+def archive_run(run_id: int) -> RunArchiveModel:
+    """
+    Save the Run (report, execution rows, and outputs) into a compressed bundle and remove its rows from the database.
+    :param run_id: ID of the Run
+    :return: Archive record
+    """
+    run_logger = logger.logger.bind(run_id=run_id)
+    run_logger.debug("run archiving")
+    run_obj = Run(run_id)
+    if run_obj.state not in states.RUN_FINAL_STATES:
+        raise exceptions.ArchiveError(f"Only Runs in states {states.RUN_FINAL_STATES} can be archived.", run_id)
+
+    rows = _get_run_rows(run_id)
+    bundle = dict(
+        version=ARCHIVE_VERSION,
+        run_id=run_id,
+        report=run_obj.report(include_output=False),  # The outputs are saved with the rows
+        rows={label: _serialize_rows(queryset) for label, queryset in rows.items()},
+    )
+    file_path = get_archive_path(run_id)
+    size = _write_bundle(file_path, bundle)
+
+    blobs = set(rows[StepExecutionModel._meta.label].exclude(output_blob="").values_list("output_blob", flat=True))
+    try:
+        with transaction.atomic():
+            archive = RunArchiveModel.objects.create(
+                run_id=run_id, plan_name=run_obj.model.plan.name, state=run_obj.state, file=file_path, size=size
+            )
+            run_obj.delete()
+    except BaseException:  # The Run stays in the database, its bundle would be left behind
+        os.remove(file_path)
+        raise
+    release_blobs(blobs)
+
+    run_logger.info("run archived", file=file_path)
+    return archive
+
+
+def restore_run(run_id: int) -> None:
+    """
+    Restore the archived Run rows and remove the archive.
+    :param run_id: ID of the archived Run
+    :return: None
+    """
+    run_logger = logger.logger.bind(run_id=run_id)
+    run_logger.debug("run restoring")
+    try:
+        archive = RunArchiveModel.objects.get(run_id=run_id)
+    except RunArchiveModel.DoesNotExist:
+        raise exceptions.RunObjectDoesNotExist(run_id)
+
+    try:
+        bundle = _read_bundle(archive.file)
+    except (OSError, ValueError) as ex:
+        raise exceptions.ArchiveError(f"Unable to read the archive. {ex}", run_id)
+
+    if bundle.get("version") != ARCHIVE_VERSION:
+        raise exceptions.ArchiveError(f"Unsupported archive version {bundle.get('version')}.", run_id)
+
+    offloaded = set()
+    try:
+        with transaction.atomic():
+            for rows in bundle["rows"].values():
+                for deserialized in serializers.deserialize("python", rows):
+                    instance: Model = deserialized.object
+                    if isinstance(instance, StepExecutionModel):
+                        instance.output, instance.output_blob, instance.output_size = blob_store.offload(
+                            instance.output
+                        )
+                        if instance.output_blob:
+                            offloaded.add(instance.output_blob)
+                    deserialized.save()
+            archive.delete()
+    except Exception as ex:
+        # The blobs must exist before the rows referencing them are committed, remove them if the rows aren't
+        release_blobs(offloaded)
+        if isinstance(ex, (serializers.base.DeserializationError, IntegrityError)):  # The Plan or a Worker is gone
+            raise exceptions.ArchiveError(f"Unable to restore the archive. {ex}", run_id)
+        raise
+
+    os.remove(archive.file)
+    run_logger.info("run restored")
+
+
+def archive_finished_runs(finished_before: datetime) -> list[int]:
+    """
+    Archive all Runs that finished before the given time.
+    :param finished_before: Runs that finished after this time are kept
+    :return: IDs of the archived Runs
+    """
+    run_ids = list(
+        RunModel.objects.filter(state__in=states.RUN_FINAL_STATES, finish_time__lt=finished_before).values_list(
+            "id", flat=True
+        )
+    )
+    archived = []
+    for run_id in run_ids:
+        try:
+            archive_run(run_id)
+        except exceptions.ArchiveError as ex:
+            logger.logger.warning("run not archived", run_id=run_id, error=str(ex))
+        else:
+            archived.append(run_id)
+
+    return archived
@@ -0,0 +1,170 @@
+import fcntl
+import gzip
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from tempfile import NamedTemporaryFile
+from typing import Iterator
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.cryton_app.models import StepExecutionModel
+
+GRACE_PERIOD = 3600  # Seconds after the last write during which a blob is never removed
+
+
+class BlobStore:
+    def __init__(self, directory: str, threshold: int = 0, grace_period: int = GRACE_PERIOD):
+        """
+        Content-addressed storage for large outputs. Blobs are compressed and saved under their SHA-256 digest.
+        A blob is saved before the row referencing it is committed, so the recently written (or rewritten) blobs are
+        never removed, even if no row references them yet.
+        :param directory: Directory to save the blobs to
+        :param threshold: Size (in bytes) above which the content is offloaded; 0 disables the offloading
+        :param grace_period: Seconds after the last write during which a blob is never removed
+        """
+        self.directory = directory
+        self.threshold = threshold
+        self.grace_period = grace_period
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest[2:])
+
+    @contextmanager
+    def _lock(self):
+        """
+        Serialize the writes and removals across threads and processes.
+        :return: None
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "wb") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def put(self, content: str) -> str:
+        """
+        Save content to the store. Content that is already saved is not written again, only its write time is updated.
+        :param content: Content to save
+        :return: Digest of the content
+        """
+        data = content.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._path(digest)
+        with self._lock():
+            if os.path.exists(blob_path):
+                os.utime(blob_path)
+                return digest
+
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            with NamedTemporaryFile("wb", dir=os.path.dirname(blob_path), delete=False) as temporary_file:
+                temporary_file.write(gzip.compress(data))
+            os.replace(temporary_file.name, blob_path)
+
+        return digest
+
+    def get(self, digest: str) -> str:
+        """
+        Load content from the store.
+        :param digest: Digest of the content
+        :return: Saved content
+        """
+        with open(self._path(digest), "rb") as blob_file:
+            return gzip.decompress(blob_file.read()).decode()
+
+    def iter_chunks(self, digest: str, chunk_size: int) -> Iterator[str]:
+        """
+        Load content from the store in chunks, without holding all of it in memory.
+        :param digest: Digest of the content
+        :param chunk_size: Number of characters in a chunk
+        :return: Chunks of the saved content
+        """
+        with gzip.open(self._path(digest), "rt", encoding="utf-8") as blob_file:
+            while chunk := blob_file.read(chunk_size):
+                yield chunk
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def remove(self, digests: set[str]) -> int:
+        """
+        Delete the blobs, except for the ones written in the grace period.
+        :param digests: Digests of the blobs to delete
+        :return: Number of deleted blobs
+        """
+        removed = 0
+        with self._lock():
+            written_before = time.time() - self.grace_period
+            for digest in digests:
+                try:
+                    if os.path.getmtime(self._path(digest)) > written_before:
+                        continue
+                except FileNotFoundError:
+                    continue
+                self.delete(digest)
+                removed += 1
+
+        return removed
+
+    def digests(self) -> set[str]:
+        """
+        Get digests of all saved blobs.
+        :return: Saved digests
+        """
+        if not os.path.isdir(self.directory):
+            return set()
+
+        saved = set()
+        for prefix in os.listdir(self.directory):
+            prefix_path = os.path.join(self.directory, prefix)
+            if os.path.isdir(prefix_path):
+                saved.update(prefix + name for name in os.listdir(prefix_path) if not name.startswith("tmp"))
+
+        return saved
+
+    def offload(self, content: str) -> tuple[str, str, int]:
+        """
+        Offload the content to the store if it exceeds the threshold.
+        :param content: Content to offload
+        :return: Inline content (empty if offloaded), blob digest (empty if kept inline), and size of the content
+        """
+        size = len(content.encode())
+        if not self.threshold or size <= self.threshold:
+            return content, "", size
+
+        return "", self.put(content), size
+
+    def remove_unreferenced(self, referenced: set[str]) -> int:
+        """
+        Delete blobs that are no longer referenced (see `remove`).
+        :param referenced: Digests that are still in use
+        :return: Number of deleted blobs
+        """
+        return self.remove(self.digests() - referenced)
+
+
+blob_store = BlobStore(SETTINGS.output_blob_directory, SETTINGS.output_offload_threshold)
+
+
+def release_blobs(digests: set[str]) -> None:
+    """
+    Delete blobs that were referenced by removed (or reset) Step executions and are not used by any other.
+    :param digests: Digests referenced by the removed (or reset) Step executions
+    :return: None
+    """
+    still_referenced = StepExecutionModel.objects.filter(output_blob__in=digests).values_list("output_blob", flat=True)
+    blob_store.remove(digests - set(still_referenced))
+
+
+def remove_unreferenced_blobs() -> int:
+    """
+    Delete blobs that aren't used by any Step execution, e.g. the ones released in their grace period.
+    :return: Number of deleted blobs
+    """
+    referenced = StepExecutionModel.objects.exclude(output_blob="").values_list("output_blob", flat=True).distinct()
+    return blob_store.remove_unreferenced(set(referenced))
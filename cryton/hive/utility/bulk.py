@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.core.exceptions import ObjectDoesNotExist
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.utility import db, exceptions
+from cryton.hive.utility.logger import logger
+
+
+def _run_action(action: Callable[[int], str], object_id: int) -> dict:
+    """
+    Run the action and turn its outcome into a result.
+    :param action: Function running the action for the object, returns a message
+    :param object_id: ID of the object
+    :return: Result of the action
+    """
+    with db.connection_limiter.slot():
+        try:
+            return dict(id=object_id, success=True, detail=action(object_id))
+        except (ObjectDoesNotExist, exceptions.ObjectDoesNotExist):
+            return dict(id=object_id, success=False, detail="Not found.")
+        except (exceptions.InvalidStateError, exceptions.RabbitError) as ex:
+            return dict(id=object_id, success=False, detail=str(ex))
+        except Exception as ex:  # One failure must not prevent the rest from finishing
+            logger.error("bulk action failed", object_id=object_id, error=str(ex))
+            return dict(id=object_id, success=False, detail=f"Unexpected error: {ex}")
+
+
+def run_action(action: Callable[[int], str], object_ids: list[int], parallelism: int | None = None) -> list[dict]:
+    """
+    Run the action for each object concurrently.
+    :param action: Function running the action for an object, returns a message
+    :param object_ids: IDs of the objects
+    :param parallelism: Maximum number of actions running at the same time
+    :return: Results of the actions (in the order of the IDs)
+    """
+    if not object_ids:
+        return []
+
+    parallelism = min(parallelism or SETTINGS.bulk_action_parallelism, len(object_ids))
+    with ThreadPoolExecutor(parallelism) as executor:
+        return list(executor.map(lambda object_id: _run_action(action, object_id), object_ids))
@@ -59,6 +59,16 @@ RESUME_JOB = "resume_job"
 PAUSE_JOB = "pause_job"
 RESCHEDULE_JOB = "reschedule_job"
 
+# Background operation types
+OPERATION_DELETE_RUN = "delete_run"
+OPERATION_DELETE_PLAN = "delete_plan"
+OPERATION_RUN_EXECUTE = "run_execute"
+OPERATION_RUN_STOP = "run_stop"
+OPERATION_RUN_HEALTHCHECK_WORKERS = "run_healthcheck_workers"
+OPERATION_RUN_VALIDATE_MODULES = "run_validate_modules"
+OPERATION_PLAN_EXECUTION_STOP = "plan_execution_stop"
+OPERATION_PLAN_EXECUTION_VALIDATE_MODULES = "plan_execution_validate_modules"
+
 # Datetime formats
 TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 TIME_FORMAT_DETAILED = "%Y-%m-%dT%H:%M:%S.%fZ"
@@ -16,6 +16,7 @@ def create_plan(template: dict) -> int:
         template["name"], template.get("settings", {}), template.get("dynamic", False), template.get("metadata", {})
     )
     create_stages(plan, template.get("stages", {}))
+    Plan(plan.id).generate_plan()  # Store the Plan's YAML
     logger.logger.info("plan created", name=plan.name, id=plan.id)
 
     return plan.id
@@ -0,0 +1,170 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+from multiprocessing import BoundedSemaphore, Value
+from threading import Thread, local
+from typing import Callable
+
+from django.db import connections, close_old_connections
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.utility.logger import logger
+
+
+class ConnectionLimiter:
+    def __init__(self, size: int, timeout: int):
+        """
+        Bound the number of threads that use the database at the same time.
+        The limiter is created on import, so it is shared by all processes forked from the Hive's main process.
+        The limit is advisory: only the execution and stop threads take slots and a thread that reaches the timeout
+        continues without one (the overflows are counted in the statistics).
+        :param size: Maximum number of threads with a database connection
+        :param timeout: How long (in seconds) to wait for a free slot before continuing without one
+        """
+        self.size = size
+        self.timeout = timeout
+        self._semaphore = BoundedSemaphore(size)
+        self._in_use = Value("l", 0)
+        self._peak = Value("l", 0)
+        self._acquired = Value("l", 0)
+        self._overflows = Value("l", 0)
+        self._wait_total = Value("d", 0.0)
+        self._wait_max = Value("d", 0.0)
+        self._held = local()  # Whether the current thread holds a slot
+
+    def _update_stats(self, wait_time: float, acquired: bool) -> None:
+        with self._in_use.get_lock():
+            self._in_use.value += 1
+            self._peak.value = max(self._peak.value, self._in_use.value)
+            self._acquired.value += 1
+            if not acquired:
+                self._overflows.value += 1
+            self._wait_total.value += wait_time
+            self._wait_max.value = max(self._wait_max.value, wait_time)
+
+    def _acquire(self) -> None:
+        start = time.monotonic()
+        acquired = self._semaphore.acquire(timeout=self.timeout)
+        wait_time = time.monotonic() - start
+        self._update_stats(wait_time, acquired)
+        if not acquired:
+            logger.warning("database connection limit exceeded", limit=self.size, wait_time=wait_time)
+        self._held.acquired = acquired
+        self._held.active = True
+
+    def _release(self) -> None:
+        connections.close_all()  # Connections are thread-local, nobody else would close them
+        with self._in_use.get_lock():
+            self._in_use.value -= 1
+        if self._held.acquired:
+            self._semaphore.release()
+        self._held.active = False
+
+    def _holds_slot(self) -> bool:
+        return getattr(self._held, "active", False)
+
+    @contextmanager
+    def slot(self):
+        """
+        Wait for a free slot, and close the thread's database connections once finished.
+        Waiting is bounded by the timeout, so a stuck thread can't block the others forever.
+        A thread that already holds a slot keeps using it.
+        :return: None
+        """
+        if self._holds_slot():
+            yield
+            return
+
+        self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def released(self):
+        """
+        Give the thread's slot (and its connections) back while it waits, e.g. for its child threads, and reacquire it
+        afterward. Only the threads using the database hold the slots, so the waiting parents never block their children.
+        :return: None
+        """
+        if not self._holds_slot():
+            yield
+            return
+
+        self._release()
+        try:
+            yield
+        finally:
+            self._acquire()
+
+    def stats(self) -> dict:
+        """
+        Get usage and wait-time statistics.
+        :return: Statistics
+        """
+        with self._in_use.get_lock():
+            acquired = self._acquired.value
+            return dict(
+                limit=self.size,
+                in_use=self._in_use.value,
+                peak=self._peak.value,
+                acquired=acquired,
+                overflows=self._overflows.value,
+                wait_time_total=round(self._wait_total.value, 3),
+                wait_time_max=round(self._wait_max.value, 3),
+                wait_time_average=round(self._wait_total.value / acquired, 3) if acquired else 0.0,
+            )
+
+
+connection_limiter = ConnectionLimiter(SETTINGS.database.max_connections, SETTINGS.database.connection_wait_timeout)
+
+
+def start_thread(target: Callable, *args, **kwargs) -> Thread:
+    """
+    Run the target in a new thread that counts towards the database connection limit.
+    :param target: Function to run
+    :param args: Positional arguments for the target
+    :param kwargs: Keyword arguments for the target
+    :return: Started thread
+    """
+
+    def run():
+        with connection_limiter.slot():
+            target(*args, **kwargs)
+
+    thread = Thread(target=run)
+    thread.start()
+
+    return thread
+
+
+def run_in_threads(targets: list[Callable]) -> None:
+    """
+    Run each target in a thread that counts towards the database connection limit and wait for them to finish.
+    :param targets: Functions to run
+    :return: None
+    """
+    with connection_limiter.released():
+        threads = [start_thread(target) for target in targets]
+        for thread in threads:
+            thread.join()
+
+
+def managed_connection(function: Callable) -> Callable:
+    """
+    Decorator for long-running threads (e.g. Rabbit consumers) using the database outside the request cycle.
+    Same as Django does for requests, obsolete or broken connections are dropped before and after each call.
+    :param function: Function to decorate
+    :return: Decorated function
+    """
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return wrapper
@@ -0,0 +1,116 @@
+from datetime import datetime
+
+from django.db.models import QuerySet
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.cryton_app.models import (
+    OperationModel,
+    RunModel,
+    PlanModel,
+    PlanExecutionModel,
+    ExecutionVariableModel,
+    StageExecutionModel,
+    StepExecutionModel,
+    CorrelationEventModel,
+)
+from cryton.hive.utility import constants, operations
+from cryton.hive.utility.blob_store import release_blobs
+
+
+def _delete_in_batches(queryset: QuerySet, operation: OperationModel, batch_size: int) -> int:
+    """
+    Delete the rows in batches, without loading them or collecting their relations.
+    Each batch is a separate short statement, so the tables are never locked for long.
+    Related rows must be removed beforehand.
+    :param queryset: Rows to delete
+    :param operation: Operation to report the progress to
+    :param batch_size: Maximum number of rows deleted at once
+    :return: Number of deleted rows
+    """
+    model = queryset.model
+    label = model._meta.label
+    deleted = operation.progress.get(label, 0)
+    ids_queryset = queryset.order_by("id").values_list("id", flat=True)
+    while ids := list(ids_queryset[:batch_size]):
+        batch = model.objects.filter(id__in=ids)
+        blobs = set()
+        if model is StepExecutionModel:
+            blobs = set(batch.exclude(output_blob="").values_list("output_blob", flat=True))
+            # Step executions reference their parents, which can have any ID, the references must not outlive the batch
+            StepExecutionModel.objects.filter(parent_id__in=ids).update(parent=None)
+
+        deleted += batch._raw_delete(batch.db)
+        release_blobs(blobs)
+        operations.update_progress(operation, **{label: deleted})
+
+    return deleted
+
+
+def _delete_run_rows(operation: OperationModel, run_id: int, batch_size: int) -> None:
+    """
+    Delete the Run's executions from the bottom up and then the Run itself.
+    :param operation: Operation to report the progress to
+    :param run_id: ID of the Run
+    :param batch_size: Maximum number of rows deleted at once
+    :return: None
+    """
+    for queryset in [
+        CorrelationEventModel.objects.filter(step_execution__stage_execution__plan_execution__run_id=run_id),
+        StepExecutionModel.objects.filter(stage_execution__plan_execution__run_id=run_id),
+        ExecutionVariableModel.objects.filter(plan_execution__run_id=run_id),
+        StageExecutionModel.objects.filter(plan_execution__run_id=run_id),
+        PlanExecutionModel.objects.filter(run_id=run_id),
+        RunModel.objects.filter(id=run_id),
+    ]:
+        _delete_in_batches(queryset, operation, batch_size)
+
+
+def delete_run(operation: OperationModel, run_id: int) -> None:
+    """
+    Delete the Run and all of its executions in batches.
+    :param operation: Operation to report the progress to
+    :param run_id: ID of the Run
+    :return: None
+    """
+    _delete_run_rows(operation, run_id, SETTINGS.deletion_batch_size)
+
+
+def delete_plan(operation: OperationModel, plan_id: int) -> None:
+    """
+    Delete the Plan's Runs in batches and then the Plan itself.
+    :param operation: Operation to report the progress to
+    :param plan_id: ID of the Plan
+    :return: None
+    """
+    for run_id in RunModel.objects.filter(plan_id=plan_id).values_list("id", flat=True):
+        _delete_run_rows(operation, run_id, SETTINGS.deletion_batch_size)
+
+    PlanModel.objects.filter(id=plan_id).delete()
+
+
+HANDLERS = {
+    constants.OPERATION_DELETE_RUN: delete_run,
+    constants.OPERATION_DELETE_PLAN: delete_plan,
+}
+
+
+def start_deletion(operation_type: str, object_id: int) -> OperationModel:
+    """
+    Delete the object in the background. If it is already being deleted, the existing operation is returned.
+    :param operation_type: Type of the deletion
+    :param object_id: ID of the object to delete
+    :return: Deletion operation
+    """
+    if (operation := operations.get_unfinished(operation_type, object_id)) is not None:
+        return operation
+
+    return operations.start(operation_type, object_id, HANDLERS[operation_type])
+
+
+def resume_deletions(started_at: datetime) -> list[int]:
+    """
+    Restart deletions interrupted by the Hive's shutdown.
+    :param started_at: When the Hive started, deletions created later are already running
+    :return: IDs of the resumed operations
+    """
+    return operations.resume(HANDLERS, started_at)
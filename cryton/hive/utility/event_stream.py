@@ -0,0 +1,263 @@
+import asyncio
+import json
+import os
+import time
+from multiprocessing.util import Finalize
+from queue import Queue, Full, Empty
+from threading import Thread, Lock
+
+import amqpstorm
+from django.utils import timezone
+
+from cryton.hive.config.settings import SETTINGS
+from cryton.hive.utility import logger
+
+RECONNECT_DELAY = 5
+FLUSH_TIMEOUT = 5  # Seconds to wait for the queued events when the process exits
+OUTPUT_CHUNK_SIZE = 65536
+
+RUN = "run"
+PLAN_EXECUTION = "plan_execution"
+STAGE_EXECUTION = "stage_execution"
+STEP_EXECUTION = "step_execution"
+STEP_EXECUTION_OUTPUT = "step_execution_output"
+OPERATION = "operation"
+EVENT_TYPES = [RUN, PLAN_EXECUTION, STAGE_EXECUTION, STEP_EXECUTION, STEP_EXECUTION_OUTPUT, OPERATION]
+
+
+def _connect() -> tuple[amqpstorm.Connection, amqpstorm.Channel]:
+    connection = amqpstorm.Connection(
+        SETTINGS.rabbit.host, SETTINGS.rabbit.username, SETTINGS.rabbit.password, SETTINGS.rabbit.port
+    )
+    channel = connection.channel()
+    channel.exchange.declare(SETTINGS.rabbit.events_exchange, "topic")
+
+    return connection, channel
+
+
+class EventPublisher:
+    def __init__(self, max_size: int = 10000):
+        """
+        Publish execution events to the RabbitMQ exchange from a background thread, so the caller is never blocked.
+        If RabbitMQ isn't available, the events are dropped.
+        :param max_size: Maximum number of events waiting to be published
+        """
+        self._max_size = max_size
+        self._lock = Lock()
+        self._pid: int | None = None
+        self._queue: Queue | None = None
+
+    def _ensure_started(self) -> None:
+        """
+        Start the publishing thread. Threads don't survive a fork, each process needs its own.
+        :return: None
+        """
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = Queue(self._max_size)
+                Thread(target=self._publish_forever, args=(self._queue,), daemon=True).start()
+                self._pid = os.getpid()
+                # Run on the process' exit, including the multiprocessing children, which skip the atexit handlers
+                Finalize(None, self.flush, exitpriority=10)
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> bool:
+        """
+        Wait until the queued events are published (or dropped, if RabbitMQ isn't available).
+        :param timeout: Maximum time to wait in seconds
+        :return: True if all events were processed in time
+        """
+        if self._pid != os.getpid():
+            return True
+
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                if (remaining := deadline - time.monotonic()) <= 0:
+                    logger.logger.debug("execution events not flushed", pending=self._queue.unfinished_tasks)
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+
+        return True
+
+    def publish(self, routing_key: str, event: dict) -> None:
+        """
+        Queue the event for publishing.
+        :param routing_key: Routing key of the event
+        :param event: Event content
+        :return: None
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((routing_key, json.dumps(event, default=str)))
+        except Full:
+            logger.logger.debug("execution event dropped", routing_key=routing_key)
+
+    @staticmethod
+    def _publish_forever(queue: Queue) -> None:
+        connection: amqpstorm.Connection | None = None
+        channel: amqpstorm.Channel | None = None
+        while True:
+            routing_key, body = queue.get()
+            try:
+                if connection is None or connection.is_closed:
+                    connection, channel = _connect()
+                message = amqpstorm.Message.create(channel, body, {"content_type": "application/json"})
+                message.publish(routing_key, SETTINGS.rabbit.events_exchange)
+            except amqpstorm.AMQPError as ex:
+                logger.logger.debug("unable to publish execution events", error=str(ex))
+                connection = None
+                while True:  # Nobody would receive the events anyway
+                    try:
+                        queue.get_nowait()
+                    except Empty:
+                        break
+                    queue.task_done()
+                queue.task_done()
+                time.sleep(RECONNECT_DELAY)
+            else:
+                queue.task_done()
+
+
+class Subscription:
+    def __init__(self, run_ids: set[int] | None, event_types: set[str], max_size: int = 1000):
+        """
+        Receiver of the events matching the filters. Must be created inside the running event loop.
+        :param run_ids: Receive only events of these Runs (None for all)
+        :param event_types: Receive only events of these types
+        :param max_size: Maximum number of events waiting to be sent, the rest is dropped
+        """
+        self.run_ids = run_ids
+        self.event_types = event_types
+        self.queue: asyncio.Queue = asyncio.Queue(max_size)
+        self.dropped = 0
+        self._loop = asyncio.get_running_loop()
+
+    def matches(self, event: dict) -> bool:
+        return event.get("type") in self.event_types and (self.run_ids is None or event.get("run_id") in self.run_ids)
+
+    def put(self, event: dict) -> None:
+        """
+        Pass the event to the subscription's event loop (thread-safe).
+        :param event: Received event
+        :return: None
+        """
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:  # Slow clients must not block the others
+            self.dropped += 1
+
+
+class EventHub:
+    def __init__(self):
+        """
+        Consume the execution events (using a single RabbitMQ queue per process) and pass them to the subscriptions.
+        """
+        self._subscriptions: set[Subscription] = set()
+        self._lock = Lock()
+        self._pid: int | None = None
+
+    def subscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if self._pid != os.getpid():
+                Thread(target=self._consume_forever, daemon=True).start()
+                self._pid = os.getpid()
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def dispatch(self, event: dict) -> None:
+        """
+        Pass the event to the matching subscriptions. Subscriptions with a closed event loop are removed.
+        :param event: Received event
+        :return: None
+        """
+        with self._lock:
+            subscriptions = [subscription for subscription in self._subscriptions if subscription.matches(event)]
+        for subscription in subscriptions:
+            try:
+                subscription.put(event)
+            except RuntimeError:  # The subscription's event loop is closed
+                logger.logger.debug("removing closed execution event subscription")
+                self.unsubscribe(subscription)
+
+    def _on_message(self, message: amqpstorm.Message) -> None:
+        try:
+            self.dispatch(message.json())
+        except ValueError:
+            logger.logger.warning("received invalid execution event", body=message.body)
+
+    def _consume_forever(self) -> None:
+        while True:
+            try:
+                connection, channel = _connect()
+                queue = channel.queue.declare(exclusive=True, auto_delete=True)["queue"]
+                channel.queue.bind(queue, SETTINGS.rabbit.events_exchange, "#")
+                channel.basic.consume(self._on_message, queue, no_ack=True)
+                channel.start_consuming()
+            except amqpstorm.AMQPError as ex:
+                logger.logger.warning("unable to consume execution events", error=str(ex))
+            time.sleep(RECONNECT_DELAY)
+
+
+publisher = EventPublisher()
+hub = EventHub()
+
+
+def get_routing_key(run_id: int | None, event_type: str) -> str:
+    if run_id is None:
+        return event_type
+    return f"run.{run_id}.{event_type}"
+
+
+def publish_state(event_type: str, object_id: int, run_id: int | None, state_from: str, state_to: str) -> None:
+    """
+    Publish the state transition.
+    :param event_type: Type of the execution (or operation)
+    :param object_id: ID of the execution
+    :param run_id: ID of the Run the execution belongs to (None if it doesn't belong to any)
+    :param state_from: Previous state
+    :param state_to: Current state
+    :return: None
+    """
+    event = dict(
+        type=event_type,
+        id=object_id,
+        run_id=run_id,
+        state_from=state_from,
+        state=state_to,
+        timestamp=timezone.now(),
+    )
+    publisher.publish(get_routing_key(run_id, event_type), event)
+
+
+def publish_output(step_execution_id: int, run_id: int, output: str, append: bool = False) -> None:
+    """
+    Publish the Step execution output split into chunks.
+    :param step_execution_id: ID of the Step execution
+    :param run_id: ID of the Run the execution belongs to
+    :param output: Raw output (or its appended part)
+    :param append: Whether the output was appended to the previous one, otherwise it replaces it
+    :return: None
+    """
+    chunks = [output[i : i + OUTPUT_CHUNK_SIZE] for i in range(0, len(output), OUTPUT_CHUNK_SIZE)]
+    routing_key = get_routing_key(run_id, STEP_EXECUTION_OUTPUT)
+    for index, chunk in enumerate(chunks):
+        event = dict(
+            type=STEP_EXECUTION_OUTPUT,
+            id=step_execution_id,
+            run_id=run_id,
+            chunk=index,
+            chunks=len(chunks),
+            output=chunk,
+            append=append,
+            timestamp=timezone.now(),
+        )
+        publisher.publish(routing_key, event)
@@ -334,6 +334,14 @@ class RunCreationFailedError(CreationFailedError):
         super().__init__(self.message)
 
 
+class ArchiveError(Error):
+    """Exception raised if a Run cannot be archived or restored."""
+
+    def __init__(self, message: Exception | str, run_id: int = None):
+        self.message = {"message": message, "run_id": run_id}
+        super().__init__(self.message)
+
+
 class RabbitError(Error):
     """Exception raised when there is some problem with RabbitMQ"""
 
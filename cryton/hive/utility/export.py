@@ -0,0 +1,223 @@
+import json
+import zlib
+from typing import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from cryton.hive.cryton_app.models import RunModel, PlanExecutionModel, StageExecutionModel, StepExecutionModel
+from cryton.hive.utility.blob_store import blob_store
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 64 * 1024
+ITERATOR_CHUNK_SIZE = 100
+
+# Compression: (content type, file extension)
+COMPRESSIONS = {
+    "none": ("application/x-ndjson", ".ndjson"),
+    "gzip": ("application/gzip", ".ndjson.gz"),
+    "zstd": ("application/zstd", ".ndjson.zst"),
+}
+
+RUN = "run"
+PLAN_EXECUTION = "plan_execution"
+STAGE_EXECUTION = "stage_execution"
+STEP_EXECUTION = "step_execution"
+
+
+def validate_compression(compression: str) -> None:
+    """
+    Check the compression is known and can be used.
+    :param compression: Compression of the export
+    :return: None
+    :raises ValueError: If the compression can't be used
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression `{compression}`, use one of: {', '.join(COMPRESSIONS)}.")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("The `zstd` compression requires the `zstandard` package.")
+
+
+def _dump(record: dict) -> str:
+    return json.dumps(record, cls=DjangoJSONEncoder)
+
+
+def _line(record: dict) -> str:
+    return f"{_dump(record)}\n"
+
+
+def _step_execution_lines(model: StepExecutionModel, include_output: bool) -> Iterator[str]:
+    """
+    Encode the Step execution. The output is encoded in chunks, so even the large ones aren't held in memory.
+    :param model: Step execution model
+    :param include_output: Whether to include the raw output
+    :return: Parts of the record line
+    """
+    record = dict(
+        type=STEP_EXECUTION,
+        id=model.id,
+        stage_execution_id=model.stage_execution_id,
+        name=model.step.name,
+        metadata=model.step.metadata,
+        state=model.state,
+        start_time=model.start_time,
+        finish_time=model.finish_time,
+        serialized_output=model.serialized_output,
+        output_size=model.output_size,
+        valid=model.valid,
+    )
+    if not include_output:
+        yield _line(record | {"output": None})
+        return
+
+    yield f'{_dump(record)[:-1]}, "output": "'
+    if model.output_blob:
+        chunks = blob_store.iter_chunks(model.output_blob, CHUNK_SIZE)
+    else:
+        chunks = (model.output[i : i + CHUNK_SIZE] for i in range(0, len(model.output), CHUNK_SIZE))
+    for chunk in chunks:
+        yield json.dumps(chunk)[1:-1]
+    yield '"}\n'
+
+
+def iter_lines(run_id: int, include_output: bool = True) -> Iterator[str]:
+    """
+    Encode the Run and its executions as JSON lines (a record for each execution, parents before their children).
+    Executions are loaded in batches, the memory use doesn't grow with the size of the Run.
+    :param run_id: ID of the Run
+    :param include_output: Whether to include the raw output of Step executions
+    :return: Parts of the record lines
+    """
+    run_model = RunModel.objects.select_related("plan").get(id=run_id)
+    yield _line(
+        dict(
+            type=RUN,
+            id=run_model.id,
+            plan_id=run_model.plan_id,
+            plan_name=run_model.plan.name,
+            state=run_model.state,
+            schedule_time=run_model.schedule_time,
+            start_time=run_model.start_time,
+            finish_time=run_model.finish_time,
+            pause_time=run_model.pause_time,
+        )
+    )
+
+    plan_executions = PlanExecutionModel.objects.filter(run_id=run_id).select_related("plan", "worker").order_by("id")
+    for plan_execution in plan_executions.iterator(ITERATOR_CHUNK_SIZE):
+        yield _line(
+            dict(
+                type=PLAN_EXECUTION,
+                id=plan_execution.id,
+                run_id=run_id,
+                plan_name=plan_execution.plan.name,
+                metadata=plan_execution.plan.metadata,
+                state=plan_execution.state,
+                schedule_time=plan_execution.schedule_time,
+                start_time=plan_execution.start_time,
+                finish_time=plan_execution.finish_time,
+                pause_time=plan_execution.pause_time,
+                worker_id=plan_execution.worker_id,
+                worker_name=plan_execution.worker.name,
+                evidence_directory=plan_execution.evidence_directory,
+            )
+        )
+
+        stage_executions = (
+            StageExecutionModel.objects.filter(plan_execution_id=plan_execution.id)
+            .select_related("stage")
+            .order_by("id")
+        )
+        for stage_execution in stage_executions.iterator(ITERATOR_CHUNK_SIZE):
+            yield _line(
+                dict(
+                    type=STAGE_EXECUTION,
+                    id=stage_execution.id,
+                    plan_execution_id=plan_execution.id,
+                    name=stage_execution.stage.name,
+                    metadata=stage_execution.stage.metadata,
+                    state=stage_execution.state,
+                    schedule_time=stage_execution.schedule_time,
+                    start_time=stage_execution.start_time,
+                    finish_time=stage_execution.finish_time,
+                    pause_time=stage_execution.pause_time,
+                )
+            )
+
+            step_executions = (
+                StepExecutionModel.objects.filter(stage_execution_id=stage_execution.id)
+                .select_related("step")
+                .order_by("id")
+            )
+            if not include_output:
+                step_executions = step_executions.defer("output")
+            for step_execution in step_executions.iterator(ITERATOR_CHUNK_SIZE):
+                yield from _step_execution_lines(step_execution, include_output)
+
+
+def _buffer(parts: Iterator[str]) -> Iterator[bytes]:
+    """
+    Join the small parts into bigger chunks to lower the overhead of sending them.
+    :param parts: Parts to join
+    :return: Chunks of about CHUNK_SIZE
+    """
+    buffer, size = [], 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def _compress(chunks: Iterator[bytes], compression: str) -> Iterator[bytes]:
+    """
+    Compress the chunks incrementally.
+    :param chunks: Chunks to compress
+    :param compression: Compression to use
+    :return: Compressed chunks
+    """
+    if compression == "none":
+        yield from chunks
+        return
+
+    if compression == "gzip":
+        compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    else:
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def export_run(run_id: int, compression: str = "none", include_output: bool = True) -> Iterator[bytes]:
+    """
+    Export the Run as JSON lines, optionally compressed.
+    :param run_id: ID of the Run
+    :param compression: Compression of the export (one of COMPRESSIONS)
+    :param include_output: Whether to include the raw output of Step executions
+    :return: Chunks of the export
+    """
+    validate_compression(compression)
+    return _compress(_buffer(iter_lines(run_id, include_output)), compression)
+
+
+async def iterate_async(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Consume the (database accessing) iterator in a thread one chunk at a time.
+    Django would otherwise load the whole synchronous iterator into memory when serving it over ASGI.
+    :param iterator: Iterator to consume
+    :return: Chunks from the iterator
+    """
+    get_next = sync_to_async(next)
+    while (chunk := await get_next(iterator, None)) is not None:
+        yield chunk
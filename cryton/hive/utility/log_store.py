@@ -0,0 +1,248 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from queue import Queue, Full, Empty
+from threading import Thread, Lock
+
+BATCH_SIZE = 500
+PRUNE_INTERVAL = 3600
+BUSY_TIMEOUT = 30
+
+# Keys extracted into columns (exact match on the indexed ones), the rest is read from the JSON data
+EXACT_COLUMNS = ["level", "logger"]
+COLUMNS = ["timestamp", "event", *EXACT_COLUMNS]
+KEY_PATTERN = re.compile(r"^\w+$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    level TEXT NOT NULL,
+    logger TEXT NOT NULL,
+    event TEXT NOT NULL,
+    process INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_timestamp ON logs (timestamp);
+CREATE INDEX IF NOT EXISTS logs_level ON logs (level);
+CREATE INDEX IF NOT EXISTS logs_logger ON logs (logger);
+CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5 (data, content='logs', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+    INSERT INTO logs_fts (rowid, data) VALUES (new.id, new.data);
+END;
+CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+    INSERT INTO logs_fts (logs_fts, rowid, data) VALUES ('delete', old.id, old.data);
+END;
+"""
+
+
+def connect(database: str) -> sqlite3.Connection:
+    """
+    Open the log store. The store is shared by all Hive processes, concurrent writers wait for each other.
+    :param database: Path to the SQLite database
+    :return: Connection
+    """
+    connection = sqlite3.connect(database, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writers
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+
+    return connection
+
+
+class LogStoreHandler(logging.Handler):
+    def __init__(self, database: str, retention: int, max_size: int = 100000):
+        """
+        Save the (JSON formatted) log records into the log store from a background thread, so logging never blocks.
+        :param database: Path to the SQLite database
+        :param retention: How long (in days) to keep the logs, 0 to keep them forever
+        :param max_size: Maximum number of records waiting to be saved, the rest is dropped
+        """
+        super().__init__(logging.DEBUG)
+        self.database = database
+        self.retention = retention
+        self.dropped = 0
+        self._max_size = max_size
+        self._start_lock = Lock()
+        self._pid: int | None = None
+        self._queue: Queue | None = None
+
+    def _ensure_started(self) -> None:
+        """
+        Start the writing thread. Threads don't survive a fork, each process needs its own.
+        :return: None
+        """
+        if self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._queue = Queue(self._max_size)
+                Thread(target=self._write_forever, args=(self._queue,), daemon=True).start()
+                self._pid = os.getpid()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = self.format(record)
+            parsed = json.loads(data)
+            row = (
+                str(parsed.get("timestamp", datetime.now(timezone.utc).isoformat())),
+                str(parsed.get("level", record.levelname.lower())),
+                str(parsed.get("logger", record.name)),
+                str(parsed.get("event", "")),
+                os.getpid(),
+                data,
+            )
+        except Exception:
+            self.handleError(record)
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except Full:
+            self.dropped += 1
+
+    @staticmethod
+    def _drain(queue: Queue, rows: list[tuple]) -> list[tuple]:
+        while len(rows) < BATCH_SIZE:
+            try:
+                rows.append(queue.get_nowait())
+            except Empty:
+                break
+
+        return rows
+
+    def _insert(self, connection: sqlite3.Connection, rows: list[tuple]) -> None:
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO logs (timestamp, level, logger, event, process, data) VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error:  # Logging the error would only add more records
+            self.dropped += len(rows)
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        if self.retention == 0:
+            return
+
+        oldest = (datetime.now(timezone.utc) - timedelta(days=self.retention)).strftime("%Y-%m-%dT%H:%M:%S")
+        try:
+            with connection:
+                connection.execute("DELETE FROM logs WHERE timestamp < ?", (oldest,))
+        except sqlite3.Error:
+            pass
+
+    def _write_forever(self, queue: Queue) -> None:
+        connection = connect(self.database)
+        pruned_at = 0.0
+        while True:
+            rows = self._drain(queue, [queue.get()])  # Batches form on their own under load
+            self._insert(connection, rows)
+            if time.monotonic() - pruned_at > PRUNE_INTERVAL:
+                self._prune(connection)
+                pruned_at = time.monotonic()
+
+    def flush(self) -> None:
+        """
+        Save the waiting records from the calling thread (called on exit by the logging module).
+        :return: None
+        """
+        if self._queue is None or self._pid != os.getpid() or self._queue.empty():
+            return
+
+        try:
+            connection = connect(self.database)
+        except sqlite3.Error:
+            return
+
+        while rows := self._drain(self._queue, []):
+            self._insert(connection, rows)
+        connection.close()
+
+
+def _build_query(
+    filters: dict[str, str], since: str | None, until: str | None, after: int | None, search: str | None
+) -> tuple[str, list]:
+    """
+    Build the WHERE clause, so the filtering is done by the database (using the indexes where possible).
+    :param filters: Substrings the log keys must contain
+    :param since: Only logs with the same or newer timestamp
+    :param until: Only logs with an older timestamp
+    :param after: Only logs with a greater ID
+    :param search: Full-text search query
+    :return: WHERE clause and its parameters
+    """
+    conditions, parameters = [], []
+    for key, value in filters.items():
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid filter key: {key}.")
+        if key in EXACT_COLUMNS:
+            conditions.append(f"{key} = ?")
+        elif key in COLUMNS:
+            conditions.append(f"instr({key}, ?) > 0")
+        else:
+            conditions.append(f"instr(json_extract(data, '$.{key}'), ?) > 0")
+        parameters.append(value)
+
+    if since is not None:
+        conditions.append("timestamp >= ?")
+        parameters.append(since)
+    if until is not None:
+        conditions.append("timestamp < ?")
+        parameters.append(until)
+    if after is not None:
+        conditions.append("id > ?")
+        parameters.append(after)
+    if search:
+        conditions.append("id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)")
+        parameters.append(search)
+
+    return f"WHERE {' AND '.join(conditions)}" if conditions else "", parameters
+
+
+def get_logs(
+    database: str,
+    offset: int = 0,
+    limit: int = 0,
+    filters: dict[str, str] | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    after: int | None = None,
+    tail: int = 0,
+    search: str | None = None,
+) -> tuple[list[dict], int | None]:
+    """
+    Get logs from the log store.
+    :param database: Path to the SQLite database
+    :param offset: Number of matching logs to skip
+    :param limit: Maximum number of logs to return (0 for all)
+    :param filters: Substrings the log keys must contain
+    :param since: Only logs with the same or newer timestamp (ISO format)
+    :param until: Only logs with an older timestamp (ISO format)
+    :param after: Only logs with a greater ID (used for following the logs)
+    :param tail: Return only the last N matching logs
+    :param search: Full-text search query
+    :return: Logs and the ID of the last returned log
+    """
+    where, parameters = _build_query(filters or {}, since, until, after, search)
+    if tail:
+        query = f"SELECT * FROM (SELECT id, data FROM logs {where} ORDER BY id DESC LIMIT ?) ORDER BY id"
+        parameters.append(tail)
+    else:
+        query = f"SELECT id, data FROM logs {where} ORDER BY id LIMIT ? OFFSET ?"
+        parameters.extend([limit or -1, offset])
+
+    connection = connect(database)
+    try:
+        rows = connection.execute(query, parameters).fetchall()
+    except sqlite3.OperationalError as ex:  # Invalid full-text query
+        raise ValueError(str(ex))
+    finally:
+        connection.close()
+
+    return [json.loads(data) for _, data in rows], rows[-1][0] if rows else after
@@ -1,6 +1,8 @@
 from cryton.lib.config.logger import LoggerWrapper
 from cryton.hive.config.settings import SETTINGS
+from cryton.hive.utility.log_store import LogStoreHandler
 
 
 logger_wrapper = LoggerWrapper("cryton-hive", SETTINGS.debug)
+logger_wrapper.add_handler(LogStoreHandler(SETTINGS.log_store_file, SETTINGS.log_store_retention))
 logger = logger_wrapper.logger
@@ -0,0 +1,123 @@
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Callable
+
+from django.utils import timezone
+
+from cryton.hive.cryton_app.models import OperationModel
+from cryton.hive.utility import db, event_stream, logger, states
+
+
+def get_unfinished(operation_type: str, object_id: int) -> OperationModel | None:
+    """
+    Get an operation of the same type that is already working on the object.
+    :param operation_type: Type of the operation
+    :param object_id: ID of the object the operation works on
+    :return: Unfinished operation or None
+    """
+    return (
+        OperationModel.objects.filter(type=operation_type, object_id=object_id)
+        .exclude(state__in=states.OPERATION_FINAL_STATES)
+        .first()
+    )
+
+
+def update_progress(operation: OperationModel, **progress: int) -> None:
+    """
+    Save the operation's progress.
+    :param operation: Operation to update
+    :param progress: Progress values to update
+    :return: None
+    """
+    operation.progress.update(progress)
+    operation.save(update_fields=["progress", "updated_at"])
+
+
+def _set_state(operation: OperationModel, state: str, update_fields: list[str]) -> None:
+    state_from, operation.state = operation.state, state
+    operation.save(update_fields=["state", "updated_at", *update_fields])
+    event_stream.publish_state(event_stream.OPERATION, operation.id, None, state_from, state)
+
+
+def _finish(operation: OperationModel, state: str, result: str = "", error: str = "") -> None:
+    operation.result = result
+    operation.error = error
+    operation.finish_time = timezone.now()
+    _set_state(operation, state, ["result", "error", "finish_time"])
+
+
+def _run(operation: OperationModel, target: Callable) -> None:
+    """
+    Run the operation and save its result.
+    :param operation: Operation to run
+    :param target: Function doing the work, it receives the operation and the object ID and can return a result message
+    :return: None
+    """
+    operation_logger = logger.logger.bind(operation_id=operation.id, type=operation.type, object_id=operation.object_id)
+    operation_logger.debug("operation started")
+    _set_state(operation, states.RUNNING, [])
+    try:
+        result = target(operation, operation.object_id)
+    except Exception as ex:
+        operation_logger.error("operation failed", error=str(ex))
+        _finish(operation, states.ERROR, error=str(ex))
+    else:
+        operation_logger.info("operation finished")
+        _finish(operation, states.FINISHED, result=result or "")
+
+
+def _run_in_slot(operation: OperationModel, target: Callable) -> None:
+    with db.connection_limiter.slot():
+        _run(operation, target)
+
+
+def start(operation_type: str, object_id: int, target: Callable, executor: Executor | None = None) -> OperationModel:
+    """
+    Create an operation and run it in the background.
+    :param operation_type: Type of the operation
+    :param object_id: ID of the object the operation works on
+    :param target: Function doing the work, it receives the operation and the object ID
+    :param executor: Executor to run the operation in, a new thread is started by default
+    :return: Created operation
+    """
+    operation = OperationModel.objects.create(type=operation_type, object_id=object_id)
+    if executor is None:
+        db.start_thread(_run, operation, target)
+    else:
+        executor.submit(_run_in_slot, operation, target)
+
+    return operation
+
+
+def resume(handlers: dict[str, Callable], created_before: datetime) -> list[int]:
+    """
+    Restart operations interrupted by the Hive's shutdown.
+    :param handlers: Functions doing the work, keyed by the operation type
+    :param created_before: Only operations created before this time are resumed
+    :return: IDs of the resumed operations
+    """
+    resumed = []
+    interrupted = OperationModel.objects.filter(type__in=handlers.keys(), created_at__lt=created_before).exclude(
+        state__in=states.OPERATION_FINAL_STATES
+    )
+    for operation in interrupted:
+        db.start_thread(_run, operation, handlers[operation.type])
+        resumed.append(operation.id)
+
+    return resumed
+
+
+def abort_interrupted(operation_types: list[str], created_before: datetime) -> list[int]:
+    """
+    Mark operations interrupted by the Hive's shutdown as failed. Used for operations that can't be safely repeated.
+    :param operation_types: Types of the operations
+    :param created_before: Only operations created before this time are aborted
+    :return: IDs of the aborted operations
+    """
+    interrupted = OperationModel.objects.filter(type__in=operation_types, created_at__lt=created_before).exclude(
+        state__in=states.OPERATION_FINAL_STATES
+    )
+    aborted = list(interrupted.values_list("id", flat=True))
+    interrupted.update(state=states.ERROR, error="Interrupted by the Hive's shutdown.", finish_time=timezone.now())
+
+    return aborted
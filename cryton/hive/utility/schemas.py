@@ -1,6 +1,8 @@
 from importlib import import_module
 
-from cryton.lib.utility.schemas import inject_schema
+from jsonschema.protocols import Validator
+
+from cryton.lib.utility.schemas import inject_schema, get_validator
 
 
 def import_module_schema(name: str):
@@ -332,3 +334,19 @@ PLAN = {
     "required": ["name", "stages"],
     "additionalProperties": False,
 }
+
+
+def _definition_schema(name: str) -> dict:
+    return {"$schema": PLAN["$schema"], "$ref": f"#/definitions/{name}", "definitions": PLAN["definitions"]}
+
+
+def get_plan_validator() -> Validator:
+    return get_validator("plan", lambda: PLAN)
+
+
+def get_stage_validator() -> Validator:
+    return get_validator("stage", lambda: _definition_schema("stage"))
+
+
+def get_step_validator() -> Validator:
+    return get_validator("step", lambda: _definition_schema("step"))
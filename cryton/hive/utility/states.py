@@ -27,6 +27,10 @@ WORKER_STATES = [UP, DOWN]
 
 WORKER_TRANSITIONS = [(UP, DOWN), (DOWN, UP)]
 
+# Operation related
+OPERATION_STATES = [PENDING, RUNNING, FINISHED, ERROR]
+OPERATION_FINAL_STATES = [FINISHED, ERROR]
+
 # Run related
 RUN_STATES = [PENDING, SCHEDULED, RUNNING, FINISHED, PAUSED, PAUSING, STOPPING, STOPPED]
 
@@ -1,14 +1,12 @@
-from threading import Thread
 from functools import reduce
 from datetime import datetime, timedelta
 import pytz
 import amqpstorm
 import re
-import json
 
 from cryton.hive.config.settings import SETTINGS
-from cryton.hive.utility import exceptions
-from cryton.hive.utility.logger import logger, logger_wrapper
+from cryton.hive.utility import db, exceptions
+from cryton.hive.utility.logger import logger
 
 from django.utils import timezone
 
@@ -87,17 +85,14 @@ def run_executions_in_threads(step_executions: list) -> None:
     with amqpstorm.Connection(**connection_parameters) as connection:
         # Split executions into threads
         thread_lists = split_into_lists(step_executions, SETTINGS.threads_per_process)
-        threads = []
-        for thread_step_executions in thread_lists:
-            new_thread = Thread(target=run_step_executions, args=(connection, thread_step_executions))
-            threads.append(new_thread)
+        with db.connection_limiter.released():
+            threads = []
+            for thread_step_executions in thread_lists:
+                threads.append(db.start_thread(run_step_executions, connection, thread_step_executions))
 
-        for thread in threads:
-            thread.start()
-
-        # Wait for threads to finish
-        for thread in threads:
-            thread.join()
+            # Wait for threads to finish
+            for thread in threads:
+                thread.join()
 
 
 def run_step_executions(rabbit_connection: amqpstorm.Connection, step_execution_list: list) -> None:
@@ -318,33 +313,3 @@ def rename_key(in_dict, rename_from, rename_to):
     """
     new_val = pop_key(in_dict, rename_from.split("."))
     add_key(in_dict, rename_to, new_val)
-
-
-def get_logs(offset: int, limit: int, filter_params: dict[str, str]) -> list[dict[str, str]]:
-    """
-    Get and parse logs from log file.
-    :param offset: On what line to start reading logs
-    :param limit: Maximum number of logs to return
-    :param filter_params: Substrings used for filtering the logs
-    :return: Parsed Logs
-    """
-    logs = []
-    with open(logger_wrapper.log_file, "r") as log_file:
-        raw_logs = log_file.readlines()
-
-    number_of_logs = len(raw_logs)
-
-    if limit == 0:
-        limit = number_of_logs
-
-    for i in range(offset, number_of_logs):
-        parsed_log = json.loads(raw_logs[i])
-        if not all(value in parsed_log.get(key, "") for key, value in filter_params.items()):
-            continue
-
-        logs.append(parsed_log)
-
-        if len(logs) == limit:
-            break
-
-    return logs
@@ -1,8 +1,27 @@
-from jsonschema import validate
+import re
 
-from cryton.hive.utility.schemas import PLAN
+from cryton.lib.utility.schemas import validate
+from cryton.hive.cryton_app.models import StageModel, StepModel, SuccessorModel
+from cryton.hive.utility.schemas import get_plan_validator, get_stage_validator, get_step_validator, NAME_PATTERN
+from cryton.hive.utility.util import get_dynamic_variables
 from cryton.hive.utility.exceptions import StageCycleDetected, StageValidationError, ValidationError
 
+PARENT_PREFIX = "parent"
+_NAME_REGEX = re.compile(NAME_PATTERN)
+
+
+def get_agent_name(step: dict) -> str | None:
+    """
+    Get the name of the agent deployed by the Step. Other Steps only refer to the agent by its name.
+    :param step: Step definition
+    :return: Name of the deployed agent (None if the Step doesn't deploy any)
+    """
+    arguments = step.get("arguments", {})
+    if step.get("module") == "empire" and arguments.get("action") == "deploy":
+        return arguments.get("agent_name")
+
+    return None
+
 
 class Validator:
     def __init__(self, scenario: dict):
@@ -11,20 +30,28 @@ class Validator:
     def validate(self):
         try:
             self._validate_schema()
-            self._validate(self._scenario)
+            self.validate_structure()
         except Exception as ex:
             raise ValidationError(ex)
 
+    def validate_structure(self) -> None:
+        """
+        Check the names, graphs, and references in the scenario, without its schema (e.g. if it was checked already).
+        :return: None
+        :raises Exception: If the scenario is invalid (unlike `validate`, the errors aren't wrapped in ValidationError)
+        """
+        self._validate(self._scenario)
+
     def _validate_schema(self):
-        validate(self._scenario, PLAN)
+        validate(self._scenario, get_plan_validator())
 
     def _validate(self, scenario: dict):
-        # TODO: validate usage of steps/stages in output sharing eg. they exist
-        stages: dict[str, dict] = dict()
+        stages: set[str] = set()
         stage_dependencies: list[str] = list()
-        steps: dict[str, dict] = dict()
-        agent_names: list[str] = list()
-        used_names: list[str] = ["parent"]
+        agent_names: set[str] = set()
+        aliases: set[str] = set()
+        used_names: set[str] = {PARENT_PREFIX}
+        references: list[tuple[str, bool, dict]] = list()
         is_dynamic = scenario.get("dynamic", False)
 
         # Allow zero stages only if the plan is dynamic
@@ -35,7 +62,7 @@ class Validator:
             stage_name: str
             stage: dict
 
-            steps_graph = dict()
+            steps_graph: dict[str, set[str]] = dict()
             init_steps_in_stage = set()
             steps_in_stage = set()
             successors_in_stage = set()
@@ -52,16 +79,16 @@ class Validator:
             if not is_dynamic and len(stage["steps"]) == 0:
                 raise ValueError("Stage must have at least one step.")
 
-            used_names.append(stage_name)
-            stages[stage_name] = stage
+            used_names.add(stage_name)
+            stages.add(stage_name)
 
-            # TODO: if the step is initial (is_init) there can't be parent prefix, add check to validation
             for step_name, step in stage["steps"].items():
                 step_name: str
                 step: dict
 
                 # Get needed information for reachability check
-                if step.get("is_init"):
+                is_init = step.get("is_init", False)
+                if is_init:
                     init_steps_in_stage.add(step_name)
                 succ_set = set()
                 for succ_obj in step.get("next", []):
@@ -69,7 +96,7 @@ class Validator:
                     if not isinstance(step_successors, list):
                         step_successors = [step_successors]
                     succ_set.update(step_successors)
-                    steps_graph.update({step_name: succ_set})
+                    steps_graph[step_name] = succ_set
                 successors_in_stage.update(succ_set)
                 steps_in_stage.add(step_name)
 
@@ -78,25 +105,26 @@ class Validator:
                     raise NameError(f"Name {step_name} is already used.")
 
                 # Check if agent name is already used
-                if agent_name := step.get("agent_name"):
+                if agent_name := get_agent_name(step):
                     if agent_name in agent_names:
                         raise NameError(f"Name {agent_name} is already used.")
-                    agent_names.append(agent_name)
+                    agent_names.add(agent_name)
+
+                if alias := step.get("output", {}).get("alias"):
+                    aliases.add(alias)
 
-                used_names.append(step_name)
-                steps[step_name] = step
+                used_names.add(step_name)
+                references.append((step_name, is_init, step.get("arguments", {})))
 
             # Check if there is at least one initial steps
             if not is_dynamic and len(init_steps_in_stage) == 0:
                 raise StageValidationError(f"Stage {stage_name} has no initial steps.")
 
             # Check reachability
-            reachable_steps = set()
-            for init_step in init_steps_in_stage:
-                try:
-                    reachable_steps.update(self._dfs_reachable(set(), set(), steps_graph, init_step))
-                except StageCycleDetected:
-                    raise StageValidationError("Cycle detected in Stage", stage_name=stage_name)
+            try:
+                reachable_steps = self._find_reachable(steps_graph, init_steps_in_stage)
+            except StageCycleDetected:
+                raise StageValidationError("Cycle detected in Stage", stage_name=stage_name)
             if steps_in_stage != reachable_steps:
                 if unreachable_successors := reachable_steps.difference(steps_in_stage):
                     raise StageValidationError(
@@ -104,7 +132,8 @@ class Validator:
                     )
                 else:
                     raise StageValidationError(
-                        f"The following steps in stage {stage_name} are unreachable: {steps_in_stage.difference(reachable_steps)}.",
+                        f"The following steps in stage {stage_name} are unreachable: "
+                        f"{steps_in_stage.difference(reachable_steps)}.",
                     )
 
             # Check that initial steps are not set as successors
@@ -113,26 +142,190 @@ class Validator:
 
         # Check if stage dependencies exist
         for stage_dependency in stage_dependencies:
-            if stage_dependency not in stages.keys():
+            if stage_dependency not in stages:
                 raise NameError(f"Stage {stage_dependency} is not defined.")
 
-    def _dfs_reachable(self, visited: set, completed: set, nodes_pairs: dict, node: str) -> set:
+        # Dynamic plans can define the referenced steps later
+        if not is_dynamic:
+            separator = scenario.get("settings", {}).get("separator", ".")
+            self._check_references(references, used_names | aliases, separator)
+
+    @staticmethod
+    def _check_references(references: list[tuple[str, bool, dict]], known_names: set[str], separator: str) -> None:
+        """
+        Check the output sharing variables refer to existing steps, aliases, or stages.
+        Only variables with a valid name followed by the separator (e.g. `$step.key`) are treated as references.
+        :param references: Step names, whether the steps are initial, and their arguments
+        :param known_names: Names the variables can refer to
+        :param separator: Output sharing separator
+        :return: None
+        :raises NameError: If a variable refers to an unknown name
+        """
+        for step_name, is_init, arguments in references:
+            for variable in get_dynamic_variables(arguments):
+                prefix, has_separator, _ = variable[1:].partition(separator)
+                if not has_separator or not _NAME_REGEX.match(prefix):
+                    continue
+                if prefix == PARENT_PREFIX and is_init:
+                    raise NameError(f"Initial step {step_name} can't use the {PARENT_PREFIX} prefix in {variable}.")
+                if prefix not in known_names:
+                    raise NameError(f"Step {step_name} refers to an undefined name {prefix} in {variable}.")
+
+    @staticmethod
+    def _find_reachable(nodes_pairs: dict[str, set[str]], roots: set[str]) -> set[str]:
+        """
+        Iterative depth first search of the nodes reachable from the roots. Each node is visited once.
+        :param nodes_pairs: Successors representation ({parent: {successors}})
+        :param roots: Nodes to start the search from
+        :return: Reachable nodes
+        :raises StageCycleDetected: If there is a cycle among the reachable nodes
+        """
+        finished: dict[str, bool] = dict()  # False while the node is on the current path
+        for root in roots:
+            if root in finished:
+                continue
+
+            finished[root] = False
+            stack = [(root, iter(nodes_pairs.get(root, ())))]
+            while stack:
+                node, successors = stack[-1]
+                for successor in successors:
+                    if (successor_finished := finished.get(successor)) is None:
+                        finished[successor] = False
+                        stack.append((successor, iter(nodes_pairs.get(successor, ()))))
+                        break
+                    if not successor_finished:
+                        raise StageCycleDetected("Stage cycle detected.")
+                else:
+                    finished[node] = True
+                    stack.pop()
+
+        return set(finished)
+
+
+class DynamicValidator:
+    def __init__(self, plan_id: int):
+        """
+        Validate Stages and Steps added to a dynamic Plan. Unlike the Validator, only the added objects are checked
+        (against the existing names and the Stage's graph), so the cost doesn't grow with the size of the Plan.
+        :param plan_id: ID of the Plan
+        """
+        self._plan_id = plan_id
+
+    def validate_stages(self, stages: dict[str, dict]) -> None:
         """
-        Depth first search of reachable nodes
-        :param visited: set of visited nodes
-        :param completed: set of completed nodes
-        :param nodes_pairs: stage successors representation ({parent: [successors]})
-        :param node: current node
-        :return:
+        Check the Stages can be added to the Plan.
+        :param stages: Stages to add
+        :return: None
+        :raises ValidationError: If the Stages are invalid
         """
-        if node in visited and node not in completed:
-            raise StageCycleDetected("Stage cycle detected.")
-        if node in completed:
-            return completed
-        visited.add(node)
-        for neighbour in nodes_pairs.get(node, []):
-            self._dfs_reachable(visited, completed, nodes_pairs, neighbour)
-        completed.add(node)
-        # completed and visited should be the same
-
-        return completed
+        try:
+            for stage in stages.values():
+                validate(stage, get_stage_validator())
+
+            # The names and graphs inside the new Stages are checked by the Validator, the dependencies separately
+            new_stages = {name: {k: v for k, v in stage.items() if k != "depends_on"} for name, stage in stages.items()}
+            Validator({"dynamic": True, "stages": new_stages}).validate_structure()
+            step_names = {step_name for stage in stages.values() for step_name in stage["steps"]}
+            self._check_names_unused(set(stages) | step_names)
+            self._check_agent_names_unused([step for stage in stages.values() for step in stage["steps"].values()])
+
+            dependencies = {dependency for stage in stages.values() for dependency in stage.get("depends_on", [])}
+            existing = set(
+                StageModel.objects.filter(plan_id=self._plan_id, name__in=dependencies).values_list("name", flat=True)
+            )
+            if undefined := dependencies - existing - set(stages):
+                raise NameError(f"Stage {undefined.pop()} is not defined.")
+        except Exception as ex:
+            raise ValidationError(ex)
+
+    def validate_steps(self, stage_id: int, steps: dict[str, dict], parents: dict[str, str] | None = None) -> None:
+        """
+        Check the Steps can be added to the Stage.
+        :param stage_id: ID of the Stage
+        :param steps: Steps to add
+        :param parents: Existing Steps that will be set as parents of the new Steps ({step: parent})
+        :return: None
+        :raises ValidationError: If the Steps are invalid
+        """
+        try:
+            self._validate_steps(stage_id, steps, parents or {})
+        except Exception as ex:
+            raise ValidationError(ex)
+
+    def _check_names_unused(self, names: set[str]) -> None:
+        if PARENT_PREFIX in names:
+            raise NameError(f"Name {PARENT_PREFIX} is already used.")
+
+        for used_names in [
+            StageModel.objects.filter(plan_id=self._plan_id, name__in=names),
+            StepModel.objects.filter(stage__plan_id=self._plan_id, name__in=names),
+        ]:
+            if used_name := used_names.values_list("name", flat=True).first():
+                raise NameError(f"Name {used_name} is already used.")
+
+    def _check_agent_names_unused(self, steps: list[dict]) -> None:
+        agent_names: set[str] = set()
+        for step in steps:
+            if agent_name := get_agent_name(step):
+                if agent_name in agent_names:
+                    raise NameError(f"Name {agent_name} is already used.")
+                agent_names.add(agent_name)
+
+        if agent_names and (
+            used_name := StepModel.objects.filter(
+                stage__plan_id=self._plan_id,
+                module="empire",
+                arguments__action="deploy",
+                arguments__agent_name__in=agent_names,
+            )
+            .values_list("arguments__agent_name", flat=True)
+            .first()
+        ):
+            raise NameError(f"Name {used_name} is already used.")
+
+    def _validate_steps(self, stage_id: int, steps: dict[str, dict], parents: dict[str, str]) -> None:
+        for step in steps.values():
+            validate(step, get_step_validator())
+        self._check_names_unused(set(steps))
+        self._check_agent_names_unused(list(steps.values()))
+
+        graph: dict[str, set[str]] = dict()
+        for step_name, step in steps.items():
+            graph[step_name] = set()
+            for successor in step.get("next", []):
+                successors = successor["step"]
+                graph[step_name].update(successors if isinstance(successors, list) else [successors])
+
+        # Only the referenced existing Steps are loaded
+        successor_names = set().union(*graph.values())
+        existing_steps = dict(
+            StepModel.objects.filter(stage_id=stage_id, name__in=successor_names - set(steps)).values_list(
+                "name", "is_init"
+            )
+        )
+        if undefined := successor_names - set(steps) - set(existing_steps):
+            raise StageValidationError(f"The following successors are unreachable: {undefined}.")
+
+        init_steps = {name for name, step in steps.items() if step.get("is_init")}
+        existing_init_steps = {name for name, is_init in existing_steps.items() if is_init}
+        if invalid_steps := successor_names.intersection(init_steps | existing_init_steps):
+            raise StageValidationError(f"The following initial steps are set as successors: {invalid_steps}.")
+
+        # The new Steps must be reachable from the new initial Steps or the existing parents
+        try:
+            reachable_steps = Validator._find_reachable(graph, init_steps | set(parents))
+        except StageCycleDetected:
+            raise StageValidationError("Cycle detected in Stage")
+        if unreachable_steps := set(steps) - reachable_steps:
+            raise StageValidationError(f"The following steps are unreachable: {unreachable_steps}.")
+
+        # The existing graph has no cycles, a new one has to go through a parent of the new Steps
+        if parents and existing_steps:
+            stage_graph: dict[str, set[str]] = dict()
+            for parent, successor in SuccessorModel.objects.filter(parent__stage_id=stage_id).values_list(
+                "parent__name", "successor__name"
+            ):
+                stage_graph.setdefault(parent, set()).add(successor)
+            if set(parents.values()) & Validator._find_reachable(stage_graph, set(existing_steps)):
+                raise StageValidationError("Cycle detected in Stage")
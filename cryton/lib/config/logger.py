@@ -29,6 +29,33 @@ class LoggerWrapper:
     def log_file(self) -> str:
         return path.join(LOGS_DIRECTORY, self._log_file_name)
 
+    @staticmethod
+    def _get_pre_chain() -> list:
+        # https://www.structlog.org/en/stable/standard-library.html
+        return [
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.ExtraAdder(),
+            structlog.processors.TimeStamper(fmt="iso"),
+        ]
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        """
+        Add a handler receiving the same (JSON formatted) records as the log file.
+        :param handler: Handler to add
+        :return: None
+        """
+        handler.setFormatter(
+            structlog.stdlib.ProcessorFormatter(
+                processors=[
+                    structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                    structlog.processors.JSONRenderer(),
+                ],
+                foreign_pre_chain=self._get_pre_chain(),
+            )
+        )
+        logging.getLogger().addHandler(handler)
+
     def _configure_structlog(self) -> None:
         structlog.configure(
             processors=[
@@ -52,14 +79,6 @@ class LoggerWrapper:
         if self._is_debug or is_in_docker():
             handlers.append("console")
 
-        # https://www.structlog.org/en/stable/standard-library.html
-        pre_chain = [
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.ExtraAdder(),
-            structlog.processors.TimeStamper(fmt="iso"),
-        ]
-
         logging.config.dictConfig(
             {
                 "version": 1,
@@ -71,7 +90,7 @@ class LoggerWrapper:
                             structlog.stdlib.ProcessorFormatter.remove_processors_meta,
                             structlog.processors.JSONRenderer(),
                         ],
-                        "foreign_pre_chain": pre_chain,
+                        "foreign_pre_chain": self._get_pre_chain(),
                     }
                 },
                 "handlers": {
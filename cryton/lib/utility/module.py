@@ -1,10 +1,9 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from copy import deepcopy
-from jsonschema import validate
 
 from cryton.lib.utility.enums import Result
-from cryton.lib.utility.schemas import inject_schema
+from cryton.lib.utility.schemas import inject_schema, get_validator, validate
 
 
 @dataclass
@@ -33,6 +32,17 @@ class ModuleBase(ABC):
     def get_schema(cls) -> dict:
         return deepcopy(cls._SCHEMA)
 
+    @classmethod
+    def get_validator(cls, allow_unresolved_variables: bool = False):
+        """
+        Get the compiled validator for the module's arguments.
+        :param allow_unresolved_variables: Allow unresolved execution and output sharing variables
+        :return: Validator for the module's arguments
+        """
+        if allow_unresolved_variables:
+            return get_validator((cls, True), lambda: inject_schema(cls.get_schema()))
+        return get_validator((cls, False), cls.get_schema)
+
     @classmethod
     def validate_arguments(cls, arguments: dict, allow_unresolved_variables: bool = False) -> None:
         """
@@ -42,9 +52,7 @@ class ModuleBase(ABC):
         :return: None
         :exception Exception: In case of error
         """
-        schema_copy = cls.get_schema()
-        schema = inject_schema(schema_copy) if allow_unresolved_variables else schema_copy
-        validate(arguments, schema)
+        validate(arguments, cls.get_validator(allow_unresolved_variables))
 
     @abstractmethod
     def check_requirements(self) -> None:
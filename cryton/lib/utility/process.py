@@ -0,0 +1,227 @@
+import os
+import signal
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from threading import Thread
+from typing import BinaryIO, Iterator
+
+BUFFER_SIZE = 1024 * 1024  # Bytes of each output kept in memory
+CHUNK_SIZE = 64 * 1024
+MAX_READ_SIZE = 64 * 1024 * 1024  # Bytes of an output that can be read into memory at once (to be parsed)
+TERMINATE_TIMEOUT = 5  # Seconds to wait for the process group to exit before it's killed
+
+
+class OutputTooLargeError(Exception):
+    """Exception raised when the whole output should be read, but it's too large."""
+
+
+class OutputBuffer:
+    def __init__(self, size: int = BUFFER_SIZE, spill_directory: str | None = None):
+        """
+        Ring buffer for a process output. Only the last `size` bytes are kept in memory,
+        the older bytes are moved (spilled) to an anonymous temporary file, which is removed once the buffer is closed.
+        :param size: Maximum number of bytes kept in memory
+        :param spill_directory: Directory for the spill file (default: the system's temporary directory)
+        """
+        self._size = size
+        self._spill_directory = spill_directory
+        self._buffer = bytearray()
+        self._spill_file: BinaryIO | None = None
+        self.spilled = 0
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        if (overflow := len(self._buffer) - self._size) <= 0:
+            return
+
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="cryton-output-", dir=self._spill_directory)
+        self._spill_file.write(self._buffer[:overflow])
+        del self._buffer[:overflow]
+        self.spilled += overflow
+
+    def close(self) -> None:
+        """
+        Remove the spilled output.
+        :return: None
+        """
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+    def text(self) -> str:
+        """
+        Get the output kept in memory, with a note about the spilled part.
+        :return: Decoded output
+        """
+        output = self._buffer.decode("utf-8", errors="replace")
+        if self.spilled:
+            output = f"[{self.spilled} bytes of the output were omitted]\n{output}"
+
+        return output
+
+    def chunks(self) -> Iterator[bytes]:
+        """
+        Iterate over the whole output, including the spilled part, without reading it into memory at once.
+        Must be used before the buffer is closed.
+        :return: Chunks of the output
+        """
+        if self.spilled:
+            self._spill_file.seek(0)
+            while chunk := self._spill_file.read(CHUNK_SIZE):
+                yield chunk
+        yield bytes(self._buffer)
+
+    def lines(self) -> Iterator[str]:
+        """
+        Iterate over the lines of the whole output (see `chunks`).
+        :return: Decoded lines without the line breaks
+        """
+        rest = b""
+        for chunk in self.chunks():
+            *lines, rest = (rest + chunk).split(b"\n")
+            for line in lines:
+                yield line.decode("utf-8", errors="replace")
+        if rest:
+            yield rest.decode("utf-8", errors="replace")
+
+    def contains(self, *substrings: str) -> bool:
+        """
+        Check if the whole output contains any of the substrings (see `chunks`).
+        :param substrings: Substrings to look for
+        :return: True if any substring was found
+        """
+        encoded = [substring.encode() for substring in substrings]
+        overlap = max((len(substring) for substring in encoded), default=1) - 1
+        tail = b""
+        for chunk in self.chunks():
+            window = tail + chunk
+            if any(substring in window for substring in encoded):
+                return True
+            tail = window[-overlap:] if overlap else b""
+
+        return False
+
+    def read(self, max_size: int = MAX_READ_SIZE) -> str:
+        """
+        Get the whole output, including the spilled part (must be called before the buffer is closed).
+        Use `chunks`, `lines`, or `contains` if the output doesn't have to be parsed at once.
+        :param max_size: Maximum size of the output in bytes
+        :return: Decoded output
+        :raises OutputTooLargeError: If the output is larger than `max_size`
+        """
+        if (size := self.spilled + len(self._buffer)) > max_size:
+            raise OutputTooLargeError(f"The output is too large to be processed ({size} bytes, at most {max_size}).")
+
+        return b"".join(self.chunks()).decode("utf-8", errors="replace")
+
+
+@dataclass
+class ProcessResult:
+    args: list[str] | str
+    returncode: int
+    stdout: OutputBuffer
+    stderr: OutputBuffer
+
+    def close(self) -> None:
+        """
+        Remove the spilled outputs.
+        :return: None
+        """
+        self.stdout.close()
+        self.stderr.close()
+
+    def __enter__(self) -> "ProcessResult":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def _read_stream(stream: BinaryIO, output: OutputBuffer) -> None:
+    try:
+        while chunk := stream.read1(CHUNK_SIZE):
+            output.write(chunk)
+    finally:
+        stream.close()
+
+
+def _terminate_process_group(process: subprocess.Popen) -> None:
+    """
+    Terminate the process and all its children (the process group), kill them if they don't exit in time.
+    :param process: Process started in its own session
+    :return: None
+    """
+    for sig, timeout in [(signal.SIGTERM, TERMINATE_TIMEOUT), (signal.SIGKILL, None)]:
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+        try:
+            process.wait(timeout)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def run_process(
+    args: list[str] | str,
+    timeout: float | None = None,
+    shell: bool = False,
+    check: bool = False,
+    buffer_size: int = BUFFER_SIZE,
+    spill_directory: str | None = None,
+) -> ProcessResult:
+    """
+    Run the process and stream its outputs into bounded buffers (see `OutputBuffer`).
+    The process runs in its own process group, which is terminated on timeout (or any error while waiting).
+    Mirrors `subprocess.run`, the exceptions contain the decoded outputs kept in memory.
+    The result must be closed (or used as a context manager) to remove the spilled outputs.
+    :param args: Command to run
+    :param timeout: Seconds to wait for the process to finish (None for no timeout)
+    :param shell: Run the command in shell
+    :param check: Raise CalledProcessError if the process exits with a non-zero return code
+    :param buffer_size: Maximum number of bytes of each output kept in memory
+    :param spill_directory: Directory for the spilled outputs
+    :return: Return code and outputs of the process
+    :raises subprocess.TimeoutExpired: If the timeout expires
+    :raises subprocess.CalledProcessError: If `check` is set and the process fails
+    """
+    process = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=shell, start_new_session=True
+    )
+    stdout, stderr = OutputBuffer(buffer_size, spill_directory), OutputBuffer(buffer_size, spill_directory)
+    readers = [
+        Thread(target=_read_stream, args=(process.stdout, stdout), daemon=True),
+        Thread(target=_read_stream, args=(process.stderr, stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        _terminate_process_group(process)
+        for reader in readers:  # Don't wait forever for the children that left the process group
+            reader.join(TERMINATE_TIMEOUT)
+        timeout_error = subprocess.TimeoutExpired(args, timeout, stdout.text(), stderr.text())
+        stdout.close()
+        stderr.close()
+        raise timeout_error
+    except BaseException:
+        _terminate_process_group(process)
+        for reader in readers:
+            reader.join(TERMINATE_TIMEOUT)
+        stdout.close()
+        stderr.close()
+        raise
+
+    for reader in readers:  # The outputs can be still open in the process' children
+        reader.join()
+
+    result = ProcessResult(args, process.returncode, stdout, stderr)
+    if check and process.returncode != 0:
+        with result:
+            raise subprocess.CalledProcessError(process.returncode, args, stdout.text(), stderr.text())
+
+    return result
@@ -1,3 +1,14 @@
+from threading import Lock
+from typing import Callable, Hashable
+
+from jsonschema import validators
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+
+_validators: dict[Hashable, Validator] = {}
+_validators_lock = Lock()
+
+
 def inject(original: dict | list) -> dict | list:
     """
     Allow definition of output sharing variables alongside the original schema property.
@@ -42,3 +53,35 @@ def inject_schema(schema: dict, ignore_sub_schema_keywords: bool = False, wrap:
             schema["items"] = inject_schema(items)
 
     return inject(schema) if wrap else schema
+
+
+def get_validator(key: Hashable, build_schema: Callable[[], dict]) -> Validator:
+    """
+    Get the compiled validator for the schema. The schema is built and checked only once per process.
+    :param key: Key identifying the schema
+    :param build_schema: Function creating the schema (called only on the first use)
+    :return: Validator for the schema
+    """
+    if (validator := _validators.get(key)) is not None:
+        return validator
+
+    with _validators_lock:
+        if (validator := _validators.get(key)) is None:
+            schema = build_schema()
+            validator_class = validators.validator_for(schema)
+            validator_class.check_schema(schema)
+            validator = _validators[key] = validator_class(schema)
+
+    return validator
+
+
+def validate(instance: dict, validator: Validator) -> None:
+    """
+    Validate the instance using the compiled validator.
+    :param instance: Instance to validate
+    :param validator: Compiled validator
+    :return: None
+    :raises jsonschema.ValidationError: The most relevant error (same as `jsonschema.validate`)
+    """
+    if (error := best_match(validator.iter_errors(instance))) is not None:
+        raise error
@@ -5,6 +5,7 @@ from snek_sploit import Error as MSFError, RPCError as MSFRPCError, SessionType
 
 from cryton.lib.metasploit import MetasploitClientUpdated
 from cryton.lib.utility.module import ModuleBase, ModuleOutput, Result
+from cryton.lib.utility.process import OutputTooLargeError, run_process
 
 
 class Module(ModuleBase):
@@ -83,25 +84,29 @@ class Module(ModuleBase):
 
         else:
             try:
-                process = subprocess.run(
-                    self._command, timeout=self._timeout, capture_output=True, shell=True, check=True
-                )
+                process = run_process(self._command, timeout=self._timeout, shell=True, check=True)
             except subprocess.TimeoutExpired:
                 self._data.output += "Command execution timed out."
                 return self._data
             except subprocess.CalledProcessError as ex:
-                self._data.output += ex.stderr.decode("utf-8")
+                self._data.output += ex.stderr
                 return self._data
             except Exception as ex:
                 self._data.output += str(ex)
                 return self._data
 
-            process_output = process.stdout.decode("utf-8")
-            process_error = process.stderr.decode("utf-8")
-
-            self._data.output += f"{process_output}\n{process_error}"
-            if not process_error:
-                self._data.result = Result.OK
+            with process:
+                process_error = process.stderr.text()
+
+                self._data.output += f"{process.stdout.text()}\n{process_error}"
+                if not process_error:
+                    self._data.result = Result.OK
+                try:
+                    process_output = process.stdout.read() if self._serialize_output_flag else ""
+                except OutputTooLargeError as ex:
+                    self._data.output += f"\n{ex}"
+                    self._data.result = Result.FAIL
+                    return self._data
 
         if self._serialize_output_flag:
             try:
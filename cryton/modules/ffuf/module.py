@@ -4,6 +4,7 @@ import subprocess
 from uuid import uuid1
 
 from cryton.lib.utility.module import ModuleBase, ModuleOutput, Result
+from cryton.lib.utility.process import run_process
 
 
 class Module(ModuleBase):
@@ -52,7 +53,7 @@ class Module(ModuleBase):
             raise OSError("Unable to access the defined wordlist.")
 
         try:
-            subprocess.run("ffuf")
+            run_process(["ffuf"]).close()
         except FileNotFoundError:
             raise OSError("Unable to find ffuf.")
 
@@ -60,18 +61,16 @@ class Module(ModuleBase):
         command = self._command.split(" ") if self._command is not None else self._build_command()
 
         try:
-            process = subprocess.run(command, capture_output=True, check=True)
+            process = run_process(command, check=True)
         except subprocess.CalledProcessError as ex:
-            self._data.output += f"{ex.stdout.decode('utf-8')}\n{ex.stderr.decode('utf-8')}"
+            self._data.output += f"{ex.stdout}\n{ex.stderr}"
             return self._data
         except Exception as ex:
             self._data.output += str(ex)
             return self._data
 
-        process_output = process.stdout.decode("utf-8")
-        process_error = process.stderr.decode("utf-8")
-
-        self._data.output += f"{process_output}\n{process_error}"
+        with process:
+            self._data.output += f"{process.stdout.text()}\n{process.stderr.text()}"
 
         if self._serialize_output and os.path.isfile(self._tmp_file):
             try:
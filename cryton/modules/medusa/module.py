@@ -2,6 +2,7 @@ import os
 import subprocess
 
 from cryton.lib.utility.module import ModuleBase, ModuleOutput, Result
+from cryton.lib.utility.process import run_process
 
 
 class Module(ModuleBase):
@@ -106,7 +107,7 @@ class Module(ModuleBase):
                 raise OSError("Unable to access password_file.")
 
         try:
-            subprocess.run("medusa")
+            run_process(["medusa"]).close()
         except FileNotFoundError:
             raise OSError("Unable to find medusa.")
 
@@ -114,22 +115,25 @@ class Module(ModuleBase):
         command = self._command.split(" ") if self._command is not None else self._build_command()
 
         try:
-            process = subprocess.run(command, capture_output=True, check=True)
+            process = run_process(command, check=True)
         except subprocess.CalledProcessError as ex:
-            self._data.output += f"{ex.stdout.decode('utf-8')}\n{ex.stderr.decode('utf-8')}"
+            self._data.output += f"{ex.stdout}\n{ex.stderr}"
             return self._data
         except Exception as ex:
             self._data.output += str(ex)
             return self._data
 
-        process_output = process.stdout.decode("utf-8")
-        process_error = process.stderr.decode("utf-8")
+        found_accounts, succeeded = [], False
+        with process:
+            self._data.output += f"{process.stdout.text()}\n{process.stderr.text()}"
+            for line in process.stdout.lines():  # The output of long brute-force attacks can be huge
+                if "ACCOUNT FOUND:" in line:
+                    found_accounts.append(line)
+                succeeded = succeeded or "[SUCCESS]" in line
 
-        self._data.output += f"{process_output}\n{process_error}"
-
-        if "ACCOUNT FOUND:" in process_output and "[SUCCESS]" in process_output:
+        if found_accounts and succeeded:
             self._data.result = Result.OK
-            self._data.serialized_output = self._parse_credentials(process_output)
+            self._data.serialized_output = self._parse_credentials("\n".join(found_accounts))
 
         return self._data
 
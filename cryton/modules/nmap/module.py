@@ -4,6 +4,7 @@ import nmap3
 from copy import deepcopy
 
 from cryton.lib.utility.module import ModuleBase, ModuleOutput, Result
+from cryton.lib.utility.process import run_process
 
 
 # TODO: this module is only updated to work with the new rules, it's not reworked
@@ -88,6 +89,7 @@ class Module(ModuleBase):
         serialize_output: bool = self._arguments.get("serialize_output", True)
 
         nmap_client = nmap3.Nmap()
+        nmap_client.run_command = run_nmap_command  # Used by scan_command as well
 
         try:
             if custom_command:
@@ -124,6 +126,31 @@ class Module(ModuleBase):
         return self._data
 
 
+def run_nmap_command(cmd: list[str], timeout: int | None = None) -> str:
+    """
+    Run Nmap with bounded error output and terminate it (with its children) on timeout.
+    Replaces `nmap3.Nmap.run_command`, which keeps all outputs in memory.
+    :param cmd: Nmap command
+    :param timeout: Timeout for the command
+    :return: Output of the command (the XML report)
+    :raises nmap3.exceptions.NmapNotInstalledError: If Nmap isn't installed
+    :raises nmap3.exceptions.NmapExecutionError: If Nmap fails
+    :raises OutputTooLargeError: If the report is too large to be parsed
+    """
+    try:
+        process = run_process(cmd, timeout=timeout)
+    except FileNotFoundError:
+        raise nmap3.exceptions.NmapNotInstalledError()
+
+    with process:
+        if process.returncode != 0:
+            raise nmap3.exceptions.NmapExecutionError(
+                f'Error during command: "{" ".join(cmd)}"\n\n{process.stderr.text()}'
+            )
+
+        return process.stdout.read().strip()
+
+
 def execute_scan(
     target: str, options: str | None, ports: list | None, nmap_client: nmap3.Nmap, timeout: int
 ) -> ElementTree.Element:
@@ -2,6 +2,7 @@ import json
 import subprocess
 
 from cryton.lib.utility.module import ModuleBase, ModuleOutput, Result
+from cryton.lib.utility.process import OutputTooLargeError, run_process
 
 
 # TODO: this module is only updated to work with the new rules, it's not reworked
@@ -54,31 +55,32 @@ class Module(ModuleBase):
                 cmd.append(str(each))
 
         try:
-            process = subprocess.run(cmd, timeout=timeout, capture_output=True)
-            process.check_returncode()
+            process = run_process(cmd, timeout=timeout, check=True)
         except subprocess.TimeoutExpired:
             self._data.output = "Timeout expired"
             return self._data
         except subprocess.CalledProcessError as err:  # process exited with return code other than 0
-            self._data.output = err.stderr.decode("utf-8")
+            self._data.output = err.stderr
             return self._data
         except Exception as err:
             self._data.output = str(err)
             return self._data
 
-        process_stdout = process.stdout.decode("utf-8")
-        print(process_stdout)
-        if not (process_error := process.stderr.decode("utf-8")):
-            self._data.result = Result.OK
+        with process:
+            process_error = process.stderr.text()
+            self._data.output = f"{process.stdout.text()}\n{process_error}"
+            if not process_error:
+                self._data.result = Result.OK
 
-        self._data.output = f"{process_stdout}\n{process_error}"
-
-        if serialize_output:
-            try:
-                script_serialized_output = json.loads(process_stdout)
-                self._data.serialized_output = script_serialized_output
-            except (json.JSONDecodeError, TypeError):
-                self._data.output += "serialized_output_error: Output of the script is not valid JSON."
-                self._data.result = Result.FAIL
+            if serialize_output:
+                try:
+                    script_serialized_output = json.loads(process.stdout.read())
+                    self._data.serialized_output = script_serialized_output
+                except (json.JSONDecodeError, TypeError):
+                    self._data.output += "serialized_output_error: Output of the script is not valid JSON."
+                    self._data.result = Result.FAIL
+                except OutputTooLargeError as ex:
+                    self._data.output += f"serialized_output_error: {ex}"
+                    self._data.result = Result.FAIL
 
         return self._data
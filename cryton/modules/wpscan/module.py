@@ -2,6 +2,7 @@ import subprocess
 import json
 
 from cryton.lib.utility.module import ModuleBase, ModuleOutput, Result
+from cryton.lib.utility.process import OutputTooLargeError, run_process
 
 
 # TODO: this module is only updated to work with the new rules, it's not reworked
@@ -42,7 +43,7 @@ class Module(ModuleBase):
         wpscan_command = parse_command(self._arguments)
 
         try:
-            wpscan_run = subprocess.run(wpscan_command, capture_output=True)
+            wpscan_run = run_process(wpscan_command)
         except OSError as err:
             self._data.output = f"Check if your command starts with 'wpscan'. Original error: {str(err)}"
             return self._data
@@ -50,14 +51,6 @@ class Module(ModuleBase):
             self._data.output = f"WPScan couldn't start. Original error: {str(err)}"
             return self._data
 
-        wpscan_std_out = wpscan_run.stdout.decode("utf-8")
-        wpscan_std_err = wpscan_run.stderr.decode("utf-8")
-
-        try:
-            self._data.serialized_output = json.loads(wpscan_std_out)
-        except json.decoder.JSONDecodeError:
-            self._data.output = wpscan_std_out
-
         failure_strings = [
             "unrecognized option",
             "option requires an argument",
@@ -66,8 +59,15 @@ class Module(ModuleBase):
             "has not been found",
             "Scan Aborted",
         ]
-        if not any(failure_string in wpscan_std_out for failure_string in failure_strings):
-            self._data.result = Result.OK
+        with wpscan_run:
+            wpscan_std_err = wpscan_run.stderr.text()
+            try:
+                self._data.serialized_output = json.loads(wpscan_run.stdout.read())
+            except (json.decoder.JSONDecodeError, OutputTooLargeError):
+                self._data.output = wpscan_run.stdout.text()
+
+            if not wpscan_run.stdout.contains(*failure_strings):
+                self._data.result = Result.OK
 
         if wpscan_std_err:
             self._data.output += wpscan_std_err
@@ -69,6 +69,14 @@ def cli() -> None:
     show_default=True,
     help="How many times to try to connect.",
 )
+@click.option(
+    "-mat",
+    "--max-attack-tasks",
+    type=click.INT,
+    default=SETTINGS.max_attack_tasks,
+    show_default=True,
+    help="How many attack tasks can run at once, the rest waits in Rabbit. (0 == no limit)",
+)
 @click.option("-P", "--persistent", is_flag=True, help="Waif forever for Rabbit connection.")
 @click.option(
     "-RM",
@@ -86,6 +94,7 @@ def start_worker(
     name: str,
     consumer_count: int,
     max_retries: int,
+    max_attack_tasks: int,
     require_metasploit: bool,
 ) -> None:
     """
@@ -100,6 +109,7 @@ def start_worker(
     :param rabbit_username: Rabbit's username
     :param rabbit_password: Rabbit's password
     :param max_retries: How many times to try to connect
+    :param max_attack_tasks: How many attack Tasks can run at once (0 for no limit)
     :param persistent: Keep Worker alive and keep on trying forever (if True)
     :param require_metasploit: Require Metasploit on startup (if True)
     :return: None
@@ -112,9 +122,9 @@ def start_worker(
         rabbit_password,
         name,
         consumer_count,
-        consumer_count,
         max_retries,
         persistent,
         require_metasploit,
+        max_attack_tasks,
     )
     worker_obj.start()
@@ -1,7 +1,15 @@
 from dataclasses import dataclass
 from os import getenv, path
 
-from cryton.lib.config.settings import SETTINGS_WORKER, getenv_bool, getenv_int, LOGS_DIRECTORY, MODULES_DIRECTORY
+from cryton.lib.config.settings import (
+    SETTINGS_WORKER,
+    APP_DIRECTORY,
+    getenv_bool,
+    getenv_int,
+    getenv_list,
+    LOGS_DIRECTORY,
+    MODULES_DIRECTORY,
+)
 
 
 @dataclass
@@ -64,14 +72,112 @@ class SettingsModules:
         )
 
 
+@dataclass
+class SettingsExecutor:
+    pool_size: int
+    max_tasks: int
+
+    def __init__(self, raw_settings: dict):
+        self.pool_size = getenv_int(
+            "CRYTON_WORKER_EXECUTOR_POOL_SIZE", raw_settings.get("pool_size", 2), min_value=0, fallback=0
+        )
+        self.max_tasks = getenv_int(
+            "CRYTON_WORKER_EXECUTOR_MAX_TASKS", raw_settings.get("max_tasks", 50), min_value=0, fallback=0
+        )
+
+
+@dataclass
+class SettingsAdmission:
+    module_limits: dict[str, int]
+    max_cpu_load: int
+    min_available_memory: int
+
+    def __init__(self, raw_settings: dict):
+        if module_limits := getenv_list("CRYTON_WORKER_ADMISSION_MODULE_LIMITS", ""):  # module=limit pairs
+            self.module_limits = {
+                module: int(limit) for module, limit in (pair.split("=", 1) for pair in module_limits if pair)
+            }
+        else:
+            self.module_limits = {module: int(limit) for module, limit in raw_settings.get("module_limits", {}).items()}
+        self.max_cpu_load = getenv_int(
+            "CRYTON_WORKER_ADMISSION_MAX_CPU_LOAD", raw_settings.get("max_cpu_load", 0), min_value=0, fallback=0
+        )
+        self.min_available_memory = getenv_int(
+            "CRYTON_WORKER_ADMISSION_MIN_AVAILABLE_MEMORY",
+            raw_settings.get("min_available_memory", 0),
+            min_value=0,
+            fallback=0,
+        )
+
+
+@dataclass
+class SettingsLimits:
+    cpu_time: int
+    memory: int
+    open_files: int
+    modules: dict[str, dict[str, int]]
+
+    def __init__(self, raw_settings: dict):
+        self.cpu_time = getenv_int(
+            "CRYTON_WORKER_LIMITS_CPU_TIME", raw_settings.get("cpu_time", 0), min_value=0, fallback=0
+        )
+        self.memory = getenv_int("CRYTON_WORKER_LIMITS_MEMORY", raw_settings.get("memory", 0), min_value=0, fallback=0)
+        self.open_files = getenv_int(
+            "CRYTON_WORKER_LIMITS_OPEN_FILES", raw_settings.get("open_files", 0), min_value=0, fallback=0
+        )
+        if modules := getenv_list("CRYTON_WORKER_LIMITS_MODULES", ""):  # module:limit=value,limit=value items
+            self.modules = {
+                module: {limit: int(value) for limit, value in (pair.split("=", 1) for pair in limits.split(","))}
+                for module, limits in (item.split(":", 1) for item in modules if item)
+            }
+        else:
+            self.modules = {
+                module: {limit: int(value) for limit, value in limits.items()}
+                for module, limits in raw_settings.get("modules", {}).items()
+            }
+
+
+@dataclass
+class SettingsSpool:
+    directory: str
+    sync_interval: int
+
+    def __init__(self, raw_settings: dict):
+        self.directory = path.expanduser(
+            getenv("CRYTON_WORKER_SPOOL_DIRECTORY", raw_settings.get("directory", path.join(APP_DIRECTORY, "spool")))
+        )
+        self.sync_interval = getenv_int(
+            "CRYTON_WORKER_SPOOL_SYNC_INTERVAL", raw_settings.get("sync_interval", 100), min_value=0, fallback=0
+        )
+
+
+@dataclass
+class SettingsMetrics:
+    enabled: bool
+    host: str
+    port: int
+
+    def __init__(self, raw_settings: dict):
+        self.enabled = getenv_bool("CRYTON_WORKER_METRICS_ENABLED", raw_settings.get("enabled", False))
+        self.host = getenv("CRYTON_WORKER_METRICS_HOST", raw_settings.get("host", "127.0.0.1"))
+        self.port = getenv_int("CRYTON_WORKER_METRICS_PORT", raw_settings.get("port", 9102))
+
+
 @dataclass
 class Settings:
     name: str
     debug: bool
     consumer_count: int  # TODO: rename
     max_retries: int
+    max_attack_tasks: int
+    request_retention: int
     log_file: str
     modules: SettingsModules
+    executor: SettingsExecutor
+    admission: SettingsAdmission
+    limits: SettingsLimits
+    spool: SettingsSpool
+    metrics: SettingsMetrics
     rabbit: SettingsRabbit
     empire: SettingsEmpire
     metasploit: SettingsMetasploit
@@ -81,8 +187,19 @@ class Settings:
         self.debug = getenv_bool("CRYTON_WORKER_DEBUG", raw_settings.get("debug", False))
         self.consumer_count = getenv_int("CRYTON_WORKER_CONSUMER_COUNT", raw_settings.get("consumer_count", 7))
         self.max_retries = getenv_int("CRYTON_WORKER_MAX_RETRIES", raw_settings.get("max_retries", 3))
+        self.max_attack_tasks = getenv_int(
+            "CRYTON_WORKER_MAX_ATTACK_TASKS", raw_settings.get("max_attack_tasks", 0), min_value=0, fallback=0
+        )
+        self.request_retention = getenv_int(
+            "CRYTON_WORKER_REQUEST_RETENTION", raw_settings.get("request_retention", 24), min_value=0, fallback=0
+        )
         self.log_file = path.join(LOGS_DIRECTORY, "worker.log")
         self.modules = SettingsModules(raw_settings.get("modules", {}))
+        self.executor = SettingsExecutor(raw_settings.get("executor", {}))
+        self.admission = SettingsAdmission(raw_settings.get("admission", {}))
+        self.limits = SettingsLimits(raw_settings.get("limits", {}))
+        self.spool = SettingsSpool(raw_settings.get("spool", {}))
+        self.metrics = SettingsMetrics(raw_settings.get("metrics", {}))
         self.rabbit = SettingsRabbit(raw_settings.get("rabbit", {}))
         self.empire = SettingsEmpire(raw_settings.get("empire", {}))
         self.metasploit = SettingsMetasploit(raw_settings.get("metasploit", {}))
@@ -2,12 +2,18 @@ from click import echo
 import amqpstorm
 import json
 import time
-from threading import Thread, Lock, Event
-from queue import PriorityQueue
+from dataclasses import asdict
+from os import path
+from threading import Thread, Lock, Event, BoundedSemaphore
 from uuid import uuid1
 
 from cryton.worker import task
-from cryton.worker.utility import logger, util
+from cryton.worker.config.settings import SETTINGS
+from cryton.worker.utility import logger, util, constants as co
+from cryton.worker.utility.spool import MessageSpool
+from cryton.worker.utility.metrics import metrics
+from cryton.worker.utility.request_table import RequestTable
+from cryton.lib.utility.module import ModuleOutput, Result
 
 
 class ChannelConsumer:
@@ -40,7 +46,7 @@ class ChannelConsumer:
 class Consumer:
     def __init__(
         self,
-        main_queue: PriorityQueue,
+        main_queue: util.MainQueue,
         rabbit_host: str,
         rabbit_port: int,
         rabbit_username: str,
@@ -49,6 +55,7 @@ class Consumer:
         consumer_count: int,
         max_retries: int,
         persistent: bool,
+        max_attack_tasks: int = 0,
     ):
         """
         Consumer takes care of the connection between Worker and RabbitMQ server and launching callbacks for the
@@ -63,15 +70,15 @@ class Consumer:
         :param consumer_count: How many consumers to use for queues (higher == faster, but heavier processor usage)
         :param max_retries: How many times to try to connect
         :param persistent: Keep Worker alive and keep on trying forever (if True)
+        :param max_attack_tasks: How many attack Tasks can run at once, 0 for no limit (the rest waits in RabbitMQ)
         """
         self._logger = logger.logger.bind()
         # TODO: rename also the queues in the hive?
         attack_q = f"cryton.worker.{worker_name}.attack.request"  # TODO: rename to cryton.attack.request.{}?
         control_q = f"cryton.worker.{worker_name}.control.request"  # TODO: rename to cryton.control.request.{}?
-        self._queues = {
-            attack_q: self._callback_attack,
-            control_q: self._callback_control,
-        }
+        # Attack requests have their own channel, so the waiting for a free slot doesn't block the control requests
+        self._attack_queues = {attack_q: self._callback_attack}
+        self._queues = {control_q: self._callback_control}
 
         self._hostname = rabbit_host
         self._port = rabbit_port
@@ -83,9 +90,15 @@ class Consumer:
         self._channel_consumer_count = consumer_count if consumer_count > 0 else 1
         self._stopped = Event()
         self._connection: amqpstorm.Connection | None = None
-        self._tasks: list[task.Task] = []
+        self._tasks: dict[str, task.Task] = dict()  # Tasks by their correlation ID
         self._tasks_lock = Lock()  # Lock to prevent modifying, while performing time-consuming actions.
-        self._undelivered_messages: list[util.UndeliveredMessage] = []
+        self._attack_slots = BoundedSemaphore(max_attack_tasks) if max_attack_tasks > 0 else None
+        self._spool = MessageSpool(
+            path.join(SETTINGS.spool.directory, f"{worker_name}.jsonl"), SETTINGS.spool.sync_interval / 1000
+        )
+        self._requests = RequestTable(
+            path.join(SETTINGS.spool.directory, f"{worker_name}.requests.sqlite3"), SETTINGS.request_retention * 3600
+        )
 
     def __str__(self) -> str:
         return f"{self._username}@{self._hostname}:{self._port}"
@@ -93,6 +106,14 @@ class Consumer:
     def is_running(self) -> bool:
         return not self._stopped.is_set()
 
+    def wait(self) -> None:
+        """
+        Wait until Consumer (self) stops.
+        :return: None
+        """
+        while not self._stopped.wait(1):  # Wait in intervals to allow KeyboardInterrupt
+            pass
+
     # TODO: should run in a Process
     # TODO: resolve the KeyboardError to prevent t_consumer raise Exception on channel fail
     def start(self) -> None:
@@ -105,7 +126,7 @@ class Consumer:
             hostname=self._hostname,
             port=self._port,
             username=self._username,
-            queues=self._queues,
+            queues=self._queues | self._attack_queues,
             max_retries=self._max_retries,
             persistent=self._persistent,
             channel_consumer_count=self._channel_consumer_count,
@@ -116,9 +137,8 @@ class Consumer:
             try:
                 if self._update_connection():
                     self._start_channel_consumers()
-                    self._get_undelivered_task_replies()
-                    self._redelivered_messages()
-                time.sleep(5)
+                self._redeliver_messages()
+                self._stopped.wait(5)
 
             except amqpstorm.AMQPConnectionError as ex:
                 if self._persistent:
@@ -147,7 +167,7 @@ class Consumer:
             self._logger.debug("stopping unfinished Tasks")
             echo("Forcefully stopping running modules..")
             with self._tasks_lock:
-                for task_obj in self._tasks:
+                for task_obj in self._tasks.values():
                     task_obj.stop()
 
         # Close connection and its channels.
@@ -159,6 +179,9 @@ class Consumer:
             self._logger.debug("Closing connection.")
             self._connection.close()
 
+        self._spool.close()
+        self._requests.close()
+
         self._logger.debug("consumer stopped")
 
     def _update_connection(self) -> bool:
@@ -195,18 +218,87 @@ class Consumer:
             thread = Thread(target=channel_consumer.start, name=f"Thread-{i}-consumer")
             thread.start()
 
+        # Prefetch of a single message (QoS) keeps the attack requests waiting for a free slot in RabbitMQ
+        channel_consumer = ChannelConsumer(0, self._connection, self._attack_queues)
+        Thread(target=channel_consumer.start, name="Thread-attack-consumer").start()
+
     def _callback_attack(self, message: amqpstorm.Message) -> None:
         """
-        Create new AttackTask and save it.
+        Wait for a free attack slot, create new AttackTask and save it. Redelivered requests aren't executed again.
         :param message: Received RabbitMQ Message
         :return: None
         """
         self._logger.debug("attack callback", correlation_id=message.correlation_id, message_body=message.body)
+        if self._handle_redelivered_attack(message):
+            return
+
+        if not self._acquire_attack_slot():
+            message.reject(requeue=True)  # Leave the request for the next start
+            return
+
+        try:
+            message.ack()
+        except amqpstorm.AMQPError:
+            self._release_attack_slot()
+            raise
+
+        self._requests.start(message.correlation_id)
+        task_obj = task.AttackTask(
+            message, self._main_queue, self._connection, self._spool, lambda: self._finish_attack_task(task_obj)
+        )
+        self._add_task(task_obj)
+
+    def _handle_redelivered_attack(self, message: amqpstorm.Message) -> bool:
+        """
+        Check if the attack request was already received. If so, acknowledge it and don't execute it again.
+        A running request replies once it finishes, a finished one gets the saved result.
+        A request interrupted by the Worker's restart gets an error, since the module could've done its work.
+        :param message: Received RabbitMQ Message
+        :return: True if the request was already received
+        """
+        correlation_id = message.correlation_id
+        if (request := self._requests.get(correlation_id)) is None:
+            return False
+
+        state, result, current_run = request
+        local_logger = self._logger.bind(correlation_id=correlation_id, state=state)
+        if state == co.TASK_RUNNING and current_run:
+            local_logger.info("redelivered attack request is already running")
+            message.ack()
+            return True
+
+        if state == co.TASK_RUNNING:
+            local_logger.warning("redelivered attack request was interrupted by the restart")
+            output = ModuleOutput(Result.ERROR, "The execution was interrupted by the Worker's restart.")
+            result = json.dumps(asdict(output))
+            self._requests.finish(correlation_id, result)
+        else:
+            local_logger.info("redelivered attack request is already finished, sending the saved result")
+
         message.ack()
-        task_obj = task.AttackTask(message, self._main_queue, self._connection)
-        task_obj.start()
-        with self._tasks_lock:
-            self._tasks.append(task_obj)
+        self.send_message(message.reply_to, result, message.properties | co.DEFAULT_MSG_PROPERTIES)
+        return True
+
+    def _finish_attack_task(self, task_obj: task.AttackTask) -> None:
+        """
+        Save the result of the AttackTask and free its attack slot.
+        If the AttackTask failed before replying, the error is saved and sent instead, so the request isn't left running.
+        :param task_obj: Finished AttackTask
+        :return: None
+        """
+        result = task_obj.result
+        if failed := result is None:
+            self._logger.error("attack task failed unexpectedly", correlation_id=task_obj.correlation_id)
+            output = ModuleOutput(Result.ERROR, "The execution failed unexpectedly.")
+            result = json.dumps(asdict(output))
+
+        try:
+            self._requests.finish(task_obj.correlation_id, result)
+            if failed:
+                self.pop_task(task_obj.correlation_id)
+                task_obj.reply(result)
+        finally:
+            self._release_attack_slot()
 
     def _callback_control(self, message: amqpstorm.Message) -> None:
         """
@@ -216,10 +308,36 @@ class Consumer:
         """
         self._logger.debug("control callback", correlation_id=message.correlation_id, message_body=message.body)
         message.ack()
-        task_obj = task.ControlTask(message, self._main_queue, self._connection)
-        task_obj.start()
+        task_obj = task.ControlTask(message, self._main_queue, self._connection, self._spool)
+        self._add_task(task_obj)
+
+    def _add_task(self, task_obj: task.Task) -> None:
+        """
+        Save the Task and start it.
+        :param task_obj: Task to start
+        :return: None
+        """
         with self._tasks_lock:
-            self._tasks.append(task_obj)
+            self._tasks[task_obj.correlation_id] = task_obj
+        task_obj.start()
+
+    def _acquire_attack_slot(self) -> bool:
+        """
+        Wait until an attack Task can be started.
+        :return: True if the slot was acquired, False if the Consumer is stopping
+        """
+        if self._attack_slots is None:
+            return True
+
+        while self.is_running():
+            if self._attack_slots.acquire(timeout=1):
+                return True
+
+        return False
+
+    def _release_attack_slot(self) -> None:
+        if self._attack_slots is not None:
+            self._attack_slots.release()
 
     def _create_connection(self) -> None:
         """
@@ -264,40 +382,48 @@ class Consumer:
             channel = self._connection.channel()
         except amqpstorm.AMQPError:
             local_logger = self._logger.bind(uuid=str(uuid1()))
-            self._undelivered_messages.append(util.UndeliveredMessage(queue, message_body, message_properties))
+            self._spool.add(util.UndeliveredMessage(queue, message_body, message_properties))
             local_logger.error("unable to send the message", queue=queue)
             local_logger.debug("unable to send the message", message=message_body, properties=message_properties)
             return
 
+        publish_started_at = time.monotonic()
         channel.queue.declare(queue)
         message = amqpstorm.Message.create(channel, message_body, message_properties)
         # TODO: publish can raise an error when a message is not acked, it also freezes until it raises and error due
         #  to a timeout (base rabbit message ack timeout)
         message.publish(queue)
         channel.close()
+        metrics.observe_reply_latency(time.monotonic() - publish_started_at)
         self._logger.debug("message sent", queue=queue, message=message_body, properties=message_properties)
 
-    def _redelivered_messages(self) -> None:
+    def _redeliver_messages(self) -> None:
         """
-        Send all undelivered messages.
+        Send the messages from the spool in order. Each message is removed once the server confirms it.
         :return: None
         """
-        self._logger.debug("redelivering messages")
-        while self._undelivered_messages:
-            message = self._undelivered_messages.pop(0)
-            self.send_message(message.recipient, message.body, message.properties)
+        if not (pending := self._spool.pending()):
+            return
 
-    def _get_undelivered_task_replies(self) -> None:
+        self._logger.debug("redelivering messages", count=len(pending))
+        try:
+            channel = self._connection.channel()
+            channel.confirm_deliveries()
+            for message_id, message in pending:
+                channel.queue.declare(message.recipient)
+                properties = message.properties | co.DEFAULT_MSG_PROPERTIES
+                if amqpstorm.Message.create(channel, message.body, properties).publish(message.recipient):
+                    self._spool.confirm(message_id)
+            channel.close()
+        except amqpstorm.AMQPError as ex:  # The rest is sent on the next attempt
+            self._logger.warning("unable to redeliver the messages", error=str(ex))
+
+    def spool_size(self) -> int:
         """
-        Get all undelivered Task messages and add them to the list.
-        :return: None
+        Get the number of messages waiting in the spool.
+        :return: Number of undelivered messages
         """
-        self._logger.debug("getting undelivered tasks' messages")
-        with self._tasks_lock:
-            for task_obj in self._tasks:
-                if messages := task_obj.undelivered_messages:
-                    self._undelivered_messages.extend(messages)
-                    self._tasks.remove(task_obj)
+        return len(self._spool)
 
     def pop_task(self, correlation_id) -> task.Task | None:
         """
@@ -307,9 +433,10 @@ class Consumer:
         """
         self._logger.debug("popping (searching) task using correlation_id", correlation_id=correlation_id)
         with self._tasks_lock:
-            for i in range(len(self._tasks)):
-                if self._tasks[i].correlation_id == correlation_id:
-                    self._logger.debug("task popping (search) succeeded", correlation_id=correlation_id)
-                    return self._tasks.pop(i)
+            task_obj = self._tasks.pop(correlation_id, None)
 
-        self._logger.debug("task popping (search) failed", correlation_id=correlation_id)
+        if task_obj is None:
+            self._logger.debug("task popping (search) failed", correlation_id=correlation_id)
+        else:
+            self._logger.debug("task popping (search) succeeded", correlation_id=correlation_id)
+        return task_obj
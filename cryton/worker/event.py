@@ -1,12 +1,12 @@
-from multiprocessing import Pipe
-from queue import PriorityQueue
+from concurrent.futures import Future
 from dataclasses import asdict
 
 from cryton.worker.utility import util, constants as co, logger
+from cryton.worker.utility.admission import admission_controller
 
 
 class Event:
-    def __init__(self, event_details: dict, main_queue: PriorityQueue):
+    def __init__(self, event_details: dict, main_queue: util.MainQueue):
         """
         Class for processing events.
         :param event_details: Received event details
@@ -15,7 +15,16 @@ class Event:
         self._logger = logger.logger.bind(event_details=event_details)
         self._event_details = event_details
         self._main_queue = main_queue
-        self._response_pipe, self._request_pipe = Pipe(False)
+
+    def _request(self, request: dict) -> dict:
+        """
+        Send the request to the Worker and wait for its result.
+        :param request: Request for the Worker (without the co.RESULT_FUTURE)
+        :return: Result of the request
+        """
+        result_future = Future()
+        self._main_queue.put(util.PrioritizedItem(co.MEDIUM_PRIORITY, request | {co.RESULT_FUTURE: result_future}))
+        return result_future.result()
 
     def validate_module(self) -> dict:
         """
@@ -34,12 +43,7 @@ class Event:
         """
         self._logger.debug("running event: stop_step_execution")
         correlation_id = self._event_details.get(co.CORRELATION_ID)
-        item = util.PrioritizedItem(
-            co.MEDIUM_PRIORITY,
-            {co.ACTION: co.ACTION_STOP_TASK, co.RESULT_PIPE: self._request_pipe, co.CORRELATION_ID: correlation_id},
-        )
-        self._main_queue.put(item)
-        return self._response_pipe.recv()
+        return self._request({co.ACTION: co.ACTION_STOP_TASK, co.CORRELATION_ID: correlation_id})
 
     def health_check(self) -> dict:
         """
@@ -48,7 +52,7 @@ class Event:
         """
         self._logger.debug("running event: health_check")
         result = co.CODE_OK
-        return {co.RESULT: result}
+        return {co.RESULT: result, co.TASKS: admission_controller.stats()}
 
     def add_trigger(self) -> dict:
         """
@@ -56,12 +60,7 @@ class Event:
         :return: Details about the event result
         """
         self._logger.debug("running event: add_trigger")
-        item = util.PrioritizedItem(
-            co.MEDIUM_PRIORITY,
-            {co.ACTION: co.ACTION_ADD_TRIGGER, co.RESULT_PIPE: self._request_pipe, co.DATA: self._event_details},
-        )
-        self._main_queue.put(item)
-        return self._response_pipe.recv()
+        return self._request({co.ACTION: co.ACTION_ADD_TRIGGER, co.DATA: self._event_details})
 
     def remove_trigger(self) -> dict:
         """
@@ -69,9 +68,4 @@ class Event:
         :return: Details about the event result
         """
         self._logger.debug("running event: remove_trigger")
-        item = util.PrioritizedItem(
-            co.MEDIUM_PRIORITY,
-            {co.ACTION: co.ACTION_REMOVE_TRIGGER, co.RESULT_PIPE: self._request_pipe, co.DATA: self._event_details},
-        )
-        self._main_queue.put(item)
-        return self._response_pipe.recv()
+        return self._request({co.ACTION: co.ACTION_REMOVE_TRIGGER, co.DATA: self._event_details})
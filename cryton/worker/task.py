@@ -1,34 +1,57 @@
 from click import echo
-from multiprocessing import Process, get_context, connection
-from queue import PriorityQueue
-from threading import Thread
+from multiprocessing.process import BaseProcess
+from threading import Thread, Lock, Event
 import amqpstorm
 import json
+import signal
+import time
 import traceback
 from jsonschema import validate, ValidationError
-from typing import Callable
+from typing import Any, Callable
 from dataclasses import asdict
 from importlib import import_module
 from uuid import uuid1
 
 from cryton.worker import event
 from cryton.worker.utility import util, constants as co, logger
+from cryton.worker.utility.exceptions import ExecutorError
+from cryton.worker.utility.executor import executor_pool
+from cryton.worker.utility.admission import admission_controller
+from cryton.worker.utility.spool import MessageSpool
+from cryton.worker.utility.metrics import metrics
+from cryton.worker.utility.limits import LimitedRun, get_limits, run_with_limits
 from cryton.lib.utility.module import ModuleOutput, Result
 
 
 class Task:
-    def __init__(self, message: amqpstorm.Message, main_queue: PriorityQueue, connection: amqpstorm.Connection):
+    def __init__(
+        self,
+        message: amqpstorm.Message,
+        main_queue: util.MainQueue,
+        connection: amqpstorm.Connection,
+        spool: MessageSpool,
+        on_finish: Callable[[], None] | None = None,
+    ):
         """
         Class for processing callbacks.
         :param message: Received RabbitMQ Message
         :param main_queue: Worker's queue for internal request processing
+        :param connection: RabbitMQ connection used for the replies
+        :param spool: Spool for the replies that can't be sent
+        :param on_finish: Called once the Task is processed (even if it failed)
         """
         self.message = message
         self.correlation_id = message.correlation_id
+        self.state = co.TASK_CREATED
+        self.result: str | None = None  # Reply with the result, once processed
+        self._on_finish = on_finish
         self._main_queue = main_queue
-        self._process: Process | None = None
+        self._process: BaseProcess | None = None
+        self._process_lock = Lock()
+        self._waiting = False  # Waiting for admission or the process, the stop is only requested
+        self._stop_requested = Event()
         self._connection = connection
-        self.undelivered_messages: list[util.UndeliveredMessage] = []
+        self._spool = spool
         self._logger = logger.logger.bind(correlation_id=self.correlation_id)
 
     def start(self):
@@ -45,7 +68,21 @@ class Task:
         """
         self._logger.debug("processing task")
         echo(f"Processing Task. correlation_id: {self.correlation_id}")
+        self.state = co.TASK_RUNNING
+        try:
+            self._process_message()
+        finally:
+            if self._on_finish is not None:
+                self._on_finish()
+
+        echo(f"Finished Task processing. correlation_id: {self.correlation_id}")
+        self._logger.debug("finished task processing")
 
+    def _process_message(self) -> None:
+        """
+        Execute callback for the message and send reply.
+        :return: None
+        """
         message_body = json.loads(self.message.body)
 
         # Confirm message was received if the ack_queue parameter is defined.
@@ -59,20 +96,17 @@ class Task:
         else:
             result = self._execute(message_body)
 
-        result_json = json.dumps(result)
-        reply_sent = self.reply(result_json)
+        self.result = json.dumps(result)
+        reply_sent = self.reply(self.result)
+        self.state = co.TASK_FINISHED if reply_sent else co.TASK_UNDELIVERED
 
         # TODO: instead of sending a message like this, it might be easier to go through the tasks and check if
         #   they're finished, less messages == better
-        # Remove Task from Consumer
-        if reply_sent:
-            item = util.PrioritizedItem(
-                co.HIGH_PRIORITY, {co.ACTION: co.ACTION_FINISH_TASK, co.CORRELATION_ID: self.correlation_id}
-            )
-            self._main_queue.put(item)
-
-        echo(f"Finished Task processing. correlation_id: {self.correlation_id}")
-        self._logger.debug("finished task processing")
+        # Remove Task from Consumer (the undelivered reply is in the spool)
+        item = util.PrioritizedItem(
+            co.HIGH_PRIORITY, {co.ACTION: co.ACTION_FINISH_TASK, co.CORRELATION_ID: self.correlation_id}
+        )
+        self._main_queue.put(item)
 
     def _execute(self, message_body: dict) -> dict:
         """
@@ -90,38 +124,41 @@ class Task:
         """
         pass
 
-    def _run_in_process(self, to_run: Callable, *args) -> ModuleOutput:
+    def _run_in_process(self, to_run: Callable, *args) -> Any:
         """
-        Run a method/callable in a new process.
+        Run a method/callable in a separate process (from the executor pool).
         :param to_run: Callable to run
         :param args: Arguments to pass to the callable
         :return: Result from the callable or a custom one in case of an error
         """
-        ctx = get_context("spawn")
-        response_pipe, request_pipe = ctx.Pipe()
-        # TODO: run in a logged process?
-        self._process = ctx.Process(target=self._pipe_results, args=(request_pipe, to_run, *args))
-        self._process.start()
-        self._process.join()
-
-        if self._process.exitcode == 0:
-            result = response_pipe.recv()
-        elif self._process.exitcode < 0:
-            result = ModuleOutput(result=Result.STOPPED)
-        else:
-            result = ModuleOutput(Result.ERROR, "An unknown error occurred.")
+        acquire_started_at = time.monotonic()
+        executor = executor_pool.acquire()
+        metrics.observe_spawn_time(time.monotonic() - acquire_started_at)
+        with self._process_lock:
+            self._waiting = False
+            if not self._stop_requested.is_set():
+                self._process = executor.process
 
-        return result
+        if self._process is None:
+            executor_pool.release(executor)
+            return ModuleOutput(result=Result.STOPPED)
 
-    @staticmethod
-    def _pipe_results(request_pipe: connection.Connection, to_run: Callable, *args) -> None:
-        """
-        Run a function and send its results into pipe.
-        :param request_pipe: Pipe for results
-        :param to_run: Callable to run
-        :return: None
-        """
-        request_pipe.send(to_run(*args))
+        try:
+            result = executor.run(to_run, *args)
+        except ExecutorError as ex:
+            if ex.exitcode == -signal.SIGXCPU:
+                result = ModuleOutput(Result.ERROR, "CPU time limit exceeded.")
+            elif ex.exitcode is not None and ex.exitcode < 0:
+                result = ModuleOutput(result=Result.STOPPED)
+            else:
+                result = ModuleOutput(Result.ERROR, "An unknown error occurred.")
+        finally:
+            # The process can be reused by another Task, it mustn't be stopped by this one anymore
+            with self._process_lock:
+                self._process = None
+            executor_pool.release(executor)
+
+        return result
 
     def stop(self) -> bool:
         """
@@ -129,9 +166,13 @@ class Task:
         :return: None
         """
         self._logger.debug("stopping task (its process)")
-        if self._process is not None and self._process.pid is not None and self._process.exitcode is None:
-            self._process.kill()
-            return True
+        with self._process_lock:
+            if self._waiting:
+                self._stop_requested.set()
+                return True
+            if self._process is not None and self._process.pid is not None and self._process.exitcode is None:
+                self._process.kill()
+                return True
         return False
 
     def send_ack(self, ack_queue: str) -> None:
@@ -146,7 +187,7 @@ class Task:
     def reply(self, message_body: str, recipient: str = None) -> bool:
         """
         Update properties and send response.
-        In case the channel contains errors, the message is saved.
+        In case the channel contains errors, the message is saved to the spool.
         :param message_body: Content to be sent inside the message
         :param recipient: On which queue to send the message (default: message.reply_to)
         :return: True, if the message was sent
@@ -161,30 +202,42 @@ class Task:
             channel = self._connection.channel()
         except amqpstorm.AMQPError:
             local_logger = self._logger.bind(uuid=str(uuid1()))
-            self.undelivered_messages.append(util.UndeliveredMessage(recipient, message_body, properties))
+            self._spool.add(util.UndeliveredMessage(recipient, message_body, properties))
             local_logger.error("unable to send the message", recipient=recipient)
             local_logger.debug("unable to send the message", message_body=message_body)
             return False
 
+        publish_started_at = time.monotonic()
         channel.queue.declare(recipient)
 
         message = amqpstorm.Message.create(channel, message_body, properties)
         message.publish(recipient)
 
         channel.close()
+        metrics.observe_reply_latency(time.monotonic() - publish_started_at)
 
         self._logger.debug("reply sent", queue=recipient, body=message_body)
         return True
 
 
 class AttackTask(Task):
-    def __init__(self, message: amqpstorm.Message, main_queue: PriorityQueue, connection: amqpstorm.Connection):
+    def __init__(
+        self,
+        message: amqpstorm.Message,
+        main_queue: util.MainQueue,
+        connection: amqpstorm.Connection,
+        spool: MessageSpool,
+        on_finish: Callable[[], None] | None = None,
+    ):
         """
         Class for processing attack callbacks.
         :param message: Received RabbitMQ Message
         :param main_queue: Worker's queue for internal request processing
+        :param connection: RabbitMQ connection used for the replies
+        :param spool: Spool for the replies that can't be sent
+        :param on_finish: Called once the Task is processed (even if it failed)
         """
-        super().__init__(message, main_queue, connection)
+        super().__init__(message, main_queue, connection, spool, on_finish)
 
     def _validate(self, message_body: dict) -> None:
         """
@@ -198,6 +251,15 @@ class AttackTask(Task):
                 co.ACK_QUEUE: {"type": "string"},
                 co.MODULE: {"type": "string"},
                 co.ARGUMENTS: {"type": "object"},
+                co.RESOURCE_LIMITS: {
+                    "type": "object",
+                    "properties": {
+                        "cpu_time": {"type": "integer", "minimum": 0},
+                        "memory": {"type": "integer", "minimum": 0},
+                        "open_files": {"type": "integer", "minimum": 0},
+                    },
+                    "additionalProperties": False,
+                },
             },
             "required": [co.ACK_QUEUE, co.MODULE, co.ARGUMENTS],
         }
@@ -213,20 +275,47 @@ class AttackTask(Task):
         self._logger.debug("running attacktask._execute()")
         module = message_body.pop(co.MODULE)
         arguments = message_body.pop(co.ARGUMENTS)
-        result = asdict(self._run_in_process(util.run_module, *(module, arguments)))
-        self._logger.debug("finished attacktask._execute()")
+        limits = get_limits(module, message_body.pop(co.RESOURCE_LIMITS, None))
+        with self._process_lock:
+            self._waiting = True
+
+        if not admission_controller.admit(module, self._stop_requested):
+            return asdict(ModuleOutput(result=Result.STOPPED))
+        started_at = time.monotonic()
+        try:
+            run = self._run_in_process(run_with_limits, limits, util.run_module, module, arguments)
+        finally:
+            admission_controller.release(module)
+        # The process can end before it reports its usage
+        output, usage = (run.result, run.usage) if isinstance(run, LimitedRun) else (run, None)
+        metrics.observe_execution(module, str(output.result), time.monotonic() - started_at)
+        self._logger.debug("finished attacktask._execute()", resource_usage=usage)
+
+        result = asdict(output)
+        if usage is not None:
+            result[co.RESOURCE_USAGE] = usage
 
         return result
 
 
 class ControlTask(Task):
-    def __init__(self, message: amqpstorm.Message, main_queue: PriorityQueue, connection: amqpstorm.Connection):
+    def __init__(
+        self,
+        message: amqpstorm.Message,
+        main_queue: util.MainQueue,
+        connection: amqpstorm.Connection,
+        spool: MessageSpool,
+        on_finish: Callable[[], None] | None = None,
+    ):
         """
         Class for processing control callbacks.
         :param message: Received RabbitMQ Message
         :param main_queue: Worker's queue for internal request processing
+        :param connection: RabbitMQ connection used for the replies
+        :param spool: Spool for the replies that can't be sent
+        :param on_finish: Called once the Task is processed (even if it failed)
         """
-        super().__init__(message, main_queue, connection)
+        super().__init__(message, main_queue, connection, spool, on_finish)
 
     def _validate(self, message_body: dict) -> None:
         """
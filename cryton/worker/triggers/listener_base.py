@@ -1,12 +1,11 @@
 from click import echo
 from threading import Lock
-from queue import PriorityQueue
 
 from cryton.worker.utility import logger, constants as co, util
 
 
 class Listener:
-    def __init__(self, main_queue: PriorityQueue):
+    def __init__(self, main_queue: util.MainQueue):
         """
         Base class for Triggers.
         :param main_queue: Worker's queue for internal request processing
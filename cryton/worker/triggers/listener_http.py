@@ -2,10 +2,9 @@ from click import echo
 import bottle
 from wsgiref.simple_server import make_server, WSGIRequestHandler
 from threading import Thread
-from queue import PriorityQueue
 from uuid import uuid1
 
-from cryton.worker.utility import constants as co
+from cryton.worker.utility import constants as co, util
 from cryton.worker.triggers import Listener
 
 
@@ -42,7 +41,7 @@ class MyWSGIRefServer(bottle.ServerAdapter):
 
 
 class HTTPListener(Listener):
-    def __init__(self, main_queue: PriorityQueue, port: int, host: str = "0.0.0.0"):
+    def __init__(self, main_queue: util.MainQueue, port: int, host: str = "0.0.0.0"):
         """
         Class for HTTPListeners (wrapper for Bottle).
         :param main_queue: Worker's queue for internal request processing
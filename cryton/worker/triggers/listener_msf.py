@@ -1,15 +1,14 @@
 from click import echo
 from threading import Thread
-from queue import PriorityQueue
 from uuid import uuid1
 
-from cryton.worker.utility import constants as co, exceptions
+from cryton.worker.utility import constants as co, exceptions, util
 from cryton.worker.triggers import Listener
 from cryton.modules.metasploit.module import Module
 
 
 class MSFListener(Listener):
-    def __init__(self, main_queue: PriorityQueue):
+    def __init__(self, main_queue: util.MainQueue):
         """
         Class for MSFListeners.
         :param main_queue: Worker's queue for internal request processing
@@ -0,0 +1,124 @@
+import os
+import time
+from collections import Counter
+from threading import Condition, Event
+
+from cryton.worker.config.settings import SETTINGS
+
+CHECK_INTERVAL = 1
+
+
+def get_cpu_load() -> float | None:
+    """
+    Get the system load (1 minute average) per CPU in percent.
+    :return: CPU load, or None if it can't be determined
+    """
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1) * 100
+    except OSError:
+        return None
+
+
+def get_available_memory() -> float | None:
+    """
+    Get the memory available for new processes in percent (Linux only).
+    :return: Available memory, or None if it can't be determined
+    """
+    try:
+        with open("/proc/meminfo") as meminfo:
+            values = {key: int(value.split()[0]) for key, value in (line.split(":", 1) for line in meminfo)}
+        return values["MemAvailable"] / values["MemTotal"] * 100
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+class AdmissionController:
+    def __init__(self, module_limits: dict[str, int], max_cpu_load: int, min_available_memory: int):
+        """
+        Decide when a module can run, so the shared resources (and the Worker itself) aren't overloaded.
+        Modules wait until they're under their concurrency limit and the system has enough free CPU and memory.
+        The resource limits are ignored when nothing is running, so the tasks can't wait forever.
+        :param module_limits: Maximum number of concurrent executions for each module (missing for no limit)
+        :param max_cpu_load: CPU load (in percent) above which the modules wait, 0 for no limit
+        :param min_available_memory: Available memory (in percent) under which the modules wait, 0 for no limit
+        """
+        self.module_limits = module_limits
+        self.max_cpu_load = max_cpu_load
+        self.min_available_memory = min_available_memory
+        self._condition = Condition()
+        self._running: Counter[str] = Counter()
+        self._queued: Counter[str] = Counter()
+        self._resources_checked_at = 0.0
+        self._resources_available = True
+
+    def _check_resources(self) -> bool:
+        """
+        Check the system resources (at most once per CHECK_INTERVAL).
+        :return: True if there are enough free resources
+        """
+        if not self.max_cpu_load and not self.min_available_memory:
+            return True
+
+        if time.monotonic() - self._resources_checked_at >= CHECK_INTERVAL:
+            cpu_load = get_cpu_load() if self.max_cpu_load else None
+            available_memory = get_available_memory() if self.min_available_memory else None
+            self._resources_available = (cpu_load is None or cpu_load <= self.max_cpu_load) and (
+                available_memory is None or available_memory >= self.min_available_memory
+            )
+            self._resources_checked_at = time.monotonic()
+
+        return self._resources_available
+
+    def _can_run(self, module: str) -> bool:
+        if (limit := self.module_limits.get(module)) is not None and self._running[module] >= limit:
+            return False
+
+        return self._running.total() == 0 or self._check_resources()
+
+    def admit(self, module: str, stopped: Event) -> bool:
+        """
+        Wait until the module can run and reserve a slot for it.
+        :param module: Module name
+        :param stopped: Stop waiting once set
+        :return: True if the module can run (call `release` once it finishes), False if stopped
+        """
+        with self._condition:
+            self._queued[module] += 1
+            try:
+                while not self._can_run(module):
+                    if stopped.is_set():
+                        return False
+                    self._condition.wait(CHECK_INTERVAL)
+
+                if stopped.is_set():
+                    return False
+                self._running[module] += 1
+                return True
+            finally:
+                self._queued[module] -= 1
+
+    def release(self, module: str) -> None:
+        """
+        Free the module's slot.
+        :param module: Module name
+        :return: None
+        """
+        with self._condition:
+            self._running[module] -= 1
+            self._condition.notify_all()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Get numbers of running and queued (waiting for admission) executions for each module.
+        :return: Running and queued executions
+        """
+        with self._condition:
+            return {
+                "running": {module: count for module, count in self._running.items() if count},
+                "queued": {module: count for module, count in self._queued.items() if count},
+            }
+
+
+admission_controller = AdmissionController(
+    SETTINGS.admission.module_limits, SETTINGS.admission.max_cpu_load, SETTINGS.admission.min_available_memory
+)
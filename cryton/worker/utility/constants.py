@@ -4,7 +4,7 @@ from datetime import datetime
 ACTION = "action"
 CORRELATION_ID = "correlation_id"
 DATA = "data"
-RESULT_PIPE = "result_pipe"
+RESULT_FUTURE = "result_future"
 QUEUE_NAME = "queue_name"
 PROPERTIES = "properties"
 HIGH_PRIORITY = 0
@@ -17,7 +17,13 @@ ACTION_FINISH_TASK = "_finish_task"
 ACTION_ADD_TRIGGER = "_add_trigger"
 ACTION_REMOVE_TRIGGER = "_remove_trigger"
 ACTION_SEND_MESSAGE = "_send_message"
-ACTION_SHUTDOWN_THREADED_PROCESSOR = "shutdown_threaded_processor"
+ACTION_SHUTDOWN_PROCESSOR = "shutdown_processor"
+
+# Task states
+TASK_CREATED = "created"
+TASK_RUNNING = "running"
+TASK_FINISHED = "finished"
+TASK_UNDELIVERED = "undelivered"  # Finished, but the reply couldn't be sent
 
 # Event types
 EVENT_TRIGGER_STAGE = "TRIGGER_STAGE"
@@ -38,6 +44,8 @@ ACK_QUEUE = "ack_queue"
 
 MODULE = "module"
 ARGUMENTS = "arguments"
+RESOURCE_LIMITS = "resource_limits"
+RESOURCE_USAGE = "resource_usage"
 
 # Other constants
 RESULT = "result"
@@ -45,3 +53,4 @@ OUTPUT = "output"
 CODE_ERROR = "error"
 CODE_OK = "ok"
 REPLY_TO = "reply_to"
+TASKS = "tasks"
@@ -23,3 +23,12 @@ class TooManyTriggers(ListenerError):
     def __init__(self, trigger_type: str):
         self.message = f"Listener '{trigger_type}' can't contain more triggers."
         super().__init__(self.message)
+
+
+class ExecutorError(Error):
+    """Exception raised when Executor's process ends before sending the result."""
+
+    def __init__(self, exitcode: int | None):
+        self.exitcode = exitcode
+        self.message = f"Executor's process ended with exit code {exitcode}."
+        super().__init__(self.message)
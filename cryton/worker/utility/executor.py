@@ -0,0 +1,200 @@
+from multiprocessing import get_context, connection
+from multiprocessing.context import SpawnContext
+from threading import Thread, Lock, Event
+from typing import Callable, Any
+
+from cryton.worker.config.settings import SETTINGS
+from cryton.worker.utility import logger
+from cryton.worker.utility.exceptions import ExecutorError
+from cryton.worker.utility.module_registry import module_registry
+
+SHUTDOWN_TIMEOUT = 5
+
+
+def _serve(request_pipe: connection.Connection, preload_modules: bool) -> None:
+    """
+    Run the received callables and send back their results until told to stop.
+    An exception ends the process (with a nonzero exit code), so no state is carried over to the next execution.
+    :param request_pipe: Pipe for requests and results
+    :param preload_modules: Import the modules before accepting requests
+    :return: None
+    """
+    try:
+        if preload_modules:
+            module_registry.preload()
+
+        while (request := request_pipe.recv()) is not None:
+            to_run, args = request
+            request_pipe.send(to_run(*args))
+    except (EOFError, KeyboardInterrupt):  # The Worker is gone or exiting
+        pass
+
+
+class Executor:
+    def __init__(self, context: SpawnContext, preload_modules: bool):
+        """
+        Process running callables sent to it one after another.
+        :param context: Multiprocessing context
+        :param preload_modules: Import the modules on start
+        """
+        self._pipe, request_pipe = context.Pipe()
+        self.process = context.Process(target=_serve, args=(request_pipe, preload_modules))
+        self.process.start()
+        request_pipe.close()  # Otherwise the reading wouldn't notice the process died
+        self.tasks = 0
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def run(self, to_run: Callable, *args) -> Any:
+        """
+        Run a callable in the process.
+        :param to_run: Callable to run (must be picklable)
+        :param args: Arguments to pass to the callable
+        :return: Result from the callable
+        :raises ExecutorError: If the process ended before sending the result
+        """
+        self.tasks += 1
+        try:
+            self._pipe.send((to_run, args))
+            return self._pipe.recv()
+        except (EOFError, OSError):
+            self.process.join()
+            raise ExecutorError(self.process.exitcode)
+
+    def kill(self) -> None:
+        self.process.kill()
+
+    def close(self) -> None:
+        """
+        Tell the process to exit (without waiting for it).
+        :return: None
+        """
+        try:
+            self._pipe.send(None)
+        except OSError:
+            pass
+        self._pipe.close()
+
+
+class ExecutorPool:
+    def __init__(self, size: int, max_tasks: int, preload_modules: bool = True):
+        """
+        Pool of warm executor processes, so the module executions don't pay for the process startup and imports.
+        Each execution gets its own process, which is returned to the pool afterward (unless it was killed).
+        :param size: Number of processes in the pool (0 starts a new process for each execution)
+        :param max_tasks: Number of executions after which the process is replaced (0 for no limit)
+        :param preload_modules: Import the modules in the pool's processes
+        """
+        self.size = size
+        self.max_tasks = max_tasks
+        self._preload_modules = preload_modules
+        self._context = get_context("spawn")
+        self._members: set[Executor] = set()
+        self._idle: list[Executor] = []
+        self._lock = Lock()
+        self._refill = Event()
+        self._stopped = Event()
+        self._stopped.set()  # Executors are kept only while the pool is running
+        self._thread: Thread | None = None
+        self._logger = logger.logger.bind()
+
+    def start(self) -> None:
+        """
+        Start filling the pool in a thread.
+        :return: None
+        """
+        if self.size <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+
+        self._stopped.clear()
+        self._refill.set()
+        self._thread = Thread(target=self._keep_filled, daemon=True)
+        self._thread.start()
+        self._logger.debug("executor pool started", size=self.size, max_tasks=self.max_tasks)
+
+    def _keep_filled(self) -> None:
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            while not self._stopped.is_set():
+                with self._lock:
+                    if len(self._members) >= self.size:
+                        break
+
+                try:  # Slow, the pool isn't locked meanwhile
+                    executor = Executor(self._context, self._preload_modules)
+                except Exception as ex:
+                    self._logger.error("unable to start executor", error=str(ex))
+                    break
+                with self._lock:
+                    if not self._stopped.is_set():
+                        self._members.add(executor)
+                        self._idle.append(executor)
+                        continue
+                executor.close()
+
+            if self._stopped.is_set():
+                return
+
+    def acquire(self) -> Executor:
+        """
+        Get an idle executor, or start a new one (outside the pool) if there is none.
+        :return: Executor reserved for the caller
+        """
+        with self._lock:
+            while self._idle:
+                if (executor := self._idle.pop()).is_alive():
+                    return executor
+                self._members.discard(executor)
+                self._refill.set()
+
+        # Started on demand, it imports only the module it runs
+        return Executor(self._context, False)
+
+    def release(self, executor: Executor) -> None:
+        """
+        Return the executor to the pool, or close it if it's dead, used up, or not from the pool.
+        :param executor: Executor to return
+        :return: None
+        """
+        with self._lock:
+            if executor not in self._members:
+                executor.close()
+                return
+
+            if (
+                not self._stopped.is_set()
+                and executor.is_alive()
+                and (self.max_tasks <= 0 or executor.tasks < self.max_tasks)
+            ):
+                self._idle.append(executor)
+                return
+
+            self._members.discard(executor)
+            self._refill.set()
+
+        self._logger.debug("replacing executor", pid=executor.process.pid, tasks=executor.tasks)
+        executor.close()
+
+    def shutdown(self) -> None:
+        """
+        Stop filling the pool and close the idle executors. Running executions are not interrupted.
+        :return: None
+        """
+        self._stopped.set()
+        self._refill.set()
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._members.clear()
+
+        for executor in idle:
+            executor.close()
+        for executor in idle:
+            executor.process.join(SHUTDOWN_TIMEOUT)
+            if executor.is_alive():
+                executor.kill()
+        self._logger.debug("executor pool stopped")
+
+
+executor_pool = ExecutorPool(SETTINGS.executor.pool_size, SETTINGS.executor.max_tasks)
@@ -0,0 +1,174 @@
+import math
+import resource
+import signal
+from dataclasses import dataclass, fields
+from typing import Any, Callable
+
+from cryton.worker.config.settings import SETTINGS
+
+_executions = 0  # Executions run in this (executor) process
+
+
+class ResourceLimitExceeded(Exception):
+    """Exception raised in the module when it exceeds its CPU time limit."""
+
+
+@dataclass
+class ResourceLimits:
+    """
+    Limits of a module execution, 0 for no limit.
+    The limits apply to the executor process; the module's subprocesses inherit them.
+    """
+
+    cpu_time: int = 0  # Seconds of CPU time
+    memory: int = 0  # Address space in MiB
+    open_files: int = 0
+
+    @classmethod
+    def from_dict(cls, limits: dict) -> "ResourceLimits":
+        names = {limit.name for limit in fields(cls)}
+        return cls(**{name: int(value) for name, value in limits.items() if name in names})
+
+    def merge(self, other: "ResourceLimits") -> "ResourceLimits":
+        """
+        Combine with other limits, the stricter one wins.
+        :param other: Limits to combine with
+        :return: Combined limits
+        """
+        merged = dict()
+        for limit in fields(self):
+            values = [value for value in (getattr(self, limit.name), getattr(other, limit.name)) if value]
+            merged[limit.name] = min(values, default=0)
+
+        return ResourceLimits(**merged)
+
+
+@dataclass
+class LimitedRun:
+    result: Any
+    usage: dict[str, float]
+
+
+def get_limits(module: str, task_limits: dict | None = None) -> ResourceLimits:
+    """
+    Get limits for the module execution.
+    :param module: Module name
+    :param task_limits: Limits requested for the execution
+    :return: The module's limits (the default ones for the unlisted limits) combined with the requested ones
+    """
+    settings = SETTINGS.limits
+    limits = ResourceLimits.from_dict(
+        {"cpu_time": settings.cpu_time, "memory": settings.memory, "open_files": settings.open_files}
+        | settings.modules.get(module, {})
+    )
+    if task_limits:
+        limits = limits.merge(ResourceLimits.from_dict(task_limits))
+
+    return limits
+
+
+def _cpu_time(usage: resource.struct_rusage) -> float:
+    return usage.ru_utime + usage.ru_stime
+
+
+def _reset_peak_memory() -> bool:
+    """
+    Reset the peak resident memory of the process (`VmHWM`, Linux only).
+    :return: True if the peak was reset
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+
+    return True
+
+
+def _get_peak_memory() -> int | None:
+    """
+    Get the peak resident memory of the process since its last reset (Linux only).
+    :return: Peak memory in MiB, None if it can't be read
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def _raise_limit_exceeded(*_) -> None:
+    raise ResourceLimitExceeded("CPU time limit exceeded.")
+
+
+def _set_soft_limit(limit: int, value: int) -> tuple[int, int]:
+    """
+    Lower the soft limit (the hard limit stays, so it can be restored).
+    :param limit: Resource
+    :param value: New soft limit
+    :return: Original limits
+    """
+    soft, hard = resource.getrlimit(limit)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(limit, (value, hard))
+    return soft, hard
+
+
+def run_with_limits(limits: ResourceLimits, to_run: Callable, *args) -> LimitedRun:
+    """
+    Run a callable with the limits applied and measure the resources it used.
+    Meant to be run in an executor process; the original limits are restored afterward.
+    :param limits: Limits to apply
+    :param to_run: Callable to run
+    :param args: Arguments to pass to the callable
+    :return: Result from the callable and the used resources
+    """
+    global _executions
+    _executions += 1
+    peak_memory_reset = _reset_peak_memory()
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    original_limits = dict()
+    if limits.cpu_time:  # The CPU time is counted for the whole life of the process
+        limit = math.ceil(_cpu_time(self_before)) + limits.cpu_time
+        original_limits[resource.RLIMIT_CPU] = _set_soft_limit(resource.RLIMIT_CPU, limit)
+        original_handler = signal.signal(signal.SIGXCPU, _raise_limit_exceeded)
+    if limits.memory:
+        original_limits[resource.RLIMIT_AS] = _set_soft_limit(resource.RLIMIT_AS, limits.memory * 1024 * 1024)
+    if limits.open_files:
+        original_limits[resource.RLIMIT_NOFILE] = _set_soft_limit(resource.RLIMIT_NOFILE, limits.open_files)
+
+    try:
+        result = to_run(*args)
+    finally:
+        for limit, original_limit in original_limits.items():
+            resource.setrlimit(limit, original_limit)
+        if limits.cpu_time:
+            signal.signal(signal.SIGXCPU, original_handler)
+
+    self_after = resource.getrusage(resource.RUSAGE_SELF)
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    usage = {
+        "cpu_time": round(_cpu_time(self_after) - _cpu_time(self_before), 3),
+        "children_cpu_time": round(_cpu_time(children_after) - _cpu_time(children_before), 3),
+        "block_reads": self_after.ru_inblock - self_before.ru_inblock,
+        "block_writes": self_after.ru_oublock - self_before.ru_oublock,
+    }
+
+    # ru_maxrss is the peak for the whole life of the (reused) executor, it's valid only for its first execution
+    max_memory = _get_peak_memory() if peak_memory_reset else None
+    if max_memory is None and _executions == 1:
+        max_memory = self_after.ru_maxrss // 1024
+    if max_memory is not None:
+        # The children's peak is known only if one of them exceeded the children from the previous executions
+        if children_after.ru_maxrss > children_before.ru_maxrss:
+            max_memory = max(max_memory, children_after.ru_maxrss // 1024)
+        usage["max_memory"] = max_memory  # In MiB
+
+    return LimitedRun(result, usage)
@@ -0,0 +1,193 @@
+import math
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Callable
+
+PREFIX = "cryton_worker"
+DURATION_BUCKETS = (1, 5, 10, 30, 60, 300, 600, 1800, 3600, math.inf)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, math.inf)
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+
+    escaped = {
+        key: value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n") for key, value in labels.items()
+    }
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return "+Inf" if value == math.inf else repr(float(value))
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        """
+        Distribution of the observed values.
+        :param buckets: Upper bounds of the buckets (the last one must be infinity)
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self, name: str, labels: dict[str, str]) -> list[str]:
+        """
+        Get the histogram lines in the Prometheus text format.
+        :param name: Metric name
+        :param labels: Metric labels
+        :return: Bucket, sum, and count lines
+        """
+        lines = []
+        cumulative_count = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            cumulative_count += count
+            bucket_labels = _format_labels(labels | {"le": _format_value(bucket)})
+            lines.append(f"{name}_bucket{bucket_labels} {cumulative_count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative_count}")
+        return lines
+
+
+@dataclass
+class Gauge:
+    """
+    Current value(s) of a metric collected when the metrics are requested.
+    Values are mapped by the value of the label, use an empty label for a single value.
+    """
+
+    name: str
+    description: str
+    label: str
+    values: dict[str, float]
+
+
+class Metrics:
+    def __init__(self):
+        """
+        Worker's runtime metrics. Counters and histograms are updated by the Tasks, gauges are collected on request.
+        """
+        self._lock = Lock()
+        self._finished: Counter[tuple[str, str]] = Counter()
+        self._durations: dict[str, Histogram] = dict()
+        self._spawn_time = Histogram(LATENCY_BUCKETS)
+        self._reply_latency = Histogram(LATENCY_BUCKETS)
+
+    def observe_execution(self, module: str, result: str, duration: float) -> None:
+        """
+        Record a finished module execution.
+        :param module: Module name
+        :param result: Result of the execution
+        :param duration: Duration of the execution in seconds
+        :return: None
+        """
+        with self._lock:
+            self._finished[(module, result)] += 1
+            self._durations.setdefault(module, Histogram(DURATION_BUCKETS)).observe(duration)
+
+    def observe_spawn_time(self, duration: float) -> None:
+        """
+        Record the time it took to get a process for a module execution.
+        :param duration: Duration in seconds
+        :return: None
+        """
+        with self._lock:
+            self._spawn_time.observe(duration)
+
+    def observe_reply_latency(self, duration: float) -> None:
+        """
+        Record the time it took to publish a reply.
+        :param duration: Duration in seconds
+        :return: None
+        """
+        with self._lock:
+            self._reply_latency.observe(duration)
+
+    def render(self, gauges: list[Gauge]) -> str:
+        """
+        Get the metrics in the Prometheus text format.
+        :param gauges: Current values to add
+        :return: Metrics
+        """
+        lines = []
+
+        def add_header(name: str, description: str, metric_type: str):
+            lines.append(f"# HELP {PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {PREFIX}_{name} {metric_type}")
+
+        for gauge in gauges:
+            add_header(gauge.name, gauge.description, "gauge")
+            for label_value, value in gauge.values.items():
+                labels = {gauge.label: label_value} if gauge.label else {}
+                lines.append(f"{PREFIX}_{gauge.name}{_format_labels(labels)} {_format_value(value)}")
+
+        with self._lock:
+            add_header("tasks_finished_total", "Finished module executions.", "counter")
+            for (module, result), count in sorted(self._finished.items()):
+                lines.append(
+                    f"{PREFIX}_tasks_finished_total{_format_labels({'module': module, 'result': result})} {count}"
+                )
+
+            add_header("module_duration_seconds", "Duration of the module executions.", "histogram")
+            for module, histogram in sorted(self._durations.items()):
+                lines.extend(histogram.samples(f"{PREFIX}_module_duration_seconds", {"module": module}))
+
+            add_header("process_spawn_seconds", "Time to get a process for a module execution.", "histogram")
+            lines.extend(self._spawn_time.samples(f"{PREFIX}_process_spawn_seconds", {}))
+
+            add_header("reply_publish_seconds", "Time to publish a reply.", "histogram")
+            lines.extend(self._reply_latency.samples(f"{PREFIX}_reply_publish_seconds", {}))
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, host: str, port: int, render: Callable[[], str]):
+        """
+        HTTP server providing the metrics on the /metrics path.
+        :param host: Address to listen on
+        :param port: Port to listen on
+        :param render: Callable returning the metrics in the Prometheus text format
+        """
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, name="Thread-metrics", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+metrics = Metrics()
@@ -0,0 +1,87 @@
+import os
+from importlib import import_module, invalidate_caches
+from pkgutil import iter_modules
+from threading import Lock
+from types import ModuleType
+
+
+class ModuleRegistry:
+    def __init__(self, namespace: str):
+        """
+        Registry of the modules in a namespace. The names are discovered once and each module is imported on first use.
+        The namespace directories are checked for changes when a name is missing, so new modules don't need a restart.
+        :param namespace: Namespace package containing the modules
+        """
+        self._namespace = namespace
+        self._lock = Lock()
+        self._names: set[str] = set()
+        self._modules: dict[str, ModuleType] = dict()
+        self._snapshot: dict[str, int | None] | None = None
+
+    @staticmethod
+    def _take_snapshot(directories: list[str]) -> dict[str, int | None]:
+        snapshot = dict()
+        for directory in directories:
+            try:
+                snapshot[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                snapshot[directory] = None
+
+        return snapshot
+
+    def _refresh(self) -> None:
+        """
+        Discover the module names again if the namespace directories changed (must be called with the lock held).
+        :return: None
+        """
+        namespace = import_module(self._namespace)
+        directories = list(namespace.__path__)
+        if (snapshot := self._take_snapshot(directories)) == self._snapshot:
+            return
+
+        invalidate_caches()  # The import system caches the directory listings
+        self._names = {name for _, name, is_package in iter_modules(directories) if is_package}
+        self._modules = {name: module for name, module in self._modules.items() if name in self._names}
+        self._snapshot = snapshot
+
+    def names(self) -> set[str]:
+        """
+        Get names of the available modules.
+        :return: Module names
+        """
+        with self._lock:
+            self._refresh()
+            return set(self._names)
+
+    def get(self, name: str) -> ModuleType:
+        """
+        Get the module, import it if it wasn't used yet.
+        :param name: Module name
+        :return: Imported module
+        :raises KeyError: If the module doesn't exist
+        """
+        with self._lock:
+            if (module := self._modules.get(name)) is not None:
+                return module
+
+            if name not in self._names:
+                self._refresh()
+                if name not in self._names:
+                    raise KeyError(name)
+
+            module = self._modules[name] = import_module(f"{self._namespace}.{name}.module")
+            return module
+
+    def preload(self) -> None:
+        """
+        Import all the modules. A module that can't be imported is skipped, its use will report the error.
+        :return: None
+        """
+        for name in self.names():
+            try:
+                self.get(name)
+            except Exception:
+                pass
+
+
+module_registry = ModuleRegistry("cryton.modules")
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import time
+from threading import Lock
+from uuid import uuid4
+
+from cryton.worker.utility import constants as co
+
+PRUNE_INTERVAL = 3600  # Seconds between the removals of the expired requests
+
+
+class RequestTable:
+    def __init__(self, file_path: str, retention: int):
+        """
+        Persistent table of the attack requests processed by the Worker, keyed by their correlation ID.
+        It's used to recognize redelivered requests, so they aren't executed again.
+        The finished requests keep their result and are removed after the retention period.
+        :param file_path: Path to the SQLite database (created on the first use)
+        :param retention: How long (in seconds) to keep the finished requests
+        """
+        self._file_path = file_path
+        self._retention = retention
+        self._run_id = uuid4().hex  # Distinguishes the requests started by this run of the Worker
+        self._lock = Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pruned_at = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database, if it isn't open yet (must be called with the lock held).
+        :return: Database connection
+        """
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self._file_path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(self._file_path, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS requests "
+                "(correlation_id TEXT PRIMARY KEY, state TEXT, result TEXT, run_id TEXT, updated_at REAL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS requests_updated_at ON requests (updated_at)")
+
+        return self._connection
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        """
+        Remove the expired requests (at most once per PRUNE_INTERVAL, must be called with the lock held).
+        Running requests expire only if they were started by a previous run of the Worker, so they can't finish anymore.
+        :param connection: Database connection
+        :return: None
+        """
+        if time.time() - self._pruned_at < PRUNE_INTERVAL:
+            return
+
+        connection.execute(
+            "DELETE FROM requests WHERE (state = ? OR run_id != ?) AND updated_at < ?",
+            (co.TASK_FINISHED, self._run_id, time.time() - self._retention),
+        )
+        self._pruned_at = time.time()
+
+    def get(self, correlation_id: str) -> tuple[str, str | None, bool] | None:
+        """
+        Find the request.
+        :param correlation_id: Correlation ID of the request
+        :return: State, result, and whether this Worker run started it; None if the request isn't known
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT state, result, run_id FROM requests WHERE correlation_id = ?", (correlation_id,))
+                .fetchone()
+            )
+
+        if row is None:
+            return None
+        state, result, run_id = row
+        return state, result, run_id == self._run_id
+
+    def start(self, correlation_id: str) -> None:
+        """
+        Save the request as running.
+        :param correlation_id: Correlation ID of the request
+        :return: None
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO requests VALUES (?, ?, NULL, ?, ?)",
+                (correlation_id, co.TASK_RUNNING, self._run_id, time.time()),
+            )
+            self._prune(connection)
+
+    def finish(self, correlation_id: str, result: str) -> None:
+        """
+        Save the result of the request.
+        :param correlation_id: Correlation ID of the request
+        :param result: Result (reply) of the request
+        :return: None
+        """
+        with self._lock:
+            self._connect().execute(
+                "UPDATE requests SET state = ?, result = ?, updated_at = ? WHERE correlation_id = ?",
+                (co.TASK_FINISHED, result, time.time(), correlation_id),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
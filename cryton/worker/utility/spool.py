@@ -0,0 +1,164 @@
+import json
+import os
+from dataclasses import asdict
+from threading import Lock, Timer
+from typing import TextIO
+
+from cryton.worker.utility.util import UndeliveredMessage
+
+COMPACT_THRESHOLD = 1000  # Number of confirmed records after which the file is rewritten
+
+
+class MessageSpool:
+    def __init__(self, file_path: str, sync_interval: float):
+        """
+        Append-only file with the messages that couldn't be sent, so they survive a Worker restart.
+        Each line is a JSON record; a message is added with its ID and removed by a confirmation record.
+        Message properties that aren't JSON serializable (e.g. the timestamp) are saved as strings.
+        Writes are synced to the disk in batches (at most `sync_interval` after the write).
+        The file is compacted (rewritten with the pending messages only) once there are enough confirmations.
+        :param file_path: Path to the spool file (created on the first write)
+        :param sync_interval: Maximum delay (in seconds) before the written messages are synced to the disk
+        """
+        self._file_path = file_path
+        self._sync_interval = sync_interval
+        self._lock = Lock()
+        self._file: TextIO | None = None
+        self._sync_timer: Timer | None = None
+        self._pending: dict[int, UndeliveredMessage] | None = None  # Loaded on the first use
+        self._next_id = 1
+        self._confirmed_records = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._pending)
+
+    def _load(self) -> None:
+        """
+        Load the pending messages from the file, if it wasn't done yet (must be called with the lock held).
+        :return: None
+        """
+        if self._pending is not None:
+            return
+
+        self._pending = dict()
+        try:
+            with open(self._file_path) as spool_file:
+                for line in spool_file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:  # Partially written record (the Worker crashed while writing)
+                        continue
+
+                    if (confirmed := record.get("confirmed")) is not None:
+                        self._pending.pop(confirmed, None)
+                        self._confirmed_records += 1
+                    else:
+                        message_id = record.pop("id")
+                        self._pending[message_id] = UndeliveredMessage(**record)
+                        self._next_id = max(self._next_id, message_id + 1)
+        except FileNotFoundError:
+            return
+
+        if self._confirmed_records:
+            self._compact()
+
+    def _write(self, record: dict) -> None:
+        """
+        Append the record to the file and schedule the sync (must be called with the lock held).
+        :param record: Record to write
+        :return: None
+        """
+        if self._file is None:
+            os.makedirs(os.path.dirname(self._file_path) or ".", exist_ok=True)
+            self._file = open(self._file_path, "a")
+
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        if self._sync_timer is None:
+            self._sync_timer = Timer(self._sync_interval, self.sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _compact(self) -> None:
+        """
+        Replace the file with the one containing only the pending messages (must be called with the lock held).
+        :return: None
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        temporary_path = f"{self._file_path}.tmp"
+        with open(temporary_path, "w") as spool_file:
+            for message_id, message in self._pending.items():
+                spool_file.write(json.dumps({"id": message_id} | asdict(message), default=str) + "\n")
+            spool_file.flush()
+            os.fsync(spool_file.fileno())
+        os.replace(temporary_path, self._file_path)
+        self._confirmed_records = 0
+
+    def add(self, message: UndeliveredMessage) -> int:
+        """
+        Save the message.
+        :param message: Message to save
+        :return: ID of the message
+        """
+        with self._lock:
+            self._load()
+            message_id = self._next_id
+            self._next_id += 1
+            self._write({"id": message_id} | asdict(message))
+            self._pending[message_id] = message
+            return message_id
+
+    def pending(self) -> list[tuple[int, UndeliveredMessage]]:
+        """
+        Get the saved messages in the order they were added.
+        :return: IDs and messages
+        """
+        with self._lock:
+            self._load()
+            return list(self._pending.items())
+
+    def confirm(self, message_id: int) -> None:
+        """
+        Remove the message, once it was delivered.
+        :param message_id: ID of the message
+        :return: None
+        """
+        with self._lock:
+            self._load()
+            if self._pending.pop(message_id, None) is None:
+                return
+
+            self._confirmed_records += 1
+            if not self._pending or self._confirmed_records >= COMPACT_THRESHOLD:
+                self._compact()
+            else:
+                self._write({"confirmed": message_id})
+
+    def sync(self) -> None:
+        """
+        Sync the written messages to the disk.
+        :return: None
+        """
+        with self._lock:
+            self._sync_timer = None
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Sync and close the file.
+        :return: None
+        """
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
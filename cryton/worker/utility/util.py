@@ -1,11 +1,12 @@
+import asyncio
 from types import ModuleType
-from importlib import import_module
-from pkgutil import iter_modules
+from threading import Lock
 import traceback
 import time
 from dataclasses import dataclass, field
 
 from cryton.lib.utility.module import ModuleBase, ModuleOutput, Result
+from cryton.worker.utility.module_registry import module_registry
 
 
 def run_module(name: str, arguments: dict, validate_only: bool = False) -> ModuleOutput:
@@ -48,12 +49,11 @@ def run_module(name: str, arguments: dict, validate_only: bool = False) -> Modul
 
 def get_module(name: str) -> type[ModuleBase]:
     """
-    Filter available modules and get matching module.
+    Get matching module from the module registry (imported on first use).
     :param name: Module name
     :return: Module class implementation
     """
-    available_modules = get_available_modules()
-    return available_modules[f"cryton.modules.{name}"].Module
+    return module_registry.get(name).Module
 
 
 def get_available_modules() -> dict[str, ModuleType]:
@@ -61,11 +61,7 @@ def get_available_modules() -> dict[str, ModuleType]:
     Get list of available modules.
     :return: Available modules
     """
-    modules_namespace = import_module("cryton.modules")
-    return {
-        name: import_module(f"{name}.module")
-        for finder, name, ispkg in iter_modules(modules_namespace.__path__, f"{modules_namespace.__name__}.")
-    }
+    return {f"cryton.modules.{name}": module_registry.get(name) for name in module_registry.names()}
 
 
 @dataclass(order=True)
@@ -79,7 +75,60 @@ class PrioritizedItem:
 
     priority: int
     item: dict = field(compare=False)
-    timestamp: int = time.time_ns()
+    timestamp: int = field(default_factory=time.time_ns)
+
+
+class MainQueue:
+    def __init__(self):
+        """
+        Priority queue for the Worker's internal requests.
+        Requests can be put from any thread, they're processed by the coroutines in the Worker's event loop.
+        Requests put before the event loop is bound are kept until then.
+        """
+        self._lock = Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.PriorityQueue | None = None
+        self._pending: list[PrioritizedItem] = []
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Bind the queue to the event loop (must be called from the event loop).
+        :param loop: Event loop processing the requests
+        :return: None
+        """
+        with self._lock:
+            self._queue = asyncio.PriorityQueue()
+            for item in self._pending:
+                self._queue.put_nowait(item)
+            self._pending.clear()
+            self._loop = loop
+
+    def put(self, item: PrioritizedItem) -> None:
+        """
+        Add a request to the queue (thread-safe).
+        :param item: Request to add
+        :return: None
+        """
+        with self._lock:
+            if self._loop is None:
+                self._pending.append(item)
+                return
+
+            try:
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+            except RuntimeError:  # The event loop is closed, the Worker is exiting
+                pass
+
+    async def get(self) -> PrioritizedItem:
+        """
+        Wait for the next request.
+        :return: Request with the highest priority
+        """
+        return await self._queue.get()
+
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._pending) if self._queue is None else self._queue.qsize()
 
 
 @dataclass
@@ -1,11 +1,17 @@
+import asyncio
+from collections import Counter
 from click import echo
-from threading import Thread, Lock, Event
-from queue import PriorityQueue
-import time
+from concurrent.futures import Future
+from threading import Thread, Event
+from typing import Awaitable, Callable
 import traceback
 
 from cryton.worker import consumer
 from cryton.worker.utility import constants as co, logger, util
+from cryton.worker.config.settings import SETTINGS
+from cryton.worker.utility.admission import admission_controller
+from cryton.worker.utility.executor import executor_pool
+from cryton.worker.utility.metrics import Gauge, MetricsServer, metrics
 from cryton.worker.triggers import Listener, ListenerEnum, ListenerIdentifiersEnum
 from cryton.lib.metasploit import MetasploitClientUpdated
 
@@ -19,13 +25,14 @@ class Worker:
         rabbit_password: str,
         worker_name: str,
         consumer_count: int,
-        processor_count: int,
         max_retries: int,
         persistent: bool,
         require_metasploit: bool,
+        max_attack_tasks: int = 0,
     ):
         """
-        Worker processes internal requests using self._main_queue and communicates with RabbitMQ server using Consumer.
+        Worker processes internal requests from self._main_queue as coroutines in its event loop and communicates with
+        RabbitMQ server using Consumer.
         :param rabbit_host: Rabbit's server port
         :param rabbit_port: Rabbit's server host
         :param rabbit_username: Rabbit's username
@@ -33,19 +40,20 @@ class Worker:
         :param worker_name: Worker name (prefix) for queues
         :param consumer_count: How many consumers to use for queues
         (higher == faster RabbitMQ requests consuming, but heavier processor usage)
-        :param processor_count: How many processors to use for internal requests
-        (higher == more responsive internal requests processing, but heavier processor usage)
         :param max_retries: How many times to try to connect
         :param persistent: Keep Worker alive and keep on trying forever (if True)
         :param require_metasploit: Require Metasploit on startup and keep on trying forever (if True)
+        :param max_attack_tasks: How many attack Tasks can run at once (0 for no limit)
         """
         self._name = worker_name
         self._require_metasploit = require_metasploit
         self._listeners: list[Listener] = []
-        self._triggers_lock = Lock()  # Lock to prevent modifying, while performing time-consuming actions.
+        self._triggers_lock = asyncio.Lock()  # Lock to prevent modifying, while performing time-consuming actions.
         self._stopped = Event()
-        self._main_queue = PriorityQueue()
-        self._processor_count = processor_count if processor_count > 0 else 1
+        self._main_queue = util.MainQueue()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: Thread | None = None
+        self._metrics_server: MetricsServer | None = None
         self._consumer = consumer.Consumer(
             self._main_queue,
             rabbit_host,
@@ -56,23 +64,25 @@ class Worker:
             consumer_count,
             max_retries,
             persistent,
+            max_attack_tasks,
         )
         self._logger = logger.logger.bind()
 
     def start(self) -> None:
         """
-        Start Consumer and processors in thread and keep self alive.
+        Start the event loop and Consumer in threads and wait until the Consumer stops.
         :return: None
         """
-        self._logger.debug("worker started", processor_count=self._processor_count)
+        self._logger.debug("worker started")
         echo(f"Starting Worker {self._name}..")
         echo("To exit press CTRL+C")
         try:
             self._check_metasploit_connection()
+            self._start_metrics_server()
+            executor_pool.start()
+            self._start_event_loop()
             self._start_consumer()
-            self._start_threaded_processors()
-            while not self._stopped.is_set() and self._consumer.is_running():  # Keep self alive and check for stops.
-                time.sleep(5)
+            self._consumer.wait()
 
         except KeyboardInterrupt:
             pass
@@ -110,35 +120,71 @@ class Worker:
 
     def stop(self) -> None:
         """
-        Stop Worker (self). Stop Consumer, processors and triggers.
+        Stop Worker (self). Stop Consumer, event loop, triggers, the executor pool and the metrics server.
         :return: None
         """
         self._logger.debug("stopping worker")
         echo("Exiting..")
-        self._consumer.stop()
+        self._consumer.stop()  # The Tasks are still finishing, the event loop must be running
         self._stopped.set()
-        self._stop_threaded_processors()
-        self._stop_listeners()
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._stop_listeners(), self._loop).result()
+            self._stop_event_loop()
+        executor_pool.shutdown()
+        if self._metrics_server is not None:
+            self._metrics_server.stop()
+
+    def _start_metrics_server(self) -> None:
+        """
+        Start the metrics server in thread, if enabled.
+        :return: None
+        """
+        if not SETTINGS.metrics.enabled:
+            return
 
-    def _start_threaded_processors(self) -> None:
+        self._logger.debug("starting metrics server", host=SETTINGS.metrics.host, port=SETTINGS.metrics.port)
+        self._metrics_server = MetricsServer(SETTINGS.metrics.host, SETTINGS.metrics.port, self._render_metrics)
+        self._metrics_server.start()
+        echo(f"Metrics available at http://{SETTINGS.metrics.host}:{self._metrics_server.port}/metrics")
+
+    def _render_metrics(self) -> str:
+        """
+        Collect the current state of the Worker and get all metrics in the Prometheus text format.
+        :return: Metrics
         """
-        Start processors in thread.
+        tasks = admission_controller.stats()
+        listener_types = {listener.value: listener.name for listener in ListenerEnum}
+        listeners = Counter(listener_types.get(type(listener_obj), "unknown") for listener_obj in list(self._listeners))
+        gauges = [
+            Gauge("tasks_running", "Running module executions.", "module", tasks["running"]),
+            Gauge("tasks_queued", "Module executions waiting for admission.", "module", tasks["queued"]),
+            Gauge("spool_messages", "Undelivered messages in the spool.", "", {"": self._consumer.spool_size()}),
+            Gauge("main_queue_depth", "Internal requests waiting for processing.", "", {"": self._main_queue.qsize()}),
+            Gauge("listeners", "Active listeners.", "type", dict(listeners)),
+        ]
+        return metrics.render(gauges)
+
+    def _start_event_loop(self) -> None:
+        """
+        Start the event loop processing the internal requests in thread.
         :return: None
         """
-        self._logger.debug("starting threaded processors", processor_count=self._processor_count)
-        for i in range(self._processor_count):
-            thread = Thread(target=self._threaded_processor, kwargs={"thread_id": i + 1}, name=f"Thread-{i}-processor")
-            thread.start()
+        self._logger.debug("starting event loop")
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = Thread(
+            target=self._loop.run_until_complete, args=(self._process_requests(),), name="Thread-event-loop"
+        )
+        self._loop_thread.start()
 
-    def _stop_threaded_processors(self) -> None:
+    def _stop_event_loop(self) -> None:
         """
-        Stop processors by sending shutdown request.
+        Stop processing the internal requests by sending shutdown request and wait for the event loop to finish.
         :return: None
         """
-        self._logger.debug("stopping threaded processors")
-        for _ in range(self._processor_count):
-            item = util.PrioritizedItem(co.LOW_PRIORITY, {co.ACTION: co.ACTION_SHUTDOWN_THREADED_PROCESSOR})
-            self._main_queue.put(item)
+        self._logger.debug("stopping event loop")
+        self._main_queue.put(util.PrioritizedItem(co.LOW_PRIORITY, {co.ACTION: co.ACTION_SHUTDOWN_PROCESSOR}))
+        self._loop_thread.join()
+        self._loop.close()
 
     def _start_consumer(self) -> None:
         """
@@ -149,65 +195,81 @@ class Worker:
         thread = Thread(target=self._consumer.start)
         thread.start()
 
-    def _stop_listeners(self) -> None:
+    async def _stop_listeners(self) -> None:
         """
         Stop all Listeners in self._listeners.
         :return: None
         """
         self._logger.debug("stopping all listeners")
-        with self._triggers_lock:
+        async with self._triggers_lock:
             while len(self._listeners) > 0:
                 listener_obj = self._listeners.pop(-1)
-                listener_obj.stop()
+                await asyncio.to_thread(listener_obj.stop)
 
-    def _threaded_processor(self, thread_id: int) -> None:
+    async def _process_requests(self) -> None:
         """
-        Start a processor for request processing.
-        :param thread_id: Fictional thread (processor) ID
+        Process the internal requests. Each request is processed in its own coroutine.
         :return: None
         """
-        local_logger = self._logger.bind(thread_id=thread_id)
-        local_logger.debug("threaded processor started")
-        while not self._stopped.is_set():
-            request: util.PrioritizedItem = self._main_queue.get()
-            local_logger.debug("processing request", request=request)
+        self._main_queue.bind(asyncio.get_running_loop())
+        self._logger.debug("request processing started")
+        processing: set[asyncio.Task] = set()
+        while True:
+            request: util.PrioritizedItem = await self._main_queue.get()
+            self._logger.debug("processing request", request=request)
             try:
                 request_action = request.item.pop(co.ACTION)
             except KeyError as ex:
-                local_logger.error("request doesn't contain action", error=str(ex))
+                self._logger.error("request doesn't contain action", error=str(ex))
                 continue
 
+            if request_action == co.ACTION_SHUTDOWN_PROCESSOR:
+                self._logger.debug("shutting down request processing")
+                break
+
             try:  # Try to get method reference.
                 action_callable = getattr(self, request_action)
             except AttributeError:
-                if request_action == co.ACTION_SHUTDOWN_THREADED_PROCESSOR:
-                    local_logger.debug("shutting down threaded processor")
-                    break
-                local_logger.warning("request contains unknown action", action=request_action)
+                self._logger.warning("request contains unknown action", action=request_action)
                 continue
 
-            try:  # Try to call method and process the request.
-                action_callable(request.item)
-            except Exception as ex:
-                local_logger.error("request threw an exception in the process", error=str(ex))
-                local_logger.debug(
-                    "request threw an exception in the process",
-                    request=request,
-                    error=str(ex),
-                    traceback=traceback.format_exc(),
-                )
-                continue
+            request_processing = asyncio.create_task(self._process_request(action_callable, request.item))
+            processing.add(request_processing)  # Keep the reference until the processing finishes
+            request_processing.add_done_callback(processing.discard)
 
-        local_logger.debug("threaded processor stopped")
+        if processing:
+            await asyncio.wait(processing)
+        self._logger.debug("request processing stopped")
 
-    def _stop_task(self, request: dict) -> None:
+    async def _process_request(self, action_callable: Callable[[dict], Awaitable[None]], request: dict) -> None:
+        """
+        Call the action and process the request. Waiting Events get an error result if the processing fails.
+        :param action_callable: Action processing the request
+        :param request: Data needed for the action
+        :return: None
+        """
+        result_future: Future | None = request.get(co.RESULT_FUTURE)
+        try:
+            await action_callable(request)
+        except Exception as ex:
+            self._logger.error("request threw an exception in the process", error=str(ex))
+            self._logger.debug(
+                "request threw an exception in the process",
+                request=request,
+                error=str(ex),
+                traceback=traceback.format_exc(),
+            )
+            if result_future is not None and not result_future.done():
+                result_future.set_result({co.RESULT: co.CODE_ERROR, co.OUTPUT: str(ex)})
+
+    async def _stop_task(self, request: dict) -> None:
         """
         Process; Stop running Task using correlation_id.
-        :param request: Data needed for process (Must contain: co.RESULT_PIPE, co.CORRELATION_ID)
+        :param request: Data needed for process (Must contain: co.RESULT_FUTURE, co.CORRELATION_ID)
         :return: None
         """
         self._logger.debug("calling process _stop_task", request=request)
-        result_pipe = request.pop(co.RESULT_PIPE)
+        result_future: Future = request.pop(co.RESULT_FUTURE)
         correlation_id = request.pop(co.CORRELATION_ID)
 
         task_obj = self._consumer.pop_task(correlation_id)
@@ -218,17 +280,17 @@ class Worker:
 
         else:  # Task found.
             try:
-                stop_action = task_obj.stop()
+                stop_action = await asyncio.to_thread(task_obj.stop)
                 result = {co.RESULT: co.CODE_OK if stop_action else co.CODE_ERROR}
 
             except Exception as ex:
                 self._logger.debug("couldn't stop the task", task_correlation_id=correlation_id, error=str(ex))
                 result = {co.RESULT: co.CODE_ERROR, co.OUTPUT: str(ex)}
 
-        result_pipe.send(result)
+        result_future.set_result(result)
         self._logger.debug("finished process _stop_task", result=result)
 
-    def _finish_task(self, request: dict) -> None:
+    async def _finish_task(self, request: dict) -> None:
         """
         Process; Delete Task from Consumer's Tasks list.
         :param request: Data needed for process (Must contain: co.CORRELATION_ID)
@@ -239,7 +301,7 @@ class Worker:
         self._consumer.pop_task(correlation_id)
         self._logger.debug("Finished process _finish_task")
 
-    def _send_message(self, request: dict) -> None:
+    async def _send_message(self, request: dict) -> None:
         """
         Process; Use Consumer to send a message.
         :param request: Data needed for process (Must contain: co.QUEUE_NAME, co.DATA, co.PROPERTIES)
@@ -251,21 +313,21 @@ class Worker:
         msg_properties = request.pop(co.PROPERTIES)
 
         msg_properties.update(co.DEFAULT_MSG_PROPERTIES)
-        self._consumer.send_message(queue_name, msg_body, msg_properties)
+        await asyncio.to_thread(self._consumer.send_message, queue_name, msg_body, msg_properties)
         self._logger.debug("finished process _send_message")
 
-    def _add_trigger(self, request: dict) -> None:
+    async def _add_trigger(self, request: dict) -> None:
         """
         Process; Add trigger and optionally create Listener, if it doesn't already exist.
-        :param request: Data needed for process (Must contain: co.RESULT_PIPE, co.DATA)
+        :param request: Data needed for process (Must contain: co.RESULT_FUTURE, co.DATA)
         :return: None
         """
         self._logger.debug("calling process _add_trigger", request=request)
-        result_pipe = request.pop(co.RESULT_PIPE)
+        result_future: Future = request.pop(co.RESULT_FUTURE)
         trigger_data = request.pop(co.DATA)
 
         listener_type = ListenerEnum[trigger_data.get(co.TRIGGER_TYPE)]
-        with self._triggers_lock:  # Try to find specified Listener.
+        async with self._triggers_lock:  # Try to find specified Listener.
             for listener_obj in self._listeners:
                 if listener_obj.compare_identifiers(trigger_data):
                     self._logger.debug(
@@ -284,33 +346,33 @@ class Worker:
                 self._listeners.append(listener_obj)
 
         try:
-            trigger_id = listener_obj.add_trigger(trigger_data)
+            trigger_id = await asyncio.to_thread(listener_obj.add_trigger, trigger_data)
         except Exception as ex:
             # raised mostly during MSF module execution
             result = {co.RESULT: co.CODE_ERROR, co.OUTPUT: str(ex)}
         else:
             result = {co.RESULT: co.CODE_OK, co.TRIGGER_ID: trigger_id}
 
-        result_pipe.send(result)
+        result_future.set_result(result)
         self._logger.debug("finished process _add_trigger", result=result)
 
-    def _remove_trigger(self, request: dict) -> None:
+    async def _remove_trigger(self, request: dict) -> None:
         """
         Process; Remove trigger and optionally delete Listener, if it doesn't have any more triggers.
-        :param request: Data needed for process (Must contain: co.RESULT_PIPE, co.DATA)
+        :param request: Data needed for process (Must contain: co.RESULT_FUTURE, co.DATA)
         :return: None
         """
         self._logger.debug("calling process _remove_trigger", request=request)
-        result_pipe = request.pop(co.RESULT_PIPE)
+        result_future: Future = request.pop(co.RESULT_FUTURE)
         data = request.pop(co.DATA)
 
         trigger_id = data.get(co.TRIGGER_ID)
-        with self._triggers_lock:  # Try to find specified Listener.
+        async with self._triggers_lock:  # Try to find specified Listener.
             for listener_obj in self._listeners:
                 trigger = listener_obj.find_trigger(trigger_id)
                 if trigger is not None:  # Remove trigger from Listener. Optionally remove listener completely.
                     self._logger.debug("found existing trigger", id=trigger_id)
-                    listener_obj.remove_trigger(trigger)
+                    await asyncio.to_thread(listener_obj.remove_trigger, trigger)
                     if not listener_obj.any_trigger_exists():
                         self._listeners.remove(listener_obj)
                     result = {co.RESULT: co.CODE_OK}
@@ -320,5 +382,5 @@ class Worker:
                 self._logger.debug("existing trigger not found", id=trigger_id)
                 result = {co.RESULT: co.CODE_ERROR, co.OUTPUT: "Existing trigger not found."}
 
-        result_pipe.send(result)
+        result_future.set_result(result)
         self._logger.debug("finished process _remove_trigger", result=result)
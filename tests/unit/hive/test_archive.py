@@ -0,0 +1,105 @@
+import gzip
+import json
+import os
+
+import pytest
+from model_bakery import baker
+from pytest_mock import MockerFixture
+
+from cryton.hive.cryton_app.models import (
+    RunModel,
+    PlanExecutionModel,
+    StageExecutionModel,
+    StepExecutionModel,
+    CorrelationEventModel,
+    RunArchiveModel,
+)
+from cryton.hive.utility import archive, blob_store as blob_store_module, exceptions, states
+from cryton.hive.utility.blob_store import BlobStore
+
+
+@pytest.mark.django_db
+class TestArchive:
+    @pytest.fixture(autouse=True)
+    def f_directories(self, mocker: MockerFixture, tmp_path):
+        mocker.patch.object(archive.SETTINGS, "archive_directory", str(tmp_path / "archive"))
+
+    @pytest.fixture
+    def f_blob_store(self, mocker: MockerFixture, tmp_path) -> BlobStore:
+        store = BlobStore(str(tmp_path / "blobs"), threshold=10, grace_period=0)
+        mocker.patch.object(archive, "blob_store", store)
+        mocker.patch.object(blob_store_module, "blob_store", store)
+        return store
+
+    @pytest.fixture
+    def f_run(self, f_blob_store: BlobStore) -> RunModel:
+        run_model = baker.make(RunModel, state=states.FINISHED)
+        plan_execution = baker.make(PlanExecutionModel, run=run_model, plan=run_model.plan)
+        stage_execution = baker.make(StageExecutionModel, plan_execution=plan_execution)
+        output, output_blob, output_size = f_blob_store.offload("large output")
+        parent = baker.make(
+            StepExecutionModel,
+            stage_execution=stage_execution,
+            output=output,
+            output_blob=output_blob,
+            output_size=output_size,
+        )
+        step_execution = baker.make(StepExecutionModel, stage_execution=stage_execution, parent=parent, output="small")
+        baker.make(CorrelationEventModel, step_execution=step_execution)
+        return run_model
+
+    def test_round_trip(self, f_run: RunModel, f_blob_store: BlobStore):
+        step_executions = {model.id: model.output_blob or model.output for model in StepExecutionModel.objects.all()}
+
+        archive_model = archive.archive_run(f_run.id)
+
+        assert not RunModel.objects.filter(id=f_run.id).exists()
+        assert StepExecutionModel.objects.count() == 0
+        assert f_blob_store.digests() == set()
+        assert archive.read_archived_report(archive_model)["id"] == f_run.id
+
+        archive.restore_run(f_run.id)
+
+        assert RunModel.objects.get(id=f_run.id).state == states.FINISHED
+        assert {
+            model.id: model.output_blob or model.output for model in StepExecutionModel.objects.all()
+        } == step_executions
+        assert f_blob_store.get(StepExecutionModel.objects.exclude(output_blob="").get().output_blob) == "large output"
+        assert CorrelationEventModel.objects.count() == 1
+        assert not RunArchiveModel.objects.exists()
+        assert not os.path.exists(archive_model.file)
+
+    def test_archive_unfinished(self, f_run: RunModel):
+        RunModel.objects.filter(id=f_run.id).update(state=states.RUNNING)
+
+        with pytest.raises(exceptions.ArchiveError):
+            archive.archive_run(f_run.id)
+        assert RunModel.objects.filter(id=f_run.id).exists()
+
+    def test_archive_failure(self, mocker: MockerFixture, f_run: RunModel, f_blob_store: BlobStore):
+        mocker.patch.object(archive.Run, "delete", side_effect=RuntimeError)
+
+        with pytest.raises(RuntimeError):
+            archive.archive_run(f_run.id)
+
+        assert RunModel.objects.filter(id=f_run.id).exists()
+        assert not RunArchiveModel.objects.exists()
+        assert not os.path.exists(archive.get_archive_path(f_run.id))
+        assert len(f_blob_store.digests()) == 1
+
+    def test_restore_failure(self, f_run: RunModel, f_blob_store: BlobStore):
+        archive_model = archive.archive_run(f_run.id)
+        with gzip.open(archive_model.file, "rb") as compressed_file:
+            bundle = json.loads(compressed_file.read())
+        bundle["rows"][CorrelationEventModel._meta.label][0]["model"] = "cryton_app.unknownmodel"
+        with gzip.open(archive_model.file, "wb") as compressed_file:
+            compressed_file.write(json.dumps(bundle).encode())
+
+        with pytest.raises(exceptions.ArchiveError):
+            archive.restore_run(f_run.id)
+
+        assert not RunModel.objects.filter(id=f_run.id).exists()
+        assert StepExecutionModel.objects.count() == 0
+        assert f_blob_store.digests() == set()
+        assert RunArchiveModel.objects.filter(run_id=f_run.id).exists()
+        assert os.path.exists(archive_model.file)
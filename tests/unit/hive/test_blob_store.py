@@ -0,0 +1,106 @@
+import gzip
+import os
+import time
+import pytest
+from model_bakery import baker
+from pytest_mock import MockerFixture
+
+from cryton.hive.cryton_app.models import StepExecutionModel
+from cryton.hive.utility import blob_store as blob_store_module
+from cryton.hive.utility.blob_store import BlobStore, release_blobs, remove_unreferenced_blobs
+
+
+class TestBlobStore:
+    @pytest.fixture
+    def f_store(self, tmp_path) -> BlobStore:
+        return BlobStore(str(tmp_path), threshold=10)
+
+    def test_put_get(self, f_store: BlobStore):
+        digest = f_store.put("output")
+
+        assert f_store.get(digest) == "output"
+        assert f_store.exists(digest)
+
+    def test_put_compressed(self, f_store: BlobStore):
+        digest = f_store.put("output" * 100)
+
+        with open(os.path.join(f_store.directory, digest[:2], digest[2:]), "rb") as blob_file:
+            assert gzip.decompress(blob_file.read()).decode() == "output" * 100
+
+    def test_put_deduplicated(self, f_store: BlobStore):
+        assert f_store.put("output") == f_store.put("output")
+        assert f_store.digests() == {f_store.put("output")}
+
+    @pytest.mark.parametrize("p_content", ["", "short", "exactly 10"])
+    def test_offload_inline(self, f_store: BlobStore, p_content: str):
+        assert f_store.offload(p_content) == (p_content, "", len(p_content))
+        assert f_store.digests() == set()
+
+    def test_offload(self, f_store: BlobStore):
+        inline, digest, size = f_store.offload("long enough output")
+
+        assert inline == ""
+        assert size == len("long enough output")
+        assert f_store.get(digest) == "long enough output"
+
+    def test_offload_disabled(self, tmp_path):
+        store = BlobStore(str(tmp_path), threshold=0)
+
+        assert store.offload("long enough output") == ("long enough output", "", len("long enough output"))
+
+    def test_remove_unreferenced(self, tmp_path):
+        store = BlobStore(str(tmp_path), grace_period=0)
+        kept = store.put("kept")
+        store.put("removed")
+
+        assert store.remove_unreferenced({kept}) == 1
+        assert store.digests() == {kept}
+
+    def test_remove_in_grace_period(self, f_store: BlobStore):
+        digest = f_store.put("output")
+        blob_path = os.path.join(f_store.directory, digest[:2], digest[2:])
+        os.utime(blob_path, (0, 0))
+
+        assert f_store.remove({digest, "0" * 64}) == 1
+        assert not f_store.exists(digest)
+
+        f_store.put("output")
+        os.utime(blob_path, (0, 0))
+        f_store.put("output")  # Saved again (e.g. for a new Step execution) while being released
+
+        assert f_store.remove({digest}) == 0
+        assert os.path.getmtime(blob_path) > time.time() - 60
+        assert f_store.get(digest) == "output"
+
+    def test_delete_missing(self, f_store: BlobStore):
+        f_store.delete("0" * 64)
+
+    def test_iter_chunks(self, f_store: BlobStore):
+        digest = f_store.put("long enough output")
+
+        assert list(f_store.iter_chunks(digest, 8)) == ["long eno", "ugh outp", "ut"]
+
+
+@pytest.mark.django_db
+class TestUnreferencedBlobs:
+    @pytest.fixture
+    def f_store(self, mocker: MockerFixture, tmp_path) -> BlobStore:
+        store = BlobStore(str(tmp_path), threshold=10, grace_period=0)
+        mocker.patch.object(blob_store_module, "blob_store", store)
+        return store
+
+    def test_release_blobs(self, f_store: BlobStore):
+        kept = baker.make(StepExecutionModel, output_blob=f_store.put("kept")).output_blob
+        removed = f_store.put("removed")
+
+        release_blobs({kept, removed})
+
+        assert f_store.digests() == {kept}
+
+    def test_remove_unreferenced_blobs(self, f_store: BlobStore):
+        kept = baker.make(StepExecutionModel, output_blob=f_store.put("kept")).output_blob
+        baker.make(StepExecutionModel)
+        f_store.put("removed")
+
+        assert remove_unreferenced_blobs() == 1
+        assert f_store.digests() == {kept}
@@ -0,0 +1,33 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.hive.cryton_app.models import RunModel
+from cryton.hive.utility import bulk, exceptions
+
+
+class TestRunAction:
+    @pytest.fixture(autouse=True)
+    def f_connections(self, mocker: MockerFixture):
+        return mocker.patch("cryton.hive.utility.db.connections")
+
+    def test_run_action(self):
+        def action(object_id: int) -> str:
+            if object_id == 2:
+                raise exceptions.InvalidStateError("wrong state")
+            if object_id == 3:
+                raise RunModel.DoesNotExist()
+            if object_id == 4:
+                raise RuntimeError("unexpected")
+            return f"done {object_id}"
+
+        results = bulk.run_action(action, [1, 2, 3, 4], 2)
+
+        assert results == [
+            {"id": 1, "success": True, "detail": "done 1"},
+            {"id": 2, "success": False, "detail": "wrong state"},
+            {"id": 3, "success": False, "detail": "Not found."},
+            {"id": 4, "success": False, "detail": "Unexpected error: unexpected"},
+        ]
+
+    def test_run_action_empty(self):
+        assert bulk.run_action(lambda object_id: "", []) == []
@@ -0,0 +1,89 @@
+import pytest
+from model_bakery import baker
+from pytest_mock import MockerFixture
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from cryton.hive.cryton_app import caching
+from cryton.hive.cryton_app.models import PlanModel, StageModel, StepModel
+
+
+@pytest.mark.django_db
+class TestConditionalResponse:
+    @pytest.fixture(autouse=True)
+    def f_cache(self, settings):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+    @pytest.fixture
+    def f_plan(self) -> PlanModel:
+        plan_model = baker.make(PlanModel)
+        baker.make(StepModel, stage__plan=plan_model, _quantity=2)
+        return plan_model
+
+    @staticmethod
+    def _request(**headers) -> Request:
+        return Request(APIRequestFactory().get("/", **headers))
+
+    def test_not_modified(self, f_plan: PlanModel):
+        etag = caching.conditional_response(self._request(), caching.get_plan_version(f_plan.id), dict)["ETag"]
+
+        response = caching.conditional_response(
+            self._request(HTTP_IF_NONE_MATCH=etag), caching.get_plan_version(f_plan.id), dict
+        )
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert "Last-Modified" not in response
+
+    @pytest.mark.parametrize(
+        "p_change",
+        [
+            lambda plan: StepModel.objects.filter(stage__plan=plan).first().delete(),
+            lambda plan: baker.make(StageModel, plan=plan),
+            lambda plan: StepModel.objects.filter(stage__plan=plan).first().save(),
+        ],
+    )
+    def test_changed(self, f_plan: PlanModel, p_change):
+        etag = caching.get_plan_version(f_plan.id).etag
+
+        p_change(f_plan)
+        response = caching.conditional_response(
+            self._request(HTTP_IF_NONE_MATCH=etag), caching.get_plan_version(f_plan.id), dict
+        )
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_replaced_row(self, f_plan: PlanModel):
+        """
+        Same count and no newer timestamp than the remaining rows still change the version.
+        """
+        steps = list(StepModel.objects.filter(stage__plan=f_plan).order_by("id"))
+        version = caching.get_plan_version(f_plan.id)
+        new_step = baker.make(StepModel, stage=steps[0].stage)
+        StepModel.objects.filter(id=new_step.id).update(updated_at=steps[0].updated_at)
+        steps[0].delete()
+
+        assert caching.get_plan_version(f_plan.id).etag != version.etag
+
+    def test_if_modified_since_ignored(self, f_plan: PlanModel):
+        response = caching.conditional_response(
+            self._request(HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"),
+            caching.get_plan_version(f_plan.id),
+            dict,
+        )
+
+        assert response.status_code == 200
+
+    def test_cached(self, mocker: MockerFixture, f_plan: PlanModel):
+        render = mocker.Mock(return_value={"plan": "content"})
+
+        for _ in range(2):
+            response = caching.conditional_response(
+                self._request(), caching.get_plan_version(f_plan.id), render, f"plan:{f_plan.id}"
+            )
+            assert response.data == {"detail": {"plan": "content"}}
+        StepModel.objects.filter(stage__plan=f_plan).first().delete()
+        caching.conditional_response(self._request(), caching.get_plan_version(f_plan.id), render, f"plan:{f_plan.id}")
+
+        assert render.call_count == 2
@@ -0,0 +1,113 @@
+import time
+from threading import Event, Thread
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.hive.utility import db
+
+
+class TestConnectionLimiter:
+    @pytest.fixture(autouse=True)
+    def f_connections(self, mocker: MockerFixture):
+        return mocker.patch("cryton.hive.utility.db.connections")
+
+    def test_slot(self, f_connections):
+        limiter = db.ConnectionLimiter(2, 1)
+
+        with limiter.slot():
+            assert limiter.stats()["in_use"] == 1
+
+        stats = limiter.stats()
+        assert stats["in_use"] == 0
+        assert stats["acquired"] == 1
+        assert stats["overflows"] == 0
+        f_connections.close_all.assert_called_once()
+
+    def test_slot_overflow(self):
+        limiter = db.ConnectionLimiter(1, 0)
+
+        in_slot, leave = Event(), Event()
+
+        def hold_slot():
+            with limiter.slot():
+                in_slot.set()
+                leave.wait(5)
+
+        with limiter.slot():
+            thread = Thread(target=hold_slot)
+            thread.start()
+            in_slot.wait(5)
+            assert limiter.stats()["in_use"] == 2
+            leave.set()
+            thread.join()
+
+        stats = limiter.stats()
+        assert stats["peak"] == 2
+        assert stats["overflows"] == 1
+
+    def test_slot_reentrant(self, f_connections):
+        limiter = db.ConnectionLimiter(1, 0)
+
+        with limiter.slot():
+            with limiter.slot():
+                assert limiter.stats()["in_use"] == 1
+
+        assert limiter.stats()["overflows"] == 0
+        f_connections.close_all.assert_called_once()
+        assert limiter._semaphore.acquire(block=False)
+
+    def test_released(self, f_connections):
+        limiter = db.ConnectionLimiter(1, 0)
+
+        with limiter.slot():
+            with limiter.released():
+                assert limiter.stats()["in_use"] == 0
+                assert limiter._semaphore.acquire(block=False)
+                limiter._semaphore.release()
+            assert limiter.stats()["in_use"] == 1
+
+        stats = limiter.stats()
+        assert stats["acquired"] == 2
+        assert stats["overflows"] == 0
+        assert f_connections.close_all.call_count == 2
+
+    def test_slot_released_on_error(self):
+        limiter = db.ConnectionLimiter(1, 0)
+
+        with pytest.raises(ValueError):
+            with limiter.slot():
+                raise ValueError()
+
+        assert limiter.stats()["in_use"] == 0
+        assert limiter._semaphore.acquire(block=False)
+
+
+def test_run_in_threads(mocker: MockerFixture):
+    mocker.patch("cryton.hive.utility.db.connections")
+    results = []
+
+    db.run_in_threads([lambda: results.append(1), lambda: results.append(2)])
+
+    assert sorted(results) == [1, 2]
+
+
+def test_run_in_threads_nested(mocker: MockerFixture):
+    mocker.patch("cryton.hive.utility.db.connections")
+    limiter = db.ConnectionLimiter(1, 10)
+    mocker.patch.object(db, "connection_limiter", limiter)
+    start = time.monotonic()
+
+    with limiter.slot():  # The parent waits for its children, which wait for theirs
+        db.run_in_threads([lambda: db.run_in_threads([lambda: None, lambda: None]), lambda: None])
+
+    assert time.monotonic() - start < 5
+    assert limiter.stats()["overflows"] == 0
+    assert limiter.stats()["peak"] == 1
+
+
+def test_managed_connection(mocker: MockerFixture):
+    mock_close = mocker.patch("cryton.hive.utility.db.close_old_connections")
+
+    assert db.managed_connection(lambda value: value)("value") == "value"
+    assert mock_close.call_count == 2
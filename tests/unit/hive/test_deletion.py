@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from model_bakery import baker
+from pytest_mock import MockerFixture
+
+from cryton.hive.cryton_app.models import (
+    OperationModel,
+    PlanModel,
+    RunModel,
+    PlanExecutionModel,
+    ExecutionVariableModel,
+    StageExecutionModel,
+    StepExecutionModel,
+    CorrelationEventModel,
+)
+from cryton.hive.utility import blob_store as blob_store_module, constants, deletion, states
+from cryton.hive.utility.blob_store import BlobStore
+
+
+@pytest.mark.django_db
+class TestDeletion:
+    @pytest.fixture
+    def f_blob_store(self, mocker: MockerFixture, tmp_path) -> BlobStore:
+        store = BlobStore(str(tmp_path), threshold=10, grace_period=0)
+        mocker.patch.object(blob_store_module, "blob_store", store)
+        return store
+
+    @pytest.fixture
+    def f_run(self, f_blob_store: BlobStore) -> RunModel:
+        run_model = baker.make(RunModel)
+        plan_execution = baker.make(PlanExecutionModel, run=run_model, plan=run_model.plan)
+        baker.make(ExecutionVariableModel, plan_execution=plan_execution)
+        stage_execution = baker.make(StageExecutionModel, plan_execution=plan_execution)
+        # Children with lower IDs than their parents (e.g. dynamically added Steps)
+        children = baker.make(StepExecutionModel, stage_execution=stage_execution, _quantity=3)
+        for child in children:
+            _, child.output_blob, _ = f_blob_store.offload(f"large output {child.id}")
+            child.parent = baker.make(StepExecutionModel, stage_execution=stage_execution)
+            child.save()
+            baker.make(CorrelationEventModel, step_execution=child)
+        return run_model
+
+    @pytest.fixture
+    def f_operation(self) -> OperationModel:
+        return OperationModel.objects.create(type=constants.OPERATION_DELETE_RUN, object_id=0)
+
+    def test_delete_run(self, mocker: MockerFixture, f_run: RunModel, f_operation: OperationModel, f_blob_store):
+        mocker.patch.object(deletion.SETTINGS, "deletion_batch_size", 2)
+        other_run = baker.make(RunModel)
+        other_step_execution = baker.make(
+            StepExecutionModel, stage_execution__plan_execution__run=other_run, output_blob=f_blob_store.put("kept")
+        )
+
+        update_progress = deletion.operations.update_progress
+
+        def check_batch(*args, **kwargs):  # The constraints are deferred, each batch must leave the references valid
+            connection.check_constraints()
+            update_progress(*args, **kwargs)
+
+        mocker.patch.object(deletion.operations, "update_progress", check_batch)
+
+        deletion.delete_run(f_operation, f_run.id)
+
+        assert list(RunModel.objects.all()) == [other_run]
+        assert list(StepExecutionModel.objects.all()) == [other_step_execution]
+        assert not CorrelationEventModel.objects.exists()
+        assert not ExecutionVariableModel.objects.exists()
+        assert f_blob_store.digests() == {other_step_execution.output_blob}
+        assert f_operation.progress == {
+            CorrelationEventModel._meta.label: 3,
+            StepExecutionModel._meta.label: 6,
+            ExecutionVariableModel._meta.label: 1,
+            StageExecutionModel._meta.label: 1,
+            PlanExecutionModel._meta.label: 1,
+            RunModel._meta.label: 1,
+        }
+
+    def test_delete_in_batches_resumed(self, f_run: RunModel, f_operation: OperationModel):
+        f_operation.progress = {StepExecutionModel._meta.label: 4}
+        queryset = StepExecutionModel.objects.filter(stage_execution__plan_execution__run_id=f_run.id)
+        CorrelationEventModel.objects.all().delete()
+
+        assert deletion._delete_in_batches(queryset, f_operation, 4) == 10
+        assert not queryset.exists()
+        assert OperationModel.objects.get(id=f_operation.id).progress == {StepExecutionModel._meta.label: 10}
+
+    def test_delete_plan(self, mocker: MockerFixture, f_run: RunModel, f_operation: OperationModel):
+        mocker.patch.object(deletion.SETTINGS, "deletion_batch_size", 100)
+        baker.make(RunModel, plan=f_run.plan)
+
+        deletion.delete_plan(f_operation, f_run.plan.id)
+
+        assert not PlanModel.objects.filter(id=f_run.plan.id).exists()
+        assert not RunModel.objects.exists()
+        assert f_operation.progress[RunModel._meta.label] == 2
+
+    def test_resume_deletions(self, mocker: MockerFixture):
+        mock_start_thread = mocker.patch("cryton.hive.utility.operations.db.start_thread")
+        interrupted = OperationModel.objects.create(
+            type=constants.OPERATION_DELETE_RUN, object_id=1, state=states.RUNNING
+        )
+        OperationModel.objects.create(type=constants.OPERATION_DELETE_RUN, object_id=2, state=states.FINISHED)
+        OperationModel.objects.filter(id=interrupted.id).update(created_at=timezone.now() - timedelta(minutes=1))
+        OperationModel.objects.create(type=constants.OPERATION_DELETE_RUN, object_id=3)  # Created after the cutoff
+
+        assert deletion.resume_deletions(timezone.now() - timedelta(seconds=30)) == [interrupted.id]
+        mock_start_thread.assert_called_once()
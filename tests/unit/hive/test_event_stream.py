@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+from model_bakery import baker
+from pytest_mock import MockerFixture
+
+from cryton.hive.cryton_app.models import StepExecutionModel
+from cryton.hive.models.step import StepExecution
+from cryton.hive.utility import event_stream
+
+
+class TestSubscription:
+    @pytest.mark.parametrize(
+        "run_ids, event_types, event, expected",
+        [
+            (None, {event_stream.RUN}, {"type": event_stream.RUN, "run_id": 1}, True),
+            ({1}, {event_stream.RUN}, {"type": event_stream.RUN, "run_id": 1}, True),
+            ({2}, {event_stream.RUN}, {"type": event_stream.RUN, "run_id": 1}, False),
+            (None, {event_stream.RUN}, {"type": event_stream.STEP_EXECUTION, "run_id": 1}, False),
+        ],
+    )
+    def test_matches(self, run_ids, event_types, event, expected):
+        async def run():
+            return event_stream.Subscription(run_ids, event_types).matches(event)
+
+        assert asyncio.run(run()) is expected
+
+    def test_put_drops_when_full(self):
+        async def run():
+            subscription = event_stream.Subscription(None, {event_stream.RUN}, 1)
+            subscription.put({"type": event_stream.RUN})
+            subscription.put({"type": event_stream.RUN})
+            await asyncio.sleep(0)
+            return subscription
+
+        subscription = asyncio.run(run())
+
+        assert subscription.queue.qsize() == 1
+        assert subscription.dropped == 1
+
+
+class TestEventHub:
+    def test_dispatch(self, mocker: MockerFixture):
+        hub = event_stream.EventHub()
+        matching, other = mocker.Mock(), mocker.Mock()
+        matching.matches.return_value, other.matches.return_value = True, False
+        hub._subscriptions = {matching, other}
+
+        hub.dispatch({"type": event_stream.RUN})
+
+        matching.put.assert_called_once_with({"type": event_stream.RUN})
+        other.put.assert_not_called()
+
+    def test_dispatch_closed_loop(self):
+        async def run():
+            return event_stream.Subscription(None, {event_stream.RUN})
+
+        hub = event_stream.EventHub()
+        closed = asyncio.run(run())  # The loop is closed once the client is gone
+        hub._subscriptions = {closed}
+
+        hub.dispatch({"type": event_stream.RUN})
+
+        assert hub._subscriptions == set()
+
+
+def test_publish_state(mocker: MockerFixture):
+    mock_publish = mocker.patch.object(event_stream.publisher, "publish")
+
+    event_stream.publish_state(event_stream.STAGE_EXECUTION, 3, 1, "PENDING", "RUNNING")
+
+    routing_key, event = mock_publish.call_args.args
+    assert routing_key == "run.1.stage_execution"
+    assert event["id"] == 3
+    assert event["state_from"] == "PENDING"
+    assert event["state"] == "RUNNING"
+
+
+def test_publish_output(mocker: MockerFixture):
+    mocker.patch.object(event_stream, "OUTPUT_CHUNK_SIZE", 4)
+    mock_publish = mocker.patch.object(event_stream.publisher, "publish")
+
+    event_stream.publish_output(3, 1, "0123456789")
+
+    events = [call.args[1] for call in mock_publish.call_args_list]
+    assert [event["output"] for event in events] == ["0123", "4567", "89"]
+    assert all(event["chunks"] == 3 for event in events)
+    assert all(event["append"] is False for event in events)
+
+
+class TestEventPublisher:
+    def test_flush(self, mocker: MockerFixture):
+        published = []
+        mocker.patch.object(event_stream, "_connect", return_value=(mocker.Mock(is_closed=False), mocker.Mock()))
+        mock_create = mocker.patch.object(event_stream.amqpstorm.Message, "create")
+        mock_create.return_value.publish.side_effect = lambda *args: (time.sleep(0.05), published.append(args))
+        publisher = event_stream.EventPublisher()
+
+        for index in range(3):
+            publisher.publish("run.1.run", {"id": index})
+
+        assert publisher.flush(5) is True
+        assert len(published) == 3
+
+    def test_flush_timeout(self, mocker: MockerFixture):
+        def connect():
+            time.sleep(0.5)
+            raise event_stream.amqpstorm.AMQPConnectionError("unreachable")
+
+        mocker.patch.object(event_stream, "_connect", side_effect=connect)
+        publisher = event_stream.EventPublisher()
+        publisher.publish("run.1.run", {})
+
+        assert publisher.flush(0.01) is False
+
+    def test_flush_not_started(self):
+        assert event_stream.EventPublisher().flush(0) is True
+
+
+@pytest.mark.django_db
+def test_step_execution_output_delta(mocker: MockerFixture, django_capture_on_commit_callbacks):
+    mock_publish_output = mocker.patch.object(event_stream, "publish_output")
+    step_execution_model = baker.make(StepExecutionModel)
+    step_execution = StepExecution(step_execution_model.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        step_execution.output = "first"
+        step_execution.append_output("second")
+        step_execution.append_output("")
+
+    assert step_execution.output == "firstsecond"
+    run_id = step_execution_model.stage_execution.plan_execution.run_id
+    assert [call.args[1:] for call in mock_publish_output.call_args_list] == [
+        (run_id, "first", False),
+        (run_id, "second", True),
+    ]
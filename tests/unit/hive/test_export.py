@@ -0,0 +1,54 @@
+import gzip
+import json
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.hive.utility import export
+
+
+class TestExport:
+    @pytest.mark.parametrize("p_compression", ["none", "gzip"])
+    def test_validate_compression(self, p_compression):
+        export.validate_compression(p_compression)
+
+    @pytest.mark.parametrize("p_compression", ["unknown", "zstd"])
+    def test_validate_compression_invalid(self, p_compression, mocker: MockerFixture):
+        mocker.patch.object(export, "zstandard", None)
+
+        with pytest.raises(ValueError):
+            export.validate_compression(p_compression)
+
+    def test_buffer(self, mocker: MockerFixture):
+        mocker.patch.object(export, "CHUNK_SIZE", 4)
+
+        assert list(export._buffer(iter(["ab", "cd", "e", "f"]))) == [b"abcd", b"ef"]
+
+    def test_compress_gzip(self):
+        compressed = b"".join(export._compress(iter([b"first\n", b"second\n"]), "gzip"))
+
+        assert gzip.decompress(compressed) == b"first\nsecond\n"
+
+    @pytest.mark.parametrize("p_output, p_output_blob", [('in "line"\n' * 3, ""), ("", "digest")])
+    def test_step_execution_lines(self, mocker: MockerFixture, p_output, p_output_blob):
+        mocker.patch.object(export, "CHUNK_SIZE", 4)
+        mock_blob_store = mocker.patch.object(export, "blob_store")
+        mock_blob_store.iter_chunks.return_value = iter(['blob"', "\n"])
+        model = mocker.Mock(output=p_output, output_blob=p_output_blob, start_time=None, finish_time=None, valid=True)
+        model.configure_mock(id=1, stage_execution_id=2, state="FINISHED", serialized_output={}, output_size=1)
+        model.step.configure_mock(name="step", metadata={})
+
+        record = json.loads("".join(export._step_execution_lines(model, True)))
+
+        assert record["type"] == export.STEP_EXECUTION
+        assert record["output"] == (p_output if not p_output_blob else 'blob"\n')
+
+    def test_step_execution_lines_without_output(self, mocker: MockerFixture):
+        model = mocker.Mock(start_time=None, finish_time=None, serialized_output={}, valid=True)
+        model.configure_mock(id=1, stage_execution_id=2, state="FINISHED", output_size=1)
+        model.step.configure_mock(name="step", metadata={})
+
+        lines = list(export._step_execution_lines(model, False))
+
+        assert len(lines) == 1
+        assert json.loads(lines[0])["output"] is None
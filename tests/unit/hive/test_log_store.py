@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+from queue import Queue
+
+import pytest
+
+from cryton.hive.utility import log_store
+
+
+@pytest.fixture
+def f_database(tmp_path) -> str:
+    database = str(tmp_path / "logs.sqlite3")
+    connection = log_store.connect(database)
+    handler = log_store.LogStoreHandler(database, 0)
+    logs = [
+        {
+            "timestamp": "2025-01-01T10:00:00Z",
+            "level": "info",
+            "logger": "cryton-hive",
+            "event": "run started",
+            "run_id": 1,
+        },
+        {"timestamp": "2025-01-01T11:00:00Z", "level": "debug", "logger": "cryton-hive", "event": "step started"},
+        {
+            "timestamp": "2025-01-01T12:00:00Z",
+            "level": "info",
+            "logger": "amqpstorm",
+            "event": "run finished",
+            "run_id": 2,
+        },
+    ]
+    handler._insert(
+        connection,
+        [(log["timestamp"], log["level"], log["logger"], log["event"], 1, json.dumps(log)) for log in logs],
+    )
+    connection.close()
+
+    return database
+
+
+class TestGetLogs:
+    def test_all(self, f_database):
+        logs, last_id = log_store.get_logs(f_database)
+
+        assert [log["event"] for log in logs] == ["run started", "step started", "run finished"]
+        assert last_id == 3
+
+    @pytest.mark.parametrize(
+        "filters, expected",
+        [
+            ({"level": "info"}, ["run started", "run finished"]),
+            ({"event": "step"}, ["step started"]),
+            ({"run_id": "2"}, ["run finished"]),
+            ({"logger": "cryton"}, []),
+        ],
+    )
+    def test_filters(self, f_database, filters, expected):
+        logs, _ = log_store.get_logs(f_database, filters=filters)
+
+        assert [log["event"] for log in logs] == expected
+
+    def test_time_range(self, f_database):
+        logs, _ = log_store.get_logs(f_database, since="2025-01-01T11:00", until="2025-01-01T12:00")
+
+        assert [log["event"] for log in logs] == ["step started"]
+
+    def test_tail_and_after(self, f_database):
+        logs, last_id = log_store.get_logs(f_database, tail=2)
+        assert [log["event"] for log in logs] == ["step started", "run finished"]
+
+        logs, last_id = log_store.get_logs(f_database, after=last_id)
+        assert logs == []
+        assert last_id == 3
+
+    def test_offset_limit(self, f_database):
+        logs, _ = log_store.get_logs(f_database, offset=1, limit=1)
+
+        assert [log["event"] for log in logs] == ["step started"]
+
+    def test_search(self, f_database):
+        logs, _ = log_store.get_logs(f_database, search="finished")
+
+        assert [log["event"] for log in logs] == ["run finished"]
+
+    def test_invalid_key(self, f_database):
+        with pytest.raises(ValueError):
+            log_store.get_logs(f_database, filters={"a' OR 1=1 --": "x"})
+
+
+def test_handler(tmp_path):
+    database = str(tmp_path / "logs.sqlite3")
+    handler = log_store.LogStoreHandler(database, 0)
+    handler.setFormatter(logging.Formatter('{"event": "%(message)s", "level": "info"}'))
+    handler._pid, handler._queue = os.getpid(), Queue()  # Save the records only on flush
+
+    handler.emit(logging.makeLogRecord({"msg": "hello", "name": "test"}))
+    handler.flush()
+
+    logs, _ = log_store.get_logs(database)
+    assert logs == [{"event": "hello", "level": "info"}]
@@ -0,0 +1,65 @@
+from concurrent.futures import Executor
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from pytest_mock import MockerFixture
+
+from cryton.hive.cryton_app.models import OperationModel
+from cryton.hive.utility import actions, constants, operations, states
+
+
+class TestRun:
+    @pytest.fixture(autouse=True)
+    def f_publish_state(self, mocker: MockerFixture):
+        return mocker.patch("cryton.hive.utility.operations.event_stream.publish_state")
+
+    def test_run(self, mocker: MockerFixture, f_publish_state):
+        operation = mocker.Mock(state=states.PENDING, object_id=1)
+
+        operations._run(operation, lambda _, object_id: f"done {object_id}")
+
+        assert operation.state == states.FINISHED
+        assert operation.result == "done 1"
+        assert operation.error == ""
+        assert [call.args[3:] for call in f_publish_state.call_args_list] == [
+            (states.PENDING, states.RUNNING),
+            (states.RUNNING, states.FINISHED),
+        ]
+
+    def test_run_error(self, mocker: MockerFixture):
+        operation = mocker.Mock(state=states.PENDING, object_id=1)
+
+        def target(_, __):
+            raise ValueError("failed")
+
+        operations._run(operation, target)
+
+        assert operation.state == states.ERROR
+        assert operation.result == ""
+        assert operation.error == "failed"
+
+
+def test_start_in_executor(mocker: MockerFixture):
+    mock_create = mocker.patch("cryton.hive.utility.operations.OperationModel.objects.create")
+    mock_start_thread = mocker.patch("cryton.hive.utility.operations.db.start_thread")
+    mock_executor = mocker.Mock(spec=Executor)
+    target = mocker.Mock()
+
+    operation = operations.start("type", 1, target, mock_executor)
+
+    assert operation == mock_create.return_value
+    mock_executor.submit.assert_called_once_with(operations._run_in_slot, operation, target)
+    mock_start_thread.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_abort_interrupted_actions():
+    started_at = timezone.now()
+    interrupted = OperationModel.objects.create(type=constants.OPERATION_RUN_EXECUTE, object_id=1, state=states.RUNNING)
+    OperationModel.objects.filter(id=interrupted.id).update(created_at=started_at - timedelta(minutes=1))
+    running = OperationModel.objects.create(type=constants.OPERATION_RUN_EXECUTE, object_id=2, state=states.RUNNING)
+
+    assert actions.abort_interrupted_actions(started_at) == [interrupted.id]
+    assert OperationModel.objects.get(id=interrupted.id).state == states.ERROR
+    assert OperationModel.objects.get(id=running.id).state == states.RUNNING
@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.urls import reverse
+from model_bakery import baker
+from rest_framework.test import APIClient
+
+from cryton.hive.cryton_app import util
+from cryton.hive.cryton_app.models import WorkerModel
+
+
+@pytest.mark.parametrize(
+    "p_key, p_search, p_lookup",
+    [
+        ("id", util.SEARCH_CONTAINS, "id"),
+        ("plan_id", util.SEARCH_EXACT, "plan_id"),
+        ("name", util.SEARCH_EXACT, "name"),
+        ("state", util.SEARCH_EXACT, "state"),
+        ("name", util.SEARCH_CONTAINS, "name__icontains"),
+        ("name", util.SEARCH_TRIGRAM, "name__trigram_similar"),
+        ("description", util.SEARCH_EXACT, "description__icontains"),
+        ("description", util.SEARCH_TRIGRAM, "description__icontains"),
+    ],
+)
+def test_get_filter_lookup(p_key, p_search, p_lookup):
+    assert util.get_filter_lookup(p_key, p_search) == p_lookup
+
+
+@pytest.mark.django_db
+class TestListEndpoint:
+    @pytest.fixture
+    def f_client(self) -> APIClient:
+        return APIClient()
+
+    @pytest.fixture
+    def f_workers(self) -> list[WorkerModel]:
+        return [baker.make(WorkerModel, name=f"worker-{index}") for index in range(5)]
+
+    @staticmethod
+    def _ids(response) -> list[int]:
+        results = response.json()
+        return [result["id"] for result in (results["results"] if isinstance(results, dict) else results)]
+
+    @pytest.mark.parametrize("p_order_by", ["id", "-id"])
+    def test_cursor_stable_across_inserts(self, f_client: APIClient, f_workers: list[WorkerModel], p_order_by):
+        ordered_ids = sorted((worker.id for worker in f_workers), reverse=p_order_by == "-id")
+
+        first_page = f_client.get(reverse("workermodel-list"), {"cursor": "", "limit": 2, "order_by": p_order_by})
+        baker.make(WorkerModel, _quantity=3)  # New rows before (-id) or after (id) the seen ones
+        second_page = f_client.get(first_page.json()["next"])
+
+        assert self._ids(first_page) == ordered_ids[:2]
+        assert self._ids(second_page) == ordered_ids[2:4]
+
+    def test_cursor_invalid_ordering(self, f_client: APIClient):
+        response = f_client.get(reverse("workermodel-list"), {"cursor": "", "order_by": "name"})
+
+        assert response.status_code == 400
+
+    def test_offset(self, f_client: APIClient, f_workers: list[WorkerModel]):
+        response = f_client.get(reverse("workermodel-list"), {"limit": 2, "offset": 1})
+
+        assert response.json()["count"] == 5
+        assert self._ids(response) == [worker.id for worker in f_workers[1:3]]
+
+    @pytest.mark.parametrize("p_search, p_count", [(util.SEARCH_EXACT, 0), (util.SEARCH_CONTAINS, 5)])
+    def test_filter_search(self, f_client: APIClient, f_workers: list[WorkerModel], p_search, p_count):
+        response = f_client.get(reverse("workermodel-list"), {"name": "worker", "search": p_search})
+
+        assert len(self._ids(response)) == p_count
+
+    def test_filter_exact(self, f_client: APIClient, f_workers: list[WorkerModel]):
+        response = f_client.get(reverse("workermodel-list"), {"name": "worker-1"})
+
+        assert self._ids(response) == [f_workers[1].id]
+
+    def test_filter_trigram_unsupported(self, f_client: APIClient):
+        response = f_client.get(reverse("workermodel-list"), {"name": "worker", "search": util.SEARCH_TRIGRAM})
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_filter_indexes_migration_reversible():
+    executor = MigrationExecutor(connection)
+    latest = executor.loader.graph.leaf_nodes("cryton_app")
+
+    executor.migrate([("cryton_app", "0004_operationmodel")])
+    executor.loader.build_graph()
+    executor.migrate(latest)
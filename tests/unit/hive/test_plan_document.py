@@ -0,0 +1,120 @@
+import pytest
+import yaml
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cryton.hive.cryton_app.models import PlanModel, StageModel, StepModel
+from cryton.hive.models.plan import Plan
+from cryton.hive.models.stage import Stage
+from cryton.hive.models.step import Step
+from cryton.hive.utility import creator
+
+
+def get_template(dynamic: bool) -> dict:
+    return {
+        "name": "plan",
+        "dynamic": dynamic,
+        "metadata": {"author": "test"},
+        "stages": {
+            "stage-1": {
+                "steps": {
+                    "step-1": {
+                        "is_init": True,
+                        "module": "command",
+                        "arguments": {"command": "id"},
+                        "next": [{"type": "state", "value": "finished", "step": "step-2"}],
+                        "output": {"alias": "first", "mapping": [{"from": "a", "to": "b"}]},
+                    },
+                    "step-2": {"module": "command", "arguments": {"command": "whoami"}},
+                }
+            },
+            "stage-2": {
+                "depends_on": ["stage-1"],
+                "steps": {"step-3": {"is_init": True, "module": "command", "arguments": {"command": "id"}}},
+            },
+        },
+    }
+
+
+def upload(data: dict) -> SimpleUploadedFile:
+    return SimpleUploadedFile("template.yml", yaml.safe_dump(data).encode())
+
+
+@pytest.mark.django_db
+class TestPlanDocument:
+    @pytest.fixture
+    def f_client(self) -> APIClient:
+        return APIClient()
+
+    @pytest.fixture
+    def f_plan(self) -> Plan:
+        return Plan(creator.create_plan(get_template(True)))
+
+    @staticmethod
+    def _assert_rebuilt(plan: Plan) -> dict:
+        """
+        Check the stored document equals a full rebuild.
+        """
+        stored = PlanModel.objects.get(id=plan.model.id).document
+        assert stored is not None
+        assert stored == plan._build_document()
+        return stored
+
+    def test_create_plan(self):
+        plan = Plan(creator.create_plan(get_template(False)))
+
+        document = self._assert_rebuilt(plan)
+        assert document["stages"]["stage-1"]["steps"]["step-1"]["output"] == {
+            "alias": "first",
+            "mapping": [{"from": "a", "to": "b"}],
+        }
+        assert plan.generate_plan() == document
+
+    def test_generate_plan_missing(self, f_plan: Plan):
+        Plan.discard_document(f_plan.model.id)
+
+        assert f_plan.generate_plan() == f_plan._build_document()
+        self._assert_rebuilt(f_plan)
+
+    def test_create_stage(self, f_client: APIClient, f_plan: Plan):
+        stage = {
+            "stage-3": {"steps": {"step-4": {"is_init": True, "module": "command", "arguments": {"command": "id"}}}}
+        }
+
+        response = f_client.post(reverse("stagemodel-list"), {"plan_id": f_plan.model.id, "file": upload(stage)})
+
+        assert response.status_code == 201
+        document = self._assert_rebuilt(f_plan)
+        assert "step-4" in document["stages"]["stage-3"]["steps"]
+
+    def test_create_step(self, f_client: APIClient, f_plan: Plan):
+        stage_id = StageModel.objects.get(plan_id=f_plan.model.id, name="stage-1").id
+        step = {"step-5": {"module": "command", "arguments": {"command": "id"}}}
+
+        response = f_client.post(reverse("stepmodel-list"), {"stage_id": stage_id, "file": upload(step)})
+
+        assert response.status_code == 201
+        document = self._assert_rebuilt(f_plan)
+        assert document["stages"]["stage-1"]["steps"]["step-2"]["next"] == [{"type": "any", "step": "step-5"}]
+
+    @pytest.mark.parametrize(
+        "p_delete",
+        [
+            lambda plan_id: Stage(StageModel.objects.get(plan_id=plan_id, name="stage-2").id).delete(),
+            lambda plan_id: Step(StepModel.objects.get(stage__plan_id=plan_id, name="step-3").id).delete(),
+        ],
+    )
+    def test_delete(self, f_plan: Plan, p_delete):
+        p_delete(f_plan.model.id)
+
+        assert PlanModel.objects.get(id=f_plan.model.id).document is None
+        assert "step-3" not in str(f_plan.generate_plan())
+        self._assert_rebuilt(f_plan)
+
+    @pytest.mark.parametrize("p_attribute, p_value", [("name", "renamed"), ("metadata", {"author": "other"})])
+    def test_plan_changed(self, f_plan: Plan, p_attribute, p_value):
+        setattr(f_plan, p_attribute, p_value)
+
+        assert f_plan.generate_plan()[p_attribute] == p_value
+        self._assert_rebuilt(f_plan)
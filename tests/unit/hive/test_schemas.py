@@ -0,0 +1,33 @@
+import pytest
+from jsonschema import ValidationError
+from pytest_mock import MockerFixture
+
+from cryton.hive.utility import schemas
+from cryton.lib.utility import schemas as lib_schemas
+
+
+class TestValidators:
+    def test_get_validator_cached(self, mocker: MockerFixture):
+        mocker.patch.object(lib_schemas, "_validators", {})
+        build_schema = mocker.Mock(return_value={"type": "object"})
+
+        validator = lib_schemas.get_validator("key", build_schema)
+
+        assert lib_schemas.get_validator("key", build_schema) is validator
+        build_schema.assert_called_once()
+
+    def test_validate(self):
+        validator = lib_schemas.get_validator("test_validate", lambda: {"type": "object", "required": ["name"]})
+
+        lib_schemas.validate({"name": "test"}, validator)
+        with pytest.raises(ValidationError):
+            lib_schemas.validate({}, validator)
+
+    def test_step_validator(self):
+        lib_schemas.validate({"module": "command", "arguments": {"command": "id"}}, schemas.get_step_validator())
+        with pytest.raises(ValidationError):
+            lib_schemas.validate({"arguments": {}}, schemas.get_step_validator())
+
+    def test_stage_validator(self):
+        with pytest.raises(ValidationError):
+            lib_schemas.validate({"type": "delta", "steps": {}}, schemas.get_stage_validator())
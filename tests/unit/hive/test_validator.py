@@ -0,0 +1,176 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.hive.cryton_app.models import StageModel
+from cryton.hive.utility import creator, exceptions
+from cryton.hive.utility.validator import Validator, DynamicValidator
+
+
+def generate_chain(length: int, arguments: dict | None = None) -> dict:
+    steps = {}
+    for i in range(length):
+        steps[f"step-{i}"] = {"module": "command", "arguments": arguments or {"command": "id"}}
+        if i + 1 < length:
+            steps[f"step-{i}"]["next"] = [{"type": "state", "value": "finished", "step": f"step-{i + 1}"}]
+    steps["step-0"]["is_init"] = True
+
+    return {"name": "plan", "stages": {"stage": {"steps": steps}}}
+
+
+def get_empire_step(action: str, agent_name: str) -> dict:
+    arguments = {"action": action, "agent_name": agent_name}
+    if action == "deploy":
+        arguments.update(session_id=1, listener={"name": "listener"}, stager={"type": "multi/bash"})
+    else:
+        arguments["command"] = "id"
+
+    return {"module": "empire", "arguments": arguments}
+
+
+class TestValidator:
+    def test_validate(self):
+        Validator(generate_chain(3)).validate()
+
+    def test_long_chain(self):
+        plan = generate_chain(100000)
+
+        Validator(plan)._validate(plan)
+
+    def test_cycle(self):
+        plan = generate_chain(3)
+        plan["stages"]["stage"]["steps"]["step-2"]["next"] = [{"type": "any", "step": "step-1"}]
+
+        with pytest.raises(exceptions.StageValidationError):
+            Validator(plan)._validate(plan)
+
+    def test_unreachable(self):
+        plan = generate_chain(3)
+        plan["stages"]["stage"]["steps"]["step-1"].pop("next")
+
+        with pytest.raises(exceptions.StageValidationError, match="unreachable"):
+            Validator(plan)._validate(plan)
+
+    def test_duplicate_name(self):
+        plan = generate_chain(2)
+        plan["stages"]["step-1"] = {"steps": {}}
+
+        with pytest.raises(NameError):
+            Validator(plan)._validate(plan)
+
+    @pytest.mark.parametrize("p_variable", ["$step-0.output", "$stage.output", "$parent.output", "$HOME", "$1/2.txt"])
+    def test_references(self, p_variable):
+        plan = generate_chain(2)
+        plan["stages"]["stage"]["steps"]["step-1"]["arguments"] = {"command": p_variable}
+
+        Validator(plan)._validate(plan)
+
+    @pytest.mark.parametrize("p_step, p_variable", [("step-1", "$missing.output"), ("step-0", "$parent.output")])
+    def test_references_unresolved(self, p_step, p_variable):
+        plan = generate_chain(2)
+        plan["stages"]["stage"]["steps"][p_step]["arguments"] = {"command": p_variable}
+
+        with pytest.raises(NameError):
+            Validator(plan)._validate(plan)
+
+    @pytest.mark.parametrize("p_action, p_valid", [("deploy", False), ("execute-command", True)])
+    def test_agent_name(self, p_action, p_valid):
+        plan = generate_chain(2)
+        plan["stages"]["stage"]["steps"]["step-0"].update(get_empire_step("deploy", "agent"))
+        plan["stages"]["stage"]["steps"]["step-1"].update(get_empire_step(p_action, "agent"))
+
+        if p_valid:
+            Validator(plan).validate()
+        else:
+            with pytest.raises(exceptions.ValidationError, match="agent is already used"):
+                Validator(plan).validate()
+
+    def test_references_dynamic(self):
+        plan = generate_chain(2, {"command": "$missing.output"})
+        plan["dynamic"] = True
+
+        Validator(plan)._validate(plan)
+
+
+class TestDynamicValidator:
+    @pytest.fixture(autouse=True)
+    def f_check_names_unused(self, mocker: MockerFixture):
+        return mocker.patch.object(DynamicValidator, "_check_names_unused")
+
+    @pytest.fixture
+    def f_existing_steps(self, mocker: MockerFixture):
+        mock_step_model = mocker.patch("cryton.hive.utility.validator.StepModel")
+        return mock_step_model.objects.filter.return_value.values_list
+
+    def test_validate_steps(self, f_existing_steps):
+        f_existing_steps.return_value = []
+        steps = {"new": {"module": "command", "arguments": {"command": "id"}}}
+
+        DynamicValidator(1).validate_steps(1, steps, {"new": "parent-step"})
+
+    @pytest.mark.parametrize(
+        "p_steps, p_parents, p_existing_steps",
+        [
+            ({"new": {"module": "command", "arguments": {"command": "id"}}}, None, []),
+            ({"new": {"module": "command", "arguments": {}}}, {"new": "parent-step"}, []),
+            (
+                {"new": {"module": "command", "arguments": {"command": "id"}, "next": [{"type": "any", "step": "x"}]}},
+                {"new": "parent-step"},
+                [],
+            ),
+            (
+                {"new": {"module": "command", "arguments": {"command": "id"}, "next": [{"type": "any", "step": "x"}]}},
+                {"new": "parent-step"},
+                [("x", True)],
+            ),
+        ],
+    )
+    def test_validate_steps_invalid(self, f_existing_steps, p_steps, p_parents, p_existing_steps):
+        f_existing_steps.return_value = p_existing_steps
+
+        with pytest.raises(exceptions.ValidationError):
+            DynamicValidator(1).validate_steps(1, p_steps, p_parents)
+
+    def test_validate_steps_cycle(self, mocker: MockerFixture, f_existing_steps):
+        f_existing_steps.return_value = [("x", False)]
+        mock_successor_model = mocker.patch("cryton.hive.utility.validator.SuccessorModel")
+        mock_successor_model.objects.filter.return_value.values_list.return_value = [("x", "parent-step")]
+        steps = {"new": {"module": "command", "arguments": {"command": "id"}, "next": [{"type": "any", "step": "x"}]}}
+
+        with pytest.raises(exceptions.ValidationError):
+            DynamicValidator(1).validate_steps(1, steps, {"new": "parent-step"})
+
+
+@pytest.mark.django_db
+class TestDynamicValidatorAgentName:
+    @pytest.fixture
+    def f_plan_id(self) -> int:
+        plan = generate_chain(1)
+        plan["dynamic"] = True
+        plan["stages"]["stage"]["steps"]["step-0"].update(get_empire_step("deploy", "agent"))
+        return creator.create_plan(plan)
+
+    @pytest.mark.parametrize(
+        "p_steps, p_valid",
+        [
+            ({"new": get_empire_step("deploy", "other")}, True),
+            ({"new": get_empire_step("execute-command", "agent")}, True),
+            ({"new": get_empire_step("deploy", "agent")}, False),
+            ({"new": get_empire_step("deploy", "other"), "new-2": get_empire_step("deploy", "other")}, False),
+        ],
+    )
+    def test_validate_steps(self, f_plan_id: int, p_steps, p_valid):
+        for step in p_steps.values():
+            step["is_init"] = True
+        stage_id = StageModel.objects.get(plan_id=f_plan_id).id
+
+        if p_valid:
+            DynamicValidator(f_plan_id).validate_steps(stage_id, p_steps)
+        else:
+            with pytest.raises(exceptions.ValidationError, match="is already used"):
+                DynamicValidator(f_plan_id).validate_steps(stage_id, p_steps)
+
+    def test_validate_stages(self, f_plan_id: int):
+        stages = {"new-stage": {"steps": {"new": {"is_init": True, **get_empire_step("deploy", "agent")}}}}
+
+        with pytest.raises(exceptions.ValidationError, match="agent is already used"):
+            DynamicValidator(f_plan_id).validate_stages(stages)
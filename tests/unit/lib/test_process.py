@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.lib.utility.process import OutputBuffer, OutputTooLargeError, run_process
+
+
+class TestOutputBuffer:
+    def test_spill(self, tmp_path):
+        output = OutputBuffer(4, str(tmp_path))
+        for chunk in [b"abc", b"def", b"gh"]:
+            output.write(chunk)
+
+        assert output.spilled == 4
+        assert output.text() == "[4 bytes of the output were omitted]\nefgh"
+        assert output.read() == "abcdefgh"
+        assert output.read() == "abcdefgh"
+        assert os.listdir(tmp_path) == []  # Anonymous, nothing to clean up or leak
+        output.close()
+        assert output.text() == "[4 bytes of the output were omitted]\nefgh"
+
+    def test_in_memory(self):
+        output = OutputBuffer(4)
+        output.write(b"abc")
+        output.close()
+
+        assert output.text() == output.read() == "abc"
+
+    def test_stream(self, mocker: MockerFixture):
+        mocker.patch("cryton.lib.utility.process.CHUNK_SIZE", 3)
+        output = OutputBuffer(4)
+        output.write(b"first\nsec")
+        output.write(b"ond\nthird")
+
+        assert list(output.chunks()) == [b"fir", b"st\n", b"sec", b"ond", b"\nt", b"hird"]
+        assert list(output.lines()) == ["first", "second", "third"]
+        assert output.contains("missing", "t\nsecond\nt")  # Spans the chunks and the spill boundary
+        assert not output.contains("missing")
+        output.close()
+
+    def test_read_too_large(self):
+        output = OutputBuffer(4)
+        output.write(b"abcdefgh")
+
+        assert output.read(8) == "abcdefgh"
+        with pytest.raises(OutputTooLargeError):
+            output.read(7)
+        output.close()
+
+
+class TestRunProcess:
+    def test_outputs(self, tmp_path):
+        script = "import sys; sys.stdout.write('x' * 100000); sys.stderr.write('error')"
+
+        with run_process([sys.executable, "-c", script], buffer_size=1000, spill_directory=str(tmp_path)) as result:
+            assert result.returncode == 0
+            assert result.stdout.spilled == 99000
+            assert result.stdout.read() == "x" * 100000
+            assert result.stderr.text() == "error"
+
+        with pytest.raises(ValueError):  # The spilled output was removed
+            result.stdout.read()
+
+    def test_check(self):
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            run_process("echo output; echo error >&2; exit 3", shell=True, check=True)
+
+        assert error.value.returncode == 3
+        assert error.value.stdout == "output\n"
+        assert error.value.stderr == "error\n"
+
+    def test_timeout(self, mocker: MockerFixture):
+        mock_close = mocker.spy(OutputBuffer, "close")
+        started_at = time.monotonic()
+
+        with pytest.raises(subprocess.TimeoutExpired) as error:
+            run_process("echo started; sleep 30 & sleep 30", shell=True, timeout=0.5)
+
+        assert time.monotonic() - started_at < 5  # The background child was terminated as well
+        assert error.value.stdout == "started\n"
+        assert mock_close.call_count == 2  # The spilled outputs are removed
+
+    def test_not_found(self):
+        with pytest.raises(FileNotFoundError):
+            run_process(["cryton-nonexistent-executable"])
@@ -4,9 +4,16 @@ from pytest_mock import MockerFixture
 import pytest
 
 from cryton.modules.command.module import Module, Result
+from cryton.lib.utility.process import OutputBuffer
 from snek_sploit import Error as MSFError
 
 
+def _output(data: str) -> OutputBuffer:
+    output = OutputBuffer()
+    output.write(data.encode())
+    return output
+
+
 class TestModuleCommand:
     path = "cryton.modules.command.module"
 
@@ -15,8 +22,8 @@ class TestModuleCommand:
         return mocker.patch(f"{self.path}.MetasploitClientUpdated")
 
     @pytest.fixture
-    def f_subprocess_run(self, mocker: MockerFixture):
-        return mocker.patch(f"{self.path}.subprocess.run")
+    def f_run_process(self, mocker: MockerFixture):
+        return mocker.patch(f"{self.path}.run_process")
 
     @pytest.mark.parametrize(
         "p_arguments",
@@ -76,11 +83,11 @@ class TestModuleCommand:
         with pytest.raises(RuntimeError):
             module.check_requirements()
 
-    def test_execute(self, f_subprocess_run):
+    def test_execute(self, f_run_process):
         module = Module({"command": "placeholder", "serialize_output": True})
 
-        f_subprocess_run.return_value.stdout = b"placeholder"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("placeholder")
+        f_run_process.return_value.stderr = _output("")
 
         module._serialize_output = Mock(return_value={"example": "example"})
 
@@ -90,10 +97,10 @@ class TestModuleCommand:
         assert result.output == "placeholder\n"
         assert result.serialized_output == {"example": "example"}
 
-    def test_execute_process_timeout(self, f_subprocess_run):
+    def test_execute_process_timeout(self, f_run_process):
         module = Module({"command": "placeholder", "serialize_output": True})
 
-        f_subprocess_run.side_effect = subprocess.TimeoutExpired("", 1)
+        f_run_process.side_effect = subprocess.TimeoutExpired("", 1)
 
         result = module.execute()
 
@@ -101,10 +108,10 @@ class TestModuleCommand:
         assert result.output == "Command execution timed out."
         assert result.serialized_output == {}
 
-    def test_execute_process_error(self, f_subprocess_run):
+    def test_execute_process_error(self, f_run_process):
         module = Module({"command": "placeholder", "serialize_output": True})
 
-        f_subprocess_run.side_effect = subprocess.CalledProcessError(1, "", stderr=b"error")
+        f_run_process.side_effect = subprocess.CalledProcessError(1, "", stderr="error")
 
         result = module.execute()
 
@@ -112,10 +119,10 @@ class TestModuleCommand:
         assert result.output == "error"
         assert result.serialized_output == {}
 
-    def test_execute_error(self, f_subprocess_run):
+    def test_execute_error(self, f_run_process):
         module = Module({"command": "placeholder", "serialize_output": True})
 
-        f_subprocess_run.side_effect = Exception("error")
+        f_run_process.side_effect = Exception("error")
 
         result = module.execute()
 
@@ -123,11 +130,11 @@ class TestModuleCommand:
         assert result.output == "error"
         assert result.serialized_output == {}
 
-    def test_execute_serialization_error(self, f_subprocess_run):
+    def test_execute_serialization_error(self, f_run_process):
         module = Module({"command": "placeholder", "serialize_output": True})
 
-        f_subprocess_run.return_value.stdout = b"output"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("output")
+        f_run_process.return_value.stderr = _output("")
 
         module._serialize_output = Mock(side_effect=TypeError("error"))
 
@@ -5,14 +5,21 @@ from pytest_mock import MockerFixture
 import pytest
 
 from cryton.modules.ffuf.module import Module, Result
+from cryton.lib.utility.process import OutputBuffer
+
+
+def _output(data: str) -> OutputBuffer:
+    output = OutputBuffer()
+    output.write(data.encode())
+    return output
 
 
 class TestModuleFFUF:
     path = "cryton.modules.ffuf.module"
 
     @pytest.fixture
-    def f_subprocess_run(self, mocker: MockerFixture):
-        return mocker.patch(f"{self.path}.subprocess.run")
+    def f_run_process(self, mocker: MockerFixture):
+        return mocker.patch(f"{self.path}.run_process")
 
     @pytest.fixture
     def f_is_file(self, mocker: MockerFixture):
@@ -89,7 +96,7 @@ class TestModuleFFUF:
         assert module._serialize_output == arguments.get("serialize_output")
         assert module._tmp_file == "/tmp/cryton-report-ffuf-uuid"
 
-    def test_check_requirements_wordlist(self, f_subprocess_run, f_is_file):
+    def test_check_requirements_wordlist(self, f_run_process, f_is_file):
         module = Module({"target": "placeholder", "wordlist": "placeholder"})
 
         f_is_file.return_value = False
@@ -97,11 +104,11 @@ class TestModuleFFUF:
         with pytest.raises(OSError):
             module.check_requirements()
 
-    def test_check_requirements_executable(self, f_subprocess_run, f_is_file):
+    def test_check_requirements_executable(self, f_run_process, f_is_file):
         module = Module({"target": "placeholder", "wordlist": "placeholder"})
 
         f_is_file.return_value = True
-        f_subprocess_run.side_effect = FileNotFoundError
+        f_run_process.side_effect = FileNotFoundError
 
         with pytest.raises(OSError):
             module.check_requirements()
@@ -111,14 +118,14 @@ class TestModuleFFUF:
 
         assert module.check_requirements() is None
 
-    def test_execute(self, f_subprocess_run, f_open, f_json_load, f_is_file, f_os_remove):
+    def test_execute(self, f_run_process, f_open, f_json_load, f_is_file, f_os_remove):
         module = Module({"target": "placeholder", "wordlist": "placeholder"})
         mock_build_command = Mock()
         module._build_command = mock_build_command
 
         f_json_load.return_value = {"example": "example"}
-        f_subprocess_run.return_value.stdout = b"placeholder"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("placeholder")
+        f_run_process.return_value.stderr = _output("")
         f_is_file.return_value = True
         f_os_remove.side_effect = OSError
 
@@ -130,11 +137,11 @@ class TestModuleFFUF:
         mock_build_command.assert_called_once()
         f_os_remove.assert_called_once_with(module._tmp_file)
 
-    def test_execute_process_error(self, f_subprocess_run):
+    def test_execute_process_error(self, f_run_process):
         module = Module({"target": "placeholder", "wordlist": "placeholder"})
         module._build_command = Mock()
 
-        f_subprocess_run.side_effect = subprocess.CalledProcessError(1, "", b"", b"error")
+        f_run_process.side_effect = subprocess.CalledProcessError(1, "", "", "error")
 
         result = module.execute()
 
@@ -142,11 +149,11 @@ class TestModuleFFUF:
         assert result.output == "\nerror"
         assert result.serialized_output == {}
 
-    def test_execute_error(self, f_subprocess_run):
+    def test_execute_error(self, f_run_process):
         module = Module({"target": "placeholder", "wordlist": "placeholder"})
         module._build_command = Mock()
 
-        f_subprocess_run.side_effect = Exception("error")
+        f_run_process.side_effect = Exception("error")
 
         result = module.execute()
 
@@ -154,13 +161,13 @@ class TestModuleFFUF:
         assert result.output == "error"
         assert result.serialized_output == {}
 
-    def test_execute_tmp_file_load_error(self, f_subprocess_run, f_open, f_json_load, f_is_file):
+    def test_execute_tmp_file_load_error(self, f_run_process, f_open, f_json_load, f_is_file):
         module = Module({"target": "placeholder", "wordlist": "placeholder"})
         module._build_command = Mock()
 
         f_open.side_effect = OSError("error")
-        f_subprocess_run.return_value.stdout = b"placeholder"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("placeholder")
+        f_run_process.return_value.stderr = _output("")
         f_is_file.return_value = True
 
         result = module.execute()
@@ -169,13 +176,13 @@ class TestModuleFFUF:
         assert result.output == "placeholder\nUnable to get the serialized data. Reason: error"
         assert result.serialized_output == {}
 
-    def test_execute_tmp_file_load_json_error(self, f_subprocess_run, f_open, f_json_load, f_is_file):
+    def test_execute_tmp_file_load_json_error(self, f_run_process, f_open, f_json_load, f_is_file):
         module = Module({"target": "placeholder", "wordlist": "placeholder"})
         module._build_command = Mock()
 
         f_json_load.side_effect = json.JSONDecodeError("error", "", 1)
-        f_subprocess_run.return_value.stdout = b"placeholder"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("placeholder")
+        f_run_process.return_value.stderr = _output("")
         f_is_file.return_value = True
 
         result = module.execute()
@@ -184,13 +191,13 @@ class TestModuleFFUF:
         assert "placeholder\nUnable to get the serialized data. Reason: error" in result.output
         assert result.serialized_output == {}
 
-    def test_execute_command(self, f_subprocess_run, f_is_file):
+    def test_execute_command(self, f_run_process, f_is_file):
         module = Module({"command": "placeholder"})
         mock_build_command = Mock()
         module._build_command = mock_build_command
 
-        f_subprocess_run.return_value.stdout = b"placeholder"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("placeholder")
+        f_run_process.return_value.stderr = _output("")
         f_is_file.return_value = False
 
         result = module.execute()
@@ -4,14 +4,21 @@ from pytest_mock import MockerFixture
 import pytest
 
 from cryton.modules.medusa.module import Module, Result
+from cryton.lib.utility.process import OutputBuffer
+
+
+def _output(data: str) -> OutputBuffer:
+    output = OutputBuffer()
+    output.write(data.encode())
+    return output
 
 
 class TestModuleMedusa:
     path = "cryton.modules.medusa.module"
 
     @pytest.fixture
-    def f_subprocess_run(self, mocker: MockerFixture):
-        return mocker.patch(f"{self.path}.subprocess.run")
+    def f_run_process(self, mocker: MockerFixture):
+        return mocker.patch(f"{self.path}.run_process")
 
     @pytest.fixture
     def f_is_file(self, mocker: MockerFixture):
@@ -96,11 +103,11 @@ class TestModuleMedusa:
         with pytest.raises(OSError):
             module.check_requirements()
 
-    def test_check_requirements_executable(self, f_subprocess_run, f_is_file):
+    def test_check_requirements_executable(self, f_run_process, f_is_file):
         module = Module({"credentials": {}})
 
         f_is_file.return_value = True
-        f_subprocess_run.side_effect = FileNotFoundError
+        f_run_process.side_effect = FileNotFoundError
 
         with pytest.raises(OSError):
             module.check_requirements()
@@ -110,7 +117,7 @@ class TestModuleMedusa:
 
         assert module.check_requirements() is None
 
-    def test_execute(self, f_subprocess_run):
+    def test_execute(self, f_run_process):
         module = Module({"target": "placeholder"})
         mock_build_command = Mock(return_value="placeholder")
         module._build_command = mock_build_command
@@ -118,8 +125,8 @@ class TestModuleMedusa:
         mock_parse_credentials = Mock(return_value={"example": "example"})
         module._parse_credentials = mock_parse_credentials
 
-        f_subprocess_run.return_value.stdout = b"ACCOUNT FOUND: [SUCCESS]"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("ACCOUNT FOUND: [SUCCESS]")
+        f_run_process.return_value.stderr = _output("")
 
         result = module.execute()
 
@@ -128,11 +135,11 @@ class TestModuleMedusa:
         assert result.serialized_output == {"example": "example"}
         mock_build_command.assert_called_once()
 
-    def test_execute_process_error(self, f_subprocess_run):
+    def test_execute_process_error(self, f_run_process):
         module = Module({"target": "placeholder"})
         module._build_command = Mock(return_value="placeholder")
 
-        f_subprocess_run.side_effect = subprocess.CalledProcessError(1, "", b"a", b"error")
+        f_run_process.side_effect = subprocess.CalledProcessError(1, "", "a", "error")
 
         result = module.execute()
 
@@ -140,11 +147,11 @@ class TestModuleMedusa:
         assert result.output == "a\nerror"
         assert result.serialized_output == {}
 
-    def test_execute_error(self, f_subprocess_run):
+    def test_execute_error(self, f_run_process):
         module = Module({"target": "placeholder"})
         module._build_command = Mock(return_value="placeholder")
 
-        f_subprocess_run.side_effect = Exception("error")
+        f_run_process.side_effect = Exception("error")
 
         result = module.execute()
 
@@ -152,7 +159,7 @@ class TestModuleMedusa:
         assert result.output == "error"
         assert result.serialized_output == {}
 
-    def test_execute_command(self, f_subprocess_run):
+    def test_execute_command(self, f_run_process):
         module = Module({"command": "placeholder"})
         mock_build_command = Mock()
         module._build_command = mock_build_command
@@ -160,8 +167,8 @@ class TestModuleMedusa:
         mock_parse_credentials = Mock(return_value={"example": "example"})
         module._parse_credentials = mock_parse_credentials
 
-        f_subprocess_run.return_value.stdout = b"ACCOUNT FOUND: [SUCCESS]"
-        f_subprocess_run.return_value.stderr = b""
+        f_run_process.return_value.stdout = _output("ACCOUNT FOUND: [SUCCESS]")
+        f_run_process.return_value.stderr = _output("")
 
         result = module.execute()
 
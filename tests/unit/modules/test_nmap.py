@@ -3,6 +3,8 @@ from pytest_mock import MockerFixture
 import pytest
 from dataclasses import asdict
 
+import nmap3
+
 from cryton.modules.nmap.module import (
     Module,
     execute_scan,
@@ -10,6 +12,7 @@ from cryton.modules.nmap.module import (
     match_cpe_in_port_parameters,
     compare_found_ports_with_port_parameters,
     parse_custom_command,
+    run_nmap_command,
     Result,
 )
 
@@ -161,12 +164,23 @@ class TestModuleNmap:
     def test_parse_custom_command(self):
         assert parse_custom_command(["test_parameter"]) == ["test_parameter", "-oX", "-"]
 
+    def test_run_nmap_command(self):
+        assert run_nmap_command(["python3", "-c", "print(' <nmaprun/> ')"]) == "<nmaprun/>"
+
+    def test_run_nmap_command_error(self):
+        with pytest.raises(nmap3.exceptions.NmapExecutionError, match="failed"):
+            run_nmap_command(["python3", "-c", "import sys; sys.exit('failed')"])
+
+    def test_run_nmap_command_not_installed(self):
+        with pytest.raises(nmap3.exceptions.NmapNotInstalledError):
+            run_nmap_command(["cryton-nonexistent-nmap", "-oX", "-"])
+
     def test_execute_custom_command(self, mocker):
         # declarations and mocks
         run_command_output_mock = "a"
         xml_root_mock = Mock()
         nmap_client_mock = mocker.patch(f"{self.path}.nmap3.Nmap")
-        nmap_client_mock.return_value.run_command.return_value = run_command_output_mock
+        run_command_mock = mocker.patch(f"{self.path}.run_nmap_command", return_value=run_command_output_mock)
         nmap_client_mock.return_value.get_xml_et.return_value = xml_root_mock
         nmap_client_mock.return_value.parser.filter_top_ports.return_value = {"runtime": {"summary": ""}}
         mocker.patch(f"{self.path}.filter_nmap_output_ports", return_value=True)
@@ -176,9 +190,7 @@ class TestModuleNmap:
         # execution and asserts
         result = Module({"command": "test_command"}).execute()
         parse_custom_command_mock.assert_called_once_with(["test_command"])
-        nmap_client_mock.return_value.run_command.assert_called_once_with(
-            cmd=["test_parameter1", "test_parameter2"], timeout=60
-        )
+        run_command_mock.assert_called_once_with(cmd=["test_parameter1", "test_parameter2"], timeout=60)
         nmap_client_mock.return_value.get_xml_et.assert_called_once_with(run_command_output_mock)
         nmap_client_mock.return_value.parser.filter_top_ports.assert_called_once_with(xml_root_mock)
 
@@ -61,13 +61,13 @@ class TestModuleScript:
             "timeout": 30,
         }
         mocker.patch("os.path.exists", return_value=True)
-        completed_process_mock = mocker.patch("subprocess.CompletedProcess")
-        completed_process_mock.stdout.decode.return_value = '{"test": "output"}'
-        completed_process_mock.stderr.decode.return_value = p_error
-        mocker.patch("subprocess.run", return_value=completed_process_mock)
+        process_mock = mocker.patch(f"{self.path}.run_process")
+        process_mock.return_value.stdout.text.return_value = '{"test": "output"}'
+        process_mock.return_value.stdout.read.return_value = '{"test": "output"}'
+        process_mock.return_value.stderr.text.return_value = p_error
 
         result = Module(mod_arguments).execute()
-        completed_process_mock.check_returncode.assert_called_once()
+        process_mock.assert_called_once_with(["python3", "/tmp/test.py"], timeout=30, check=True)
         assert asdict(result) == {
             "output": '{"test": "output"}\n' + p_error,
             "serialized_output": {"test": "output"},
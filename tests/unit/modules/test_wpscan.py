@@ -3,6 +3,13 @@ import pytest
 import subprocess
 
 from cryton.modules.wpscan.module import Module, ModuleOutput, Result, parse_command
+from cryton.lib.utility.process import OutputBuffer
+
+
+def _output(data: str, size: int = 1024) -> OutputBuffer:
+    output = OutputBuffer(size)
+    output.write(data.encode())
+    return output
 
 
 class TestModuleWPScan:
@@ -74,31 +81,39 @@ class TestModuleWPScan:
     def test_execute_with_standard_output(self, mocker, p_stdout, p_stderr, p_final_output):
         module_arguments = {"test": "argument"}
         mocker.patch(f"{self.path}.parse_command", return_value=["test", "command"])
-        completed_process_mock = mocker.patch("subprocess.CompletedProcess")
-        completed_process_mock.stdout.decode.return_value = p_stdout
-        completed_process_mock.stderr.decode.return_value = p_stderr
-        process_mock = mocker.patch("subprocess.run")
-        process_mock.return_value = completed_process_mock
+        process_mock = mocker.patch(f"{self.path}.run_process")
+        process_mock.return_value.stdout = _output(p_stdout)
+        process_mock.return_value.stderr = _output(p_stderr)
 
         result = Module(module_arguments).execute()
 
-        process_mock.assert_called_once_with(["test", "command"], capture_output=True)
+        process_mock.assert_called_once_with(["test", "command"])
         assert result == ModuleOutput(Result.OK, p_final_output, {})
 
     def test_execute_with_json_output(self, mocker):
         module_arguments = {"test": "argument"}
         mocker.patch(f"{self.path}.parse_command", return_value=["test", "command"])
-        completed_process_mock = mocker.patch("subprocess.CompletedProcess")
-        completed_process_mock.stdout.decode.return_value = '{"test": "output"}'
-        completed_process_mock.stderr.decode.return_value = "test_error"
-        process_mock = mocker.patch("subprocess.run")
-        process_mock.return_value = completed_process_mock
+        process_mock = mocker.patch(f"{self.path}.run_process")
+        process_mock.return_value.stdout = _output('{"test": "output"}')
+        process_mock.return_value.stderr = _output("test_error")
 
         result = Module(module_arguments).execute()
 
-        process_mock.assert_called_once_with(["test", "command"], capture_output=True)
+        process_mock.assert_called_once_with(["test", "command"])
         assert result == ModuleOutput(Result.OK, "test_error", {"test": "output"})
 
+    def test_execute_failed(self, mocker):
+        mocker.patch(f"{self.path}.parse_command", return_value=["test", "command"])
+        process_mock = mocker.patch(f"{self.path}.run_process")
+        process_mock.return_value.stdout = _output(
+            "[!] The remote website is up, but does not seem to be running WordPress.", 4  # Found in the spilled part
+        )
+        process_mock.return_value.stderr = _output("")
+
+        result = Module({"test": "argument"}).execute()
+
+        assert result.result == Result.FAIL
+
     @pytest.mark.parametrize(
         "p_exception, p_result",
         [
@@ -109,7 +124,7 @@ class TestModuleWPScan:
     def test_execute_with_exceptions(self, mocker, p_exception, p_result):
         module_arguments = {"test": "argument"}
         mocker.patch(f"{self.path}.parse_command", return_value=(Mock, Mock))
-        process_mock = mocker.patch("subprocess.run")
+        process_mock = mocker.patch(f"{self.path}.run_process")
         process_mock.side_effect = p_exception
 
         result = Module(module_arguments).execute()
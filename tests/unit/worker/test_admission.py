@@ -0,0 +1,91 @@
+from threading import Event, Thread
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.lib.utility.module import Result
+from cryton.worker import task
+from cryton.worker.utility import admission
+from cryton.worker.utility.admission import AdmissionController
+
+
+class TestAdmissionController:
+    def test_module_limit(self):
+        controller = AdmissionController({"metasploit": 1}, 0, 0)
+        stopped = Event()
+
+        assert controller.admit("metasploit", stopped) is True
+        assert controller.admit("nmap", stopped) is True
+
+        waiting = Thread(target=controller.admit, args=("metasploit", stopped))
+        waiting.start()
+        while not controller.stats()["queued"]:
+            pass
+        assert controller.stats() == {"running": {"metasploit": 1, "nmap": 1}, "queued": {"metasploit": 1}}
+
+        controller.release("metasploit")
+        waiting.join(5)
+        assert controller.stats() == {"running": {"metasploit": 1, "nmap": 1}, "queued": {}}
+
+    def test_stopped(self):
+        controller = AdmissionController({"nmap": 0}, 0, 0)
+        stopped = Event()
+        stopped.set()
+
+        assert controller.admit("nmap", stopped) is False
+        assert controller.stats() == {"running": {}, "queued": {}}
+
+    def test_resources(self, mocker: MockerFixture):
+        mocker.patch.object(admission, "get_cpu_load", return_value=95.0)
+        mocker.patch.object(admission, "get_available_memory", return_value=50.0)
+        controller = AdmissionController({}, 90, 10)
+        stopped = Event()
+
+        assert controller.admit("nmap", stopped) is True  # Nothing is running
+        assert controller._can_run("nmap") is False
+
+        admission.get_cpu_load.return_value = 50.0
+        controller._resources_checked_at = 0
+        assert controller._can_run("nmap") is True
+
+        admission.get_available_memory.return_value = 5.0
+        controller._resources_checked_at = 0
+        assert controller._can_run("nmap") is False
+
+    def test_resources_unknown(self, mocker: MockerFixture):
+        mocker.patch.object(admission, "get_cpu_load", return_value=None)
+        mocker.patch.object(admission, "get_available_memory", return_value=None)
+        controller = AdmissionController({}, 90, 10)
+        controller.admit("nmap", Event())
+
+        assert controller._can_run("nmap") is True
+
+
+class TestAttackTaskAdmission:
+    @pytest.fixture
+    def task_obj(self, mocker: MockerFixture):
+        return task.AttackTask(mocker.Mock(), mocker.Mock(), mocker.Mock(), mocker.Mock())
+
+    def test_stop_while_waiting(self, task_obj: task.AttackTask, mocker: MockerFixture):
+        mocker.patch.object(task, "admission_controller", AdmissionController({"nmap": 0}, 0, 0))
+        mock_run = mocker.patch.object(task.AttackTask, "_run_in_process")
+
+        execution = Thread(
+            target=lambda: setattr(task_obj, "result", task_obj._execute({"module": "nmap", "arguments": {}}))
+        )
+        execution.start()
+        while not task.admission_controller.stats()["queued"]:
+            pass
+
+        assert task_obj.stop() is True
+        execution.join(5)
+        assert task_obj.result["result"] == Result.STOPPED
+        mock_run.assert_not_called()
+
+    def test_release(self, task_obj: task.AttackTask, mocker: MockerFixture):
+        mock_controller = mocker.patch.object(task, "admission_controller")
+        mocker.patch.object(task.AttackTask, "_run_in_process", side_effect=RuntimeError)
+
+        with pytest.raises(RuntimeError):
+            task_obj._execute({"module": "nmap", "arguments": {}})
+        mock_controller.release.assert_called_once_with("nmap")
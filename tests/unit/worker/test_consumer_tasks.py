@@ -0,0 +1,163 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.worker import consumer
+from cryton.worker.utility import constants as co, util
+from cryton.worker.utility.spool import MessageSpool
+
+
+@pytest.fixture(autouse=True)
+def spool_directory(mocker: MockerFixture, tmp_path):
+    mocker.patch.object(consumer.SETTINGS.spool, "directory", str(tmp_path))
+
+
+@pytest.fixture
+def consumer_obj(mocker: MockerFixture):
+    mocker.patch.object(consumer.task.Task, "start")
+    return consumer.Consumer(mocker.Mock(), "host", 5672, "user", "pass", "worker", 1, 1, False, max_attack_tasks=1)
+
+
+def _message(mocker: MockerFixture, correlation_id: str):
+    return mocker.Mock(correlation_id=correlation_id, reply_to="reply", properties={})
+
+
+class TestTasks:
+    def test_pop_task(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        consumer_obj._callback_control(_message(mocker, "first"))
+        consumer_obj._callback_control(_message(mocker, "second"))
+
+        assert consumer_obj.pop_task("second").correlation_id == "second"
+        assert consumer_obj.pop_task("second") is None
+        assert list(consumer_obj._tasks) == ["first"]
+
+    def test_undelivered_reply(self, consumer_obj: consumer.Consumer, mocker: MockerFixture, tmp_path):
+        consumer_obj._spool = MessageSpool(str(tmp_path / "spool.jsonl"), 0)
+        consumer_obj._connection = mocker.Mock()
+        consumer_obj._connection.channel.side_effect = consumer.amqpstorm.AMQPConnectionError
+        consumer_obj._callback_control(_message(mocker, "first"))
+        task_obj = consumer_obj._tasks["first"]
+        task_obj.message.properties = {}
+
+        assert task_obj.reply("reply", "queue") is False
+        assert consumer_obj._spool.pending() == [
+            (1, util.UndeliveredMessage("queue", "reply", co.DEFAULT_MSG_PROPERTIES))
+        ]
+
+
+class TestRedelivery:
+    def test_redeliver_messages(self, consumer_obj: consumer.Consumer, mocker: MockerFixture, tmp_path):
+        consumer_obj._spool = MessageSpool(str(tmp_path / "spool.jsonl"), 0)
+        consumer_obj._connection = mocker.Mock()
+        consumer_obj._spool.add(util.UndeliveredMessage("queue", "first", {}))
+        consumer_obj._spool.add(util.UndeliveredMessage("queue", "second", {}))
+        mock_create = mocker.patch.object(consumer.amqpstorm.Message, "create")
+        mock_create.return_value.publish.side_effect = [True, False]
+
+        consumer_obj._redeliver_messages()
+
+        assert [call.args[1] for call in mock_create.call_args_list] == ["first", "second"]
+        consumer_obj._connection.channel.return_value.confirm_deliveries.assert_called_once()
+        assert [message.body for _, message in consumer_obj._spool.pending()] == ["second"]
+
+    def test_connection_error(self, consumer_obj: consumer.Consumer, mocker: MockerFixture, tmp_path):
+        consumer_obj._spool = MessageSpool(str(tmp_path / "spool.jsonl"), 0)
+        consumer_obj._connection = mocker.Mock()
+        consumer_obj._connection.channel.side_effect = consumer.amqpstorm.AMQPConnectionError
+        consumer_obj._spool.add(util.UndeliveredMessage("queue", "first", {}))
+
+        consumer_obj._redeliver_messages()
+
+        assert len(consumer_obj._spool) == 1
+
+
+class TestAttackSlots:
+    def test_limit(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        consumer_obj._callback_attack(_message(mocker, "first"))
+
+        assert consumer_obj._attack_slots.acquire(blocking=False) is False
+        consumer_obj._tasks["first"].result = '{"result": "ok"}'
+        consumer_obj._tasks["first"]._on_finish()
+        assert consumer_obj._attack_slots.acquire(blocking=False) is True
+
+    def test_stopped_while_waiting(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        consumer_obj._callback_attack(_message(mocker, "first"))
+        consumer_obj._stopped.set()
+        message = _message(mocker, "second")
+
+        consumer_obj._callback_attack(message)
+
+        message.reject.assert_called_once_with(requeue=True)
+        message.ack.assert_not_called()
+        assert list(consumer_obj._tasks) == ["first"]
+
+    def test_slot_released_on_ack_error(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        message = _message(mocker, "first")
+        message.ack.side_effect = consumer.amqpstorm.AMQPChannelError
+
+        with pytest.raises(consumer.amqpstorm.AMQPChannelError):
+            consumer_obj._callback_attack(message)
+        assert consumer_obj._attack_slots.acquire(blocking=False) is True
+
+    def test_unlimited(self, mocker: MockerFixture):
+        mocker.patch.object(consumer.task.Task, "start")
+        consumer_obj = consumer.Consumer(mocker.Mock(), "host", 5672, "user", "pass", "worker", 1, 1, False)
+
+        for correlation_id in ["first", "second"]:
+            consumer_obj._callback_attack(_message(mocker, correlation_id))
+
+        assert len(consumer_obj._tasks) == 2
+
+
+class TestRedeliveredAttack:
+    def test_running(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        consumer_obj._callback_attack(_message(mocker, "first"))
+        message = _message(mocker, "first")
+        mock_send = mocker.patch.object(consumer_obj, "send_message")
+
+        consumer_obj._callback_attack(message)
+
+        message.ack.assert_called_once()
+        mock_send.assert_not_called()
+        assert consumer_obj._attack_slots.acquire(blocking=False) is False  # Only the first Task holds the slot
+
+    def test_finished(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        consumer_obj._callback_attack(_message(mocker, "first"))
+        task_obj = consumer_obj.pop_task("first")
+        task_obj.result = '{"result": "ok"}'
+        task_obj._on_finish()
+        message = _message(mocker, "first")
+        mock_send = mocker.patch.object(consumer_obj, "send_message")
+
+        consumer_obj._callback_attack(message)
+
+        message.ack.assert_called_once()
+        mock_send.assert_called_once_with("reply", '{"result": "ok"}', co.DEFAULT_MSG_PROPERTIES)
+        assert "first" not in consumer_obj._tasks
+
+    def test_interrupted(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        consumer_obj._callback_attack(_message(mocker, "first"))
+        consumer_obj._requests.close()
+        restarted_consumer = consumer.Consumer(mocker.Mock(), "host", 5672, "user", "pass", "worker", 1, 1, False)
+        mock_send = mocker.patch.object(restarted_consumer, "send_message")
+
+        restarted_consumer._callback_attack(_message(mocker, "first"))
+
+        assert '"result": "error"' in mock_send.call_args.args[1]
+        assert restarted_consumer._requests.get("first")[0] == co.TASK_FINISHED
+        assert restarted_consumer._tasks == {}
+
+    def test_task_failed(self, consumer_obj: consumer.Consumer, mocker: MockerFixture):
+        consumer_obj._callback_attack(_message(mocker, "first"))
+        task_obj = consumer_obj._tasks["first"]
+        mock_reply = mocker.patch.object(task_obj, "reply")
+        mocker.patch.object(task_obj, "_process_message", side_effect=RuntimeError)
+
+        with pytest.raises(RuntimeError):
+            task_obj()
+
+        state, result, _ = consumer_obj._requests.get("first")
+        assert state == co.TASK_FINISHED
+        assert '"result": "error"' in result
+        mock_reply.assert_called_once_with(result)
+        assert consumer_obj._tasks == {}
+        assert consumer_obj._attack_slots.acquire(blocking=False) is True
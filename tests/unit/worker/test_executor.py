@@ -0,0 +1,112 @@
+import os
+import signal
+import time
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.lib.utility.module import ModuleOutput, Result
+from cryton.worker import task
+from cryton.worker.utility.exceptions import ExecutorError
+from cryton.worker.utility.executor import ExecutorPool
+
+
+@pytest.fixture
+def pool():
+    executor_pool = ExecutorPool(1, 2, preload_modules=False)
+    executor_pool.start()
+    yield executor_pool
+    executor_pool.shutdown()
+
+
+def _wait_for_idle(executor_pool: ExecutorPool, count: int) -> None:
+    deadline = time.monotonic() + 30
+    while len(executor_pool._idle) < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+class TestExecutorPool:
+    def test_reuse(self, pool: ExecutorPool):
+        _wait_for_idle(pool, 1)
+
+        executor = pool.acquire()
+        pid = executor.run(os.getpid)
+        pool.release(executor)
+
+        executor = pool.acquire()
+        second_pid = executor.run(os.getpid)
+        pool.release(executor)
+
+        assert second_pid == pid
+
+    def test_recycle(self, pool: ExecutorPool):
+        executor = pool.acquire()
+        executor.run(os.getpid)
+        executor.run(os.getpid)
+        pool.release(executor)
+
+        assert executor not in pool._idle
+
+    def test_kill(self, pool: ExecutorPool):
+        _wait_for_idle(pool, 1)
+        executor = pool.acquire()
+        other_executor = pool.acquire()  # Started outside the pool
+        executor.kill()
+
+        with pytest.raises(ExecutorError) as ex:
+            executor.run(os.getpid)
+        other_pid = other_executor.run(os.getpid)
+        pool.release(executor)
+        pool.release(other_executor)
+
+        assert ex.value.exitcode < 0
+        assert other_pid == other_executor.process.pid
+        assert executor not in pool._members
+        assert other_executor not in pool._members
+        _wait_for_idle(pool, 1)
+        assert len(pool._idle) == 1
+
+    def test_error(self, pool: ExecutorPool):
+        executor = pool.acquire()
+
+        with pytest.raises(ExecutorError) as ex:
+            executor.run(int, "not a number")
+        assert ex.value.exitcode == 1
+
+        pool.release(executor)
+
+    def test_disabled(self):
+        executor_pool = ExecutorPool(0, 0, preload_modules=False)
+        executor_pool.start()
+
+        executor = executor_pool.acquire()
+        executor.run(os.getpid)
+        executor_pool.release(executor)
+
+        assert executor_pool._idle == []
+        executor.process.join(5)
+        assert executor.process.exitcode == 0
+
+
+class TestTaskExecution:
+    @pytest.fixture
+    def task_obj(self, mocker: MockerFixture):
+        return task.Task(mocker.Mock(), mocker.Mock(), mocker.Mock(), mocker.Mock())
+
+    def test_run_in_process(self, task_obj: task.Task, mocker: MockerFixture):
+        mock_pool = mocker.patch.object(task, "executor_pool")
+        mock_pool.acquire.return_value.run.return_value = ModuleOutput(Result.OK)
+
+        assert task_obj._run_in_process(os.getpid) == ModuleOutput(Result.OK)
+        mock_pool.release.assert_called_once_with(mock_pool.acquire.return_value)
+        assert task_obj._process is None
+
+    @pytest.mark.parametrize(
+        "exitcode, result", [(-9, Result.STOPPED), (-signal.SIGXCPU, Result.ERROR), (1, Result.ERROR)]
+    )
+    def test_run_in_process_ended(self, task_obj: task.Task, mocker: MockerFixture, exitcode: int, result: str):
+        mock_pool = mocker.patch.object(task, "executor_pool")
+        mock_pool.acquire.return_value.run.side_effect = ExecutorError(exitcode)
+
+        assert task_obj._run_in_process(os.getpid).result == result
+        mock_pool.release.assert_called_once()
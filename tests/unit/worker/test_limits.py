@@ -0,0 +1,110 @@
+import resource
+import signal
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.lib.utility.module import ModuleOutput, Result
+from cryton.worker import task
+from cryton.worker.utility import limits
+from cryton.worker.utility.limits import LimitedRun, ResourceLimitExceeded, ResourceLimits, run_with_limits
+
+
+class TestResourceLimits:
+    def test_from_dict(self):
+        assert ResourceLimits.from_dict({"cpu_time": "10", "unknown": 1}) == ResourceLimits(cpu_time=10)
+
+    def test_merge(self):
+        merged = ResourceLimits(cpu_time=10, memory=0, open_files=100).merge(ResourceLimits(5, 512, 0))
+
+        assert merged == ResourceLimits(cpu_time=5, memory=512, open_files=100)
+
+    @pytest.mark.parametrize(
+        "module, task_limits, expected",
+        [
+            ("script", None, ResourceLimits(10, 0, 100)),
+            ("nmap", None, ResourceLimits(60, 0, 100)),
+            ("nmap", {"cpu_time": 100, "memory": 512}, ResourceLimits(60, 512, 100)),
+        ],
+    )
+    def test_get_limits(self, mocker: MockerFixture, module: str, task_limits: dict | None, expected: ResourceLimits):
+        mock_settings = mocker.patch.object(limits.SETTINGS, "limits")
+        mock_settings.cpu_time, mock_settings.memory, mock_settings.open_files = 10, 0, 100
+        mock_settings.modules = {"nmap": {"cpu_time": 60}}
+
+        assert limits.get_limits(module, task_limits) == expected
+
+
+class TestRunWithLimits:
+    def test_usage(self):
+        run = run_with_limits(ResourceLimits(), sum, [1, 2])
+
+        assert run.result == 3
+        assert set(run.usage) == {"cpu_time", "children_cpu_time", "max_memory", "block_reads", "block_writes"}
+        assert run.usage["cpu_time"] >= 0
+
+    def test_max_memory_per_execution(self):
+        def allocate():
+            data = bytearray(200 * 1024 * 1024)
+            data[::4096] = b"x" * len(data[::4096])  # Touch the pages, so they're resident
+
+        peak = run_with_limits(ResourceLimits(), allocate).usage["max_memory"]
+        following = run_with_limits(ResourceLimits(), sum, [1, 2]).usage["max_memory"]
+
+        assert peak >= 200
+        assert following < peak - 150  # The peak of the previous execution isn't reported again
+
+    @pytest.mark.parametrize("p_executions, p_reported", [(0, True), (1, False)])
+    def test_max_memory_fallback(self, mocker: MockerFixture, p_executions, p_reported):
+        mocker.patch.object(limits, "_executions", p_executions)
+        mocker.patch.object(limits, "_reset_peak_memory", return_value=False)
+
+        run = run_with_limits(ResourceLimits(), sum, [1, 2])
+
+        assert ("max_memory" in run.usage) is p_reported
+
+    def test_limits_restored(self):
+        original_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+
+        run = run_with_limits(ResourceLimits(open_files=64), resource.getrlimit, resource.RLIMIT_NOFILE)
+
+        assert run.result == (64, original_limit[1])
+        assert resource.getrlimit(resource.RLIMIT_NOFILE) == original_limit
+
+    def test_cpu_time_exceeded(self):
+        original_handler, original_limit = signal.getsignal(signal.SIGXCPU), resource.getrlimit(resource.RLIMIT_CPU)
+
+        def busy_loop():
+            while True:
+                pass
+
+        with pytest.raises(ResourceLimitExceeded):
+            run_with_limits(ResourceLimits(cpu_time=1), busy_loop)
+        assert resource.getrlimit(resource.RLIMIT_CPU) == original_limit
+        assert signal.getsignal(signal.SIGXCPU) == original_handler
+
+
+class TestAttackTaskLimits:
+    @pytest.fixture
+    def task_obj(self, mocker: MockerFixture):
+        mocker.patch.object(task, "admission_controller")
+        return task.AttackTask(mocker.Mock(), mocker.Mock(), mocker.Mock(), mocker.Mock())
+
+    def test_usage_reported(self, task_obj: task.AttackTask, mocker: MockerFixture):
+        mock_run = mocker.patch.object(
+            task.AttackTask, "_run_in_process", return_value=LimitedRun(ModuleOutput(Result.OK), {"cpu_time": 1.5})
+        )
+
+        result = task_obj._execute({"module": "nmap", "arguments": {}, "resource_limits": {"cpu_time": 5}})
+
+        assert result["result"] == Result.OK
+        assert result["resource_usage"] == {"cpu_time": 1.5}
+        assert mock_run.call_args.args[1].cpu_time == 5
+
+    def test_process_ended(self, task_obj: task.AttackTask, mocker: MockerFixture):
+        mocker.patch.object(task.AttackTask, "_run_in_process", return_value=ModuleOutput(Result.STOPPED))
+
+        result = task_obj._execute({"module": "nmap", "arguments": {}})
+
+        assert result["result"] == Result.STOPPED
+        assert "resource_usage" not in result
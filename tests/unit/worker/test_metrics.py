@@ -0,0 +1,77 @@
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.worker import worker
+from cryton.worker.triggers import HTTPListener
+from cryton.worker.utility import util
+from cryton.worker.utility.metrics import Gauge, Histogram, Metrics, MetricsServer
+
+
+class TestMetrics:
+    def test_histogram(self):
+        histogram = Histogram((1, 5, float("inf")))
+        for value in [0.5, 1, 3, 10]:
+            histogram.observe(value)
+
+        assert histogram.samples("duration", {"module": "nmap"}) == [
+            'duration_bucket{module="nmap",le="1.0"} 2',
+            'duration_bucket{module="nmap",le="5.0"} 3',
+            'duration_bucket{module="nmap",le="+Inf"} 4',
+            'duration_sum{module="nmap"} 14.5',
+            'duration_count{module="nmap"} 4',
+        ]
+
+    def test_render(self):
+        metrics = Metrics()
+        metrics.observe_execution("nmap", "ok", 2)
+        metrics.observe_execution("nmap", "ok", 20)
+        metrics.observe_reply_latency(0.002)
+
+        rendered = metrics.render([Gauge("tasks_running", "Running.", "module", {'my"module': 1})]).splitlines()
+
+        assert rendered[:3] == [
+            "# HELP cryton_worker_tasks_running Running.",
+            "# TYPE cryton_worker_tasks_running gauge",
+            'cryton_worker_tasks_running{module="my\\"module"} 1.0',
+        ]
+        assert 'cryton_worker_tasks_finished_total{module="nmap",result="ok"} 2' in rendered
+        assert 'cryton_worker_module_duration_seconds_bucket{module="nmap",le="5.0"} 1' in rendered
+        assert "cryton_worker_process_spawn_seconds_count 0" in rendered
+        assert 'cryton_worker_reply_publish_seconds_bucket{le="0.005"} 1' in rendered
+
+
+class TestMetricsServer:
+    @pytest.fixture
+    def server(self):
+        server = MetricsServer("127.0.0.1", 0, lambda: "metric 1.0\n")
+        server.start()
+        yield server
+        server.stop()
+
+    def test_metrics(self, server: MetricsServer):
+        with urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            assert response.read() == b"metric 1.0\n"
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+
+    def test_unknown_path(self, server: MetricsServer):
+        with pytest.raises(HTTPError) as error:
+            urlopen(f"http://127.0.0.1:{server.port}/")
+        assert error.value.code == 404
+
+
+def test_worker_render_metrics(mocker: MockerFixture):
+    worker_obj = worker.Worker("host", 5672, "user", "pass", "worker", 1, 1, False, False)
+    worker_obj._listeners = [HTTPListener.__new__(HTTPListener)]
+    worker_obj._main_queue.put(util.PrioritizedItem(0, {}))
+    mocker.patch.object(worker_obj._consumer, "spool_size", return_value=3)
+    mocker.patch.object(worker.admission_controller, "stats", return_value={"running": {"nmap": 2}, "queued": {}})
+
+    rendered = worker_obj._render_metrics().splitlines()
+
+    assert 'cryton_worker_tasks_running{module="nmap"} 2.0' in rendered
+    assert "cryton_worker_spool_messages 3.0" in rendered
+    assert "cryton_worker_main_queue_depth 1.0" in rendered
+    assert 'cryton_worker_listeners{type="HTTP"} 1.0' in rendered
@@ -0,0 +1,57 @@
+import sys
+
+import pytest
+
+from cryton.worker.utility import util
+from cryton.worker.utility.module_registry import ModuleRegistry
+
+NAMESPACE = "registry_test_modules"
+
+
+def _add_module(directory, name: str) -> None:
+    module_directory = directory / NAMESPACE / name
+    module_directory.mkdir(parents=True)
+    (module_directory / "__init__.py").write_text("")
+    (module_directory / "module.py").write_text(f"class Module:\n    name = '{name}'\n")
+
+
+@pytest.fixture
+def modules_directory(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    _add_module(tmp_path, "first")
+    yield tmp_path
+    for name in [name for name in sys.modules if name.startswith(NAMESPACE)]:
+        del sys.modules[name]
+
+
+class TestModuleRegistry:
+    def test_lazy_import(self, modules_directory):
+        _add_module(modules_directory, "second")
+        registry = ModuleRegistry(NAMESPACE)
+
+        assert registry.names() == {"first", "second"}
+        assert f"{NAMESPACE}.first.module" not in sys.modules
+
+        module = registry.get("first")
+
+        assert module.Module.name == "first"
+        assert registry.get("first") is module
+        assert f"{NAMESPACE}.second.module" not in sys.modules
+
+    def test_new_module(self, modules_directory):
+        registry = ModuleRegistry(NAMESPACE)
+        registry.get("first")
+
+        _add_module(modules_directory, "second")
+
+        assert registry.get("second").Module.name == "second"
+
+    def test_unknown_module(self, modules_directory):
+        registry = ModuleRegistry(NAMESPACE)
+
+        with pytest.raises(KeyError):
+            registry.get("unknown")
+
+
+def test_get_module():
+    assert util.get_module("command").__module__ == "cryton.modules.command.module"
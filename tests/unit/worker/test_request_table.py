@@ -0,0 +1,23 @@
+from pytest_mock import MockerFixture
+
+from cryton.worker.utility import constants as co, request_table
+from cryton.worker.utility.request_table import RequestTable
+
+
+class TestRequestTable:
+    def test_prune(self, tmp_path, mocker: MockerFixture):
+        file_path = str(tmp_path / "requests.db")
+        previous_table = RequestTable(file_path, 60)
+        for correlation_id in ["finished", "interrupted"]:
+            previous_table.start(correlation_id)
+        previous_table.finish("finished", "result")
+        previous_table.close()
+        mocker.patch.object(request_table.time, "time", return_value=request_table.time.time() + 120)
+
+        table = RequestTable(file_path, 60)
+        table.start("running")
+        table.start("new")  # Running requests of the current run are kept
+
+        assert table.get("finished") is None
+        assert table.get("interrupted") is None
+        assert table.get("running") == (co.TASK_RUNNING, None, True)
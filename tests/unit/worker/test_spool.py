@@ -0,0 +1,70 @@
+from pytest_mock import MockerFixture
+
+from cryton.worker.utility import spool
+from cryton.worker.utility.spool import MessageSpool
+from cryton.worker.utility.util import UndeliveredMessage
+
+
+def _message(body: str) -> UndeliveredMessage:
+    return UndeliveredMessage("queue", body, {"correlation_id": body})
+
+
+class TestMessageSpool:
+    def test_replay_in_order(self, tmp_path):
+        spool_path = str(tmp_path / "spool" / "worker.jsonl")
+        message_spool = MessageSpool(spool_path, 0)
+        for body in ["first", "second", "third"]:
+            message_spool.add(_message(body))
+        message_spool.confirm(2)
+        message_spool.close()
+
+        restored_spool = MessageSpool(spool_path, 0)
+
+        assert restored_spool.pending() == [(1, _message("first")), (3, _message("third"))]
+        assert restored_spool.add(_message("fourth")) == 4
+
+    def test_compaction(self, tmp_path, mocker: MockerFixture):
+        mocker.patch.object(spool, "COMPACT_THRESHOLD", 2)
+        spool_path = tmp_path / "worker.jsonl"
+        message_spool = MessageSpool(str(spool_path), 0)
+        for body in ["first", "second", "third"]:
+            message_spool.add(_message(body))
+
+        message_spool.confirm(1)
+        assert len(spool_path.read_text().splitlines()) == 4
+
+        message_spool.confirm(2)
+        assert len(spool_path.read_text().splitlines()) == 1
+
+        message_spool.confirm(3)
+        assert spool_path.read_text() == ""
+
+    def test_partial_record(self, tmp_path):
+        spool_path = tmp_path / "worker.jsonl"
+        message_spool = MessageSpool(str(spool_path), 0)
+        message_spool.add(_message("first"))
+        message_spool.close()
+        with open(spool_path, "a") as spool_file:
+            spool_file.write('{"id": 2, "recip')
+
+        assert MessageSpool(str(spool_path), 0).pending() == [(1, _message("first"))]
+
+    def test_sync_batching(self, tmp_path, mocker: MockerFixture):
+        mock_fsync = mocker.patch.object(spool.os, "fsync")
+        mock_timer = mocker.patch.object(spool, "Timer")
+        message_spool = MessageSpool(str(tmp_path / "worker.jsonl"), 1)
+
+        message_spool.add(_message("first"))
+        message_spool.add(_message("second"))
+
+        mock_timer.assert_called_once_with(1, message_spool.sync)
+        mock_fsync.assert_not_called()
+        message_spool.sync()
+        mock_fsync.assert_called_once()
+
+    def test_no_file(self, tmp_path):
+        message_spool = MessageSpool(str(tmp_path / "worker.jsonl"), 0)
+
+        assert message_spool.pending() == []
+        message_spool.close()
+        assert not (tmp_path / "worker.jsonl").exists()
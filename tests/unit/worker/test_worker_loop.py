@@ -0,0 +1,91 @@
+import asyncio
+from threading import Thread
+
+import pytest
+from pytest_mock import MockerFixture
+
+from cryton.worker import worker, event
+from cryton.worker.utility import constants as co, util
+
+
+@pytest.fixture
+def worker_obj():
+    worker_obj = worker.Worker("host", 5672, "user", "pass", "worker", 1, 1, False, False)
+    worker_obj._start_event_loop()
+    yield worker_obj
+    worker_obj._stop_event_loop()
+
+
+class TestMainQueue:
+    def test_put_before_bind(self):
+        main_queue = util.MainQueue()
+        main_queue.put(util.PrioritizedItem(co.LOW_PRIORITY, {"id": "low"}))
+        main_queue.put(util.PrioritizedItem(co.HIGH_PRIORITY, {"id": "high"}))
+        assert main_queue.qsize() == 2
+
+        async def get_items():
+            main_queue.bind(asyncio.get_running_loop())
+            return [(await main_queue.get()).item["id"] for _ in range(2)]
+
+        assert asyncio.run(get_items()) == ["high", "low"]
+
+    def test_put_from_thread(self):
+        main_queue = util.MainQueue()
+
+        async def get_item():
+            main_queue.bind(asyncio.get_running_loop())
+            Thread(target=main_queue.put, args=(util.PrioritizedItem(co.MEDIUM_PRIORITY, {"id": "item"}),)).start()
+            return (await main_queue.get()).item["id"]
+
+        assert asyncio.run(get_item()) == "item"
+
+    def test_same_priority_order(self):
+        first = util.PrioritizedItem(co.MEDIUM_PRIORITY, {})
+        second = util.PrioritizedItem(co.MEDIUM_PRIORITY, {})
+
+        assert first.timestamp <= second.timestamp
+        assert not second < first
+
+
+class TestRequests:
+    def test_stop_task(self, worker_obj: worker.Worker, mocker: MockerFixture):
+        mock_task = mocker.Mock()
+        mock_task.stop.return_value = True
+        mocker.patch.object(worker_obj._consumer, "pop_task", return_value=mock_task)
+
+        result = event.Event({co.CORRELATION_ID: "id"}, worker_obj._main_queue).stop_step_execution()
+
+        assert result == {co.RESULT: co.CODE_OK}
+
+    def test_add_and_remove_trigger(self, worker_obj: worker.Worker, mocker: MockerFixture):
+        mock_listener = mocker.Mock()
+        mock_listener.return_value.add_trigger.return_value = "trigger-id"
+        mock_listener.return_value.any_trigger_exists.return_value = False
+        mocker.patch.object(worker, "ListenerEnum", {"HTTP": mock_listener})
+
+        result = event.Event({co.TRIGGER_TYPE: "HTTP"}, worker_obj._main_queue).add_trigger()
+
+        assert result == {co.RESULT: co.CODE_OK, co.TRIGGER_ID: "trigger-id"}
+        assert worker_obj._listeners == [mock_listener.return_value]
+
+        result = event.Event({co.TRIGGER_ID: "trigger-id"}, worker_obj._main_queue).remove_trigger()
+
+        assert result == {co.RESULT: co.CODE_OK}
+        assert worker_obj._listeners == []
+
+    def test_request_error(self, worker_obj: worker.Worker, mocker: MockerFixture):
+        mocker.patch.object(worker_obj._consumer, "pop_task", side_effect=RuntimeError("error"))
+
+        result = event.Event({co.CORRELATION_ID: "id"}, worker_obj._main_queue).stop_step_execution()
+
+        assert result == {co.RESULT: co.CODE_ERROR, co.OUTPUT: "error"}
+
+    def test_send_message(self, worker_obj: worker.Worker, mocker: MockerFixture):
+        mock_send = mocker.patch.object(worker_obj._consumer, "send_message")
+        request = {co.ACTION: co.ACTION_SEND_MESSAGE, co.QUEUE_NAME: "queue", co.DATA: "data", co.PROPERTIES: {}}
+
+        worker_obj._main_queue.put(util.PrioritizedItem(co.HIGH_PRIORITY, request))
+        worker_obj._stop_event_loop()
+
+        mock_send.assert_called_once_with("queue", "data", co.DEFAULT_MSG_PROPERTIES)
+        worker_obj._start_event_loop()  # For the fixture teardown